@@ -25,6 +25,7 @@ from app.models.audit_log import AuditLogModel
 from app.models.mcp_server import MCPServerModel
 from app.models.working_directory import WorkingDirectoryModel
 from app.models.hook import HookModel
+from app.models.storage_usage import StorageUsageModel, StorageUsageTotalModel
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
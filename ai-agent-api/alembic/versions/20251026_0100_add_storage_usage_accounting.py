@@ -0,0 +1,56 @@
+"""Add storage usage accounting tables.
+
+Revision ID: storage_usage_1026
+Revises: add_tool_group_1025
+Create Date: 2025-10-26 01:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'storage_usage_1026'
+down_revision = 'add_tool_group_1025'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('storage_usage',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('execution_id', sa.UUID(), nullable=True),
+    sa.Column('resource_type', sa.String(length=50), nullable=False),
+    sa.Column('resource_path', sa.Text(), nullable=False),
+    sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('file_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('reconciled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.CheckConstraint("resource_type IN ('working_directory', 'archive', 'report')", name=op.f('ck_storage_usage_chk_storage_usage_resource_type')),
+    sa.CheckConstraint('size_bytes >= 0 AND file_count >= 0', name=op.f('ck_storage_usage_chk_storage_usage_counters')),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_storage_usage_user_id_users'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['execution_id'], ['task_executions.id'], name=op.f('fk_storage_usage_execution_id_task_executions'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_storage_usage')),
+    sa.UniqueConstraint('resource_path', name=op.f('uq_storage_usage_resource_path'))
+    )
+    op.create_index(op.f('ix_storage_usage_user_id'), 'storage_usage', ['user_id'], unique=False)
+    op.create_index('idx_storage_usage_user_type', 'storage_usage', ['user_id', 'resource_type'], unique=False)
+
+    op.create_table('storage_usage_totals',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('owner_key', sa.String(length=64), nullable=False),
+    sa.Column('resource_type', sa.String(length=50), nullable=False),
+    sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('file_count', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_storage_usage_totals')),
+    sa.UniqueConstraint('owner_key', 'resource_type', name='uq_storage_usage_totals_owner_type')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('storage_usage_totals')
+    op.drop_index('idx_storage_usage_user_type', table_name='storage_usage')
+    op.drop_index(op.f('ix_storage_usage_user_id'), table_name='storage_usage')
+    op.drop_table('storage_usage')
@@ -0,0 +1,29 @@
+"""Add health probe details to mcp_servers table.
+
+Revision ID: mcp_health_1027
+Revises: storage_usage_1026
+Create Date: 2025-10-27 01:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.database.base import JSONB
+
+# revision identifiers, used by Alembic.
+revision = 'mcp_health_1027'
+down_revision = 'storage_usage_1026'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Result of the last MCP initialize + list-tools probe
+    op.add_column('mcp_servers', sa.Column('last_error', sa.Text(), nullable=True))
+    op.add_column('mcp_servers', sa.Column('health_latency_ms', sa.Integer(), nullable=True))
+    op.add_column('mcp_servers', sa.Column('health_tools', JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('mcp_servers', 'health_tools')
+    op.drop_column('mcp_servers', 'health_latency_ms')
+    op.drop_column('mcp_servers', 'last_error')
@@ -3,7 +3,7 @@ FastAPI dependencies for dependency injection.
 """
 
 import jwt
-from fastapi import Depends, HTTPException, WebSocket, status
+from fastapi import Depends, HTTPException, Query, WebSocket, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -133,6 +133,34 @@ async def require_admin(
     return current_user
 
 
+async def get_event_stream_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(HTTPBearer(auto_error=False)),
+    token: str | None = Query(None, description="JWT token (for EventSource, which cannot set headers)"),
+    db: AsyncSession = Depends(get_db_session),
+    token_service: TokenService = Depends(get_token_service),
+) -> User:
+    """
+    Get current active user for Server-Sent Events endpoints.
+
+    Accepts the usual Bearer header, or the token as a query parameter
+    since browser EventSource connections cannot send headers.
+
+    Raises:
+        HTTPException: If no token is given or authentication fails
+    """
+    if credentials is None:
+        if not token:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Not authenticated",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    user = await get_current_user(credentials, db, token_service)
+    return await get_current_active_user(user)
+
+
 async def get_optional_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(HTTPBearer(auto_error=False)),
     db: AsyncSession = Depends(get_db_session),
@@ -232,6 +260,7 @@ async def get_permission_manager(
     db: AsyncSession = Depends(get_db_session)
 ):
     """Get PermissionManager instance."""
+    from app.claude_sdk.permissions.decision_log import get_permission_decision_log
     from app.claude_sdk.permissions.permission_manager import PermissionManager
     from app.claude_sdk.permissions.policy_engine import PolicyEngine
     from app.repositories.permission_decision_repository import PermissionDecisionRepository
@@ -240,20 +269,25 @@ async def get_permission_manager(
     # Register default policies
     # TODO: Load and register policies based on configuration
 
-    return PermissionManager(db, policy_engine, PermissionDecisionRepository(db))
+    return PermissionManager(
+        db,
+        policy_engine,
+        PermissionDecisionRepository(db),
+        decision_log=get_permission_decision_log()
+    )
 
 
-async def get_storage_archiver():
+async def get_storage_archiver(
+    db: AsyncSession = Depends(get_db_session)
+):
     """Get StorageArchiver instance."""
     from app.claude_sdk.persistence.storage_archiver import StorageArchiver
-    from app.core.config import settings
-
-    return StorageArchiver(
-        provider=settings.storage_provider,
-        bucket=settings.aws_s3_bucket if settings.storage_provider == "s3" else None,
-        region=settings.aws_s3_region if settings.storage_provider == "s3" else None
+    from app.repositories.working_directory_archive_repository import (
+        WorkingDirectoryArchiveRepository
     )
 
+    return StorageArchiver.from_settings(db, WorkingDirectoryArchiveRepository(db))
+
 
 async def get_metrics_collector(
     db: AsyncSession = Depends(get_db_session)
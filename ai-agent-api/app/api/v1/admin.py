@@ -8,20 +8,30 @@ from uuid import UUID
 from fastapi import (
     APIRouter,
     Depends,
+    HTTPException,
     Query,
+    status,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, select
 from datetime import datetime, timedelta
 
 from app.api.dependencies import require_admin, get_db_session
+from app.claude_sdk.event_broadcaster import get_event_broadcaster
 from app.domain.entities import User
 from app.repositories.task_repository import TaskRepository
 from app.repositories.user_repository import UserRepository
 from app.models.task import Task as TaskModel
 from app.models.user import User as UserModel
-from app.schemas.admin import SystemStatsResponse
+from app.schemas.admin import SystemStatsResponse, StorageMaintenanceResponse
 from app.schemas.common import PaginationParams
+from app.services.storage_accounting_service import StorageAccountingService
+from app.services.storage_maintenance_service import (
+    MANUAL_MAINTENANCE_LOCK_SECONDS,
+    StorageMaintenanceService,
+    acquire_maintenance_lock,
+    release_maintenance_lock,
+)
 
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -45,6 +55,9 @@ async def get_system_stats(
     user_repo = UserRepository(db)
     total_users = await user_repo.count()
 
+    # Storage statistics (maintained counters, no filesystem walk)
+    storage_usage = await StorageAccountingService(db).get_global_usage()
+
     return SystemStatsResponse(
         sessions={
             "total": 0,
@@ -65,13 +78,43 @@ async def get_system_stats(
             "today_usd": 0.0,
         },
         storage={
-            "working_dirs_mb": 0,
-            "reports_mb": 0,
-            "archives_mb": 0,
+            "working_dirs_mb": storage_usage["working_directory"]["size_bytes"] // (1024 * 1024),
+            "reports_mb": storage_usage["report"]["size_bytes"] // (1024 * 1024),
+            "archives_mb": storage_usage["archive"]["size_bytes"] // (1024 * 1024),
         },
+        websocket=get_event_broadcaster().get_stats(),
     )
 
 
+@router.post("/storage/maintenance", response_model=StorageMaintenanceResponse)
+async def run_storage_maintenance(
+    dry_run: bool = Query(True, description="Only report what would be reclaimed"),
+    admin_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db_session),
+) -> StorageMaintenanceResponse:
+    """
+    Run storage retention and orphan cleanup now (admin only).
+
+    Defaults to a dry run that reports what would be archived or deleted.
+    A real pass takes the same lock as the periodic maintenance worker and
+    fails with 409 while another pass holds it.
+    """
+    if dry_run:
+        report = await StorageMaintenanceService(db).run(dry_run=True)
+        return StorageMaintenanceResponse(**report)
+
+    if not await acquire_maintenance_lock(MANUAL_MAINTENANCE_LOCK_SECONDS):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another storage maintenance pass is running",
+        )
+    try:
+        report = await StorageMaintenanceService(db).run(dry_run=False)
+    finally:
+        await release_maintenance_lock()
+    return StorageMaintenanceResponse(**report)
+
+
 @router.get("/users", response_model=dict)
 async def list_all_users(
     include_deleted: bool = Query(False, description="Include deleted users"),
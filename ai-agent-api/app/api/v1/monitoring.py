@@ -16,6 +16,7 @@ from app.api.dependencies import (
 )
 from app.domain.entities import User
 from app.claude_sdk.monitoring.cost_tracker import TimePeriod
+from app.claude_sdk.monitoring.system_metrics import get_system_metrics_sampler
 
 
 router = APIRouter(prefix="/monitoring", tags=["monitoring"])
@@ -65,6 +66,30 @@ async def storage_health(
     return {"healthy": is_healthy}
 
 
+@router.get("/system")
+async def system_metrics(
+    current_user: User = Depends(get_current_active_user),
+) -> Dict[str, Any]:
+    """
+    Get host resource usage.
+
+    Returns the latest background sample plus avg/min/max/p50/p95 of CPU,
+    memory, disk and network over rolling 1s, 1m and 5m windows. Reads
+    from memory only; when background sampling is disabled a sample is
+    taken on demand instead.
+
+    Returns:
+        System metrics snapshot
+    """
+    sampler = get_system_metrics_sampler()
+    if not sampler.running:
+        try:
+            await sampler.current()
+        except ImportError:
+            pass  # psutil not installed: report no samples
+    return sampler.snapshot()
+
+
 @router.get("/costs/user/{user_id}")
 async def get_user_costs(
     user_id: UUID,
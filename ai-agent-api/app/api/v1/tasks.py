@@ -8,16 +8,20 @@ from uuid import UUID
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
     HTTPException,
     Query,
+    Response,
     status,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_active_user, get_db_session
+from app.api.dependencies import get_current_active_user, get_db_session, get_event_stream_user
 from app.domain.entities import User
+from app.domain.exceptions import QuotaExceededError
 from app.repositories.task_repository import TaskRepository
 from app.repositories.task_execution_repository import TaskExecutionRepository
+from app.services.execution_events import stream_execution_events
 from app.services.task_service import TaskService
 from app.schemas.task import (
     TaskCreateRequest,
@@ -567,11 +571,17 @@ async def execute_task(
     )
 
     # Execute task
-    execution = await service.execute_task(
-        task_id=str(task_id),
-        trigger_type="manual",
-        variables=request.variables,
-    )
+    try:
+        execution = await service.execute_task(
+            task_id=str(task_id),
+            trigger_type="manual",
+            variables=request.variables,
+        )
+    except QuotaExceededError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+        )
 
     logger.info(
         "API: Task execution initiated successfully",
@@ -830,6 +840,57 @@ async def get_task_execution(
     return response
 
 
+@router.get("/executions/{execution_id}/events")
+async def stream_task_execution_events(
+    execution_id: UUID,
+    last_event_id: Optional[str] = Header(None, description="Resume after this event id"),
+    current_user: User = Depends(get_event_stream_user),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    Stream task execution progress as Server-Sent Events.
+
+    Replaces polling `GET /tasks/executions/{id}`. Events (each with an
+    `id` usable as `Last-Event-ID`):
+    - `status`: status transition (`running`, then `completed`, `failed`
+      or `cancelled`, which ends the stream)
+    - `assistant_text`: text produced by Claude
+    - `tool_call`: tool requested by Claude (name and input)
+    - `result`: final duration, turns and cost
+
+    Recent events are replayed on connect, and after `Last-Event-ID` on
+    reconnect. Idle streams receive `: heartbeat` comments. Browsers can
+    authenticate with `?token=<jwt>` since EventSource cannot set headers.
+    """
+    from fastapi.responses import StreamingResponse
+
+    exec_repo = TaskExecutionRepository(db)
+    execution = await exec_repo.get_by_id(str(execution_id))
+
+    if execution is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task execution {execution_id} not found",
+        )
+
+    task_repo = TaskRepository(db)
+    task = await task_repo.get_by_id(str(execution.task_id))
+
+    if task and task.user_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this execution",
+        )
+
+    resume_after = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+    return StreamingResponse(
+        stream_execution_events(execution_id, execution.status, resume_after),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ===== NEW ENDPOINTS: Tool Calls, Cancellation, Working Directory Management =====
 
 
@@ -955,14 +1016,21 @@ async def cancel_execution(
 @router.get("/executions/{execution_id}/files", response_model=WorkingDirectoryManifest)
 async def get_execution_files(
     execution_id: UUID,
+    response: Response,
+    pattern: Optional[str] = Query(None, description="Glob filter on relative paths (e.g. '*.log')"),
+    page: int = Query(1, ge=1, description="Page number (used with page_size)"),
+    page_size: Optional[int] = Query(None, ge=1, le=1000, description="Files per page (all files if omitted)"),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db_session),
-) -> WorkingDirectoryManifest:
+):
     """
     Get file manifest for task execution's working directory.
 
-    Returns a list of all files in the execution's working directory with metadata
-    (path, size, modified timestamp).
+    Returns files in the execution's working directory with metadata
+    (path, size, modified timestamp), sorted by path. Supports glob filtering
+    and pagination. The response carries an `ETag`; send it back in
+    `If-None-Match` to get `304 Not Modified` when nothing changed.
 
     **Note**: Working directory must still exist (not yet archived or cleaned up).
     """
@@ -981,8 +1049,19 @@ async def get_execution_files(
         manifest_data = await service.get_execution_files(
             execution_id=execution_id,
             user_id=current_user.id,
+            pattern=pattern,
+            offset=(page - 1) * page_size if page_size else 0,
+            limit=page_size,
+            if_none_match=if_none_match,
         )
 
+        if manifest_data["not_modified"]:
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": manifest_data["etag"]},
+            )
+        response.headers["ETag"] = manifest_data["etag"]
+
         # Convert file list to response models
         file_infos = [
             WorkingDirectoryFileInfo(**file_data)
@@ -994,6 +1073,9 @@ async def get_execution_files(
             execution_id=manifest_data["execution_id"],
             total_files=manifest_data["total_files"],
             total_size=manifest_data["total_size"],
+            matched_files=manifest_data["matched_files"],
+            page=page if page_size else None,
+            page_size=page_size,
             files=file_infos,
             _links=Links(
                 self=f"/api/v1/task-executions/{execution_id}/files",
@@ -1173,7 +1255,6 @@ async def download_archive(
     """
     from fastapi.responses import FileResponse
     from app.services.storage_manager import StorageManager
-    from pathlib import Path
 
     task_execution_repo = TaskExecutionRepository(db)
     task_repo = TaskRepository(db)
@@ -1200,25 +1281,162 @@ async def download_archive(
             detail="Not authorized to download this archive",
         )
 
-    # Find archive file
+    # Find archive file (most recent if multiple exist)
     storage_mgr = StorageManager()
-    archive_dir = storage_mgr.archive_dir
-
-    # Look for archive files matching this execution/session ID
     session_id_for_archive = execution.session_id if execution.session_id else execution.task_id
-    matching_archives = list(archive_dir.glob(f"{session_id_for_archive}_*.tar.gz"))
+    archive_path = await storage_mgr.find_archive(session_id_for_archive)
 
-    if not matching_archives:
+    if not archive_path:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Archive file not found for execution {archive_id}",
         )
 
-    # Return most recent archive if multiple exist
-    archive_path = sorted(matching_archives, key=lambda p: p.stat().st_mtime, reverse=True)[0]
-
     return FileResponse(
         path=str(archive_path),
         filename=archive_path.name,
         media_type="application/gzip",
     )
+
+
+@router.get("/archives/{archive_id}/files/{file_path:path}")
+async def download_archive_file(
+    archive_id: UUID,
+    file_path: str,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    Download a single file from an archived working directory.
+
+    Uses the archive's sidecar index to decompress only the frame that holds
+    the requested file, so fetching one log from a large archive reads
+    kilobytes instead of the whole tarball. Archives stored in S3 are read
+    with a ranged GET of that frame.
+
+    The archive_id is the same as the execution_id for which the directory was archived.
+    """
+    from pathlib import PurePosixPath
+    from fastapi.responses import StreamingResponse
+    from app.claude_sdk.persistence.archive_index import (
+        ArchiveMemberNotFoundError,
+        normalize_member_path,
+    )
+    from app.claude_sdk.persistence.storage_archiver import StorageArchiver
+    from app.claude_sdk.persistence.storage_backends import S3_PROVIDERS
+    from app.core.config import settings
+    from app.domain.entities.archive_metadata import ArchiveStatus
+    from app.repositories.working_directory_archive_repository import (
+        WorkingDirectoryArchiveRepository
+    )
+    from app.services.storage_manager import StorageManager
+
+    task_execution_repo = TaskExecutionRepository(db)
+    task_repo = TaskRepository(db)
+
+    # Get execution and authorize
+    execution = await task_execution_repo.get_by_id(str(archive_id))
+    if not execution:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Archive {archive_id} not found",
+        )
+
+    task = await task_repo.get_by_id(str(execution.task_id))
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task {execution.task_id} not found",
+        )
+
+    # Check authorization
+    if task.user_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to download this archive",
+        )
+
+    try:
+        normalize_member_path(file_path)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file path (directory traversal detected)",
+        )
+
+    session_id_for_archive = execution.session_id if execution.session_id else execution.task_id
+    filename = PurePosixPath(file_path).name
+
+    # Archives uploaded to S3: ranged read of the frame holding the file
+    if settings.storage_provider in S3_PROVIDERS:
+        archive_repo = WorkingDirectoryArchiveRepository(db)
+        archive = await archive_repo.get_by_session(session_id_for_archive)
+        if (
+            archive is not None
+            and archive.status == ArchiveStatus.COMPLETED.value
+            and (archive.manifest or {}).get("index_path")
+        ):
+            archiver = StorageArchiver.from_settings(db, archive_repo)
+            try:
+                size, chunks = await archiver.open_archive_file(archive.id, file_path)
+            except ArchiveMemberNotFoundError:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"File not found in archive: {file_path}",
+                )
+            except ValueError:
+                # The path was validated above: the archive record changed
+                # (deleted or re-archived) since it was looked up
+                if await archive_repo.get_by_id(archive.id) is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"Archive {archive_id} not found",
+                    )
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Archive {archive_id} is being modified, retry later",
+                )
+
+            return StreamingResponse(
+                chunks,
+                media_type="application/octet-stream",
+                headers={
+                    "Content-Length": str(size),
+                    "Content-Disposition": f'attachment; filename="{filename}"',
+                },
+            )
+
+    storage_mgr = StorageManager()
+    archive_path = await storage_mgr.find_archive(session_id_for_archive)
+
+    if not archive_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Archive file not found for execution {archive_id}",
+        )
+
+    try:
+        member = await storage_mgr.open_archive_file(archive_path, file_path)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file path (directory traversal detected)",
+        )
+
+    if member is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"File not found in archive: {file_path}",
+        )
+
+    size, chunks = member
+
+    # Sync iterator: Starlette drains it in a thread pool
+    return StreamingResponse(
+        chunks,
+        media_type="application/octet-stream",
+        headers={
+            "Content-Length": str(size),
+            "Content-Disposition": f'attachment; filename="{filename}"',
+        },
+    )
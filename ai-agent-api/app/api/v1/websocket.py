@@ -3,7 +3,7 @@ WebSocket API endpoints for real-time session streaming.
 """
 
 import json
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from fastapi import (
@@ -18,9 +18,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_websocket_user, get_db_session
 from app.domain.entities import User
+from app.repositories.message_repository import MessageRepository
 from app.repositories.session_repository import SessionRepository
 from app.services.sdk_session_service import SDKIntegratedSessionService
-from app.claude_sdk.message_processor import EventBroadcaster
+from app.claude_sdk.event_broadcaster import get_event_broadcaster, message_to_dict
+from app.claude_sdk.stream_protocol import negotiate_codec
 from app.core.logging import get_logger
 
 
@@ -28,8 +30,8 @@ logger = get_logger(__name__)
 router = APIRouter(tags=["websocket"])
 
 
-# Global event broadcaster instance
-event_broadcaster = EventBroadcaster()
+# Process-wide event broadcaster (Redis-backed when running multiple workers)
+event_broadcaster = get_event_broadcaster()
 
 
 @router.websocket("/sessions/{session_id}/stream")
@@ -37,6 +39,15 @@ async def websocket_session_stream(
     websocket: WebSocket,
     session_id: UUID,
     token: str = Query(..., description="JWT authentication token"),
+    since_sequence: Optional[int] = Query(
+        None, ge=0, description="Resume after this message sequence number"
+    ),
+    encoding: str = Query(
+        "json", pattern="^(json|msgpack)$", description="Frame encoding: json (text) or msgpack (binary)"
+    ),
+    compression: str = Query(
+        "none", pattern="^(none|deflate)$", description="Per-frame deflate for binary frames"
+    ),
     db: AsyncSession = Depends(get_db_session),
 ) -> None:
     """
@@ -48,6 +59,17 @@ async def websocket_session_stream(
         'ws://api/v1/sessions/{session_id}/stream?token=<jwt_token>'
     );
     ```
+
+    **Resume after a disconnect:** pass the `sequence_number` of the last
+    message received as `since_sequence`. Missed messages are replayed,
+    followed by a `replay_complete` event, and then the live feed continues
+    without gaps or duplicates.
+
+    **Compact binary frames:** pass `encoding=msgpack` (and optionally
+    `compression=deflate`) to receive msgpack binary frames with
+    dictionary-coded field names instead of JSON text. The `connected`
+    event reports the protocol in use; see `app.claude_sdk.stream_protocol`
+    for the frame format. Client messages are always JSON text.
     
     **Send Message:**
     ```json
@@ -62,9 +84,13 @@ async def websocket_session_stream(
     - `status_change`: Session status changed
     - `tool_call_started`: Tool execution started
     - `tool_call_completed`: Tool execution completed
+    - `replay_complete`: Missed messages replayed (resume only)
+    - `replay_gap`: Too far behind to replay everything; names the skipped
+      sequence range to fetch from the messages API (resume only)
     - `error`: Error occurred
     """
     await websocket.accept()
+    codec = negotiate_codec(encoding, compression)
     
     try:
         # Authenticate user
@@ -75,7 +101,7 @@ async def websocket_session_stream(
         session = await repo.get_by_id(str(session_id))
         
         if session is None:
-            await websocket.send_json({
+            await codec.send(websocket, {
                 "type": "error",
                 "data": {
                     "code": "SESSION_NOT_FOUND",
@@ -86,7 +112,7 @@ async def websocket_session_stream(
             return
         
         if session.user_id != current_user.id and current_user.role != "admin":
-            await websocket.send_json({
+            await codec.send(websocket, {
                 "type": "error",
                 "data": {
                     "code": "FORBIDDEN",
@@ -96,23 +122,42 @@ async def websocket_session_stream(
             await websocket.close(code=1008, reason="Not authorized")
             return
         
-        # Subscribe to session events
-        subscriber_id = event_broadcaster.subscribe(str(session_id))
-        logger.info(f"WebSocket client connected to session {session_id}")
-        
         # Send connection confirmation
-        await websocket.send_json({
+        await codec.send(websocket, {
             "type": "connected",
             "data": {
                 "session_id": str(session_id),
                 "status": session.status,
+                "since_sequence": since_sequence,
+                "protocol": codec.describe(),
             }
         })
+
+        async def load_history(after: int, before: Optional[int]) -> List[Dict]:
+            """Load messages older than the replay buffer from the database."""
+            messages = await MessageRepository(db).get_after_sequence(
+                session_id, after, before, limit=event_broadcaster.history_limit
+            )
+            return [message_to_dict(message) for message in messages]
+
+        # Subscribe to session events (replaying missed messages on resume)
+        subscriber = await event_broadcaster.subscribe(
+            session_id,
+            websocket,
+            since_sequence=since_sequence,
+            load_history=load_history,
+            codec=codec,
+        )
+        logger.info(
+            f"WebSocket client connected to session {session_id}",
+            extra={"since_sequence": since_sequence},
+        )
         
         # Initialize service
         service = SDKIntegratedSessionService(db)
         
-        # Main message loop
+        # Main message loop. Replies go through the subscriber's queue so
+        # its writer task stays the only sender on this connection.
         while True:
             try:
                 # Wait for message from client
@@ -125,7 +170,7 @@ async def websocket_session_stream(
                     # Send message to Claude
                     message_content = data.get("message")
                     if not message_content:
-                        await websocket.send_json({
+                        subscriber.send_event({
                             "type": "error",
                             "data": {
                                 "code": "INVALID_INPUT",
@@ -141,7 +186,7 @@ async def websocket_session_stream(
                     )
                     
                     # Confirm message sent
-                    await websocket.send_json({
+                    subscriber.send_event({
                         "type": "message_sent",
                         "data": {
                             "message_id": str(message.id),
@@ -151,10 +196,10 @@ async def websocket_session_stream(
                 
                 elif message_type == "ping":
                     # Heartbeat
-                    await websocket.send_json({"type": "pong"})
+                    subscriber.send_event({"type": "pong"})
                 
                 else:
-                    await websocket.send_json({
+                    subscriber.send_event({
                         "type": "error",
                         "data": {
                             "code": "UNKNOWN_MESSAGE_TYPE",
@@ -167,7 +212,7 @@ async def websocket_session_stream(
                 break
             
             except json.JSONDecodeError:
-                await websocket.send_json({
+                subscriber.send_event({
                     "type": "error",
                     "data": {
                         "code": "INVALID_JSON",
@@ -177,7 +222,7 @@ async def websocket_session_stream(
             
             except Exception as e:
                 logger.error(f"Error processing WebSocket message: {e}", exc_info=True)
-                await websocket.send_json({
+                subscriber.send_event({
                     "type": "error",
                     "data": {
                         "code": "INTERNAL_ERROR",
@@ -194,8 +239,8 @@ async def websocket_session_stream(
     
     finally:
         # Unsubscribe from events
-        if 'subscriber_id' in locals():
-            event_broadcaster.unsubscribe(str(session_id), subscriber_id)
+        if 'subscriber' in locals():
+            await event_broadcaster.unsubscribe(session_id, subscriber)
         
         logger.info(f"WebSocket connection closed for session {session_id}")
 
@@ -213,8 +258,4 @@ async def broadcast_session_event(
         event_type: Event type (message, status_change, tool_call_started, etc.)
         data: Event data
     """
-    message = {
-        "type": event_type,
-        "data": data,
-    }
-    await event_broadcaster.broadcast_message(session_id, message)
+    await event_broadcaster.broadcast(session_id, event_type, data)
@@ -29,10 +29,14 @@ from app.claude_sdk.hook_handlers import (
     create_notification_hook,
     create_webhook_hook,
 )
-from app.claude_sdk.message_processor import (
-    MessageProcessor,
+from app.claude_sdk.message_processor import MessageProcessor
+from app.claude_sdk.event_broadcaster import (
     EventBroadcaster,
+    RedisEventBroadcaster,
+    Subscriber,
+    get_event_broadcaster,
 )
+from app.claude_sdk.stream_protocol import StreamCodec, decode_frame, negotiate_codec
 
 # Phase 2 - NEW Core components
 from app.claude_sdk.core import (
@@ -121,6 +125,12 @@ __all__ = [
     # Phase 1 - Message Processing (Legacy)
     "MessageProcessor",
     "EventBroadcaster",
+    "RedisEventBroadcaster",
+    "Subscriber",
+    "get_event_broadcaster",
+    "StreamCodec",
+    "decode_frame",
+    "negotiate_codec",
 
     # Exceptions (Phase 1 + Phase 2)
     "ClientAlreadyExistsError",
@@ -27,6 +27,7 @@ from app.claude_sdk.exceptions import (
     SDKConnectionError,
 )
 from app.core.logging import get_logger
+from app.mcp.process_pool import route_mcp_servers
 
 logger = get_logger(__name__)
 
@@ -235,8 +236,8 @@ class ClaudeSDKClientManager:
             # Working directory
             cwd=str(session.working_directory_path) if session.working_directory_path else None,
             
-            # MCP servers
-            mcp_servers=sdk_config.get("mcp_servers", {}),
+            # MCP servers (stdio servers reach shared processes when pooling is on)
+            mcp_servers=route_mcp_servers(sdk_config.get("mcp_servers", {})),
             
             # System prompt
             system_prompt=sdk_config.get("system_prompt"),
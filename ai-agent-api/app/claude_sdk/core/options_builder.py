@@ -3,6 +3,7 @@ from typing import Optional, Dict, Any, List, Callable
 from pathlib import Path
 from claude_agent_sdk import ClaudeAgentOptions
 from app.domain.entities.session import Session
+from app.mcp.process_pool import route_mcp_servers
 
 
 class OptionsBuilder:
@@ -58,7 +59,7 @@ class OptionsBuilder:
             max_turns=max_turns,
             include_partial_messages=session.include_partial_messages,
             cwd=cwd,
-            mcp_servers=mcp_servers or {},
+            mcp_servers=route_mcp_servers(mcp_servers or {}),
             allowed_tools=allowed_tools,
             can_use_tool=permission_callback,
             hooks=hooks or {},
@@ -93,7 +94,7 @@ class OptionsBuilder:
             max_turns=config_dict.get("max_turns", 10),
             include_partial_messages=config_dict.get("include_partial_messages", False),
             cwd=Path(config_dict["working_directory"]) if "working_directory" in config_dict else None,
-            mcp_servers=config_dict.get("mcp_servers", {}),
+            mcp_servers=route_mcp_servers(config_dict.get("mcp_servers", {})),
             allowed_tools=config_dict.get("allowed_tools"),
             can_use_tool=permission_callback,
             hooks=hooks or {},
@@ -0,0 +1,948 @@
+"""Event broadcasting for WebSocket session streaming.
+
+Producers (message processor, stream handler, executors) publish session
+events; every WebSocket connected to that session receives them.
+
+Two implementations share one interface:
+
+- ``EventBroadcaster``: in-process fan-out. Suitable for a single worker
+  and for tests.
+- ``RedisEventBroadcaster``: publishes to a per-session Redis pub/sub
+  channel. Each node subscribes only to channels of sessions it has local
+  WebSocket connections for and fans messages out locally, so a viewer
+  connected to worker A sees events produced on worker B. The listener
+  resubscribes automatically after Redis connection loss.
+
+Delivery is decoupled from producers: each subscriber has a bounded queue
+drained by its own writer task, so one slow client never delays the agent
+stream or other viewers (see ``Subscriber`` for the overflow policies).
+
+Streams are resumable. Recently broadcast messages are kept in a bounded
+per-session replay buffer (in memory, or a Redis sorted set shared by all
+workers). A client reconnecting with ``since_sequence`` gets the messages
+it missed from the buffer, falling back to the database only for gaps
+older than the buffer, and then continues on the live feed without
+duplicates. A client too far behind for the database replay limit gets an
+explicit ``replay_gap`` event naming the missing range.
+
+Each subscriber can negotiate a wire encoding (see ``stream_protocol``);
+a frame is encoded at most once per encoding, however many subscribers
+receive it.
+"""
+
+import asyncio
+import copy
+import dataclasses
+import json
+from collections import OrderedDict, deque
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple, Union
+from uuid import UUID
+
+from prometheus_client import Counter, Gauge
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.claude_sdk.stream_protocol import JSON_CODEC, StreamCodec
+from app.domain.value_objects.message import Message
+
+logger = get_logger(__name__)
+
+SessionKey = Union[UUID, str]
+
+# Loads persisted messages with after < sequence_number < before (None: no bound),
+# oldest first and at most the broadcaster's history_limit of them
+HistoryLoader = Callable[[int, Optional[int]], Awaitable[List[Dict[str, Any]]]]
+
+OVERFLOW_POLICIES = ("coalesce", "drop_oldest", "disconnect")
+
+# Events that are superseded by the complete message and may be dropped
+DROPPABLE_EVENT_TYPES = frozenset({"partial_message"})
+
+# Streaming delta types and the field holding their incremental text
+DELTA_TEXT_FIELDS = {
+    "text_delta": "text",
+    "input_json_delta": "partial_json",
+    "thinking_delta": "thinking",
+}
+
+WS_QUEUED_FRAMES = Gauge(
+    "websocket_send_queue_frames",
+    "Frames queued for WebSocket subscribers in this process",
+)
+WS_FRAMES_DROPPED = Counter(
+    "websocket_frames_dropped_total",
+    "Frames dropped or merged under WebSocket backpressure",
+    ["reason"],
+)
+WS_SLOW_CONSUMER_DISCONNECTS = Counter(
+    "websocket_slow_consumer_disconnects_total",
+    "WebSocket subscribers disconnected for falling behind",
+)
+
+
+def message_to_dict(message: Any) -> Dict[str, Any]:
+    """Convert a domain message (or message model) to its WebSocket payload."""
+    return {
+        "id": str(message.id),
+        "session_id": str(message.session_id),
+        "sequence_number": message.sequence_number,
+        "message_type": getattr(message.message_type, "value", message.message_type),
+        "content": message.content,
+        "created_at": message.created_at.isoformat() if getattr(message, "created_at", None) else None,
+    }
+
+
+def sequence_of(payload: Any) -> Optional[int]:
+    """Get the message sequence number an event carries, if any.
+
+    Recognizes message payloads from ``broadcast_message``,
+    ``{"type": "message", "data": {"message": ...}}`` events and events
+    with their own top-level ``sequence`` (task execution progress).
+    """
+    if isinstance(payload, Message):
+        return payload.sequence_number
+    if not isinstance(payload, dict):
+        return None
+    if isinstance(payload.get("sequence"), int):
+        return payload["sequence"]
+    if "message_type" in payload:
+        return payload.get("sequence_number")
+    if payload.get("type") == "message" and isinstance(payload.get("data"), dict):
+        return sequence_of(payload["data"].get("message"))
+    return None
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values the json module does not handle natively."""
+    if isinstance(value, Message):
+        return message_to_dict(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    return str(value)
+
+
+_UNKNOWN = object()
+
+
+class Frame:
+    """A serialized event, shared by every subscriber it is queued for.
+
+    The payload is only parsed back from the text when an overflow policy
+    needs to inspect it (e.g. frames received from Redis). Binary encodings
+    are derived from the text on first use and cached per codec.
+    """
+
+    __slots__ = ("text", "_payload", "_sequence", "_encoded")
+
+    def __init__(self, text: str, payload: Any = None, sequence: Any = _UNKNOWN):
+        self.text = text
+        self._payload = payload
+        self._sequence = sequence
+        self._encoded: Optional[Dict[str, bytes]] = None
+
+    def encode(self, codec: StreamCodec) -> Union[str, bytes]:
+        """Get the frame in a subscriber's wire encoding."""
+        if not codec.binary:
+            return self.text
+        if self._encoded is None:
+            self._encoded = {}
+        data = self._encoded.get(codec.name)
+        if data is None:
+            data = self._encoded[codec.name] = codec.encode_text(self.text)
+        return data
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        """Get the decoded event payload."""
+        if self._payload is None:
+            try:
+                self._payload = json.loads(self.text)
+            except ValueError:
+                self._payload = {}
+        return self._payload if isinstance(self._payload, dict) else {}
+
+    @property
+    def sequence(self) -> Optional[int]:
+        """Get the message sequence number this frame carries, if any."""
+        if self._sequence is _UNKNOWN:
+            self._sequence = sequence_of(self.payload)
+        return self._sequence
+
+    @property
+    def droppable(self) -> bool:
+        """Whether the frame may be dropped under backpressure."""
+        return self.payload.get("type") in DROPPABLE_EVENT_TYPES
+
+    @property
+    def delta(self) -> Optional[Tuple[int, str, str]]:
+        """Get (block index, delta type, delta text field) for mergeable deltas."""
+        if self.payload.get("type") != "partial_message":
+            return None
+        event = (self.payload.get("data") or {}).get("event_data") or {}
+        delta = event.get("delta") or {}
+        field = DELTA_TEXT_FIELDS.get(delta.get("type"))
+        if event.get("type") != "content_block_delta" or field is None:
+            return None
+        return event.get("index"), delta["type"], field
+
+
+def merge_delta_frames(older: Frame, newer: Frame) -> Optional[Frame]:
+    """Merge two consecutive deltas for the same content block into one frame.
+
+    Returns:
+        The merged frame, or None if the frames cannot be merged
+    """
+    key = older.delta
+    if key is None or key != newer.delta:
+        return None
+
+    field = key[2]
+    merged = copy.deepcopy(newer.payload)
+    older_delta = older.payload["data"]["event_data"]["delta"]
+    merged_delta = merged["data"]["event_data"]["delta"]
+    merged_delta[field] = older_delta.get(field, "") + merged_delta.get(field, "")
+    return Frame(json.dumps(merged), merged)
+
+
+class Subscriber:
+    """A WebSocket connection with its own bounded send queue and writer task.
+
+    Producers only ever append to the queue, so a slow or stalled client
+    never delays the producing stream or other viewers. When the queue is
+    full, the overflow policy decides what happens:
+
+    - ``coalesce``: merge the frame into the queued tail delta of the same
+      content block; otherwise fall back to ``drop_oldest``.
+    - ``drop_oldest``: drop the oldest queued partial-message frame;
+      if only complete messages are queued, disconnect.
+    - ``disconnect``: close the connection so the client reconnects.
+    """
+
+    def __init__(
+        self,
+        websocket,
+        max_queue: int,
+        overflow_policy: str,
+        send_timeout: Optional[float],
+        on_close: Callable[["Subscriber"], None],
+        paused: bool = False,
+        codec: StreamCodec = JSON_CODEC,
+    ):
+        self.websocket = websocket
+        self.codec = codec
+        self.max_queue = max_queue
+        self.overflow_policy = overflow_policy
+        self.send_timeout = send_timeout
+        self.queue: Deque[Frame] = deque()
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        self.paused = paused
+        self._on_close = on_close
+        self._ready = asyncio.Event()
+        self._writer = asyncio.create_task(self._write_loop())
+
+    def offer(self, frame: Frame) -> None:
+        """Queue a frame without blocking, applying the overflow policy."""
+        if self.closed:
+            return
+
+        if len(self.queue) >= self.max_queue and not self._make_room(frame):
+            return
+
+        self.queue.append(frame)
+        WS_QUEUED_FRAMES.inc()
+        self._ready.set()
+
+    def send_event(self, payload: Dict[str, Any]) -> None:
+        """Queue a control event (pong, error, acknowledgement) for this client.
+
+        Goes through the same queue and writer as broadcast frames, so the
+        connection only ever has one sender. Control events are small and
+        never dropped, so they bypass the queue limit.
+        """
+        if self.closed:
+            return
+        self.queue.append(Frame(json.dumps(payload, default=_json_default), payload, sequence=None))
+        WS_QUEUED_FRAMES.inc()
+        self._ready.set()
+
+    def _make_room(self, frame: Frame) -> bool:
+        """Apply the overflow policy to a full queue.
+
+        Returns:
+            True if the frame should still be appended
+        """
+        if self.overflow_policy == "coalesce":
+            merged = merge_delta_frames(self.queue[-1], frame)
+            if merged is not None:
+                self.queue[-1] = merged
+                self.coalesced += 1
+                WS_FRAMES_DROPPED.labels(reason="coalesced").inc()
+                return False
+
+        if self.overflow_policy in ("coalesce", "drop_oldest"):
+            for index, queued in enumerate(self.queue):
+                if queued.droppable:
+                    del self.queue[index]
+                    WS_QUEUED_FRAMES.dec()
+                    self.dropped += 1
+                    WS_FRAMES_DROPPED.labels(reason="overflow").inc()
+                    return True
+            if frame.droppable:
+                self.dropped += 1
+                WS_FRAMES_DROPPED.labels(reason="overflow").inc()
+                return False
+
+        # Only complete messages are queued (or policy is disconnect):
+        # cut the slow consumer loose rather than silently losing data
+        logger.warning(
+            "Disconnecting slow WebSocket consumer",
+            extra={"queue_depth": len(self.queue), "overflow_policy": self.overflow_policy},
+        )
+        WS_SLOW_CONSUMER_DISCONNECTS.inc()
+        self.close(disconnect=True)
+        return False
+
+    def resume(self, replay: List[Frame]) -> None:
+        """Send replayed frames, then continue with the live frames held so far.
+
+        Live frames already covered by the replay are skipped, so the client
+        sees every message exactly once and in order.
+        """
+        if self.closed:
+            return
+
+        last = max((f.sequence for f in replay if f.sequence is not None), default=None)
+        live = [
+            frame for frame in self.queue
+            if last is None or frame.sequence is None or frame.sequence > last
+        ]
+        replayed = sum(1 for frame in replay if frame.sequence is not None)
+        marker = Frame(json.dumps({
+            "type": "replay_complete",
+            "data": {"replayed": replayed, "last_sequence": last},
+        }))
+
+        WS_QUEUED_FRAMES.inc(len(replay) + 1 + len(live) - len(self.queue))
+        self.queue = deque([*replay, marker, *live])
+        self.paused = False
+        self._ready.set()
+
+    def close(self, disconnect: bool = False) -> None:
+        """Stop the writer and release queued frames.
+
+        Args:
+            disconnect: Also close the WebSocket (slow consumer eviction)
+        """
+        if self.closed:
+            return
+        self.closed = True
+        WS_QUEUED_FRAMES.dec(len(self.queue))
+        self.queue.clear()
+        self._writer.cancel()
+        self._on_close(self)
+
+        if disconnect:
+            asyncio.create_task(self._close_websocket())
+
+    async def _close_websocket(self) -> None:
+        """Close the WebSocket with 'try again later'."""
+        try:
+            await self.websocket.close(code=1013, reason="Client too slow")
+        except Exception:
+            pass
+
+    async def _write_loop(self) -> None:
+        """Send queued frames to the WebSocket in order."""
+        try:
+            while True:
+                while not self.queue or self.paused:
+                    self._ready.clear()
+                    await self._ready.wait()
+
+                frame = self.queue.popleft()
+                WS_QUEUED_FRAMES.dec()
+                data = frame.encode(self.codec)
+                send = self.websocket.send_bytes(data) if self.codec.binary else self.websocket.send_text(data)
+                if self.send_timeout:
+                    await asyncio.wait_for(send, self.send_timeout)
+                else:
+                    await send
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning("WebSocket send timed out, disconnecting subscriber")
+            WS_SLOW_CONSUMER_DISCONNECTS.inc()
+            self.close(disconnect=True)
+        except Exception as e:
+            logger.error(f"Error broadcasting to subscriber: {e}")
+            self.close()
+
+
+class EventBroadcaster:
+    """In-process event broadcaster for WebSocket message streaming.
+
+    Each event is serialized to JSON once and the same frame is queued for
+    every subscriber; per-subscriber writer tasks do the sending, so
+    broadcasting never waits on a client. Message frames are also kept in
+    an in-process replay buffer for resuming subscribers.
+    """
+
+    def __init__(
+        self,
+        max_queue: Optional[int] = None,
+        overflow_policy: Optional[str] = None,
+        send_timeout: Optional[float] = None,
+        replay_size: Optional[int] = None,
+        history_limit: Optional[int] = None,
+    ):
+        """Initialize event broadcaster.
+
+        Args:
+            max_queue: Per-subscriber queue size (frames)
+            overflow_policy: coalesce, drop_oldest or disconnect
+            send_timeout: Seconds a single send may take before the client is dropped
+            replay_size: Messages kept per session for resuming (0 disables)
+            history_limit: Most messages replayed from the database per resume
+        """
+        self.max_queue = max_queue or settings.websocket_send_queue_size
+        self.overflow_policy = overflow_policy or settings.websocket_overflow_policy
+        self.send_timeout = (
+            settings.websocket_send_timeout_seconds if send_timeout is None else send_timeout
+        )
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy '{self.overflow_policy}'. "
+                f"Must be one of: {', '.join(OVERFLOW_POLICIES)}"
+            )
+        self.replay_size = (
+            settings.websocket_replay_buffer_size if replay_size is None else replay_size
+        )
+        self.history_limit = history_limit or settings.websocket_replay_max_history
+        self.subscribers: Dict[str, List[Subscriber]] = {}
+        self._replay: "OrderedDict[str, Deque[Frame]]" = OrderedDict()
+
+    async def broadcast_message(self, session_id: SessionKey, message: Union[Message, Dict[str, Any]]) -> None:
+        """Broadcast a message to session subscribers.
+
+        Args:
+            session_id: Session UUID
+            message: Domain message, or a ready-made event dict
+        """
+        payload = message_to_dict(message) if isinstance(message, Message) else message
+        await self._publish(str(session_id), self._serialize(payload))
+
+    async def broadcast(self, session_id: SessionKey, event_type: str, data: Any) -> None:
+        """Broadcast a typed event to session subscribers.
+
+        Args:
+            session_id: Session UUID
+            event_type: Event type (message, partial_message, status_change, ...)
+            data: Event data
+        """
+        await self._publish(str(session_id), self._serialize({"type": event_type, "data": data}))
+
+    async def subscribe(
+        self,
+        session_id: SessionKey,
+        websocket,
+        since_sequence: Optional[int] = None,
+        load_history: Optional[HistoryLoader] = None,
+        codec: StreamCodec = JSON_CODEC,
+    ) -> Subscriber:
+        """Add WebSocket subscriber for session.
+
+        With ``since_sequence``, the subscriber first receives every message
+        with a higher sequence number, followed by a ``replay_complete``
+        event, and then the live feed. Live events arriving during the
+        replay are held back and deduplicated against it.
+
+        Args:
+            session_id: Session UUID
+            websocket: WebSocket connection
+            since_sequence: Last message sequence number the client has seen
+            load_history: Loader for messages older than the replay buffer
+            codec: Wire encoding negotiated by the client
+
+        Returns:
+            Subscriber handle to pass to unsubscribe
+        """
+        key = str(session_id)
+        subscriber = Subscriber(
+            websocket,
+            max_queue=self.max_queue,
+            overflow_policy=self.overflow_policy,
+            send_timeout=self.send_timeout,
+            on_close=lambda sub: self._discard(key, sub),
+            paused=since_sequence is not None,
+            codec=codec,
+        )
+        self.subscribers.setdefault(key, []).append(subscriber)
+
+        if since_sequence is not None:
+            try:
+                replay = await self.get_replay(key, since_sequence, load_history)
+            except Exception as e:
+                logger.error(
+                    f"Failed to replay missed messages: {e}",
+                    extra={"session_id": key, "since_sequence": since_sequence},
+                )
+                replay = []
+            subscriber.resume(replay)
+
+        return subscriber
+
+    async def get_replay(
+        self,
+        session_id: SessionKey,
+        since_sequence: int,
+        load_history: Optional[HistoryLoader] = None,
+    ) -> List[Frame]:
+        """Get the message frames a client missed since a sequence number.
+
+        Served from the replay buffer; the database is only queried for the
+        part of the gap that is older than the buffer. If that part holds
+        more than ``history_limit`` messages, the oldest ones are replayed
+        and a ``replay_gap`` frame reports the range that was skipped, so
+        the client can fetch it through the messages API. Its
+        ``before_sequence`` is None when nothing newer is buffered, in which
+        case the gap extends to the first live message.
+
+        Args:
+            session_id: Session UUID
+            since_sequence: Last message sequence number the client has seen
+            load_history: Loader for messages older than the replay buffer
+
+        Returns:
+            Frames ordered by sequence number
+        """
+        key = str(session_id)
+        buffered, oldest = await self._get_buffered(key, since_sequence)
+
+        history: List[Frame] = []
+        if load_history is not None and (oldest is None or oldest > since_sequence + 1):
+            messages = await load_history(since_sequence, oldest)
+            history = [self._serialize(message) for message in messages]
+            if messages:
+                logger.debug(
+                    "Replayed messages from database",
+                    extra={"session_id": key, "count": len(messages)},
+                )
+            if len(messages) >= self.history_limit:
+                after = history[-1].sequence if history[-1].sequence is not None else since_sequence
+                logger.warning(
+                    "Resuming client is too far behind, replay has a gap",
+                    extra={"session_id": key, "after_sequence": after, "before_sequence": oldest},
+                )
+                history.append(self._serialize({
+                    "type": "replay_gap",
+                    "data": {
+                        "reason": "too_far_behind",
+                        "after_sequence": after,
+                        "before_sequence": oldest,
+                    },
+                }))
+
+        return history + buffered
+
+    async def unsubscribe(self, session_id: SessionKey, subscriber) -> None:
+        """Remove WebSocket subscriber.
+
+        Args:
+            session_id: Session UUID
+            subscriber: Handle returned by subscribe (or its WebSocket)
+        """
+        for candidate in list(self.subscribers.get(str(session_id), ())):
+            if candidate is subscriber or candidate.websocket is subscriber:
+                candidate.close()
+
+    async def close(self) -> None:
+        """Stop all subscriber writers."""
+        for subscribers in list(self.subscribers.values()):
+            for subscriber in list(subscribers):
+                subscriber.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get fan-out statistics for this process."""
+        subscribers = [sub for subs in self.subscribers.values() for sub in subs]
+        return {
+            "sessions": len(self.subscribers),
+            "subscribers": len(subscribers),
+            "queued_frames": sum(len(sub.queue) for sub in subscribers),
+            "max_queue_depth": max((len(sub.queue) for sub in subscribers), default=0),
+            "dropped_frames": sum(sub.dropped for sub in subscribers),
+            "coalesced_frames": sum(sub.coalesced for sub in subscribers),
+        }
+
+    @staticmethod
+    def _serialize(payload: Any) -> Frame:
+        """Serialize an event payload to a frame."""
+        return Frame(json.dumps(payload, default=_json_default), sequence=sequence_of(payload))
+
+    async def _publish(self, session_key: str, frame: Frame) -> None:
+        """Publish a frame for a session."""
+        self._record(session_key, frame)
+        self._deliver_local(session_key, frame)
+
+    def _record(self, session_key: str, frame: Frame) -> None:
+        """Keep a message frame in the session's replay buffer."""
+        if not self.replay_size or frame.sequence is None:
+            return
+
+        buffer = self._replay.get(session_key)
+        if buffer is None:
+            buffer = self._replay[session_key] = deque(maxlen=self.replay_size)
+            while len(self._replay) > settings.websocket_replay_max_sessions:
+                self._replay.popitem(last=False)
+        else:
+            self._replay.move_to_end(session_key)
+        buffer.append(frame)
+
+    async def _get_buffered(self, session_key: str, since_sequence: int) -> Tuple[List[Frame], Optional[int]]:
+        """Get buffered frames after a sequence number.
+
+        Returns:
+            Tuple of (frames after since_sequence, oldest buffered sequence or None)
+        """
+        buffer = self._replay.get(session_key)
+        if not buffer:
+            return [], None
+        frames = [frame for frame in buffer if frame.sequence > since_sequence]
+        return frames, buffer[0].sequence
+
+    def _deliver_local(self, session_key: str, frame: Frame) -> None:
+        """Queue a frame for this process's subscribers of a session."""
+        for subscriber in list(self.subscribers.get(session_key, ())):
+            subscriber.offer(frame)
+
+    def _discard(self, session_key: str, subscriber: Subscriber) -> None:
+        """Forget a closed subscriber."""
+        subscribers = self.subscribers.get(session_key)
+        if subscribers and subscriber in subscribers:
+            subscribers.remove(subscriber)
+            if not subscribers:
+                del self.subscribers[session_key]
+                self._on_session_empty(session_key)
+
+    def _on_session_empty(self, session_key: str) -> None:
+        """Hook called when the last local subscriber of a session leaves."""
+
+
+class RedisEventBroadcaster(EventBroadcaster):
+    """Event broadcaster that fans out across workers via Redis pub/sub.
+
+    Events are published to ``{channel_prefix}{session_id}``. A single
+    listener task per process holds one pub/sub connection subscribed to
+    the channels of sessions with local subscribers, and delivers received
+    events to those WebSockets. If publishing fails, the event is still
+    delivered to local subscribers.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        channel_prefix: Optional[str] = None,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+        subscribe_timeout: float = 5.0,
+        **options: Any,
+    ):
+        """Initialize Redis event broadcaster.
+
+        Args:
+            redis: Redis client (defaults to RedisClientManager's client)
+            channel_prefix: Pub/sub channel prefix
+            reconnect_delay: Initial delay before reconnecting after an error
+            max_reconnect_delay: Upper bound for the reconnect backoff
+            subscribe_timeout: How long subscribe() waits for Redis to confirm
+                the channel subscription before replaying anyway
+            **options: EventBroadcaster options (max_queue, overflow_policy, ...)
+        """
+        super().__init__(**options)
+        self._redis = redis
+        self.channel_prefix = channel_prefix or settings.event_broadcaster_channel_prefix
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.subscribe_timeout = subscribe_timeout
+
+        self._pubsub = None
+        self._subscribed: Set[str] = set()
+        # Session key -> set once Redis confirmed the channel subscription
+        self._confirmed: Dict[str, asyncio.Event] = {}
+        # Session key -> last message sequence received from the channel
+        self._last_sequence: Dict[str, int] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    @property
+    def redis(self):
+        """Get the Redis client."""
+        if self._redis is None:
+            from app.infrastructure.redis_client import RedisClientManager
+            return RedisClientManager.get_client()
+        return self._redis
+
+    async def subscribe(
+        self,
+        session_id: SessionKey,
+        websocket,
+        since_sequence: Optional[int] = None,
+        load_history: Optional[HistoryLoader] = None,
+        codec: StreamCodec = JSON_CODEC,
+    ) -> Subscriber:
+        """Add WebSocket subscriber and subscribe to the session channel."""
+        key = str(session_id)
+        if key not in self.subscribers:
+            self._ensure_listener()
+            await self._subscribe_channel(key)
+        # Read the replay buffer only once the channel is live, so no
+        # message can fall between the two
+        await self._wait_confirmed(key)
+        return await super().subscribe(key, websocket, since_sequence, load_history, codec)
+
+    async def _wait_confirmed(self, session_key: str) -> None:
+        """Wait until Redis confirmed the subscription to a session channel."""
+        confirmed = self._confirmed.get(session_key)
+        if confirmed is None or confirmed.is_set():
+            return
+        try:
+            await asyncio.wait_for(confirmed.wait(), self.subscribe_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Redis channel subscription not confirmed, replaying without it",
+                extra={"session_id": session_key},
+            )
+
+    def _on_session_empty(self, session_key: str) -> None:
+        """Leave the session channel once no local subscriber remains."""
+        if session_key in self._subscribed:
+            self._subscribed.discard(session_key)
+            self._confirmed.pop(session_key, None)
+            self._last_sequence.pop(session_key, None)
+            if self._pubsub is not None:
+                asyncio.create_task(self._unsubscribe_channel(session_key))
+
+    async def _unsubscribe_channel(self, session_key: str) -> None:
+        """Unsubscribe the shared pub/sub connection from a session channel."""
+        # A viewer may have reconnected in the meantime
+        if session_key in self._subscribed or self._pubsub is None:
+            return
+        try:
+            await self._pubsub.unsubscribe(self._channel(session_key))
+        except Exception as e:
+            logger.debug(f"Failed to unsubscribe from Redis channel: {e}")
+
+    async def close(self) -> None:
+        """Stop the listener, subscriber writers and the pub/sub connection."""
+        await super().close()
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+
+    async def _publish(self, session_key: str, frame: Frame) -> None:
+        """Publish a frame to the session channel, recording messages for replay."""
+        try:
+            if self.replay_size and frame.sequence is not None:
+                replay_key = self._replay_key(session_key)
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.zadd(replay_key, {frame.text: frame.sequence})
+                pipe.zremrangebyrank(replay_key, 0, -(self.replay_size + 1))
+                pipe.expire(replay_key, settings.websocket_replay_ttl_seconds)
+                pipe.publish(self._channel(session_key), frame.text)
+                await pipe.execute()
+            else:
+                await self.redis.publish(self._channel(session_key), frame.text)
+        except Exception as e:
+            logger.warning(
+                "Redis publish failed, delivering to local subscribers only",
+                extra={"session_id": session_key, "error": str(e)},
+            )
+            self._record(session_key, frame)
+            self._deliver_local(session_key, frame)
+
+    async def _get_buffered(self, session_key: str, since_sequence: int) -> Tuple[List[Frame], Optional[int]]:
+        """Get frames after a sequence number from the shared Redis buffer."""
+        if not self.replay_size:
+            return [], None
+        try:
+            replay_key = self._replay_key(session_key)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zrangebyscore(replay_key, f"({since_sequence}", "+inf", withscores=True)
+            pipe.zrange(replay_key, 0, 0, withscores=True)
+            missed, oldest = await pipe.execute()
+        except Exception as e:
+            logger.warning(
+                "Redis replay buffer unavailable, using local buffer",
+                extra={"session_id": session_key, "error": str(e)},
+            )
+            return await super()._get_buffered(session_key, since_sequence)
+
+        frames = [Frame(text, sequence=int(score)) for text, score in missed]
+        return frames, int(oldest[0][1]) if oldest else None
+
+    def _channel(self, session_key: str) -> str:
+        """Get the pub/sub channel name for a session."""
+        return f"{self.channel_prefix}{session_key}"
+
+    def _replay_key(self, session_key: str) -> str:
+        """Get the replay buffer key for a session."""
+        return f"{self.channel_prefix}replay:{session_key}"
+
+    def _ensure_listener(self) -> None:
+        """Start the listener task if it is not running."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _subscribe_channel(self, session_key: str) -> None:
+        """Subscribe the shared pub/sub connection to a session channel.
+
+        The listener sets the channel's confirmation event when Redis
+        acknowledges the subscription.
+        """
+        self._subscribed.add(session_key)
+        self._confirmed.setdefault(session_key, asyncio.Event())
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.subscribe(self._channel(session_key))
+            except Exception as e:
+                # The listener resubscribes every channel when it reconnects
+                logger.debug(f"Deferred Redis channel subscription: {e}")
+        self._wakeup.set()
+
+    async def _on_channel_confirmed(self, session_key: str) -> None:
+        """Mark a channel live and catch up on what a reconnect missed.
+
+        Messages published while the listener was disconnected never reach
+        this worker, so after a resubscribe the replay buffer is read from
+        the last sequence delivered on the channel.
+        """
+        confirmed = self._confirmed.get(session_key)
+        if confirmed is not None:
+            confirmed.set()
+
+        last = self._last_sequence.get(session_key)
+        if last is None:
+            return
+        try:
+            missed, _ = await self._get_buffered(session_key, last)
+        except Exception as e:
+            logger.warning(
+                "Failed to catch up on Redis channel after reconnect",
+                extra={"session_id": session_key, "error": str(e)},
+            )
+            return
+        for frame in missed:
+            self._deliver_remote(session_key, frame)
+
+    def _deliver_remote(self, session_key: str, frame: Frame) -> None:
+        """Deliver a frame received from Redis, skipping repeated messages."""
+        sequence = frame.sequence
+        if sequence is not None:
+            last = self._last_sequence.get(session_key)
+            if last is not None and sequence <= last:
+                return
+            self._last_sequence[session_key] = sequence
+        self._deliver_local(session_key, frame)
+
+    async def _listen(self) -> None:
+        """Receive events from Redis and fan them out locally.
+
+        Reconnects with exponential backoff on connection errors and
+        resubscribes to every channel that still has local subscribers.
+        """
+        delay = self.reconnect_delay
+        prefix_length = len(self.channel_prefix)
+
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.redis.pubsub()
+                self._pubsub = pubsub
+                subscribed = False
+                # A new connection holds no subscriptions yet
+                for confirmed in self._confirmed.values():
+                    confirmed.clear()
+
+                while True:
+                    if not subscribed:
+                        channels = [self._channel(key) for key in self._subscribed]
+                        if not channels:
+                            # Nothing to listen to until a client subscribes
+                            self._wakeup.clear()
+                            await self._wakeup.wait()
+                            continue
+                        await pubsub.subscribe(*channels)
+                        subscribed = True
+                        delay = self.reconnect_delay
+                        logger.debug(
+                            "Subscribed to Redis event channels",
+                            extra={"channels": len(channels)},
+                        )
+
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is None:
+                        if not pubsub.subscribed:
+                            subscribed = False
+                        continue
+
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    session_key = channel[prefix_length:]
+                    if message["type"] == "subscribe":
+                        await self._on_channel_confirmed(session_key)
+                        continue
+                    if message["type"] != "message":
+                        continue
+                    data = message["data"]
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    self._deliver_remote(session_key, Frame(data))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "Redis event listener disconnected, reconnecting",
+                    extra={"error": str(e), "retry_in_seconds": delay},
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+            finally:
+                self._pubsub = None
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+
+_event_broadcaster: Optional[EventBroadcaster] = None
+
+
+def get_event_broadcaster() -> EventBroadcaster:
+    """Get the process-wide event broadcaster.
+
+    Uses Redis pub/sub when ``event_broadcaster_backend`` is ``redis`` so
+    streaming works across workers, otherwise in-process fan-out.
+    """
+    global _event_broadcaster
+    if _event_broadcaster is None:
+        if settings.event_broadcaster_backend == "redis":
+            _event_broadcaster = RedisEventBroadcaster()
+        else:
+            _event_broadcaster = EventBroadcaster()
+    return _event_broadcaster
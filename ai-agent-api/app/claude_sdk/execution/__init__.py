@@ -5,6 +5,11 @@ from app.claude_sdk.execution.interactive_executor import InteractiveExecutor
 from app.claude_sdk.execution.background_executor import BackgroundExecutor, ExecutionResult
 from app.claude_sdk.execution.forked_executor import ForkedExecutor
 from app.claude_sdk.execution.executor_factory import ExecutorFactory
+from app.claude_sdk.execution.pipeline_cache import (
+    ExecutionPipeline,
+    PipelineCache,
+    get_pipeline_cache,
+)
 
 __all__ = [
     "BaseExecutor",
@@ -13,4 +18,7 @@ __all__ = [
     "ExecutionResult",
     "ForkedExecutor",
     "ExecutorFactory",
+    "ExecutionPipeline",
+    "PipelineCache",
+    "get_pipeline_cache",
 ]
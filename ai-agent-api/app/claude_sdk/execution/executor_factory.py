@@ -14,6 +14,7 @@ from app.claude_sdk.execution.base_executor import BaseExecutor
 from app.claude_sdk.execution.interactive_executor import InteractiveExecutor
 from app.claude_sdk.execution.background_executor import BackgroundExecutor
 from app.claude_sdk.execution.forked_executor import ForkedExecutor
+from app.claude_sdk.execution.pipeline_cache import get_pipeline_cache
 from app.claude_sdk.retry.retry_manager import RetryManager, RetryPolicy
 from app.repositories.message_repository import MessageRepository
 from app.repositories.tool_call_repository import ToolCallRepository
@@ -22,14 +23,10 @@ from app.repositories.session_metrics_snapshot_repository import SessionMetricsS
 from app.repositories.hook_execution_repository import HookExecutionRepository
 from app.repositories.permission_decision_repository import PermissionDecisionRepository
 from app.services.audit_service import AuditService
+from app.claude_sdk.hooks.hook_context import HookContext
 from app.claude_sdk.hooks.hook_manager import HookManager
-from app.claude_sdk.hooks.base_hook import HookType
-from app.claude_sdk.hooks.implementations.audit_hook import AuditHook
-from app.claude_sdk.hooks.implementations.metrics_hook import MetricsHook
-from app.claude_sdk.hooks.implementations.validation_hook import ValidationHook
-from app.claude_sdk.hooks.implementations.notification_hook import NotificationHook
+from app.claude_sdk.permissions.decision_log import get_permission_decision_log
 from app.claude_sdk.permissions.permission_manager import PermissionManager
-from app.claude_sdk.permissions.policy_engine import PolicyEngine
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -84,61 +81,40 @@ class ExecutorFactory:
         hook_execution_repo = HookExecutionRepository(db)
         permission_decision_repo = PermissionDecisionRepository(db)
 
-        # Initialize HookManager and register default hooks
-        hook_manager = HookManager(db, hook_execution_repo)
+        # Hooks, policies and the decision cache are compiled once per
+        # configuration and shared; session-specific parts go through the
+        # HookContext and the per-session managers below
+        pipeline = get_pipeline_cache().get(session.hooks_enabled)
+
+        hook_manager = HookManager(
+            db,
+            hook_execution_repo,
+            registry=pipeline.hook_registry,
+            session_context=HookContext(
+                session_id=session.id,
+                user_id=session.user_id,
+                audit_service=AuditService(db)
+            )
+        )
         hooks_dict: Optional[Dict[str, List[Any]]] = None
 
         if session.hooks_enabled:
-            logger.info(
-                f"Registering hooks for session {session.id}: {session.hooks_enabled}",
-                extra={"session_id": str(session.id), "hooks": session.hooks_enabled}
-            )
-
-            # Register default hook implementations based on enabled hooks
-            for hook_type_name in session.hooks_enabled:
-                try:
-                    hook_type = HookType(hook_type_name)
-
-                    # Register AuditHook for PreToolUse
-                    if hook_type == HookType.PRE_TOOL_USE:
-                        audit_hook = AuditHook(db)
-                        await hook_manager.register_hook(hook_type, audit_hook, priority=10)
-
-                        validation_hook = ValidationHook(db)
-                        await hook_manager.register_hook(hook_type, validation_hook, priority=20)
-
-                    # Register MetricsHook for PostToolUse
-                    elif hook_type == HookType.POST_TOOL_USE:
-                        metrics_hook = MetricsHook(db)
-                        await hook_manager.register_hook(hook_type, metrics_hook, priority=10)
-
-                    # Register NotificationHook for Stop events
-                    elif hook_type == HookType.STOP:
-                        notification_hook = NotificationHook(db)
-                        await hook_manager.register_hook(hook_type, notification_hook, priority=10)
-
-                except ValueError:
-                    logger.warning(
-                        f"Unknown hook type: {hook_type_name}",
-                        extra={"session_id": str(session.id)}
-                    )
-
             # Build SDK-compatible hook matchers
-            enabled_hook_types = [HookType(ht) for ht in session.hooks_enabled if ht in [e.value for e in HookType]]
-            hooks_dict = hook_manager.build_hook_matchers(session.id, enabled_hook_types)
+            hooks_dict = hook_manager.build_hook_matchers(session.id, list(pipeline.hook_types))
 
             logger.info(
                 f"Built {len(hooks_dict)} hook matchers for session {session.id}",
                 extra={"session_id": str(session.id), "hook_types": list(hooks_dict.keys())}
             )
 
-        # Initialize PermissionManager and PolicyEngine
-        policy_engine = PolicyEngine()
-        permission_manager = PermissionManager(db, policy_engine, permission_decision_repo)
-
-        # Register default policies based on permission mode
-        # For now, we'll use the policy engine without pre-registered policies
-        # Specific policies can be added based on session.custom_policies if needed
+        # Initialize PermissionManager on the shared PolicyEngine
+        permission_manager = PermissionManager(
+            db,
+            pipeline.policy_engine,
+            permission_decision_repo,
+            decision_cache=pipeline.decision_cache,
+            decision_log=get_permission_decision_log()
+        )
 
         # Create permission callback
         permission_callback = permission_manager.create_callback(
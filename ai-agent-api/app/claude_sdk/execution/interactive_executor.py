@@ -87,19 +87,16 @@ class InteractiveExecutor(BaseExecutor):
             # Stream responses
             async for message in self.client.receive_response():
                 if isinstance(message, AssistantMessage):
+                    # Send coalesced deltas still buffered before the full message
+                    await self.stream_handler.flush(self.session.id)
+
                     # Process and persist assistant message
                     domain_message = await self.message_handler.handle_assistant_message(
                         message, self.session.id
                     )
+                    self.stream_handler.mark_delivered(self.session.id)
 
-                    # Broadcast to WebSocket if available
-                    if self.event_broadcaster:
-                        await self.event_broadcaster.broadcast(
-                            session_id=self.session.id,
-                            event_type="message",
-                            data={"message": domain_message},
-                        )
-
+                    await self._broadcast_message(domain_message)
                     yield domain_message
 
                 elif isinstance(message, StreamEvent):
@@ -111,6 +108,47 @@ class InteractiveExecutor(BaseExecutor):
                     await self.result_handler.handle_result_message(message, self.session.id)
                     break
 
+            # Keep a message the stream ended before completing
+            partial_message = await self._save_partial_message()
+            if partial_message is not None:
+                yield partial_message
+
         except Exception as e:
+            try:
+                await self._save_partial_message()
+            except Exception as save_error:
+                logger.warning(
+                    f"Failed to save partial message: {save_error}",
+                    extra={"session_id": str(self.session.id)},
+                )
             await self._handle_error(e, {"prompt": prompt})
             raise
+
+    async def _save_partial_message(self) -> Optional[DomainMessage]:
+        """Persist and broadcast the streamed message not yet delivered.
+
+        Releases the session's streaming state. When the stream stopped
+        before its complete AssistantMessage arrived, the message assembled
+        from the partial events is stored with is_partial set.
+
+        Returns:
+            DomainMessage if a partial message was saved, None otherwise
+        """
+        aggregated = await self.stream_handler.aggregate_partial_messages(self.session.id)
+        if aggregated is None:
+            return None
+
+        domain_message = await self.message_handler.handle_partial_message(
+            aggregated, self.session.id
+        )
+        await self._broadcast_message(domain_message)
+        return domain_message
+
+    async def _broadcast_message(self, domain_message: DomainMessage) -> None:
+        """Broadcast a message to WebSocket clients if a broadcaster is set."""
+        if self.event_broadcaster:
+            await self.event_broadcaster.broadcast(
+                session_id=self.session.id,
+                event_type="message",
+                data={"message": domain_message},
+            )
@@ -0,0 +1,166 @@
+"""Process-wide hook and policy pipelines shared between sessions.
+
+Building hooks, a hook registry and a policy engine for every execution
+repeats the same work and throws away state worth keeping (MetricsHook's
+counters, the policy engine's per-tool lookup cache). Sessions with the
+same configuration now share one immutable ExecutionPipeline; what differs
+per session (database session, session and user IDs, audit service) is
+supplied when a HookManager and PermissionManager are created for it, via
+HookContext.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from app.claude_sdk.hooks.base_hook import HookType
+from app.claude_sdk.hooks.hook_registry import HookRegistry
+from app.claude_sdk.hooks.implementations.audit_hook import AuditHook
+from app.claude_sdk.hooks.implementations.metrics_hook import MetricsHook
+from app.claude_sdk.hooks.implementations.notification_hook import NotificationHook
+from app.claude_sdk.hooks.implementations.validation_hook import ValidationHook
+from app.claude_sdk.permissions.decision_cache import PermissionDecisionCache
+from app.claude_sdk.permissions.policy_engine import PolicyEngine
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Enabled hook types; the only configuration the pipeline depends on today
+PipelineSignature = FrozenSet[HookType]
+
+
+@dataclass(frozen=True)
+class ExecutionPipeline:
+    """Hooks and policies compiled once for one configuration signature.
+
+    Attributes:
+        signature: Configuration the pipeline was built for
+        hook_registry: Frozen registry of session-independent hooks
+        hook_types: Enabled hook types that have hooks, in HookType order
+        policy_engine: Policy engine shared by every session's PermissionManager
+        decision_cache: Permission decision cache shared by those managers
+            (keys are scoped by session and user)
+    """
+    signature: PipelineSignature
+    hook_registry: HookRegistry
+    hook_types: Tuple[HookType, ...]
+    policy_engine: PolicyEngine
+    decision_cache: PermissionDecisionCache
+
+
+class PipelineCache:
+    """Builds and caches ExecutionPipelines by configuration signature.
+
+    There are at most 2**len(HookType) signatures, so the cache is not
+    bounded. One MetricsHook is shared by every pipeline, so its
+    aggregates cover all sessions.
+
+    Example:
+        >>> pipeline = get_pipeline_cache().get(session.hooks_enabled)
+        >>> hook_manager = HookManager(db, repo, registry=pipeline.hook_registry,
+        ...                            session_context=HookContext(session_id=session.id))
+    """
+
+    def __init__(self):
+        """Initialize empty pipeline cache."""
+        self._pipelines: Dict[PipelineSignature, ExecutionPipeline] = {}
+        self.metrics_hook = MetricsHook()
+        self.stats: Dict[str, int] = {"hits": 0, "builds": 0}
+
+    @staticmethod
+    def signature(hooks_enabled: Optional[Iterable[str]]) -> PipelineSignature:
+        """Get the configuration signature for a session's enabled hooks.
+
+        Args:
+            hooks_enabled: Hook type names from the session (unknown names
+                are logged and ignored)
+
+        Returns:
+            Frozen set of enabled hook types
+        """
+        hook_types = set()
+        for hook_type_name in hooks_enabled or []:
+            try:
+                hook_types.add(HookType(hook_type_name))
+            except ValueError:
+                logger.warning(f"Unknown hook type: {hook_type_name}")
+        return frozenset(hook_types)
+
+    def get(self, hooks_enabled: Optional[Iterable[str]]) -> ExecutionPipeline:
+        """Get the pipeline for a configuration, building it on first use.
+
+        Args:
+            hooks_enabled: Hook type names from the session
+
+        Returns:
+            Shared ExecutionPipeline
+        """
+        signature = self.signature(hooks_enabled)
+        pipeline = self._pipelines.get(signature)
+        if pipeline is not None:
+            self.stats["hits"] += 1
+            return pipeline
+
+        pipeline = self._build(signature)
+        self._pipelines[signature] = pipeline
+        self.stats["builds"] += 1
+        return pipeline
+
+    def clear(self) -> None:
+        """Drop every pipeline (MetricsHook aggregates are kept)."""
+        self._pipelines.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {"pipelines": len(self._pipelines), **self.stats}
+
+    def _build(self, signature: PipelineSignature) -> ExecutionPipeline:
+        registry = HookRegistry()
+
+        # Register default hook implementations based on enabled hooks
+        if HookType.PRE_TOOL_USE in signature:
+            # One tier, so both run concurrently: ValidationHook is pure and
+            # AuditHook is the only one writing to the session's database
+            registry.register(HookType.PRE_TOOL_USE, AuditHook(), priority=10)
+            registry.register(HookType.PRE_TOOL_USE, ValidationHook(), priority=10)
+        if HookType.POST_TOOL_USE in signature:
+            registry.register(HookType.POST_TOOL_USE, self.metrics_hook, priority=10)
+        if HookType.STOP in signature:
+            registry.register(HookType.STOP, NotificationHook(HookType.STOP), priority=10)
+        registry.freeze()
+
+        hook_types = tuple(
+            hook_type for hook_type in HookType
+            if hook_type in signature and registry.get_tiers(hook_type)
+        )
+
+        # No default policies are registered yet; the engine is still shared
+        # so its per-tool policy lookups are computed once, and frozen so no
+        # session can change the policies of every other one
+        policy_engine = PolicyEngine()
+        policy_engine.freeze()
+
+        logger.info(
+            "Built execution pipeline",
+            extra={
+                "hook_types": [hook_type.value for hook_type in hook_types],
+                "hook_count": registry.get_hook_count(),
+            }
+        )
+        return ExecutionPipeline(
+            signature=signature,
+            hook_registry=registry,
+            hook_types=hook_types,
+            policy_engine=policy_engine,
+            decision_cache=PermissionDecisionCache(),
+        )
+
+
+_pipeline_cache: Optional[PipelineCache] = None
+
+
+def get_pipeline_cache() -> PipelineCache:
+    """Get the process-wide pipeline cache."""
+    global _pipeline_cache
+    if _pipeline_cache is None:
+        _pipeline_cache = PipelineCache()
+    return _pipeline_cache
+
@@ -1,13 +1,14 @@
 """Message and event handlers for Claude SDK."""
 
 from app.claude_sdk.handlers.message_handler import MessageHandler
-from app.claude_sdk.handlers.stream_handler import StreamHandler
+from app.claude_sdk.handlers.stream_handler import PartialMessageAggregator, StreamHandler
 from app.claude_sdk.handlers.result_handler import ResultHandler
 from app.claude_sdk.handlers.error_handler import ErrorHandler
 
 __all__ = [
     "MessageHandler",
     "StreamHandler",
+    "PartialMessageAggregator",
     "ResultHandler",
     "ErrorHandler",
 ]
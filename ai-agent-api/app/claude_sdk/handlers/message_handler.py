@@ -151,6 +151,65 @@ class MessageHandler:
 
         return domain_message
 
+    async def handle_partial_message(
+        self, message: DomainMessage, session_id: UUID
+    ) -> DomainMessage:
+        """Persist a message assembled from stream events as partial.
+
+        Used when a stream stops before the complete AssistantMessage
+        arrives, so the text the client already saw is not lost. Tool use
+        blocks are kept in the content only; no tool calls are recorded
+        because they never ran.
+
+        Args:
+            message: Aggregated message from StreamHandler
+            session_id: Session identifier
+
+        Returns:
+            DomainMessage: Persisted message with its sequence number
+        """
+        blocks = message.content.get("content", [])
+        text_content = [b.get("text", "") for b in blocks if b.get("type") == "text"]
+        thinking_content = [b.get("thinking", "") for b in blocks if b.get("type") == "thinking"]
+
+        sequence_number = await self.message_repo.get_next_sequence_number(session_id)
+
+        from app.models.message import MessageModel
+
+        message_model = MessageModel(
+            id=message.id,
+            session_id=session_id,
+            message_type=MessageType.ASSISTANT.value,
+            content="\n\n".join(text_content),
+            sequence_number=sequence_number,
+            model=message.model,
+            thinking_content="\n\n".join(thinking_content) if thinking_content else None,
+            is_partial=True,
+            created_at=datetime.utcnow(),
+        )
+
+        self.db.add(message_model)
+        await self.db.flush()
+
+        logger.info(
+            f"Persisted partial AssistantMessage: id={message.id}, sequence={sequence_number}",
+            extra={
+                "session_id": str(session_id),
+                "message_id": str(message.id),
+                "sequence_number": sequence_number,
+            },
+        )
+
+        return DomainMessage(
+            id=message.id,
+            session_id=session_id,
+            message_type=MessageType.ASSISTANT,
+            content=message_model.content,
+            sequence_number=sequence_number,
+            model=message.model,
+            created_at=message_model.created_at,
+        )
+
     async def handle_tool_use_block(
         self, block: ToolUseBlock, session_id: UUID, message_id: UUID
     ) -> DomainToolCall:
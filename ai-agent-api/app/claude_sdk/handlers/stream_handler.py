@@ -1,18 +1,127 @@
 """Stream handler for handling StreamEvent from Claude SDK."""
+import asyncio
+import json
 import logging
-from typing import Optional, Dict, Any
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 from uuid import UUID, uuid4
 from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from claude_agent_sdk.types import StreamEvent
 
+from app.claude_sdk.event_broadcaster import DELTA_TEXT_FIELDS
+from app.core.config import settings
 from app.domain.value_objects.message import Message as DomainMessage, MessageType
 from app.repositories.message_repository import MessageRepository
 
 logger = logging.getLogger(__name__)
 
 
+class PartialMessageAggregator:
+    """Assemble a streamed assistant message from its partial events.
+
+    Applies message_start / content_block_* / message_delta events in
+    memory and keeps content blocks in the same shape MessageProcessor
+    stores for complete assistant messages.
+    """
+
+    def __init__(self):
+        """Initialize empty aggregator."""
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard any assembled state."""
+        self.message_id: Optional[str] = None
+        self.model: Optional[str] = None
+        self.stop_reason: Optional[str] = None
+        self.usage: Dict[str, Any] = {}
+        self.blocks: Dict[int, Dict[str, Any]] = {}
+        self._partial_json: Dict[int, List[str]] = {}
+        self.complete = False
+        self.delivered = False
+
+    def apply(self, event: Dict[str, Any]) -> None:
+        """Apply one raw stream event.
+
+        Args:
+            event: Anthropic streaming event (StreamEvent.event)
+        """
+        event_type = event.get("type")
+
+        if event_type == "message_start":
+            message = event.get("message") or {}
+            # A repeated message_start for the same message keeps its blocks
+            if message.get("id") is None or message.get("id") != self.message_id:
+                self.reset()
+            self.message_id = message.get("id")
+            self.model = message.get("model") or self.model
+            self.usage.update(message.get("usage") or {})
+
+        elif event_type == "content_block_start":
+            index = event.get("index", len(self.blocks))
+            block = dict(event.get("content_block") or {})
+            if block.get("type") == "tool_use":
+                block.setdefault("input", {})
+                self._partial_json[index] = []
+            self.blocks[index] = block
+
+        elif event_type == "content_block_delta":
+            index = event.get("index", 0)
+            delta = event.get("delta") or {}
+            block = self.blocks.setdefault(index, {"type": "text", "text": ""})
+            delta_type = delta.get("type")
+
+            if delta_type == "input_json_delta":
+                self._partial_json.setdefault(index, []).append(delta.get("partial_json", ""))
+            elif delta_type == "signature_delta":
+                block["signature"] = block.get("signature", "") + delta.get("signature", "")
+            elif delta_type in DELTA_TEXT_FIELDS:
+                field = DELTA_TEXT_FIELDS[delta_type]
+                block[field] = block.get(field, "") + delta.get(field, "")
+
+        elif event_type == "content_block_stop":
+            self._finish_tool_input(event.get("index", 0))
+
+        elif event_type == "message_delta":
+            self.stop_reason = (event.get("delta") or {}).get("stop_reason", self.stop_reason)
+            self.usage.update(event.get("usage") or {})
+
+        elif event_type == "message_stop":
+            for index in list(self._partial_json):
+                self._finish_tool_input(index)
+            self.complete = True
+
+    def _finish_tool_input(self, index: int) -> None:
+        """Parse the accumulated JSON input of a tool_use block."""
+        parts = self._partial_json.pop(index, None)
+        if not parts:
+            return
+        try:
+            self.blocks[index]["input"] = json.loads("".join(parts))
+        except ValueError:
+            self.blocks[index]["input"] = {"raw": "".join(parts)}
+
+    def to_content(self) -> Dict[str, Any]:
+        """Get the assembled message content."""
+        return {"content": [self.blocks[index] for index in sorted(self.blocks)]}
+
+
+class _StreamState:
+    """Per-session streaming state: aggregator plus not-yet-sent deltas."""
+
+    def __init__(self):
+        self.aggregator = PartialMessageAggregator()
+        self.pending: "OrderedDict[Tuple[int, str], List[str]]" = OrderedDict()
+        self.pending_bytes = 0
+        self.last_flush = 0.0  # first delta goes out immediately
+        self.flush_timer: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+        self.events_received = 0
+        self.frames_sent = 0
+
+
 class StreamHandler:
     """Handle StreamEvent for partial message updates.
 
@@ -21,8 +130,10 @@ class StreamHandler:
 
     Features:
     - Processes partial message chunks
-    - Optionally broadcasts to WebSocket clients
-    - Aggregates partial messages into complete messages
+    - Coalesces content_block_delta events per block and broadcasts them
+      at a fixed cadence (every flush interval or flush size, whichever
+      comes first) instead of one WebSocket frame per token
+    - Aggregates partial messages into complete messages in memory
     - Tracks message progression in real-time
 
     Example:
@@ -36,6 +147,8 @@ class StreamHandler:
         db: AsyncSession,
         message_repo: MessageRepository,
         event_broadcaster: Optional[Any] = None,
+        flush_interval_ms: Optional[int] = None,
+        flush_bytes: Optional[int] = None,
     ):
         """Initialize stream handler with repositories and optional broadcaster.
 
@@ -43,16 +156,28 @@ class StreamHandler:
             db: Async database session
             message_repo: Repository for message persistence
             event_broadcaster: Optional WebSocket event broadcaster
+            flush_interval_ms: Max time deltas are held before broadcasting (0 disables coalescing)
+            flush_bytes: Pending delta size that triggers an immediate broadcast
         """
         self.db = db
         self.message_repo = message_repo
         self.event_broadcaster = event_broadcaster
+        self.flush_interval = (
+            settings.stream_delta_flush_interval_ms if flush_interval_ms is None else flush_interval_ms
+        ) / 1000
+        self.flush_bytes = settings.stream_delta_flush_bytes if flush_bytes is None else flush_bytes
+        self._streams: Dict[UUID, _StreamState] = {}
 
     async def handle_stream_event(
         self, event: StreamEvent, session_id: UUID
     ) -> Dict[str, Any]:
         """Process streaming event and broadcast partial update.
 
+        Text, thinking and tool-input deltas are buffered per content block
+        and broadcast as one merged delta when the flush interval elapses or
+        the buffer reaches flush_bytes. Other events flush pending deltas
+        and are broadcast immediately, so ordering is preserved.
+
         Args:
             event: StreamEvent from SDK with partial message data
             session_id: Session identifier
@@ -60,66 +185,191 @@ class StreamHandler:
         Returns:
             Dictionary with partial message data
         """
-        logger.debug(
-            f"Processing StreamEvent: type={event.event.get('type')}",
-            extra={"session_id": str(session_id)},
-        )
-
         # Extract event data
         event_type = event.event.get("type", "unknown")
         event_data = event.event
 
+        state = self._streams.get(session_id)
+        if state is None:
+            state = self._streams[session_id] = _StreamState()
+        state.events_received += 1
+        state.aggregator.apply(event_data)
+
         # Create partial message representation
-        partial_message = {
-            "session_id": str(session_id),
-            "event_type": event_type,
-            "event_data": event_data,
-            "timestamp": datetime.utcnow().isoformat(),
-        }
+        partial_message = self._partial_message(session_id, event_type, event_data)
+
+        if not self.event_broadcaster:
+            return partial_message
+
+        delta = event_data.get("delta") or {}
+        field = DELTA_TEXT_FIELDS.get(delta.get("type"))
+        if event_type == "content_block_delta" and field is not None and self.flush_interval > 0:
+            text = delta.get(field, "")
+            state.pending.setdefault((event_data.get("index", 0), delta["type"]), []).append(text)
+            state.pending_bytes += len(text)
+
+            if (
+                state.pending_bytes >= self.flush_bytes
+                or time.monotonic() - state.last_flush >= self.flush_interval
+            ):
+                await self._flush(session_id, state)
+            elif state.flush_timer is None:
+                state.flush_timer = asyncio.create_task(self._flush_later(session_id, state))
+            return partial_message
 
-        # Broadcast to WebSocket clients if broadcaster available
-        if self.event_broadcaster:
-            try:
-                await self.event_broadcaster.broadcast(
-                    session_id=session_id,
-                    event_type="partial_message",
-                    data=partial_message,
-                )
-                logger.debug(
-                    f"Broadcasted StreamEvent to WebSocket clients",
-                    extra={"session_id": str(session_id)},
-                )
-            except Exception as e:
-                logger.error(
-                    f"Failed to broadcast stream event: {str(e)}",
-                    extra={"session_id": str(session_id)},
-                )
+        await self._flush(session_id, state, trailing=partial_message)
+
+        if event_type == "message_stop":
+            logger.debug(
+                "Streamed message complete",
+                extra={
+                    "session_id": str(session_id),
+                    "events_received": state.events_received,
+                    "frames_sent": state.frames_sent,
+                },
+            )
 
         return partial_message
 
+    async def flush(self, session_id: UUID) -> None:
+        """Broadcast any buffered deltas for a session now.
+
+        Call before broadcasting the complete message so clients receive
+        the last deltas first.
+
+        Args:
+            session_id: Session identifier
+        """
+        state = self._streams.get(session_id)
+        if state is not None:
+            await self._flush(session_id, state)
+
+    def mark_delivered(self, session_id: UUID) -> None:
+        """Record that the streamed message arrived as a complete message.
+
+        Call once the complete AssistantMessage has been persisted so
+        aggregate_partial_messages() does not return it a second time.
+
+        Args:
+            session_id: Session identifier
+        """
+        state = self._streams.get(session_id)
+        if state is not None:
+            state.aggregator.delivered = True
+
     async def aggregate_partial_messages(
         self, session_id: UUID, parent_message_id: Optional[UUID] = None
     ) -> Optional[DomainMessage]:
         """Aggregate all partial messages into complete message.
 
         This method is used when streaming completes to consolidate
-        all partial updates into a final message.
+        all partial updates into a final message. The message is assembled
+        from the in-memory stream state, so no database query is needed.
+        Pending deltas are flushed and the session's stream state released.
 
         Args:
             session_id: Session identifier
-            parent_message_id: Optional parent message to aggregate under
+            parent_message_id: Optional ID to give the aggregated message
 
         Returns:
-            DomainMessage: Aggregated complete message, or None if no partials found
+            DomainMessage: Aggregated message (not persisted, so
+            sequence_number is 0), or None if no partials were received
+            or the message was already delivered (see mark_delivered)
         """
+        state = self._streams.get(session_id)
+        if state is None:
+            return None
+
+        await self._flush(session_id, state)
+        self._streams.pop(session_id, None)
+
+        aggregator = state.aggregator
+        if not aggregator.blocks or aggregator.delivered:
+            return None
+
         logger.info(
-            f"Aggregating partial messages for session {session_id}",
-            extra={"session_id": str(session_id)},
+            f"Aggregated partial messages for session {session_id}",
+            extra={
+                "session_id": str(session_id),
+                "content_blocks": len(aggregator.blocks),
+                "events_received": state.events_received,
+                "frames_sent": state.frames_sent,
+            },
         )
 
-        # TODO: Implement partial message aggregation
-        # This would query partial messages from database and combine them
-        # For now, this is a placeholder for Phase 3 implementation
+        return DomainMessage(
+            id=parent_message_id or uuid4(),
+            session_id=session_id,
+            message_type=MessageType.ASSISTANT,
+            content=aggregator.to_content(),
+            sequence_number=0,
+            created_at=datetime.utcnow(),
+            model=aggregator.model,
+        )
+
+    def _partial_message(
+        self, session_id: UUID, event_type: str, event_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the partial message payload broadcast to clients."""
+        return {
+            "session_id": str(session_id),
+            "event_type": event_type,
+            "event_data": event_data,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    async def _flush_later(self, session_id: UUID, state: _StreamState) -> None:
+        """Flush pending deltas once the flush interval has elapsed."""
+        await asyncio.sleep(self.flush_interval)
+        state.flush_timer = None
+        await self._flush(session_id, state)
+
+    async def _flush(
+        self,
+        session_id: UUID,
+        state: _StreamState,
+        trailing: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Broadcast pending deltas merged per block, then an optional event.
+
+        Args:
+            session_id: Session identifier
+            state: Session stream state
+            trailing: Partial message to broadcast after the pending deltas
+        """
+        if state.flush_timer is not None and state.flush_timer is not asyncio.current_task():
+            state.flush_timer.cancel()
+            state.flush_timer = None
+
+        pending, state.pending = state.pending, OrderedDict()
+        state.pending_bytes = 0
+        state.last_flush = time.monotonic()
+
+        payloads = [
+            self._partial_message(session_id, "content_block_delta", {
+                "type": "content_block_delta",
+                "index": index,
+                "delta": {"type": delta_type, DELTA_TEXT_FIELDS[delta_type]: "".join(parts)},
+            })
+            for (index, delta_type), parts in pending.items()
+        ]
+        if trailing is not None:
+            payloads.append(trailing)
+        if not payloads:
+            return
 
-        logger.warning("Partial message aggregation not yet fully implemented")
-        return None
+        # Serialize broadcasts so timer and event flushes cannot reorder frames
+        async with state.lock:
+            for payload in payloads:
+                try:
+                    await self.event_broadcaster.broadcast(
+                        session_id=session_id,
+                        event_type="partial_message",
+                        data=payload,
+                    )
+                    state.frames_sent += 1
+                except Exception as e:
+                    logger.error(
+                        f"Failed to broadcast stream event: {str(e)}",
+                        extra={"session_id": str(session_id)},
+                    )
@@ -91,3 +91,12 @@ class BaseHook(ABC):
         Hooks with lower priority numbers execute first.
         """
         return 100
+
+    @property
+    def timeout_ms(self) -> Optional[int]:
+        """Return this hook's execution budget in milliseconds.
+
+        Default None uses settings.hook_execution_timeout_ms. A hook that
+        exceeds its budget is treated as failed.
+        """
+        return None
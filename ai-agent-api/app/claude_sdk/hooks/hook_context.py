@@ -9,11 +9,16 @@ class HookContext:
     """Context object passed to hooks during execution.
 
     Contains session and execution metadata to help hooks make informed decisions.
+    Hooks shared between sessions get everything session-specific from here:
+    the SDK's own context object and session-bound services such as the
+    audit service.
     """
     session_id: UUID
     tool_name: Optional[str] = None
     user_id: Optional[UUID] = None
     execution_metadata: Optional[Dict[str, Any]] = None
+    sdk_context: Any = None
+    audit_service: Any = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert context to dictionary for serialization."""
@@ -1,27 +1,43 @@
 """Hook manager for orchestrating hook execution."""
+import asyncio
+import dataclasses
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from claude_agent_sdk import HookMatcher
+from prometheus_client import Histogram
 
 from app.claude_sdk.hooks.base_hook import BaseHook, HookType
 from app.claude_sdk.hooks.hook_registry import HookRegistry
 from app.claude_sdk.hooks.hook_context import HookContext
 from app.repositories.hook_execution_repository import HookExecutionRepository
 from app.models.hook_execution import HookExecutionModel
+from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+HOOK_EXECUTION_SECONDS = Histogram(
+    "hook_execution_seconds",
+    "Hook execution time by hook and outcome",
+    ["hook_type", "hook_name", "outcome"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+# (result, execution_time_ms, error_message) of one hook run
+HookOutcome = Tuple[Dict[str, Any], int, Optional[str]]
+
 
 class HookManager:
     """Orchestrate hook execution across all hook types.
 
     The HookManager is responsible for:
     - Registering hooks by type and priority
-    - Executing hooks in the correct order
+    - Executing hooks in priority tiers: hooks sharing a priority run
+      concurrently, each within its timeout budget, and tiers run in order
+    - Applying the fail-open/fail-closed policy of each hook type
     - Logging hook executions to the database
     - Building SDK-compatible HookMatcher configurations
     - Handling hook errors gracefully
@@ -37,17 +53,33 @@ class HookManager:
     def __init__(
         self,
         db: AsyncSession,
-        hook_execution_repo: HookExecutionRepository
+        hook_execution_repo: HookExecutionRepository,
+        fail_closed_types: Optional[Iterable[HookType]] = None,
+        registry: Optional[HookRegistry] = None,
+        session_context: Optional[HookContext] = None
     ):
         """Initialize hook manager.
 
         Args:
             db: Database session for persistence
             hook_execution_repo: Repository for logging hook executions
+            fail_closed_types: Hook types where a failed or timed-out hook
+                blocks execution (default: settings.hook_fail_closed_types)
+            registry: Prebuilt (usually frozen, shared) registry to execute
+                instead of an empty one
+            session_context: If given, hooks receive a copy of it carrying
+                the tool name and SDK context instead of the bare SDK context
         """
         self.db = db
         self.hook_execution_repo = hook_execution_repo
-        self.registry = HookRegistry()
+        self.registry = registry if registry is not None else HookRegistry()
+        self.session_context = session_context
+        if fail_closed_types is None:
+            fail_closed_types = [
+                HookType(ht) for ht in settings.hook_fail_closed_types
+                if ht in HookType._value2member_map_
+            ]
+        self.fail_closed_types = frozenset(fail_closed_types)
 
         logger.info("HookManager initialized")
 
@@ -75,7 +107,7 @@ class HookManager:
                 "hook_type": hook_type.value,
                 "hook_class": hook.__class__.__name__,
                 "priority": actual_priority,
-                "enabled": hook.enabled
+                "enabled": getattr(hook, "enabled", True)
             }
         )
 
@@ -87,7 +119,7 @@ class HookManager:
         context: Any,
         session_id: UUID
     ) -> Dict[str, Any]:
-        """Execute all hooks for a given type in priority order.
+        """Execute all hooks for a given type, tier by tier.
 
         Based on POC script 04_hook_system.py, hooks receive:
         - input_data: Dict containing tool information and parameters
@@ -96,6 +128,13 @@ class HookManager:
 
         Hooks must return: {"continue_": True/False, ...}
 
+        Hooks with the same priority run concurrently; lower priorities run
+        first. Results are merged in priority then registration order, so
+        the outcome doesn't depend on which hook finishes first. If any hook
+        in a tier blocks, later tiers are skipped. A hook that raises or
+        exceeds its timeout is skipped (fail-open) unless its hook type is
+        fail-closed, in which case it blocks.
+
         Args:
             hook_type: Type of hooks to execute
             input_data: Hook input data from SDK
@@ -106,83 +145,125 @@ class HookManager:
         Returns:
             Merged hook results with at least {"continue_": bool}
         """
-        hooks = self.registry.get_hooks(hook_type)
+        tiers = self.registry.get_tiers(hook_type)
 
-        if not hooks:
+        if not tiers:
             # No hooks registered for this type, continue execution
             return {"continue_": True}
 
         # Merged result starts with continue=True
         merged_result: Dict[str, Any] = {"continue_": True}
+        tool_name = input_data.get("name") or input_data.get("tool_name")
+        context_data = self._serialize_context(context)
+        hook_context = context
+        if self.session_context is not None:
+            hook_context = dataclasses.replace(
+                self.session_context, tool_name=tool_name, sdk_context=context
+            )
 
-        for hook in hooks:
-            hook_name = hook.__class__.__name__
-            start_time = time.time()
-
-            try:
-                logger.debug(
-                    f"Executing hook: {hook_name} for {hook_type.value}",
-                    extra={"session_id": str(session_id), "tool_use_id": tool_use_id}
-                )
-
-                # Execute the hook
-                hook_result = await hook.execute(input_data, tool_use_id, context)
+        for tier in tiers:
+            outcomes: List[HookOutcome] = await asyncio.gather(*(
+                self._run_hook(hook_type, hook, input_data, tool_use_id, hook_context, session_id)
+                for hook in tier
+            ))
 
-                # Calculate execution time
-                execution_time_ms = int((time.time() - start_time) * 1000)
+            blocked = False
+            for hook, (hook_result, execution_time_ms, error_message) in zip(tier, outcomes):
+                hook_name = hook.__class__.__name__
 
-                # Log successful execution
+                # Log execution (sequentially: hooks share the db session)
                 await self._log_hook_execution(
                     session_id=session_id,
                     hook_type=hook_type,
                     hook_name=hook_name,
                     tool_use_id=tool_use_id,
-                    tool_name=input_data.get("name") or input_data.get("tool_name"),
+                    tool_name=tool_name,
                     input_data=input_data,
                     output_data=hook_result,
-                    context_data=self._serialize_context(context),
+                    context_data=context_data,
                     execution_time_ms=execution_time_ms,
-                    error_message=None
+                    error_message=error_message
                 )
 
+                if error_message is not None:
+                    if hook_type not in self.fail_closed_types:
+                        # Fail open: continue with other hooks despite error
+                        continue
+                    hook_result = {
+                        "continue_": False,
+                        "reason": f"Hook {hook_name} failed: {error_message}"
+                    }
+
                 # Merge results (later hooks can override earlier ones)
                 merged_result.update(hook_result)
 
-                # Stop if hook says to not continue
                 if not hook_result.get("continue_", True):
+                    blocked = True
                     logger.warning(
                         f"Hook {hook_name} blocked execution",
                         extra={"session_id": str(session_id), "tool_use_id": tool_use_id}
                     )
-                    break
 
-            except Exception as e:
-                execution_time_ms = int((time.time() - start_time) * 1000)
+            # Stop if any hook in the tier said to not continue
+            if blocked:
+                merged_result["continue_"] = False
+                break
 
-                logger.error(
-                    f"Hook {hook_name} failed: {type(e).__name__} - {str(e)}",
-                    extra={"session_id": str(session_id), "tool_use_id": tool_use_id},
-                    exc_info=True
-                )
+        return merged_result
 
-                # Log failed execution
-                await self._log_hook_execution(
-                    session_id=session_id,
-                    hook_type=hook_type,
-                    hook_name=hook_name,
-                    tool_use_id=tool_use_id,
-                    tool_name=input_data.get("name") or input_data.get("tool_name"),
-                    input_data=input_data,
-                    output_data={},
-                    context_data=self._serialize_context(context),
-                    execution_time_ms=execution_time_ms,
-                    error_message=f"{type(e).__name__}: {str(e)}"
-                )
+    async def _run_hook(
+        self,
+        hook_type: HookType,
+        hook: BaseHook,
+        input_data: Dict[str, Any],
+        tool_use_id: Optional[str],
+        context: Any,
+        session_id: UUID
+    ) -> HookOutcome:
+        """Run one hook within its timeout budget, timing it.
 
-                # Continue with other hooks despite error
-                continue
+        Returns:
+            Hook result ({} on failure), execution time in ms and error
+            message (None on success)
+        """
+        hook_name = hook.__class__.__name__
+        timeout_ms = getattr(hook, "timeout_ms", None) or settings.hook_execution_timeout_ms
+        start_time = time.perf_counter()
+        hook_result: Dict[str, Any] = {}
+        error_message: Optional[str] = None
+
+        logger.debug(
+            f"Executing hook: {hook_name} for {hook_type.value}",
+            extra={"session_id": str(session_id), "tool_use_id": tool_use_id}
+        )
 
-        return merged_result
+        try:
+            hook_result = await asyncio.wait_for(
+                hook.execute(input_data, tool_use_id, context),
+                timeout=timeout_ms / 1000
+            )
+            outcome = "success"
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            error_message = f"TimeoutError: exceeded {timeout_ms} ms budget"
+            logger.error(
+                f"Hook {hook_name} timed out after {timeout_ms} ms",
+                extra={"session_id": str(session_id), "tool_use_id": tool_use_id}
+            )
+        except Exception as e:
+            outcome = "error"
+            error_message = f"{type(e).__name__}: {str(e)}"
+            logger.error(
+                f"Hook {hook_name} failed: {type(e).__name__} - {str(e)}",
+                extra={"session_id": str(session_id), "tool_use_id": tool_use_id},
+                exc_info=True
+            )
+
+        elapsed = time.perf_counter() - start_time
+        HOOK_EXECUTION_SECONDS.labels(
+            hook_type=hook_type.value, hook_name=hook_name, outcome=outcome
+        ).observe(elapsed)
+        return hook_result, int(elapsed * 1000), error_message
 
     def build_hook_matchers(
         self,
@@ -15,7 +15,9 @@ class HookRegistry:
     """Registry for managing hooks across hook types.
 
     Maintains a registry of hooks organized by type and supports priority-based
-    ordering for execution.
+    ordering for execution. Priority tiers are computed once per type and
+    reused until hooks change. A frozen registry can be shared between
+    sessions (see ExecutionPipeline).
     """
 
     def __init__(self):
@@ -23,6 +25,8 @@ class HookRegistry:
         self._hooks: Dict[HookType, List[RegisteredHook]] = {
             hook_type: [] for hook_type in HookType
         }
+        self._tiers: Dict[HookType, List[List[BaseHook]]] = {}
+        self.frozen = False
 
     def register(
         self,
@@ -36,9 +40,14 @@ class HookRegistry:
             hook_type: Type of hook to register
             hook: Hook instance to register
             priority: Execution priority (lower = earlier)
+
+        Raises:
+            RuntimeError: If the registry is frozen
         """
+        self._check_not_frozen()
         registered_hook = RegisteredHook(hook=hook, priority=priority)
         self._hooks[hook_type].append(registered_hook)
+        self._tiers.pop(hook_type, None)
 
     def get_hooks(self, hook_type: HookType) -> List[BaseHook]:
         """Get all hooks for a type, sorted by priority.
@@ -53,12 +62,43 @@ class HookRegistry:
         sorted_hooks = sorted(registered_hooks, key=lambda rh: rh.priority)
         return [rh.hook for rh in sorted_hooks]
 
+    def get_tiers(self, hook_type: HookType) -> List[List[BaseHook]]:
+        """Get hooks for a type grouped by priority.
+
+        Hooks sharing a priority form one tier; tiers are ordered by
+        priority and hooks within a tier by registration order.
+
+        Args:
+            hook_type: Type of hooks to retrieve
+
+        Returns:
+            List of tiers, each a list of hooks
+        """
+        cached = self._tiers.get(hook_type)
+        if cached is not None:
+            return cached
+
+        tiers: List[List[BaseHook]] = []
+        last_priority: Optional[int] = None
+        for rh in sorted(self._hooks.get(hook_type, []), key=lambda rh: rh.priority):
+            if not tiers or rh.priority != last_priority:
+                tiers.append([])
+                last_priority = rh.priority
+            tiers[-1].append(rh.hook)
+        self._tiers[hook_type] = tiers
+        return tiers
+
     def clear(self, hook_type: Optional[HookType] = None) -> None:
         """Clear hooks for a specific type or all types.
 
         Args:
             hook_type: Type to clear, or None to clear all
+
+        Raises:
+            RuntimeError: If the registry is frozen
         """
+        self._check_not_frozen()
+        self._tiers.clear()
         if hook_type:
             self._hooks[hook_type] = []
         else:
@@ -76,3 +116,11 @@ class HookRegistry:
         if hook_type:
             return len(self._hooks.get(hook_type, []))
         return sum(len(hooks) for hooks in self._hooks.values())
+
+    def freeze(self) -> None:
+        """Make the registry read-only so it can be shared between sessions."""
+        self.frozen = True
+
+    def _check_not_frozen(self) -> None:
+        if self.frozen:
+            raise RuntimeError("Hook registry is frozen and cannot be modified")
@@ -4,6 +4,7 @@ from typing import Dict, Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.claude_sdk.hooks.base_hook import BaseHook, HookType
+from app.claude_sdk.hooks.hook_context import HookContext
 from app.services.audit_service import AuditService
 
 logger = logging.getLogger(__name__)
@@ -15,13 +16,17 @@ class AuditHook(BaseHook):
     Logs all tool executions to the audit trail for compliance and debugging.
     This hook executes before tool execution (PreToolUse) to capture all
     invocation attempts, including those that may be blocked by permissions.
+
+    When shared between sessions the hook is created without a service and
+    uses the audit service carried by the per-session HookContext.
     """
 
-    def __init__(self, audit_service: AuditService):
+    def __init__(self, audit_service: Optional[AuditService] = None):
         """Initialize audit hook.
 
         Args:
-            audit_service: Service for logging audit events
+            audit_service: Service for logging audit events (default: the
+                one on the HookContext passed to execute)
         """
         self.audit_service = audit_service
 
@@ -55,11 +60,17 @@ class AuditHook(BaseHook):
             tool_name = input_data.get("name") or input_data.get("tool_name", "unknown")
             tool_input = input_data.get("input", {})
 
-            # Extract session_id from context if available
+            # Extract session_id and audit service from context if available
             session_id = getattr(context, "session_id", None)
+            audit_service = self.audit_service
+            if isinstance(context, HookContext) and context.audit_service is not None:
+                audit_service = context.audit_service
+            if audit_service is None:
+                logger.debug(f"Audit: no audit service for {tool_name}, skipping")
+                return {"continue_": True}
 
             # Log to audit trail
-            await self.audit_service.log_event(
+            await audit_service.log_event(
                 event_type="tool_execution_attempt",
                 event_category="tool",
                 resource_type="tool",
@@ -7,6 +7,7 @@ This module provides MCP (Model Context Protocol) server management:
 - MCPServerManager: Manager for MCP server lifecycle
 - ToolRegistry: Registry for discovering and tracking MCP tools
 - ToolInfo: Information about individual tools
+- ToolAccessIndex: Compiled allowed/disallowed tool patterns
 
 Example usage:
     >>> from app.claude_sdk.mcp import MCPServerManager, MCPServerConfig, MCPServerType
@@ -46,6 +47,11 @@ Example usage:
 from app.claude_sdk.mcp.mcp_server_config import MCPServerConfig, MCPServerType
 from app.claude_sdk.mcp.mcp_server_manager import MCPServerManager
 from app.claude_sdk.mcp.tool_registry import ToolRegistry, ToolInfo
+from app.claude_sdk.mcp.tool_pattern_index import (
+    ToolAccessIndex,
+    ToolPatternIndex,
+    get_tool_access_index,
+)
 
 __all__ = [
     "MCPServerConfig",
@@ -53,4 +59,7 @@ __all__ = [
     "MCPServerManager",
     "ToolRegistry",
     "ToolInfo",
+    "ToolAccessIndex",
+    "ToolPatternIndex",
+    "get_tool_access_index",
 ]
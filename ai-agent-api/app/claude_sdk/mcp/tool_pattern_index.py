@@ -0,0 +1,146 @@
+"""Compiled tool-name patterns for allow/deny checks.
+
+Tool lists such as a task's ``allowed_tools`` mix exact names (``Read``,
+``mcp__kubernetes_readonly__list_pods``) with globs (``mcp__kubernetes_readonly__*``,
+``*``). Rather than scanning every pattern per tool call, patterns are
+compiled once into:
+
+- a set of exact names (hash lookup),
+- a character trie of trailing-``*`` prefixes (walk of the tool name),
+- one combined regex for the rare patterns with ``*`` elsewhere
+  (e.g. ``mcp__*__get_*``).
+
+so a check costs O(len(tool_name)) regardless of how many patterns or MCP
+tools a fleet has.
+"""
+import fnmatch
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Marks a trie node where a prefix pattern ends
+_TERMINAL = ""
+
+
+class ToolPatternIndex:
+    """Set of tool-name patterns with O(length) membership checks.
+
+    Example:
+        >>> index = ToolPatternIndex(["Read", "mcp__kubernetes_readonly__*"])
+        >>> index.matches("mcp__kubernetes_readonly__list_pods")
+        True
+        >>> index.matches("Write")
+        False
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """Compile patterns.
+
+        Args:
+            patterns: Exact tool names and ``*`` globs
+        """
+        self.patterns: Tuple[str, ...] = tuple(dict.fromkeys(p for p in patterns if p))
+        self._exact = set()
+        self._prefixes: Dict[str, dict] = {}
+        self._match_all = False
+        globs: List[str] = []
+
+        for pattern in self.patterns:
+            star = pattern.find("*")
+            if star == -1:
+                self._exact.add(pattern)
+            elif star == len(pattern) - 1:
+                if star == 0:
+                    self._match_all = True
+                self._add_prefix(pattern[:-1])
+            else:
+                globs.append(pattern)
+
+        self._glob: Optional[re.Pattern] = (
+            re.compile("|".join(f"(?:{fnmatch.translate(g)})" for g in globs))
+            if globs else None
+        )
+
+    def _add_prefix(self, prefix: str) -> None:
+        node = self._prefixes
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[_TERMINAL] = {}
+
+    def _matches_prefix(self, tool_name: str) -> bool:
+        node = self._prefixes
+        if _TERMINAL in node:
+            return True
+        for char in tool_name:
+            node = node.get(char)
+            if node is None:
+                return False
+            if _TERMINAL in node:
+                return True
+        return False
+
+    def matches(self, tool_name: str) -> bool:
+        """Check whether a tool name matches any pattern."""
+        if self._match_all or tool_name in self._exact:
+            return True
+        if self._prefixes and self._matches_prefix(tool_name):
+            return True
+        return self._glob is not None and self._glob.match(tool_name) is not None
+
+    def __contains__(self, tool_name: str) -> bool:
+        return self.matches(tool_name)
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+
+class ToolAccessIndex:
+    """Compiled ``allowed_tools``/``disallowed_tools`` of a task or session.
+
+    Disallowed patterns win. An empty allow list places no restriction,
+    matching the SDK's handling of ``allowed_tools``.
+    """
+
+    def __init__(
+        self,
+        allowed_tools: Optional[Iterable[str]] = None,
+        disallowed_tools: Optional[Iterable[str]] = None,
+    ):
+        """Compile allow and deny lists.
+
+        Args:
+            allowed_tools: Tool names and globs that may be used
+            disallowed_tools: Tool names and globs that may never be used
+        """
+        self.allowed = ToolPatternIndex(allowed_tools or ())
+        self.disallowed = ToolPatternIndex(disallowed_tools or ())
+
+    def is_allowed(self, tool_name: str) -> bool:
+        """Check whether a tool may be used."""
+        if self.disallowed.matches(tool_name):
+            return False
+        return not self.allowed or self.allowed.matches(tool_name)
+
+    def filter(self, tool_names: Iterable[str]) -> List[str]:
+        """Keep the tools that may be used, in their original order."""
+        return [name for name in tool_names if self.is_allowed(name)]
+
+
+@lru_cache(maxsize=256)
+def _compile(allowed: Tuple[str, ...], disallowed: Tuple[str, ...]) -> ToolAccessIndex:
+    return ToolAccessIndex(allowed, disallowed)
+
+
+def get_tool_access_index(
+    allowed_tools: Optional[Iterable[str]] = None,
+    disallowed_tools: Optional[Iterable[str]] = None,
+) -> ToolAccessIndex:
+    """Get the compiled index for a pair of tool lists.
+
+    Indexes are shared process-wide, so tasks and sessions with the same
+    tool lists (typically from the same tool group) compile them once.
+    """
+    return _compile(tuple(allowed_tools or ()), tuple(disallowed_tools or ()))
@@ -3,6 +3,8 @@ import logging
 from typing import Dict, List, Set, Optional
 from dataclasses import dataclass
 
+from app.claude_sdk.mcp.tool_pattern_index import ToolAccessIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +32,13 @@ class ToolRegistry:
         """Initialize empty tool registry."""
         self._tools: Dict[str, ToolInfo] = {}
         self._tools_by_server: Dict[str, Set[str]] = {}
+        # Sorted name lists, rebuilt only after registrations change
+        self._sorted_tools: Optional[List[str]] = None
+        self._sorted_server_tools: Dict[str, List[str]] = {}
+
+    def _invalidate(self) -> None:
+        self._sorted_tools = None
+        self._sorted_server_tools.clear()
 
     def register_sdk_server_tools(
         self,
@@ -58,6 +67,7 @@ class ToolRegistry:
             self._tools[full_name] = tool_info
             self._tools_by_server[server_name].add(full_name)
 
+        self._invalidate()
         logger.info(
             f"Registered {len(tool_names)} tools from SDK server '{server_name}'"
         )
@@ -92,6 +102,7 @@ class ToolRegistry:
                 self._tools[full_name] = tool_info
                 self._tools_by_server[server_name].add(full_name)
 
+            self._invalidate()
             logger.info(
                 f"Registered {len(tool_names)} tools from external server '{server_name}'"
             )
@@ -120,7 +131,11 @@ class ToolRegistry:
         Returns:
             List of full tool names
         """
-        return sorted(self._tools_by_server.get(server_name, set()))
+        tools = self._sorted_server_tools.get(server_name)
+        if tools is None:
+            tools = sorted(self._tools_by_server.get(server_name, set()))
+            self._sorted_server_tools[server_name] = tools
+        return list(tools)
 
     def list_all_tools(self) -> List[str]:
         """Get list of all registered tools.
@@ -128,7 +143,22 @@ class ToolRegistry:
         Returns:
             List of full tool names
         """
-        return sorted(self._tools.keys())
+        if self._sorted_tools is None:
+            self._sorted_tools = sorted(self._tools.keys())
+        return list(self._sorted_tools)
+
+    def list_allowed_tools(self, access: ToolAccessIndex) -> List[str]:
+        """Get registered tools permitted by a task's or session's tool lists.
+
+        Args:
+            access: Compiled allowed/disallowed tools (see get_tool_access_index)
+
+        Returns:
+            List of full tool names
+        """
+        if self._sorted_tools is None:
+            self._sorted_tools = sorted(self._tools.keys())
+        return access.filter(self._sorted_tools)
 
     def list_servers(self) -> List[str]:
         """Get list of all servers.
@@ -157,6 +187,7 @@ class ToolRegistry:
         Args:
             server_name: Server to clear, or None to clear all
         """
+        self._invalidate()
         if server_name:
             # Remove tools for specific server
             tool_names = self._tools_by_server.get(server_name, set())
@@ -6,7 +6,7 @@ to our domain entities and persisting to database.
 Based on Document 5: Session Management - Message Processing Pipeline
 """
 
-from typing import AsyncIterator, Any, Dict
+from typing import AsyncIterator, Any, Dict, Optional
 from uuid import UUID, uuid4
 from datetime import datetime
 
@@ -23,6 +23,7 @@ from claude_agent_sdk.types import (
     ToolResultBlock,
 )
 
+from app.claude_sdk.event_broadcaster import EventBroadcaster  # noqa: F401 (re-export)
 from app.domain.entities.session import Session
 from app.domain.value_objects.message import Message, MessageType
 from app.domain.value_objects.tool_call import ToolCall
@@ -54,7 +55,7 @@ class MessageProcessor:
         message_repo: MessageRepository,
         tool_call_repo: ToolCallRepository,
         session_repo: SessionRepository,
-        event_broadcaster=None,  # Optional EventBroadcaster
+        event_broadcaster: Optional[EventBroadcaster] = None,
     ):
         """Initialize message processor with repositories."""
         self.db = db
@@ -341,61 +342,3 @@ class MessageProcessor:
         if num_turns > 0:
             session.total_turns = num_turns
 
-
-class EventBroadcaster:
-    """Event broadcaster for WebSocket message streaming.
-    
-    Optional component for real-time message broadcasting to connected clients.
-    """
-
-    def __init__(self):
-        """Initialize event broadcaster."""
-        self.subscribers: Dict[UUID, list] = {}
-
-    async def broadcast_message(self, session_id: UUID, message: Message) -> None:
-        """Broadcast message to session subscribers.
-        
-        Args:
-            session_id: Session UUID
-            message: Domain message to broadcast
-        """
-        if session_id in self.subscribers:
-            # Convert message to dict for JSON serialization
-            message_dict = {
-                "id": str(message.id),
-                "session_id": str(message.session_id),
-                "sequence_number": message.sequence_number,
-                "message_type": message.message_type.value,
-                "content": message.content,
-                "created_at": message.created_at.isoformat() if hasattr(message, 'created_at') else None,
-            }
-
-            # Send to all subscribers
-            for subscriber in self.subscribers[session_id]:
-                try:
-                    await subscriber.send_json(message_dict)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to subscriber: {e}")
-
-    def subscribe(self, session_id: UUID, websocket) -> None:
-        """Add WebSocket subscriber for session.
-        
-        Args:
-            session_id: Session UUID
-            websocket: WebSocket connection
-        """
-        if session_id not in self.subscribers:
-            self.subscribers[session_id] = []
-        self.subscribers[session_id].append(websocket)
-
-    def unsubscribe(self, session_id: UUID, websocket) -> None:
-        """Remove WebSocket subscriber.
-        
-        Args:
-            session_id: Session UUID
-            websocket: WebSocket connection
-        """
-        if session_id in self.subscribers:
-            self.subscribers[session_id].remove(websocket)
-            if not self.subscribers[session_id]:
-                del self.subscribers[session_id]
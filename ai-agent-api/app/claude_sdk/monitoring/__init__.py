@@ -3,9 +3,12 @@
 from app.claude_sdk.monitoring.metrics_collector import MetricsCollector
 from app.claude_sdk.monitoring.cost_tracker import CostTracker
 from app.claude_sdk.monitoring.health_checker import HealthChecker
+from app.claude_sdk.monitoring.system_metrics import SystemMetricsSampler, get_system_metrics_sampler
 
 __all__ = [
     "MetricsCollector",
     "CostTracker",
     "HealthChecker",
+    "SystemMetricsSampler",
+    "get_system_metrics_sampler",
 ]
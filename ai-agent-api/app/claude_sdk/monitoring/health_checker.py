@@ -36,11 +36,46 @@ class HealthChecker:
             return False
 
     async def check_mcp_servers(self) -> Dict[str, bool]:
-        """Check health of all MCP servers."""
-        # TODO: Implement MCP server health checks
-        # This would query the MCP server manager for active servers
-        # and ping each one to verify it's responsive
-        return {}
+        """Check health of all enabled external MCP servers.
+
+        Servers are probed concurrently; results younger than
+        mcp_health_cache_ttl_seconds are reused. Outcomes are recorded on
+        the server rows.
+        """
+        from app.mcp.config_builder import MCPConfigBuilder
+        from app.mcp.health_prober import get_mcp_health_prober
+        from app.repositories.mcp_server_repository import MCPServerRepository
+
+        repo = MCPServerRepository(self.db)
+        try:
+            servers = [s for s in await repo.list_enabled() if s.server_type != "sdk"]
+        except Exception as e:
+            logger.error(f"MCP server health check failed: {e}")
+            return {}
+
+        configs = {}
+        for server in servers:
+            try:
+                configs[str(server.id)] = MCPConfigBuilder._convert_to_sdk_format(server)
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Skipping MCP server {server.name} with invalid config: {e}")
+
+        results = await get_mcp_health_prober().probe_many(configs)
+        health = {}
+        for server in servers:
+            result = results.get(str(server.id))
+            if result is None:
+                continue
+            health[server.name] = result.healthy
+            if server.health_status != result.status or server.last_error != result.error:
+                await repo.update_health_status(
+                    server.id,
+                    result.status,
+                    last_error=result.error,
+                    latency_ms=result.latency_ms,
+                    tools=result.tools,
+                )
+        return health
 
     async def check_database(self) -> bool:
         """Check database connectivity."""
@@ -0,0 +1,248 @@
+"""System metrics sampler for host CPU, memory, disk and network usage.
+
+A background task samples the host every ``system_metrics_interval_seconds``
+into a ring buffer covering ``system_metrics_history_seconds``. CPU usage is
+measured between consecutive samples (``psutil.cpu_percent(interval=None)``),
+so readers never sleep: the get_system_metrics tool and the monitoring
+endpoint read the latest sample and rolling 1s/1m/5m windows from memory.
+
+With ``system_metrics_interval_seconds`` set to 0 nothing runs in the
+background; ``current()`` takes a sample on demand instead.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+WINDOWS = {"1s": 1, "1m": 60, "5m": 300}
+
+# Shortest CPU measurement after priming, so a first reading is not 0%
+CPU_PRIME_SECONDS = 0.1
+
+# Fields summarized over each window
+WINDOW_FIELDS = (
+    "cpu_percent",
+    "memory_percent",
+    "disk_percent",
+    "net_sent_bytes_per_second",
+    "net_recv_bytes_per_second",
+)
+
+
+@dataclass
+class SystemSample:
+    """One point-in-time reading of host resource usage."""
+
+    timestamp: float
+    cpu_percent: float
+    memory_percent: float
+    memory_used_bytes: int
+    memory_total_bytes: int
+    disk_percent: float
+    disk_used_bytes: int
+    disk_total_bytes: int
+    net_sent_bytes_per_second: float
+    net_recv_bytes_per_second: float
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of pre-sorted values."""
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class SystemMetricsSampler:
+    """Samples host metrics in the background and serves rolling windows."""
+
+    def __init__(
+        self,
+        interval_seconds: Optional[float] = None,
+        history_seconds: Optional[int] = None,
+        disk_path: str = "/",
+    ):
+        """Initialize sampler.
+
+        Args:
+            interval_seconds: Delay between samples (0: on-demand samples only)
+            history_seconds: Longest window kept in the ring buffer
+            disk_path: Filesystem reported as disk usage
+        """
+        self.interval_seconds = (
+            settings.system_metrics_interval_seconds if interval_seconds is None else interval_seconds
+        )
+        history_seconds = history_seconds or settings.system_metrics_history_seconds
+        self.disk_path = disk_path
+        self.samples: Deque[SystemSample] = deque(
+            maxlen=max(1, int(history_seconds / (self.interval_seconds or 1.0)) + 1)
+        )
+        self.cpu_count: Optional[int] = None
+        self._last_net = None
+        self._primed_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _prime(self) -> None:
+        """Start the CPU and network counters the next sample is measured against."""
+        import psutil
+
+        psutil.cpu_percent(interval=None)
+        net = psutil.net_io_counters()
+        self._primed_at = time.monotonic()
+        if net is not None:
+            self._last_net = (self._primed_at, net.bytes_sent, net.bytes_recv)
+
+    def sample_once(self) -> SystemSample:
+        """Take a sample and append it to the ring buffer.
+
+        Each call is a handful of non-blocking reads (no sleeping).
+
+        Raises:
+            ImportError: If psutil is not installed
+        """
+        import psutil
+
+        now = time.monotonic()
+        if self.cpu_count is None:
+            self.cpu_count = psutil.cpu_count()
+
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        net = psutil.net_io_counters()
+
+        sent_rate = recv_rate = 0.0
+        if self._last_net is not None and net is not None:
+            last_time, last_sent, last_recv = self._last_net
+            elapsed = now - last_time
+            if elapsed > 0:
+                sent_rate = max(0, net.bytes_sent - last_sent) / elapsed
+                recv_rate = max(0, net.bytes_recv - last_recv) / elapsed
+        if net is not None:
+            self._last_net = (now, net.bytes_sent, net.bytes_recv)
+
+        sample = SystemSample(
+            timestamp=time.time(),
+            cpu_percent=psutil.cpu_percent(interval=None),
+            memory_percent=memory.percent,
+            memory_used_bytes=memory.used,
+            memory_total_bytes=memory.total,
+            disk_percent=disk.percent,
+            disk_used_bytes=disk.used,
+            disk_total_bytes=disk.total,
+            net_sent_bytes_per_second=sent_rate,
+            net_recv_bytes_per_second=recv_rate,
+        )
+        self.samples.append(sample)
+        return sample
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start background sampling on the running event loop.
+
+        Raises:
+            ValueError: If the interval is 0 (background sampling disabled)
+        """
+        if self.running:
+            return
+        if self.interval_seconds <= 0:
+            raise ValueError("System metrics sampling interval is 0")
+        # Prime the counters so the first sample covers one interval
+        self._prime()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop background sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                self.sample_once()
+            except Exception as e:
+                logger.warning("System metrics sample failed", extra={"error": str(e)})
+
+    def latest(self) -> Optional[SystemSample]:
+        """Get the most recent sample."""
+        return self.samples[-1] if self.samples else None
+
+    async def current(self) -> SystemSample:
+        """Get the latest background sample, or take one now.
+
+        A sample is taken on demand when background sampling is not
+        running or has not produced a sample yet. The first one waits until
+        the CPU counters have run for CPU_PRIME_SECONDS, without blocking
+        the loop.
+        """
+        if self.running and self.samples:
+            return self.samples[-1]
+        if self._primed_at is None:
+            self._prime()
+        remaining = CPU_PRIME_SECONDS - (time.monotonic() - self._primed_at)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        return self.sample_once()
+
+    def window(self, seconds: float) -> Dict[str, Any]:
+        """Summarize samples taken within the last ``seconds``.
+
+        Returns:
+            Sample count and avg/min/max/p50/p95 per metric
+        """
+        cutoff = time.time() - seconds - self.interval_seconds / 2
+        recent = []
+        for sample in reversed(self.samples):
+            if sample.timestamp < cutoff:
+                break
+            recent.append(sample)
+
+        summary: Dict[str, Any] = {"samples": len(recent)}
+        if not recent:
+            return summary
+        for field in WINDOW_FIELDS:
+            values = sorted(getattr(sample, field) for sample in recent)
+            summary[field] = {
+                "avg": sum(values) / len(values),
+                "min": values[0],
+                "max": values[-1],
+                "p50": _percentile(values, 0.5),
+                "p95": _percentile(values, 0.95),
+            }
+        return summary
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the latest sample and rolling windows."""
+        latest = self.latest()
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval_seconds,
+            "cpu_count": self.cpu_count,
+            "latest": asdict(latest) if latest else None,
+            "windows": {name: self.window(seconds) for name, seconds in WINDOWS.items()},
+        }
+
+
+_system_metrics_sampler: Optional[SystemMetricsSampler] = None
+
+
+def get_system_metrics_sampler() -> SystemMetricsSampler:
+    """Get the process-wide system metrics sampler."""
+    global _system_metrics_sampler
+    if _system_metrics_sampler is None:
+        _system_metrics_sampler = SystemMetricsSampler()
+    return _system_metrics_sampler
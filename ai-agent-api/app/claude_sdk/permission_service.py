@@ -19,6 +19,12 @@ from claude_agent_sdk.types import (
     ToolPermissionContext,
 )
 
+from app.claude_sdk.permissions.decision_log import (
+    PermissionDecisionLog,
+    get_permission_decision_log,
+)
+from app.claude_sdk.permissions.pattern_matcher import RegexPatternSet
+from app.domain.entities.permission_decision import PermissionResult as PermissionDecision
 from app.domain.entities.user import User
 from app.repositories.user_repository import UserRepository
 from app.repositories.session_repository import SessionRepository
@@ -47,13 +53,21 @@ class PermissionService:
         session_repo: SessionRepository,
         mcp_server_repo: MCPServerRepository,
         audit_service: AuditService,
+        decision_log: Optional[PermissionDecisionLog] = None,
     ):
-        """Initialize permission service with dependencies."""
+        """Initialize permission service with dependencies.
+
+        Decisions are queued on ``decision_log`` (the process-wide
+        PermissionDecisionLog by default) and bulk-written to
+        permission_decisions, so checks don't wait on the database unless
+        the log is in strict mode and the decision is a denial.
+        """
         self.db = db
         self.user_repo = user_repo
         self.session_repo = session_repo
         self.mcp_server_repo = mcp_server_repo
         self.audit_service = audit_service
+        self.decision_log = decision_log or get_permission_decision_log()
 
         # Dangerous bash command patterns
         self.dangerous_commands = [
@@ -67,6 +81,8 @@ class PermissionService:
             r"curl.*\|.*bash",  # Pipe to bash
             r"wget.*\|.*bash",  # Pipe to bash
         ]
+        # Compiled once; a command is scanned for every pattern in one pass
+        self._dangerous_matcher = RegexPatternSet(self.dangerous_commands, re.IGNORECASE)
 
         # System paths blocked from write access
         self.blocked_paths = [
@@ -128,7 +144,8 @@ class PermissionService:
                     "user_active": user.is_active if user else None
                 }
             )
-            await self.audit_service.log_permission_denied(
+            await self._log_decision(
+                decision=PermissionDecision.DENIED,
                 session_id=session_id,
                 user_id=user_id,
                 tool_name=tool_name,
@@ -172,7 +189,8 @@ class PermissionService:
                     "user_id": str(user.id)
                 }
             )
-            await self.audit_service.log_permission_allowed(
+            await self._log_decision(
+                decision=PermissionDecision.ALLOWED,
                 session_id=session_id,
                 user_id=user.id,
                 tool_name=tool_name,
@@ -180,6 +198,35 @@ class PermissionService:
             )
             return PermissionResultAllow()
 
+    async def _log_decision(
+        self,
+        decision: PermissionDecision,
+        session_id: UUID,
+        user_id: UUID,
+        tool_name: str,
+        tool_input: dict,
+        reason: str = "allowed",
+    ) -> None:
+        """Queue a decision on the permission decision log."""
+        try:
+            await self.decision_log.record(
+                session_id=session_id,
+                tool_name=tool_name,
+                input_data=tool_input,
+                context_data={"user_id": str(user_id)},
+                decision=decision,
+                reason=reason,
+                policy_applied="permission_service",
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to log permission decision: {type(e).__name__} - {str(e)}",
+                extra={"session_id": str(session_id), "tool_name": tool_name},
+            )
+            # Strict mode never returns a denial that was not persisted
+            if self.decision_log.strict:
+                raise
+
     async def _check_bash_permission(
         self,
         session_id: UUID,
@@ -201,28 +248,29 @@ class PermissionService:
         )
 
         # Check for dangerous commands
-        for pattern in self.dangerous_commands:
-            if re.search(pattern, command, re.IGNORECASE):
-                logger.warning(
-                    f"Dangerous bash command blocked",
-                    extra={
-                        "session_id": str(session_id),
-                        "user_id": str(user.id),
-                        "command": command,
-                        "matched_pattern": pattern
-                    }
-                )
-                await self.audit_service.log_permission_denied(
-                    session_id=session_id,
-                    user_id=user.id,
-                    tool_name="Bash",
-                    tool_input=tool_input,
-                    reason=f"Dangerous command pattern: {pattern}",
-                )
-                return PermissionResultDeny(
-                    message=f"Dangerous command blocked: {command[:50]}...",
-                    interrupt=False
-                )
+        pattern = self._dangerous_matcher.search(command)
+        if pattern is not None:
+            logger.warning(
+                f"Dangerous bash command blocked",
+                extra={
+                    "session_id": str(session_id),
+                    "user_id": str(user.id),
+                    "command": command,
+                    "matched_pattern": pattern
+                }
+            )
+            await self._log_decision(
+                decision=PermissionDecision.DENIED,
+                session_id=session_id,
+                user_id=user.id,
+                tool_name="Bash",
+                tool_input=tool_input,
+                reason=f"Dangerous command pattern: {pattern}",
+            )
+            return PermissionResultDeny(
+                message=f"Dangerous command blocked (matched '{pattern}'): {command[:50]}...",
+                interrupt=False
+            )
 
         # Check user role restrictions
         if user.role == "viewer":
@@ -254,7 +302,8 @@ class PermissionService:
                         "allowed_commands": readonly_commands
                     }
                 )
-                await self.audit_service.log_permission_denied(
+                await self._log_decision(
+                    decision=PermissionDecision.DENIED,
                     session_id=session_id,
                     user_id=user.id,
                     tool_name="Bash",
@@ -276,7 +325,8 @@ class PermissionService:
                 "command_name": command.split()[0] if command.strip() else ""
             }
         )
-        await self.audit_service.log_permission_allowed(
+        await self._log_decision(
+            decision=PermissionDecision.ALLOWED,
             session_id=session_id,
             user_id=user.id,
             tool_name="Bash",
@@ -298,7 +348,8 @@ class PermissionService:
         path = Path(file_path)
         for blocked in self.blocked_paths:
             if str(path).startswith(blocked):
-                await self.audit_service.log_permission_denied(
+                await self._log_decision(
+                    decision=PermissionDecision.DENIED,
                     session_id=session_id,
                     user_id=user.id,
                     tool_name="Write",
@@ -323,7 +374,8 @@ class PermissionService:
 
                 # Check if resolved path is within workdir
                 if not str(resolved_path).startswith(str(workdir.resolve())):
-                    await self.audit_service.log_permission_denied(
+                    await self._log_decision(
+                        decision=PermissionDecision.DENIED,
                         session_id=session_id,
                         user_id=user.id,
                         tool_name="Write",
@@ -342,7 +394,8 @@ class PermissionService:
                 )
 
         # Allow write
-        await self.audit_service.log_permission_allowed(
+        await self._log_decision(
+            decision=PermissionDecision.ALLOWED,
             session_id=session_id,
             user_id=user.id,
             tool_name="Write",
@@ -362,7 +415,8 @@ class PermissionService:
         # Parse MCP tool name: mcp__server_name__tool_name
         parts = tool_name.split("__")
         if len(parts) < 3:
-            await self.audit_service.log_permission_denied(
+            await self._log_decision(
+                decision=PermissionDecision.DENIED,
                 session_id=session_id,
                 user_id=user.id,
                 tool_name=tool_name,
@@ -382,7 +436,8 @@ class PermissionService:
             # Check if it's a global server
             server = await self.mcp_server_repo.get_global_by_name(server_name)
             if not server:
-                await self.audit_service.log_permission_denied(
+                await self._log_decision(
+                    decision=PermissionDecision.DENIED,
                     session_id=session_id,
                     user_id=user.id,
                     tool_name=tool_name,
@@ -396,7 +451,8 @@ class PermissionService:
 
         # Check if server is enabled
         if not server.is_enabled:
-            await self.audit_service.log_permission_denied(
+            await self._log_decision(
+                decision=PermissionDecision.DENIED,
                 session_id=session_id,
                 user_id=user.id,
                 tool_name=tool_name,
@@ -409,7 +465,8 @@ class PermissionService:
             )
 
         # Allow MCP tool
-        await self.audit_service.log_permission_allowed(
+        await self._log_decision(
+            decision=PermissionDecision.ALLOWED,
             session_id=session_id,
             user_id=user.id,
             tool_name=tool_name,
@@ -6,6 +6,8 @@ This module provides a comprehensive permission system for controlling tool acce
 - PolicyEngine: Evaluates policies in priority order
 - PermissionManager: Orchestrates permission checks and logging
 - PermissionContext: Context object for policy evaluation
+- PermissionDecisionCache: Bounded LRU + TTL cache of decisions
+- PermissionDecisionLog: Buffered, batched writer of decisions
 - Built-in policies: FileAccessPolicy, CommandPolicy, NetworkPolicy, etc.
 
 Example usage:
@@ -31,6 +33,11 @@ Example usage:
 """
 from app.claude_sdk.permissions.base_policy import BasePolicy
 from app.claude_sdk.permissions.permission_context import PermissionContext
+from app.claude_sdk.permissions.decision_cache import PermissionDecisionCache
+from app.claude_sdk.permissions.decision_log import (
+    PermissionDecisionLog,
+    get_permission_decision_log,
+)
 from app.claude_sdk.permissions.policy_engine import PolicyEngine
 from app.claude_sdk.permissions.permission_manager import PermissionManager
 from app.claude_sdk.permissions.policies import (
@@ -45,6 +52,9 @@ __all__ = [
     # Base classes
     "BasePolicy",
     "PermissionContext",
+    "PermissionDecisionCache",
+    "PermissionDecisionLog",
+    "get_permission_decision_log",
     "PolicyEngine",
     "PermissionManager",
     # Built-in policies
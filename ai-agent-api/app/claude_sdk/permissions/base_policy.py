@@ -76,6 +76,8 @@ class BasePolicy(ABC):
         """Check if this policy applies to the given tool.
 
         Override this method to limit policy scope to specific tools.
+        PolicyEngine caches the answer per tool name, so it must depend on
+        the name only.
 
         Args:
             tool_name: Name of the tool
@@ -0,0 +1,109 @@
+"""Bounded LRU + TTL cache of permission decisions."""
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+from claude_agent_sdk import PermissionResultAllow, PermissionResultDeny
+from prometheus_client import Counter
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PermissionResultType = Union[PermissionResultAllow, PermissionResultDeny]
+
+PERMISSION_CACHE_EVENTS = Counter(
+    "permission_decision_cache_total",
+    "Permission decision cache lookups and evictions",
+    ["result"],
+)
+
+
+class PermissionDecisionCache:
+    """Size-bounded, expiring store of permission decisions.
+
+    Entries are evicted least-recently-used first once ``max_entries`` is
+    reached, and are ignored after ``ttl_seconds``. Callers scope keys by
+    session, user and policy-set version (see PermissionManager), so a
+    decision is never reused for another session or after policies change.
+
+    Example:
+        >>> cache = PermissionDecisionCache(max_entries=2, ttl_seconds=60)
+        >>> cache.put("key", PermissionResultAllow())
+        >>> cache.get("key") is not None
+        True
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """Initialize decision cache.
+
+        Args:
+            max_entries: Decisions kept before the least recently used is evicted
+            ttl_seconds: How long a decision is reused
+        """
+        self.max_entries = max_entries or settings.permission_cache_max_entries
+        self.ttl_seconds = settings.permission_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, PermissionResultType]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key: str) -> Optional[PermissionResultType]:
+        """Get an unexpired decision, marking it recently used.
+
+        Args:
+            key: Scoped cache key
+
+        Returns:
+            Cached decision or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._record("misses")
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            self._record("expirations")
+            self._record("misses")
+            return None
+        self._entries.move_to_end(key)
+        self._record("hits")
+        return entry[1]
+
+    def put(self, key: str, result: PermissionResultType) -> None:
+        """Store a decision, evicting the least recently used beyond the bound.
+
+        Args:
+            key: Scoped cache key
+            result: Decision to reuse
+        """
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._record("evictions")
+
+    def clear(self) -> None:
+        """Drop every decision."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics."""
+        return {"entries": len(self._entries), **self.stats}
+
+    def _record(self, result: str) -> None:
+        self.stats[result] += 1
+        PERMISSION_CACHE_EVENTS.labels(result=result).inc()
+
+    def __setitem__(self, key: str, result: PermissionResultType) -> None:
+        self.put(key, result)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
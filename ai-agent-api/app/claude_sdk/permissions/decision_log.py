@@ -0,0 +1,366 @@
+"""Buffered, batched logging of permission decisions."""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from prometheus_client import Counter
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from app.core.config import settings
+from app.domain.entities.permission_decision import PermissionResult
+from app.repositories.permission_decision_repository import PermissionDecisionRepository
+
+logger = logging.getLogger(__name__)
+
+PERMISSION_LOG_EVENTS = Counter(
+    "permission_decision_log_total",
+    "Permission decisions buffered, written, aggregated or dropped",
+    ["result"],
+)
+
+# (session_id, tool_name, decision, reason)
+_AggregateKey = Tuple[UUID, str, str, str]
+
+# Errors meaning the database is unreachable rather than a row being bad
+_TRANSIENT_ERRORS = (OperationalError, InterfaceError, ConnectionError, OSError, asyncio.TimeoutError)
+
+
+class PermissionDecisionLog:
+    """Writes permission decisions to permission_decisions off the hot path.
+
+    Decisions are queued in memory and written by a background task in
+    bulk inserts, either every ``flush_interval_seconds`` or as soon as
+    ``batch_size`` rows are waiting. Decisions served from the decision
+    cache are aggregated into one row per session, tool, decision and
+    reason, with the number of occurrences in ``context_data["count"]``.
+
+    The buffer holds at most ``max_pending`` rows; beyond that new rows are
+    dropped (and counted) rather than slowing down permission checks. When
+    the database rejects a batch, it is split to isolate the offending rows,
+    so one bad row does not hold back the others; a row rejected
+    ``max_write_attempts`` times is dropped. In strict mode, recording a denial waits until it has been written, so a
+    denial is never returned before it is persisted.
+
+    Example:
+        >>> log = get_permission_decision_log()
+        >>> await log.record(session_id, "Bash", {"command": "ls"}, {},
+        ...                  PermissionResult.ALLOWED, "policy_allowed")
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        max_pending: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_seconds: Optional[float] = None,
+        strict: Optional[bool] = None,
+        max_write_attempts: Optional[int] = None,
+    ):
+        """Initialize decision log.
+
+        Args:
+            session_factory: Creates database sessions (default: AsyncSessionLocal)
+            max_pending: Buffered rows before new ones are dropped
+            batch_size: Rows that trigger an early flush
+            flush_interval_seconds: Max delay before buffered rows are written
+            strict: Persist denials before record() returns
+            max_write_attempts: Times a rejected row is retried before it is dropped
+        """
+        self._session_factory = session_factory
+        self.max_pending = max_pending or settings.permission_log_max_pending
+        self.batch_size = batch_size or settings.permission_log_batch_size
+        self.flush_interval_seconds = (
+            flush_interval_seconds or settings.permission_log_flush_interval_seconds
+        )
+        self.strict = settings.permission_log_strict if strict is None else strict
+        self.max_write_attempts = max_write_attempts or settings.permission_log_max_write_attempts
+
+        self._pending: List[Dict[str, Any]] = []
+        # id(row) -> times the database rejected that pending row
+        self._rejections: Dict[int, int] = {}
+        self._aggregates: Dict[_AggregateKey, Dict[str, Any]] = {}
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats: Dict[str, int] = {
+            "queued": 0, "aggregated": 0, "written": 0, "dropped": 0, "failed": 0
+        }
+
+    async def record(
+        self,
+        session_id: UUID,
+        tool_name: str,
+        input_data: dict,
+        context_data: Dict[str, Any],
+        decision: PermissionResult,
+        reason: str,
+        policy_applied: Optional[str] = None,
+    ) -> None:
+        """Queue a decision for writing.
+
+        Returns immediately, except for denials in strict mode, which return
+        once the batch containing them has been written.
+
+        Args:
+            session_id: Session ID
+            tool_name: Tool name
+            input_data: Tool input
+            context_data: Serialized SDK context
+            decision: Allow/Deny decision
+            reason: Decision reason
+            policy_applied: Name of the policy that decided, if known
+        """
+        row = {
+            "session_id": session_id,
+            "tool_call_id": None,
+            "tool_use_id": "",  # SDK doesn't provide this in permission callback
+            "tool_name": tool_name,
+            "input_data": input_data,
+            "context_data": context_data,
+            "decision": decision.value,
+            "reason": reason,
+            "policy_applied": policy_applied,
+            "created_at": datetime.utcnow(),
+        }
+        if not self._enqueue(row):
+            return
+
+        if self.strict and decision == PermissionResult.DENIED:
+            await self.flush()
+        else:
+            self._ensure_flusher()
+
+    def record_cached(
+        self,
+        session_id: UUID,
+        tool_name: str,
+        decision: PermissionResult,
+        reason: str,
+    ) -> None:
+        """Count a decision served from the decision cache.
+
+        Args:
+            session_id: Session ID
+            tool_name: Tool name
+            decision: Cached Allow/Deny decision
+            reason: Cached decision reason
+        """
+        now = datetime.utcnow()
+        key = (session_id, tool_name, decision.value, reason)
+        aggregate = self._aggregates.get(key)
+        if aggregate is None:
+            if self._buffered() >= self.max_pending:
+                self._record_stat("dropped")
+                return
+            aggregate = self._aggregates[key] = {"count": 0, "first_at": now}
+        aggregate["count"] += 1
+        aggregate["last_at"] = now
+        self._record_stat("aggregated")
+        self._ensure_flusher()
+
+    async def flush(self) -> int:
+        """Write every buffered decision now.
+
+        Returns:
+            Number of rows written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            rows, self._pending = self._pending, []
+            rows.extend(self._aggregate_rows())
+            if not rows:
+                return 0
+
+            errors: List[Exception] = []
+            rejected: List[Dict[str, Any]] = []
+            unreachable: List[Dict[str, Any]] = []
+            written = await self._write_isolating(rows, rejected, unreachable, errors)
+            if written:
+                self._record_stat("written", written)
+            if not rejected and not unreachable:
+                self._rejections = {}
+                return written
+
+            self._record_stat("failed", len(rows) - written)
+            attempts = {id(row): self._rejections.get(id(row), 0) for row in unreachable}
+            for row in rejected:
+                attempts[id(row)] = self._rejections.get(id(row), 0) + 1
+            retry = []
+            for row in rows:
+                count = attempts.get(id(row))
+                if count is None:
+                    continue
+                if count >= self.max_write_attempts:
+                    self._record_stat("dropped")
+                    logger.warning(
+                        "Dropping permission decision rejected by the database",
+                        extra={"tool_name": row["tool_name"], "attempts": count},
+                    )
+                    continue
+                retry.append(row)
+
+            # Keep the rows for the next flush, within the buffer bound
+            room = max(self.max_pending - self._buffered(), 0)
+            self._pending[:0] = retry[:room]
+            self._record_stat("dropped", len(retry) - len(retry[:room]))
+            self._rejections = {
+                id(row): attempts[id(row)] for row in retry[:room] if attempts[id(row)]
+            }
+
+            error = errors[-1]
+            logger.error(
+                f"Failed to write permission decisions: {type(error).__name__} - {str(error)}",
+                extra={"rows": len(rows) - written, "written": written},
+                exc_info=error
+            )
+            if self.strict:
+                raise error
+            return written
+
+    async def close(self) -> None:
+        """Stop the background flusher and write what is left."""
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None and not flusher.done():
+            flusher.cancel()
+            try:
+                await flusher
+            except asyncio.CancelledError:
+                pass
+        try:
+            await self.flush()
+        except Exception:
+            pass  # Already logged by flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get buffer statistics."""
+        return {"pending": self._buffered(), **self.stats}
+
+    def _enqueue(self, row: Dict[str, Any]) -> bool:
+        if self._buffered() >= self.max_pending:
+            self._record_stat("dropped")
+            logger.warning(
+                "Permission decision log buffer full, dropping decision",
+                extra={"tool_name": row["tool_name"], "decision": row["decision"]}
+            )
+            return False
+        self._pending.append(row)
+        self._record_stat("queued")
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def _aggregate_rows(self) -> List[Dict[str, Any]]:
+        aggregates, self._aggregates = self._aggregates, {}
+        return [
+            {
+                "session_id": session_id,
+                "tool_call_id": None,
+                "tool_use_id": "",
+                "tool_name": tool_name,
+                "input_data": {},
+                "context_data": {
+                    "cached": True,
+                    "count": aggregate["count"],
+                    "first_at": aggregate["first_at"].isoformat(),
+                    "last_at": aggregate["last_at"].isoformat(),
+                },
+                "decision": decision,
+                "reason": reason,
+                "policy_applied": None,
+                "created_at": aggregate["last_at"],
+            }
+            for (session_id, tool_name, decision, reason), aggregate in aggregates.items()
+        ]
+
+    async def _write_isolating(
+        self,
+        rows: List[Dict[str, Any]],
+        rejected: List[Dict[str, Any]],
+        unreachable: List[Dict[str, Any]],
+        errors: List[Exception],
+    ) -> int:
+        """Write rows, splitting a rejected batch to find the rows at fault.
+
+        Rows the database rejects on their own go to ``rejected``. When the
+        database is unreachable the batch is not split, since every part
+        would fail the same way; its rows go to ``unreachable``.
+
+        Returns:
+            Number of rows written
+        """
+        try:
+            await self._write(rows)
+            return len(rows)
+        except Exception as e:
+            errors.append(e)
+            if self._is_transient(e):
+                unreachable.extend(rows)
+                return 0
+            if len(rows) == 1:
+                rejected.extend(rows)
+                return 0
+
+        middle = len(rows) // 2
+        written = await self._write_isolating(rows[:middle], rejected, unreachable, errors)
+        return written + await self._write_isolating(rows[middle:], rejected, unreachable, errors)
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        if isinstance(error, DBAPIError) and error.connection_invalidated:
+            return True
+        return isinstance(error, _TRANSIENT_ERRORS)
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> None:
+        if self._session_factory is None:
+            from app.database.session import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+        async with self._session_factory() as db:
+            await PermissionDecisionRepository(db).bulk_create(rows)
+            await db.commit()
+
+    def _ensure_flusher(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._flusher is not None and not self._flusher.done() and self._loop is loop:
+            return
+        # Locks and events belong to the loop that created the flusher
+        self._loop = loop
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._flusher = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                pass  # Logged by flush(); rows stay buffered for the next round
+
+    def _buffered(self) -> int:
+        return len(self._pending) + len(self._aggregates)
+
+    def _record_stat(self, result: str, count: int = 1) -> None:
+        self.stats[result] += count
+        PERMISSION_LOG_EVENTS.labels(result=result).inc(count)
+
+
+_permission_decision_log: Optional[PermissionDecisionLog] = None
+
+
+def get_permission_decision_log() -> PermissionDecisionLog:
+    """Get the process-wide permission decision log."""
+    global _permission_decision_log
+    if _permission_decision_log is None:
+        _permission_decision_log = PermissionDecisionLog()
+    return _permission_decision_log
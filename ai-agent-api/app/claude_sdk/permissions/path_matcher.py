@@ -0,0 +1,174 @@
+"""Canonical path matching for file access policies.
+
+Comparing raw path strings is both wrong and slow:
+``/tmp/../etc/passwd`` starts with ``/tmp/``, ``/etc/passwd_backup`` starts
+with ``/etc/passwd``, and every rule is tested in turn. Instead:
+
+- PathCanonicalizer turns a tool's path into an absolute, symlink-free path
+  (``~`` expanded, relative paths joined to the session's working
+  directory, ``..`` and links resolved). Links are resolved on every call,
+  never cached, because a directory can be replaced by a symlink at any time.
+- PathPrefixTrie stores rules by path component, so a lookup walks one node
+  per component of the checked path (plus the alternatives opened by glob
+  and ``**`` components). A rule matches the path itself and everything
+  below it. Components may be globs (``*.pem``, ``project-?``), and ``**``
+  matches zero or more whole components, anywhere in the rule.
+"""
+import fnmatch
+import os
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+PathLike = Union[str, os.PathLike]
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _components(path: str) -> List[str]:
+    return [part for part in path.split(os.sep) if part]
+
+
+def canonicalize(path: PathLike, base_dir: Optional[PathLike] = None) -> str:
+    """Resolve a path to an absolute, normalized, symlink-free form.
+
+    Args:
+        path: Path as given by a tool (may be relative or start with ~)
+        base_dir: Directory relative paths are resolved against (default: cwd)
+
+    Returns:
+        Canonical absolute path
+    """
+    expanded = os.path.expanduser(os.fspath(path))
+    if not os.path.isabs(expanded):
+        expanded = os.path.join(os.fspath(base_dir) if base_dir else os.getcwd(), expanded)
+    return os.path.realpath(expanded)
+
+
+class PathCanonicalizer:
+    """Canonicalizes paths for one session.
+
+    Results are deliberately not cached: the decision must reflect the
+    filesystem at the time of the check, not when the path was first seen.
+    """
+
+    def __init__(self, base_dir: Optional[PathLike] = None):
+        """Initialize canonicalizer.
+
+        Args:
+            base_dir: Session working directory for relative paths
+        """
+        self.base_dir = os.fspath(base_dir) if base_dir else None
+
+    def __call__(self, path: PathLike) -> str:
+        return canonicalize(path, self.base_dir)
+
+
+class _Node:
+    __slots__ = ("children", "globs", "deep", "rule")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.globs: List[Tuple[str, "_Node"]] = []
+        self.deep: Optional["_Node"] = None  # reached through a ``**`` component
+        self.rule: Optional[str] = None
+
+
+class PathPrefixTrie:
+    """Component-wise prefix trie of path rules.
+
+    Example:
+        >>> trie = PathPrefixTrie(["/etc/passwd", "/home/*/.ssh"])
+        >>> trie.match("/etc/passwd")
+        '/etc/passwd'
+        >>> trie.match("/etc/passwd_backup") is None
+        True
+        >>> trie.match("/home/alice/.ssh/id_rsa")
+        '/home/*/.ssh'
+        >>> trie = PathPrefixTrie(["/workspace/**/out"])
+        >>> trie.match("/workspace/a/b/out/report.md")
+        '/workspace/**/out'
+        >>> trie.match("/workspace/secret/anything") is None
+        True
+    """
+
+    def __init__(self, rules: Iterable[PathLike] = ()):
+        """Compile rules.
+
+        Args:
+            rules: Absolute paths or globs (``~`` is expanded; links in
+                existing leading directories are resolved)
+        """
+        self._root = _Node()
+        self.rules: List[str] = []
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule: PathLike) -> None:
+        """Add a rule."""
+        text = os.path.expanduser(os.fspath(rule))
+        parts = _components(text)
+        # Resolve the literal leading directories so rules and canonical
+        # paths agree on symlinks (e.g. /tmp -> /private/tmp)
+        literal = 0
+        while literal < len(parts) and not (_GLOB_CHARS & set(parts[literal])):
+            literal += 1
+        if literal:
+            resolved = _components(os.path.realpath(os.sep + os.sep.join(parts[:literal])))
+            parts = resolved + parts[literal:]
+
+        node = self._root
+        for part in parts:
+            if part == "**":
+                if node.deep is None:
+                    node.deep = _Node()
+                node = node.deep
+            elif _GLOB_CHARS & set(part):
+                for pattern, child in node.globs:
+                    if pattern == part:
+                        node = child
+                        break
+                else:
+                    child = _Node()
+                    node.globs.append((part, child))
+                    node = child
+            else:
+                node = node.children.setdefault(part, _Node())
+        if node.rule is None:
+            node.rule = os.fspath(rule)
+        self.rules.append(os.fspath(rule))
+
+    def match(self, canonical_path: str) -> Optional[str]:
+        """Get the rule covering a canonical path (the path or an ancestor).
+
+        Args:
+            canonical_path: Output of canonicalize()/PathCanonicalizer
+
+        Returns:
+            The matching rule as given, or None
+        """
+        return self._match(self._root, _components(canonical_path), 0)
+
+    def _match(self, node: _Node, parts: List[str], index: int) -> Optional[str]:
+        while True:
+            if node.rule is not None:
+                return node.rule
+            if node.deep is not None:
+                # ``**`` consumes zero or more components
+                for next_index in range(index, len(parts) + 1):
+                    found = self._match(node.deep, parts, next_index)
+                    if found is not None:
+                        return found
+            if index == len(parts):
+                return None
+            part = parts[index]
+            for pattern, child in node.globs:
+                if fnmatch.fnmatchcase(part, pattern):
+                    found = self._match(child, parts, index + 1)
+                    if found is not None:
+                        return found
+            node = node.children.get(part)
+            if node is None:
+                return None
+            index += 1
+
+    def __len__(self) -> int:
+        return len(self.rules)
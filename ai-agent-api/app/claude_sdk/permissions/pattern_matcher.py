@@ -0,0 +1,126 @@
+"""Compiled multi-pattern matchers for permission checks.
+
+Command policies check one input against hundreds of patterns.
+Instead of one search per pattern, each pattern set is compiled once into a
+single regex, so the scan runs in the regex engine's C loop and reports
+which pattern matched:
+
+- LiteralPatternSet: substrings, folded into a character trie and emitted
+  as a nested alternation (``rm -rf|rmdir`` -> ``rm(?: -rf|dir)``), so
+  patterns with shared prefixes are tried together.
+- RegexPatternSet: regexes, combined as ``(?P<p0>...)|(?P<p1>...)``.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# Marks a trie node where a literal ends
+_END = ""
+
+
+def _trie_regex(node: Dict[str, dict]) -> str:
+    """Render a literal trie as a regex alternation.
+
+    Where a literal ends, longer literals sharing it as a prefix are
+    dropped: the shorter one occurring is already a match.
+    """
+    if _END in node:
+        return ""
+    branches = [re.escape(char) + _trie_regex(child) for char, child in sorted(node.items())]
+    return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+
+class LiteralPatternSet:
+    """Finds which of many literal substrings occurs in a text.
+
+    Example:
+        >>> patterns = LiteralPatternSet(["rm -rf", "sudo rm", "mkfs"])
+        >>> patterns.search("cd /tmp && sudo rm -f x")
+        'sudo rm'
+    """
+
+    def __init__(self, patterns: Iterable[str], ignore_case: bool = False):
+        """Compile literals.
+
+        Args:
+            patterns: Substrings to look for (empty strings are ignored)
+            ignore_case: Match regardless of case
+        """
+        self.patterns: List[str] = list(dict.fromkeys(p for p in patterns if p))
+        self.ignore_case = ignore_case
+        self._originals: Dict[str, str] = {}
+
+        trie: Dict[str, dict] = {}
+        for pattern in self.patterns:
+            key = pattern.lower() if ignore_case else pattern
+            self._originals.setdefault(key, pattern)
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[_END] = {}
+
+        self._regex: Optional[re.Pattern] = (
+            re.compile(_trie_regex(trie), re.IGNORECASE if ignore_case else 0)
+            if self.patterns else None
+        )
+
+    def search(self, text: str) -> Optional[str]:
+        """Get the pattern occurring earliest in the text, or None."""
+        if self._regex is None or not text:
+            return None
+        match = self._regex.search(text)
+        if match is None:
+            return None
+        found = match.group(0)
+        return self._originals[found.lower() if self.ignore_case else found]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+
+class RegexPatternSet:
+    """Finds which of many regexes matches a text, in one scan.
+
+    Example:
+        >>> patterns = RegexPatternSet([r"mkfs", r"chmod\\s+777"])
+        >>> patterns.search("chmod 777 /srv")
+        'chmod\\\\s+777'
+    """
+
+    def __init__(self, patterns: Sequence[str], flags: int = 0):
+        """Compile regexes.
+
+        Args:
+            patterns: Regular expressions
+            flags: re flags applied to every pattern
+        """
+        self.patterns: List[str] = list(patterns)
+        self._combined: Optional[re.Pattern] = None
+        self._separate: List[re.Pattern] = []
+
+        # Numbered backreferences would point at the wrong group once
+        # combined, and named groups may clash between patterns
+        if self.patterns and not any(re.search(r"\\[1-9]", p) for p in self.patterns):
+            try:
+                self._combined = re.compile(
+                    "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(self.patterns)), flags
+                )
+            except re.error:
+                self._combined = None
+        if self._combined is None:
+            self._separate = [re.compile(p, flags) for p in self.patterns]
+
+    def search(self, text: str) -> Optional[str]:
+        """Get the pattern matching earliest in the text, or None."""
+        if self._combined is not None:
+            match = self._combined.search(text)
+            if match is None:
+                return None
+            # The outer named group closes last, so lastgroup names the pattern
+            return self.patterns[int(match.lastgroup[1:])]
+        for regex in self._separate:
+            if regex.search(text):
+                return regex.pattern
+        return None
+
+    def __len__(self) -> int:
+        return len(self.patterns)
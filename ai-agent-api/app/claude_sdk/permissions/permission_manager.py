@@ -1,12 +1,14 @@
 """Permission manager for orchestrating permission checks."""
 import logging
-from typing import Union, Callable, Dict, Any, Optional
+from typing import Union, Callable, Dict, Any, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from claude_agent_sdk import PermissionResultAllow, PermissionResultDeny, ToolPermissionContext
 
+from app.claude_sdk.permissions.decision_cache import PermissionDecisionCache
+from app.claude_sdk.permissions.decision_log import PermissionDecisionLog
 from app.claude_sdk.permissions.policy_engine import PolicyEngine
 from app.repositories.permission_decision_repository import PermissionDecisionRepository
 from app.models.permission_decision import PermissionDecisionModel
@@ -21,8 +23,11 @@ class PermissionManager:
     The PermissionManager creates a permission callback function that can
     be passed to ClaudeAgentOptions. It:
     - Evaluates policies via the PolicyEngine
-    - Logs all permission decisions to the database
-    - Provides optional caching for performance
+    - Logs all permission decisions to the database, through a
+      PermissionDecisionLog buffer when one is given (cache hits are
+      aggregated as counts) or inline through the repository otherwise
+    - Caches decisions per session, user and policy-set version (bounded
+      LRU with TTL, see PermissionDecisionCache)
     - Serializes SDK context for storage
 
     Example usage from POC 03_custom_permissions.py:
@@ -40,7 +45,9 @@ class PermissionManager:
         db: AsyncSession,
         policy_engine: PolicyEngine,
         permission_decision_repo: PermissionDecisionRepository,
-        enable_cache: bool = True
+        enable_cache: bool = True,
+        decision_cache: Optional[PermissionDecisionCache] = None,
+        decision_log: Optional[PermissionDecisionLog] = None
     ):
         """Initialize permission manager.
 
@@ -49,12 +56,19 @@ class PermissionManager:
             policy_engine: Engine for evaluating policies
             permission_decision_repo: Repository for logging decisions
             enable_cache: Whether to cache permission decisions
+            decision_cache: Cache to use (defaults to one sized from settings);
+                may be shared by managers of different sessions
+            decision_log: Buffered batch writer for decisions (defaults to
+                writing each decision inline through the repository)
         """
         self.db = db
         self.policy_engine = policy_engine
         self.permission_decision_repo = permission_decision_repo
         self.enable_cache = enable_cache
-        self._decision_cache: Dict[str, Union[PermissionResultAllow, PermissionResultDeny]] = {}
+        self._decision_cache = (
+            decision_cache if decision_cache is not None else PermissionDecisionCache()
+        )
+        self.decision_log = decision_log
 
         logger.info("PermissionManager initialized")
 
@@ -127,23 +141,22 @@ class PermissionManager:
             PermissionResultAllow or PermissionResultDeny
         """
         # Check cache if enabled
+        cache_key = None
         if self.enable_cache:
-            cache_key = self._make_cache_key(tool_name, input_data)
-            if cache_key in self._decision_cache:
-                cached_result = self._decision_cache[cache_key]
+            cache_key = self._scoped_cache_key(tool_name, input_data, session_id, user_id)
+            cached_result = self._decision_cache.get(cache_key)
+            if cached_result is not None:
                 logger.debug(f"Permission cache hit for {tool_name}")
+                if self.decision_log is not None:
+                    decision, reason = self._describe(cached_result)
+                    self.decision_log.record_cached(session_id, tool_name, decision, reason)
                 return cached_result
 
         # Evaluate policies
         result = await self.policy_engine.evaluate(tool_name, input_data, context)
 
         # Determine decision type
-        if isinstance(result, PermissionResultAllow):
-            decision = PermissionResult.ALLOWED
-            reason = "policy_allowed"
-        else:
-            decision = PermissionResult.DENIED
-            reason = result.message or "policy_denied"
+        decision, reason = self._describe(result)
 
         # Log decision to database
         await self._log_decision(
@@ -157,9 +170,8 @@ class PermissionManager:
         )
 
         # Cache decision if enabled
-        if self.enable_cache:
-            cache_key = self._make_cache_key(tool_name, input_data)
-            self._decision_cache[cache_key] = result
+        if cache_key is not None:
+            self._decision_cache.put(cache_key, result)
 
         return result
 
@@ -188,6 +200,17 @@ class PermissionManager:
             # Serialize context
             context_data = self._serialize_context(context)
 
+            if self.decision_log is not None:
+                await self.decision_log.record(
+                    session_id=session_id,
+                    tool_name=tool_name,
+                    input_data=input_data,
+                    context_data=context_data,
+                    decision=decision,
+                    reason=reason
+                )
+                return
+
             # Create permission decision record
             permission_decision = PermissionDecisionModel(
                 session_id=session_id,
@@ -218,7 +241,19 @@ class PermissionManager:
                 extra={"session_id": str(session_id)},
                 exc_info=True
             )
-            # Don't fail permission check if logging fails
+            # Strict mode never returns a denial that was not persisted;
+            # otherwise don't fail the permission check if logging fails
+            if self.decision_log is not None and self.decision_log.strict:
+                raise
+
+    @staticmethod
+    def _describe(
+        result: Union[PermissionResultAllow, PermissionResultDeny]
+    ) -> Tuple[PermissionResult, str]:
+        """Get the logged decision and reason for a policy result."""
+        if isinstance(result, PermissionResultAllow):
+            return PermissionResult.ALLOWED, "policy_allowed"
+        return PermissionResult.DENIED, result.message or "policy_denied"
 
     def _make_cache_key(self, tool_name: str, input_data: dict) -> str:
         """Create cache key from tool name and input.
@@ -239,6 +274,26 @@ class PermissionManager:
 
         return f"{tool_name}:{input_hash}"
 
+    def _scoped_cache_key(
+        self,
+        tool_name: str,
+        input_data: dict,
+        session_id: UUID,
+        user_id: Optional[UUID]
+    ) -> str:
+        """Create cache key scoped to a session, user and policy-set version.
+
+        The engine identity and version are part of the key, so managers
+        sharing a cache with different engines never see each other's
+        decisions, and decisions made under an earlier policy set are no
+        longer found once the version changes (they age out of the LRU).
+        """
+        engine = self.policy_engine
+        return (
+            f"{id(engine)}:{engine.version}:{session_id}:{user_id}:"
+            f"{self._make_cache_key(tool_name, input_data)}"
+        )
+
     def _serialize_context(self, context: ToolPermissionContext) -> Dict[str, Any]:
         """Serialize SDK context to dictionary.
 
@@ -261,3 +316,7 @@ class PermissionManager:
         """Clear permission decision cache."""
         self._decision_cache.clear()
         logger.info("Permission cache cleared")
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get permission decision cache statistics."""
+        return self._decision_cache.get_stats()
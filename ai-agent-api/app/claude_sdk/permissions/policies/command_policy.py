@@ -5,6 +5,7 @@ from typing import List, Union
 from claude_agent_sdk import PermissionResultAllow, PermissionResultDeny, ToolPermissionContext
 
 from app.claude_sdk.permissions.base_policy import BasePolicy
+from app.claude_sdk.permissions.pattern_matcher import LiteralPatternSet
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,8 @@ class CommandPolicy(BasePolicy):
             blocked_patterns: Command patterns to block
         """
         self.blocked_patterns = blocked_patterns
+        # All patterns are searched in a single scan of the command
+        self._matcher = LiteralPatternSet(blocked_patterns)
 
     @property
     def policy_name(self) -> str:
@@ -74,16 +77,16 @@ class CommandPolicy(BasePolicy):
             return PermissionResultAllow()
 
         # Check for blocked patterns
-        for pattern in self.blocked_patterns:
-            if pattern in command:
-                logger.warning(
-                    f"Blocked dangerous command: contains '{pattern}'",
-                    extra={"tool_name": tool_name, "command": command[:100]}
-                )
-                return PermissionResultDeny(
-                    message=f"Command blocked: contains dangerous pattern '{pattern}'",
-                    interrupt=False
-                )
+        pattern = self._matcher.search(command)
+        if pattern is not None:
+            logger.warning(
+                f"Blocked dangerous command: contains '{pattern}'",
+                extra={"tool_name": tool_name, "command": command[:100]}
+            )
+            return PermissionResultDeny(
+                message=f"Command blocked: contains dangerous pattern '{pattern}'",
+                interrupt=False
+            )
 
         # Passed all checks - allow
         logger.debug(f"Command allowed: {command[:50]}...")
@@ -1,11 +1,12 @@
 """File access policy for restricting file operations."""
 import logging
 from pathlib import Path
-from typing import List, Union
+from typing import List, Optional, Union
 
 from claude_agent_sdk import PermissionResultAllow, PermissionResultDeny, ToolPermissionContext
 
 from app.claude_sdk.permissions.base_policy import BasePolicy
+from app.claude_sdk.permissions.path_matcher import PathCanonicalizer, PathPrefixTrie
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +17,10 @@ class FileAccessPolicy(BasePolicy):
     Based on POC 03_custom_permissions.py patterns, this policy:
     - Blocks access to restricted files/directories (e.g., /etc/passwd, ~/.ssh/)
     - Only allows writes to explicitly allowed paths
-    - Expands ~ in paths before checking
+    - Canonicalizes paths before checking (~ expanded, relative paths joined
+      to the working directory, .. and symlinks resolved)
+    - Matches whole path components, so /etc/passwd does not cover
+      /etc/passwd_backup; rule components may be globs (e.g. ~/.ssh/*.pem)
 
     Example usage:
         >>> policy = FileAccessPolicy(
@@ -28,13 +32,16 @@ class FileAccessPolicy(BasePolicy):
     def __init__(
         self,
         restricted_read_paths: List[str],
-        allowed_write_paths: List[str]
+        allowed_write_paths: List[str],
+        working_directory: Optional[str] = None,
     ):
         """Initialize file access policy.
 
         Args:
             restricted_read_paths: Paths that cannot be read
             allowed_write_paths: Paths where writes are allowed
+            working_directory: Session directory relative paths resolve against
+                (default: process cwd)
         """
         self.restricted_read_paths = [
             Path(p).expanduser() for p in restricted_read_paths
@@ -42,6 +49,10 @@ class FileAccessPolicy(BasePolicy):
         self.allowed_write_paths = [
             Path(p).expanduser() for p in allowed_write_paths
         ]
+        self.working_directory = working_directory
+        self._restricted_reads = PathPrefixTrie(self.restricted_read_paths)
+        self._allowed_writes = PathPrefixTrie(self.allowed_write_paths)
+        self._canonicalize = PathCanonicalizer(working_directory)
 
     @property
     def policy_name(self) -> str:
@@ -88,37 +99,40 @@ class FileAccessPolicy(BasePolicy):
             # No file path specified - allow (shouldn't happen)
             return PermissionResultAllow()
 
-        # Expand user home directory
-        expanded_path = Path(file_path).expanduser()
+        # Resolve ~, relative paths, .. and symlinks
+        canonical_path = self._canonicalize(file_path)
 
         # Check read restrictions
         if tool_name in ["read_file", "Read"]:
-            for restricted in self.restricted_read_paths:
-                # Check if file is restricted or within restricted directory
-                if (str(expanded_path) == str(restricted) or
-                    str(expanded_path).startswith(str(restricted))):
-                    logger.warning(
-                        f"Blocked read of restricted file: {file_path}",
-                        extra={"tool_name": tool_name, "file_path": file_path}
-                    )
-                    return PermissionResultDeny(
-                        message=f"Reading restricted file blocked: {file_path}. "
-                                f"This file contains sensitive system information.",
-                        interrupt=False
-                    )
+            # Check if file is restricted or within restricted directory
+            restricted = self._restricted_reads.match(canonical_path)
+            if restricted is not None:
+                logger.warning(
+                    f"Blocked read of restricted file: {file_path}",
+                    extra={
+                        "tool_name": tool_name,
+                        "file_path": file_path,
+                        "canonical_path": canonical_path,
+                        "rule": restricted,
+                    }
+                )
+                return PermissionResultDeny(
+                    message=f"Reading restricted file blocked: {file_path}. "
+                            f"This file contains sensitive system information.",
+                    interrupt=False
+                )
 
         # Check write restrictions
         elif tool_name in ["write_file", "Write", "Edit"]:
             # Check if path is in allowed write directories
-            is_allowed = any(
-                str(expanded_path).startswith(str(allowed))
-                for allowed in self.allowed_write_paths
-            )
-
-            if not is_allowed:
+            if self._allowed_writes.match(canonical_path) is None:
                 logger.warning(
                     f"Blocked write to non-allowed path: {file_path}",
-                    extra={"tool_name": tool_name, "file_path": file_path}
+                    extra={
+                        "tool_name": tool_name,
+                        "file_path": file_path,
+                        "canonical_path": canonical_path,
+                    }
                 )
                 return PermissionResultDeny(
                     message=f"File write not allowed in: {file_path}. "
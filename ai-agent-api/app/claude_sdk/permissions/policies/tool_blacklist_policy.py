@@ -4,6 +4,7 @@ from typing import List, Union
 
 from claude_agent_sdk import PermissionResultAllow, PermissionResultDeny, ToolPermissionContext
 
+from app.claude_sdk.mcp.tool_pattern_index import ToolPatternIndex
 from app.claude_sdk.permissions.base_policy import BasePolicy
 
 logger = logging.getLogger(__name__)
@@ -22,9 +23,10 @@ class ToolBlacklistPolicy(BasePolicy):
         """Initialize tool blacklist policy.
 
         Args:
-            blocked_tools: List of blocked tool names
+            blocked_tools: Blocked tool names or globs (e.g. "mcp__shell__*")
         """
         self.blocked_tools = set(blocked_tools)
+        self._index = ToolPatternIndex(blocked_tools)
 
     @property
     def policy_name(self) -> str:
@@ -52,7 +54,7 @@ class ToolBlacklistPolicy(BasePolicy):
         Returns:
             PermissionResultAllow or PermissionResultDeny
         """
-        if tool_name in self.blocked_tools:
+        if self._index.matches(tool_name):
             logger.warning(
                 f"Tool blocked by blacklist: {tool_name}",
                 extra={"tool_name": tool_name}
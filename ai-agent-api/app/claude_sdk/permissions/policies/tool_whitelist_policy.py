@@ -4,6 +4,7 @@ from typing import List, Union
 
 from claude_agent_sdk import PermissionResultAllow, PermissionResultDeny, ToolPermissionContext
 
+from app.claude_sdk.mcp.tool_pattern_index import ToolPatternIndex
 from app.claude_sdk.permissions.base_policy import BasePolicy
 
 logger = logging.getLogger(__name__)
@@ -22,9 +23,10 @@ class ToolWhitelistPolicy(BasePolicy):
         """Initialize tool whitelist policy.
 
         Args:
-            allowed_tools: List of allowed tool names
+            allowed_tools: Allowed tool names or globs (e.g. "mcp__kubernetes_readonly__*")
         """
         self.allowed_tools = set(allowed_tools)
+        self._index = ToolPatternIndex(allowed_tools)
 
     @property
     def policy_name(self) -> str:
@@ -52,7 +54,7 @@ class ToolWhitelistPolicy(BasePolicy):
         Returns:
             PermissionResultAllow or PermissionResultDeny
         """
-        if tool_name in self.allowed_tools:
+        if self._index.matches(tool_name):
             logger.debug(f"Tool allowed by whitelist: {tool_name}")
             return PermissionResultAllow()
         else:
@@ -1,6 +1,6 @@
 """Policy engine for evaluating permission policies."""
 import logging
-from typing import List, Union
+from typing import Dict, List, Union
 
 from claude_agent_sdk import PermissionResultAllow, PermissionResultDeny, ToolPermissionContext
 
@@ -16,22 +16,41 @@ class PolicyEngine:
     them in priority order (lowest number first). The first policy that
     denies access stops evaluation and returns the denial.
 
-    If no policies deny, access is allowed.
+    If no policies deny, access is allowed. A frozen engine can be shared
+    between sessions (see ExecutionPipeline).
     """
 
     def __init__(self):
         """Initialize policy engine with empty policy list."""
         self._policies: List[BasePolicy] = []
+        # Tool name -> applicable policies, reset whenever policies change
+        self._policies_by_tool: Dict[str, List[BasePolicy]] = {}
+        self._version = 0
+        self.frozen = False
+
+    @property
+    def version(self) -> int:
+        """Policy-set version, incremented whenever policies change.
+
+        Cached decisions are only valid for the version they were made under.
+        """
+        return self._version
 
     def register_policy(self, policy: BasePolicy) -> None:
         """Register a permission policy.
 
         Args:
             policy: Policy to register
+
+        Raises:
+            RuntimeError: If the engine is frozen
         """
+        self._check_not_frozen()
         self._policies.append(policy)
         # Sort policies by priority (lower number = higher priority)
         self._policies.sort(key=lambda p: p.priority)
+        self._policies_by_tool.clear()
+        self._version += 1
 
         logger.info(
             f"Registered policy: {policy.policy_name} "
@@ -47,10 +66,16 @@ class PolicyEngine:
         Returns:
             List of applicable policies in priority order
         """
-        return [
-            policy for policy in self._policies
-            if policy.applies_to_tool(tool_name)
-        ]
+        # applies_to_tool depends only on the tool name, so each tool is
+        # matched against the policy list once
+        policies = self._policies_by_tool.get(tool_name)
+        if policies is None:
+            policies = [
+                policy for policy in self._policies
+                if policy.applies_to_tool(tool_name)
+            ]
+            self._policies_by_tool[tool_name] = policies
+        return policies
 
     async def evaluate(
         self,
@@ -107,10 +132,25 @@ class PolicyEngine:
         return PermissionResultAllow()
 
     def clear_policies(self) -> None:
-        """Clear all registered policies."""
+        """Clear all registered policies.
+
+        Raises:
+            RuntimeError: If the engine is frozen
+        """
+        self._check_not_frozen()
         self._policies.clear()
+        self._policies_by_tool.clear()
+        self._version += 1
         logger.info("All policies cleared")
 
     def get_policy_count(self) -> int:
         """Get number of registered policies."""
         return len(self._policies)
+
+    def freeze(self) -> None:
+        """Make the policy set read-only so it can be shared between sessions."""
+        self.frozen = True
+
+    def _check_not_frozen(self) -> None:
+        if self.frozen:
+            raise RuntimeError("Policy engine is frozen and cannot be modified")
@@ -5,6 +5,7 @@ This module provides persistence components for saving session data:
 - SessionPersister: Persists messages and tool calls
 - MetricsPersister: Creates metrics snapshots
 - StorageArchiver: Archives working directories to S3 or local storage
+- StorageBackend: Local filesystem and S3-compatible storage backends
 
 Example usage:
     >>> from app.claude_sdk.persistence import (
@@ -47,9 +48,19 @@ Example usage:
 from app.claude_sdk.persistence.session_persister import SessionPersister
 from app.claude_sdk.persistence.metrics_persister import MetricsPersister
 from app.claude_sdk.persistence.storage_archiver import StorageArchiver
+from app.claude_sdk.persistence.storage_backends import (
+    StorageBackend,
+    LocalStorageBackend,
+    S3StorageBackend,
+    create_storage_backend,
+)
 
 __all__ = [
     "SessionPersister",
     "MetricsPersister",
     "StorageArchiver",
+    "StorageBackend",
+    "LocalStorageBackend",
+    "S3StorageBackend",
+    "create_storage_backend",
 ]
@@ -0,0 +1,340 @@
+"""Random-access index for working directory archives.
+
+Archives are written as a tar stream split into independently compressed
+gzip members ("frames"). Concatenated gzip members are still a valid
+``.tar.gz``, so ``tarfile`` and ``tar -xzf`` read them as before, but a
+sidecar index mapping each file to its frame lets a single member be read by
+decompressing only the frame that contains it instead of the whole archive.
+"""
+import gzip
+import json
+import os
+import tarfile
+import zlib
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+ARCHIVE_INDEX_VERSION = 1
+ARCHIVE_INDEX_FORMAT = "tar+gzip-frames"
+INDEX_SUFFIX = ".index.json"
+
+# Target uncompressed size of a frame. Small files share a frame so the
+# compression ratio stays close to a single-stream tar.gz; files larger than
+# this get a frame of their own.
+DEFAULT_FRAME_SIZE = 1024 * 1024
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class ArchiveMemberNotFoundError(KeyError):
+    """Raised when a path is not present in an archive index."""
+    pass
+
+
+def index_path_for(archive_path: Path) -> Path:
+    """Get the sidecar index path for an archive file."""
+    return archive_path.with_name(archive_path.name + INDEX_SUFFIX)
+
+
+def normalize_member_path(member_path: str) -> str:
+    """Normalize a member path to the form used as index key.
+
+    Raises:
+        ValueError: If the path is absolute or escapes the archive root
+    """
+    path = PurePosixPath(member_path.replace("\\", "/"))
+    if path.is_absolute() or ".." in path.parts:
+        raise ValueError(f"Invalid archive member path: {member_path}")
+
+    parts = [part for part in path.parts if part not in ("", ".")]
+    if not parts:
+        raise ValueError(f"Invalid archive member path: {member_path}")
+
+    return "/".join(parts)
+
+
+class _FrameWriter:
+    """Write a byte stream as a sequence of independent gzip members."""
+
+    def __init__(self, fileobj: BinaryIO, frame_size: int):
+        self._out = fileobj
+        self._frame_size = frame_size
+        self._gzip: Optional[gzip.GzipFile] = None
+        self._frame_start = 0
+        self.position = 0  # Uncompressed bytes written to the current frame
+        self.frames: List[List[int]] = []  # [compressed_offset, compressed_length]
+
+    @property
+    def is_open(self) -> bool:
+        """Whether a frame is currently being written."""
+        return self._gzip is not None
+
+    @property
+    def frame_number(self) -> int:
+        """Index of the frame currently being written."""
+        return len(self.frames)
+
+    def should_rotate(self, member_size: int) -> bool:
+        """Whether the next member should start a fresh frame."""
+        if not self.is_open:
+            return True
+        if self.position >= self._frame_size:
+            return True
+        return self.position > 0 and member_size >= self._frame_size
+
+    def start_frame(self) -> None:
+        """Close the current frame and open a new one."""
+        self.close_frame()
+        self._frame_start = self._out.tell()
+        self._gzip = gzip.GzipFile(filename="", fileobj=self._out, mode="wb", mtime=0)
+        self.position = 0
+
+    def close_frame(self) -> None:
+        """Finish the current gzip member, if any."""
+        if self._gzip is None:
+            return
+        self._gzip.close()
+        self.frames.append([self._frame_start, self._out.tell() - self._frame_start])
+        self._gzip = None
+
+    def write(self, data: bytes) -> None:
+        """Write uncompressed bytes to the current frame."""
+        self._gzip.write(data)
+        self.position += len(data)
+
+
+def _iter_source_paths(source_dir: Path) -> Iterator[Path]:
+    """Yield paths under source_dir in a stable, parent-first order."""
+    yield source_dir
+    for dirpath, dirnames, filenames in os.walk(source_dir):
+        dirnames.sort()
+        base = Path(dirpath)
+        for name in dirnames:
+            yield base / name
+        for name in sorted(filenames):
+            yield base / name
+
+
+def _build_tarinfo(path: Path, arcname: str) -> Optional[tarfile.TarInfo]:
+    """Build a tar header for a filesystem path (None for unsupported types)."""
+    stat = path.lstat()
+    info = tarfile.TarInfo(arcname)
+    info.mtime = int(stat.st_mtime)
+    info.mode = stat.st_mode & 0o7777
+    info.uid = stat.st_uid
+    info.gid = stat.st_gid
+
+    if path.is_symlink():
+        info.type = tarfile.SYMTYPE
+        info.linkname = os.readlink(path)
+    elif path.is_dir():
+        info.type = tarfile.DIRTYPE
+    elif path.is_file():
+        info.type = tarfile.REGTYPE
+        info.size = stat.st_size
+    else:
+        return None
+
+    return info
+
+
+def create_indexed_tar_gz(
+    source_dir: Path,
+    archive_path: Path,
+    arcname: Optional[str] = None,
+    frame_size: int = DEFAULT_FRAME_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    before_read: Optional[Callable[[int], None]] = None,
+) -> Dict[str, Any]:
+    """Create a framed tar.gz archive and return its random-access index (blocking).
+
+    Args:
+        source_dir: Directory to archive
+        archive_path: Destination archive path
+        arcname: Name of the top-level directory inside the archive
+            (defaults to source_dir name, like ``tarfile.add``)
+        frame_size: Target uncompressed frame size in bytes
+        chunk_size: Read buffer size for file contents
+        before_read: Called with the size of each file read before it is
+            issued (e.g. to pace I/O; may block)
+
+    Returns:
+        Index dictionary (see ``write_index``)
+    """
+    root = arcname or source_dir.name
+    entries: Dict[str, Dict[str, Any]] = {}
+
+    with open(archive_path, "wb") as out:
+        writer = _FrameWriter(out, frame_size)
+
+        for path in _iter_source_paths(source_dir):
+            relative = path.relative_to(source_dir).as_posix()
+            member_name = root if relative == "." else f"{root}/{relative}"
+
+            info = _build_tarinfo(path, member_name)
+            if info is None:
+                continue
+
+            if writer.should_rotate(info.size):
+                writer.start_frame()
+
+            writer.write(info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape"))
+
+            if not info.isreg():
+                continue
+
+            entries[relative] = {
+                "frame": writer.frame_number,
+                "offset": writer.position,
+                "size": info.size,
+                "mtime": info.mtime,
+            }
+
+            remaining = info.size
+            with open(path, "rb") as src:
+                while remaining > 0:
+                    read_size = min(chunk_size, remaining)
+                    if before_read is not None:
+                        before_read(read_size)
+                    chunk = src.read(read_size)
+                    if not chunk:
+                        raise OSError(f"File changed size while archiving: {path}")
+                    writer.write(chunk)
+                    remaining -= len(chunk)
+
+            padding = info.size % tarfile.BLOCKSIZE
+            if padding:
+                writer.write(tarfile.NUL * (tarfile.BLOCKSIZE - padding))
+
+        # End-of-archive marker lives in the final frame
+        if not writer.is_open:
+            writer.start_frame()
+        writer.write(tarfile.NUL * (tarfile.BLOCKSIZE * 2))
+        writer.close_frame()
+
+    return {
+        "version": ARCHIVE_INDEX_VERSION,
+        "format": ARCHIVE_INDEX_FORMAT,
+        "root": root,
+        "frame_size": frame_size,
+        "frames": writer.frames,
+        "files": entries,
+        "created_at": datetime.utcnow().isoformat(),
+    }
+
+
+def write_index(index: Dict[str, Any], path: Path) -> None:
+    """Write an archive index to a sidecar file (blocking)."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+
+
+def load_index(path: Path) -> Optional[Dict[str, Any]]:
+    """Load an archive index, returning None if it is missing or unsupported."""
+    if not path.exists():
+        return None
+
+    with open(path, "r", encoding="utf-8") as f:
+        index = json.load(f)
+
+    if index.get("version") != ARCHIVE_INDEX_VERSION:
+        return None
+
+    return index
+
+
+def locate_member(index: Dict[str, Any], member_path: str) -> Tuple[int, int, Dict[str, Any]]:
+    """Find the compressed byte range holding a member.
+
+    Args:
+        index: Archive index
+        member_path: Path relative to the archived directory
+
+    Returns:
+        Tuple of (frame_offset, frame_length, entry)
+
+    Raises:
+        ValueError: If the path is invalid
+        ArchiveMemberNotFoundError: If the path is not in the archive
+    """
+    key = normalize_member_path(member_path)
+    entry = index["files"].get(key)
+    if entry is None:
+        raise ArchiveMemberNotFoundError(key)
+
+    frame_offset, frame_length = index["frames"][entry["frame"]]
+    return frame_offset, frame_length, entry
+
+
+def iter_frame_member(
+    compressed_chunks: Iterable[bytes],
+    offset: int,
+    size: int,
+) -> Iterator[bytes]:
+    """Decompress a frame and yield only the bytes of one member.
+
+    Decompression stops as soon as the member has been produced, so
+    trailing members in the same frame are never inflated.
+
+    Args:
+        compressed_chunks: Compressed bytes of the frame, in order
+        offset: Uncompressed offset of the member data within the frame
+        size: Member size in bytes
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    skip = offset
+    remaining = size
+
+    for chunk in compressed_chunks:
+        if remaining <= 0:
+            break
+
+        data = decompressor.decompress(chunk)
+        if skip:
+            if len(data) <= skip:
+                skip -= len(data)
+                continue
+            data = data[skip:]
+            skip = 0
+
+        if data:
+            data = data[:remaining]
+            remaining -= len(data)
+            yield data
+
+    if remaining > 0:
+        raise OSError("Archive frame ended before member data was complete")
+
+
+def read_file_range(
+    path: Path,
+    offset: int,
+    length: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Yield a byte range of a local file in chunks (blocking)."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def iter_local_member(
+    archive_path: Path,
+    index: Dict[str, Any],
+    member_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[Dict[str, Any], Iterator[bytes]]:
+    """Open a member of a local indexed archive for streaming.
+
+    Returns:
+        Tuple of (index entry, iterator over member bytes)
+    """
+    frame_offset, frame_length, entry = locate_member(index, member_path)
+    chunks = read_file_range(archive_path, frame_offset, frame_length, chunk_size)
+    return entry, iter_frame_member(chunks, entry["offset"], entry["size"])
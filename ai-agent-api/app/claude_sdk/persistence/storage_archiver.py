@@ -3,12 +3,28 @@ import logging
 import tarfile
 import tempfile
 import asyncio
+import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Iterator, Optional, Tuple
 from uuid import UUID, uuid4
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.claude_sdk.persistence.archive_index import (
+    create_indexed_tar_gz,
+    index_path_for,
+    iter_frame_member,
+    locate_member,
+    write_index,
+)
+from app.claude_sdk.persistence.storage_backends import (
+    LOCAL_PROVIDERS,
+    S3_PROVIDERS,
+    StorageBackend,
+    create_storage_backend,
+    file_sha256,
+)
+from app.core.config import settings
 from app.repositories.working_directory_archive_repository import WorkingDirectoryArchiveRepository
 from app.models.working_directory_archive import WorkingDirectoryArchiveModel
 from app.domain.entities.archive_metadata import ArchiveStatus
@@ -20,7 +36,10 @@ class StorageArchiver:
     """Archive working directories to S3 or local filesystem storage.
 
     Compresses working directories into tar.gz archives and uploads to
-    configured storage backend (S3 or local filesystem).
+    configured storage backend (S3 or local filesystem). Each archive is
+    stored with a sidecar index so single files can be read back with a
+    ranged read instead of downloading and extracting the whole archive,
+    and with a SHA-256 checksum that is verified on retrieval.
     """
 
     def __init__(
@@ -30,18 +49,26 @@ class StorageArchiver:
         storage_provider: str = "local",
         s3_bucket: Optional[str] = None,
         s3_region: Optional[str] = None,
-        local_archive_path: Optional[str] = None
+        local_archive_path: Optional[str] = None,
+        backend: Optional[StorageBackend] = None
     ):
         """Initialize storage archiver.
 
         Args:
             db: Database session
             archive_repo: Archive repository
-            storage_provider: "s3" or "local"
+            storage_provider: "s3" or "local" ("filesystem" is accepted as an
+                alias of "local" to match settings.storage_provider)
             s3_bucket: S3 bucket name (required if provider=s3)
             s3_region: S3 region (required if provider=s3)
             local_archive_path: Local storage path (required if provider=local)
+            backend: Pre-built storage backend (overrides provider options)
         """
+        if storage_provider in LOCAL_PROVIDERS:
+            storage_provider = "local"
+        elif storage_provider not in S3_PROVIDERS:
+            raise ValueError(f"Unknown storage provider: {storage_provider}")
+
         self.db = db
         self.archive_repo = archive_repo
         self.storage_provider = storage_provider
@@ -49,28 +76,51 @@ class StorageArchiver:
         self.s3_region = s3_region
         self.local_archive_path = local_archive_path
 
-        # Initialize S3 client if needed
-        if storage_provider == "s3":
-            if not s3_bucket or not s3_region:
-                raise ValueError("S3 bucket and region required for S3 storage")
+        if storage_provider == "local":
+            self.local_archive_path = Path(local_archive_path or "/tmp/archives")
+
+        self.backend = backend or create_storage_backend(
+            storage_provider,
+            local_path=self.local_archive_path,
+            bucket=s3_bucket,
+            region=s3_region,
+            endpoint_url=settings.aws_s3_endpoint_url,
+            part_size=settings.storage_multipart_part_size_mb * 1024 * 1024,
+            max_concurrency=settings.storage_multipart_concurrency,
+            max_retries=settings.storage_multipart_max_retries,
+        )
 
-            try:
-                import boto3
-                self.s3_client = boto3.client("s3", region_name=s3_region)
-            except ImportError:
-                raise ImportError("boto3 is required for S3 storage. Install with: pip install boto3")
+        if storage_provider == "s3":
+            self.s3_client = getattr(self.backend, "client", None)
 
-        elif storage_provider == "local":
-            if not local_archive_path:
-                local_archive_path = "/tmp/archives"
+        logger.info(f"StorageArchiver initialized with provider: {storage_provider}")
 
-            self.local_archive_path = Path(local_archive_path)
-            self.local_archive_path.mkdir(parents=True, exist_ok=True)
+    @classmethod
+    def from_settings(
+        cls,
+        db: AsyncSession,
+        archive_repo: WorkingDirectoryArchiveRepository,
+        storage_provider: Optional[str] = None
+    ) -> "StorageArchiver":
+        """Create an archiver configured from application settings.
 
-        else:
-            raise ValueError(f"Unknown storage provider: {storage_provider}")
+        Args:
+            db: Database session
+            archive_repo: Archive repository
+            storage_provider: Override settings.storage_provider
 
-        logger.info(f"StorageArchiver initialized with provider: {storage_provider}")
+        Returns:
+            Configured StorageArchiver
+        """
+        provider = storage_provider or settings.storage_provider
+        return cls(
+            db,
+            archive_repo,
+            storage_provider=provider,
+            s3_bucket=settings.aws_s3_bucket if provider in S3_PROVIDERS else None,
+            s3_region=settings.aws_s3_region if provider in S3_PROVIDERS else None,
+            local_archive_path=str(settings.agent_workdir_archive)
+        )
 
     async def archive_working_directory(
         self,
@@ -116,12 +166,19 @@ class StorageArchiver:
 
             # Generate manifest
             manifest = await self._generate_manifest(working_dir)
+            manifest["sha256"] = await asyncio.get_event_loop().run_in_executor(
+                None, file_sha256, archive_file_path
+            )
+
+            # Get file size before the backend consumes the local file
+            size_bytes = archive_file_path.stat().st_size
 
             # Upload to storage
             storage_path = await self._upload_archive(archive_file_path, archive_id, session_id)
-
-            # Get file size
-            size_bytes = archive_file_path.stat().st_size
+            index_file_path = index_path_for(archive_file_path)
+            manifest["index_path"] = await self._upload_archive(
+                index_file_path, archive_id, session_id
+            )
 
             # Update archive record
             await self.archive_repo.update(
@@ -133,11 +190,9 @@ class StorageArchiver:
                 archived_at=datetime.utcnow()
             )
 
-            # Clean up temporary file
-            try:
-                archive_file_path.unlink()
-            except Exception:
-                pass
+            # Clean up temporary files
+            for temp_file in (archive_file_path, index_file_path):
+                temp_file.unlink(missing_ok=True)
 
             logger.info(
                 f"Archived working directory: {storage_path} ({size_bytes} bytes)",
@@ -172,14 +227,14 @@ class StorageArchiver:
         source_dir: Path,
         archive_id: UUID
     ) -> Path:
-        """Create compressed tar.gz archive.
+        """Create compressed tar.gz archive and its sidecar index.
 
         Args:
             source_dir: Source directory to archive
             archive_id: Archive ID
 
         Returns:
-            Path to created archive file
+            Path to created archive file (index is written next to it)
         """
         # Create archive in temp directory
         temp_dir = Path(tempfile.gettempdir())
@@ -197,15 +252,19 @@ class StorageArchiver:
 
         return archive_path
 
-    def _create_tar_gz(self, source_dir: Path, archive_path: Path) -> None:
-        """Create tar.gz archive (blocking operation).
+    def _create_tar_gz(self, source_dir: Path, archive_path: Path) -> Dict[str, Any]:
+        """Create indexed tar.gz archive (blocking operation).
 
         Args:
             source_dir: Source directory
             archive_path: Destination archive path
+
+        Returns:
+            Archive index (also written to the sidecar index file)
         """
-        with tarfile.open(archive_path, "w:gz") as tar:
-            tar.add(source_dir, arcname=source_dir.name)
+        index = create_indexed_tar_gz(source_dir, archive_path, arcname=source_dir.name)
+        write_index(index, index_path_for(archive_path))
+        return index
 
     async def _generate_manifest(self, source_dir: Path) -> Dict[str, Any]:
         """Generate manifest of archived files.
@@ -256,77 +315,20 @@ class StorageArchiver:
         Returns:
             Storage path/URI
         """
-        if self.storage_provider == "s3":
-            return await self._upload_to_s3(archive_path, archive_id, session_id)
-        elif self.storage_provider == "local":
-            return await self._upload_to_local(archive_path, archive_id, session_id)
-        else:
-            raise ValueError(f"Unknown storage provider: {self.storage_provider}")
-
-    async def _upload_to_s3(
-        self,
-        archive_path: Path,
-        archive_id: UUID,
-        session_id: UUID
-    ) -> str:
-        """Upload archive to S3.
-
-        Args:
-            archive_path: Local archive path
-            archive_id: Archive ID
-            session_id: Session ID
-
-        Returns:
-            S3 URI
-        """
-        s3_key = f"archives/{session_id}/{archive_id}.tar.gz"
-
-        # Upload in thread pool (blocking operation)
-        await asyncio.get_event_loop().run_in_executor(
-            None,
-            self.s3_client.upload_file,
-            str(archive_path),
-            self.s3_bucket,
-            s3_key
-        )
-
-        s3_uri = f"s3://{self.s3_bucket}/{s3_key}"
-        logger.info(f"Uploaded to S3: {s3_uri}")
-
-        return s3_uri
-
-    async def _upload_to_local(
-        self,
-        archive_path: Path,
-        archive_id: UUID,
-        session_id: UUID
-    ) -> str:
-        """Copy archive to local storage.
-
-        Args:
-            archive_path: Source archive path
-            archive_id: Archive ID
-            session_id: Session ID
-
-        Returns:
-            Local file path
-        """
-        # Create session directory
-        session_dir = self.local_archive_path / str(session_id)
-        session_dir.mkdir(parents=True, exist_ok=True)
-
-        # Copy to local storage
-        dest_path = session_dir / f"{archive_id}.tar.gz"
+        key_prefix = settings.aws_s3_archive_prefix if self.storage_provider == "s3" else ""
+        key = f"{key_prefix}{session_id}/{archive_path.name}"
 
-        await asyncio.get_event_loop().run_in_executor(
+        # Upload in thread pool (blocking operation; S3 parts upload concurrently)
+        storage_path = await asyncio.get_event_loop().run_in_executor(
             None,
-            archive_path.rename,
-            dest_path
+            self.backend.upload_file,
+            archive_path,
+            key
         )
 
-        logger.info(f"Copied to local storage: {dest_path}")
+        logger.info(f"Stored archive: {storage_path}", extra={"archive_id": str(archive_id)})
 
-        return str(dest_path)
+        return storage_path
 
     async def retrieve_archive(
         self,
@@ -351,7 +353,11 @@ class StorageArchiver:
             raise ValueError(f"Archive not completed: {archive.status}")
 
         # Download archive
-        temp_archive = await self._download_archive(archive.archive_path, archive_id)
+        temp_archive = await self._download_archive(
+            archive.archive_path,
+            archive_id,
+            expected_sha256=(archive.manifest or {}).get("sha256")
+        )
 
         # Extract archive
         await asyncio.get_event_loop().run_in_executor(
@@ -371,37 +377,34 @@ class StorageArchiver:
 
         return extract_to
 
-    async def _download_archive(self, storage_path: str, archive_id: UUID) -> Path:
+    async def _download_archive(
+        self,
+        storage_path: str,
+        archive_id: UUID,
+        expected_sha256: Optional[str] = None
+    ) -> Path:
         """Download archive from storage.
 
         Args:
             storage_path: Storage path/URI
             archive_id: Archive ID
+            expected_sha256: Checksum recorded at archive time, if any
 
         Returns:
             Path to downloaded file
+
+        Raises:
+            ChecksumMismatchError: If the downloaded archive is corrupted
         """
         temp_path = Path(tempfile.gettempdir()) / f"{archive_id}_retrieved.tar.gz"
 
-        if storage_path.startswith("s3://"):
-            # Download from S3
-            s3_bucket, s3_key = storage_path.replace("s3://", "").split("/", 1)
-
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                self.s3_client.download_file,
-                s3_bucket,
-                s3_key,
-                str(temp_path)
-            )
-        else:
-            # Copy from local storage
-            source_path = Path(storage_path)
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                source_path.rename,
-                temp_path
-            )
+        await asyncio.get_event_loop().run_in_executor(
+            None,
+            self.backend.download_file,
+            storage_path,
+            temp_path,
+            expected_sha256
+        )
 
         return temp_path
 
@@ -416,3 +419,113 @@ class StorageArchiver:
 
         with tarfile.open(archive_path, "r:gz") as tar:
             tar.extractall(extract_to)
+
+    async def open_archive_file(
+        self,
+        archive_id: UUID,
+        file_path: str,
+        chunk_size: int = 64 * 1024
+    ) -> Tuple[int, AsyncIterator[bytes]]:
+        """Open a single file inside an archive for streaming.
+
+        The archive record and index are checked before returning, so a
+        missing file is reported before any response is started. Only the
+        compressed frame containing the file is then read from storage,
+        using a ranged GET for S3 and a seek for local archives.
+
+        Args:
+            archive_id: Archive ID
+            file_path: File path relative to the archived working directory
+            chunk_size: Read size for storage requests
+
+        Returns:
+            Tuple of (file size, async iterator over file bytes)
+
+        Raises:
+            ValueError: If archive is missing, incomplete or has no index,
+                or if file_path escapes the archive root
+            ArchiveMemberNotFoundError: If the file is not in the archive
+        """
+        archive = await self.archive_repo.get_by_id(archive_id)
+        if not archive:
+            raise ValueError(f"Archive not found: {archive_id}")
+
+        if archive.status != ArchiveStatus.COMPLETED.value:
+            raise ValueError(f"Archive not completed: {archive.status}")
+
+        index_path = (archive.manifest or {}).get("index_path")
+        if not index_path:
+            raise ValueError(f"Archive has no index: {archive_id}")
+
+        loop = asyncio.get_event_loop()
+        index = await loop.run_in_executor(None, self._read_index, index_path)
+        frame_offset, frame_length, entry = locate_member(index, file_path)
+
+        compressed = self._read_range(archive.archive_path, frame_offset, frame_length, chunk_size)
+        member_chunks = iter_frame_member(compressed, entry["offset"], entry["size"])
+        return entry["size"], self._iter_in_executor(member_chunks)
+
+    async def stream_archive_file(
+        self,
+        archive_id: UUID,
+        file_path: str,
+        chunk_size: int = 64 * 1024
+    ) -> AsyncIterator[bytes]:
+        """Stream a single file out of an archive without extracting it.
+
+        Args:
+            archive_id: Archive ID
+            file_path: File path relative to the archived working directory
+            chunk_size: Read size for storage requests
+
+        Yields:
+            File content chunks
+
+        Raises:
+            ValueError: If archive is missing, incomplete or has no index
+            ArchiveMemberNotFoundError: If the file is not in the archive
+        """
+        _, chunks = await self.open_archive_file(archive_id, file_path, chunk_size)
+        async for chunk in chunks:
+            yield chunk
+
+    @staticmethod
+    async def _iter_in_executor(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+        """Pull chunks in the thread pool so storage reads never block the loop."""
+        loop = asyncio.get_event_loop()
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+
+    def _read_index(self, index_path: str) -> Dict[str, Any]:
+        """Load an archive index from storage (blocking operation).
+
+        Args:
+            index_path: Storage path/URI of the index
+
+        Returns:
+            Archive index
+        """
+        return json.loads(self.backend.read_bytes(index_path))
+
+    def _read_range(
+        self,
+        storage_path: str,
+        offset: int,
+        length: int,
+        chunk_size: int
+    ):
+        """Read a byte range of a stored archive (blocking iterator).
+
+        Args:
+            storage_path: Storage path/URI of the archive
+            offset: Start offset in bytes
+            length: Number of bytes to read
+            chunk_size: Chunk size for yielded data
+
+        Yields:
+            Raw archive bytes
+        """
+        yield from self.backend.read_range(storage_path, offset, length, chunk_size)
@@ -0,0 +1,430 @@
+"""Storage backends for archive uploads and downloads.
+
+Backends move finished archive files between local disk and long-term
+storage. All methods are blocking; callers run them in a thread pool.
+
+- LocalStorageBackend: moves files under a base directory
+- S3StorageBackend: S3-compatible object storage (AWS, MinIO) with
+  concurrent multipart upload and ranged parallel download
+"""
+import base64
+import hashlib
+import logging
+import os
+import shutil
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from app.claude_sdk.persistence.archive_index import read_file_range
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+MIN_PART_SIZE = 5 * 1024 * 1024  # S3 minimum for all parts but the last
+MAX_PARTS = 10000
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 3
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Provider names accepted from settings.storage_provider and callers
+LOCAL_PROVIDERS = ("local", "filesystem")
+S3_PROVIDERS = ("s3",)
+
+
+class ChecksumMismatchError(Exception):
+    """Stored or downloaded data does not match its expected checksum."""
+
+
+def file_sha256(path: Path) -> str:
+    """Compute the SHA-256 hex digest of a file (blocking)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StorageBackend(ABC):
+    """Interface for archive storage."""
+
+    @abstractmethod
+    def upload_file(self, local_path: Path, key: str) -> str:
+        """Store a local file under a key.
+
+        The local file may be consumed (moved) by the backend.
+
+        Returns:
+            Storage URI for the stored object
+        """
+
+    @abstractmethod
+    def download_file(
+        self,
+        uri: str,
+        local_path: Path,
+        expected_sha256: Optional[str] = None,
+    ) -> Path:
+        """Copy a stored object to a local path, leaving the stored copy in place.
+
+        Raises:
+            ChecksumMismatchError: If expected_sha256 is given and does not match
+        """
+
+    @abstractmethod
+    def read_bytes(self, uri: str) -> bytes:
+        """Read a whole (small) stored object."""
+
+    @abstractmethod
+    def read_range(self, uri: str, offset: int, length: int, chunk_size: int) -> Iterator[bytes]:
+        """Yield a byte range of a stored object."""
+
+    @abstractmethod
+    def delete(self, uri: str) -> None:
+        """Delete a stored object if it exists."""
+
+
+class LocalStorageBackend(StorageBackend):
+    """Store archives under a local (or mounted) directory."""
+
+    def __init__(self, base_path: Path):
+        self.base_path = Path(base_path)
+        self.base_path.mkdir(parents=True, exist_ok=True)
+
+    def upload_file(self, local_path: Path, key: str) -> str:
+        dest_path = self.base_path / key
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(local_path), dest_path)
+        return str(dest_path)
+
+    def download_file(
+        self,
+        uri: str,
+        local_path: Path,
+        expected_sha256: Optional[str] = None,
+    ) -> Path:
+        shutil.copyfile(uri, local_path)
+        if expected_sha256 and file_sha256(local_path) != expected_sha256:
+            local_path.unlink(missing_ok=True)
+            raise ChecksumMismatchError(f"Checksum mismatch for {uri}")
+        return local_path
+
+    def read_bytes(self, uri: str) -> bytes:
+        return Path(uri).read_bytes()
+
+    def read_range(self, uri: str, offset: int, length: int, chunk_size: int) -> Iterator[bytes]:
+        yield from read_file_range(Path(uri), offset, length, chunk_size)
+
+    def delete(self, uri: str) -> None:
+        Path(uri).unlink(missing_ok=True)
+
+
+class S3StorageBackend(StorageBackend):
+    """Store archives in S3-compatible object storage.
+
+    Files larger than one part are uploaded with multipart upload: parts are
+    read sequentially and uploaded by a pool of ``max_concurrency`` threads,
+    with at most ``max_concurrency`` parts buffered at once. Every part is
+    sent with Content-MD5 so storage rejects corrupted parts, each part is
+    retried up to ``max_retries`` times, and the final ETag is checked
+    against the part digests. Downloads fetch ranges of ``part_size`` in
+    parallel and can verify a whole-file SHA-256.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        region: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        client: Any = None,
+    ):
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"S3 part size must be at least {MIN_PART_SIZE} bytes")
+
+        self.bucket = bucket
+        self.part_size = part_size
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+
+        if client is None:
+            try:
+                import boto3
+                from botocore.config import Config
+            except ImportError:
+                raise ImportError("boto3 is required for S3 storage. Install with: pip install boto3")
+
+            client = boto3.client(
+                "s3",
+                region_name=region,
+                endpoint_url=endpoint_url or None,
+                # One pooled connection per concurrent part
+                config=Config(max_pool_connections=self.max_concurrency + 2),
+            )
+
+        self.client = client
+
+    def upload_file(self, local_path: Path, key: str) -> str:
+        size = local_path.stat().st_size
+        part_size = self._effective_part_size(size)
+
+        if size <= part_size:
+            self._put_single(local_path, key)
+        else:
+            self._put_multipart(local_path, key, part_size)
+
+        uri = f"s3://{self.bucket}/{key}"
+        logger.info(f"Uploaded to S3: {uri}", extra={"size_bytes": size})
+        return uri
+
+    def download_file(
+        self,
+        uri: str,
+        local_path: Path,
+        expected_sha256: Optional[str] = None,
+    ) -> Path:
+        bucket, key = self.parse_uri(uri)
+        size = self.client.head_object(Bucket=bucket, Key=key)["ContentLength"]
+
+        # Preallocate so parts can be written at their offsets from any thread
+        with open(local_path, "wb") as f:
+            f.truncate(size)
+
+        ranges = [
+            (offset, min(self.part_size, size - offset))
+            for offset in range(0, size, self.part_size)
+        ]
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                futures = [
+                    pool.submit(self._download_range, bucket, key, local_path, offset, length)
+                    for offset, length in ranges
+                ]
+                for future in futures:
+                    future.result()
+
+            if local_path.stat().st_size != size:
+                raise ChecksumMismatchError(f"Size mismatch downloading {uri}")
+            if expected_sha256 and file_sha256(local_path) != expected_sha256:
+                raise ChecksumMismatchError(f"Checksum mismatch for {uri}")
+        except Exception:
+            local_path.unlink(missing_ok=True)
+            raise
+
+        return local_path
+
+    def read_bytes(self, uri: str) -> bytes:
+        bucket, key = self.parse_uri(uri)
+        return self.client.get_object(Bucket=bucket, Key=key)["Body"].read()
+
+    def read_range(self, uri: str, offset: int, length: int, chunk_size: int) -> Iterator[bytes]:
+        bucket, key = self.parse_uri(uri)
+        response = self.client.get_object(
+            Bucket=bucket,
+            Key=key,
+            Range=f"bytes={offset}-{offset + length - 1}"
+        )
+        yield from response["Body"].iter_chunks(chunk_size)
+
+    def delete(self, uri: str) -> None:
+        bucket, key = self.parse_uri(uri)
+        self.client.delete_object(Bucket=bucket, Key=key)
+
+    @staticmethod
+    def parse_uri(uri: str) -> Tuple[str, str]:
+        """Split an s3:// URI into bucket and key."""
+        bucket, key = uri.replace("s3://", "", 1).split("/", 1)
+        return bucket, key
+
+    def _effective_part_size(self, size: int) -> int:
+        """Grow the part size if needed to stay within the S3 part limit."""
+        part_size = self.part_size
+        while size > part_size * MAX_PARTS:
+            part_size *= 2
+        return part_size
+
+    def _put_single(self, local_path: Path, key: str) -> None:
+        """Upload a small file in one request."""
+        body = local_path.read_bytes()
+        md5 = hashlib.md5(body)
+
+        response = self._with_retries(
+            f"put {key}",
+            lambda: self.client.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=body,
+                ContentMD5=base64.b64encode(md5.digest()).decode(),
+            ),
+        )
+        self._verify_etag(response.get("ETag"), md5.hexdigest(), key)
+
+    def _put_multipart(self, local_path: Path, key: str, part_size: int) -> None:
+        """Upload a large file as concurrently uploaded parts."""
+        upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=key)["UploadId"]
+        parts: Dict[int, Dict[str, Any]] = {}
+        digests: Dict[int, bytes] = {}
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool, open(local_path, "rb") as f:
+                in_flight = set()
+                part_number = 0
+
+                while True:
+                    body = f.read(part_size)
+                    if not body:
+                        break
+                    part_number += 1
+
+                    # Bound buffered parts to the pool size
+                    if len(in_flight) >= self.max_concurrency:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+
+                    in_flight.add(pool.submit(
+                        self._upload_part, key, upload_id, part_number, body, parts, digests
+                    ))
+
+                for future in in_flight:
+                    future.result()
+
+            ordered = [parts[number] for number in sorted(parts)]
+            response = self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": ordered},
+            )
+        except Exception:
+            try:
+                self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            except Exception as abort_error:
+                logger.warning(f"Failed to abort multipart upload for {key}: {abort_error}")
+            raise
+
+        combined = hashlib.md5(b"".join(digests[number] for number in sorted(digests)))
+        self._verify_etag(response.get("ETag"), f"{combined.hexdigest()}-{len(digests)}", key)
+
+    def _upload_part(
+        self,
+        key: str,
+        upload_id: str,
+        part_number: int,
+        body: bytes,
+        parts: Dict[int, Dict[str, Any]],
+        digests: Dict[int, bytes],
+    ) -> None:
+        """Upload one part with retries and record its ETag."""
+        md5 = hashlib.md5(body)
+
+        response = self._with_retries(
+            f"part {part_number} of {key}",
+            lambda: self.client.upload_part(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body,
+                ContentMD5=base64.b64encode(md5.digest()).decode(),
+            ),
+        )
+        self._verify_etag(response.get("ETag"), md5.hexdigest(), f"{key} part {part_number}")
+
+        # Dict item assignment is atomic; each thread writes its own key
+        parts[part_number] = {"PartNumber": part_number, "ETag": response["ETag"]}
+        digests[part_number] = md5.digest()
+
+    def _download_range(self, bucket: str, key: str, local_path: Path, offset: int, length: int) -> None:
+        """Download one range with retries and write it at its offset."""
+        def fetch() -> bytes:
+            response = self.client.get_object(
+                Bucket=bucket,
+                Key=key,
+                Range=f"bytes={offset}-{offset + length - 1}"
+            )
+            data = response["Body"].read()
+            if len(data) != length:
+                raise ChecksumMismatchError(
+                    f"Short read for {key} at {offset}: {len(data)} of {length} bytes"
+                )
+            return data
+
+        data = self._with_retries(f"range {offset} of {key}", fetch)
+
+        fd = os.open(local_path, os.O_WRONLY)
+        try:
+            os.pwrite(fd, data, offset)
+        finally:
+            os.close(fd)
+
+    def _with_retries(self, label: str, func):
+        """Call func, retrying with exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                delay = 0.5 * (2 ** (attempt - 1))
+                logger.warning(
+                    f"Retrying S3 {label} after error: {type(e).__name__} - {e}",
+                    extra={"attempt": attempt, "delay_seconds": delay}
+                )
+                time.sleep(delay)
+
+    @staticmethod
+    def _verify_etag(etag: Optional[str], expected: str, label: str) -> None:
+        """Compare an S3 ETag to the expected MD5-based value.
+
+        ETags are not MD5-based for SSE-KMS objects; only a mismatch between
+        two MD5-shaped values is treated as corruption.
+        """
+        if not etag:
+            return
+        etag = etag.strip('"')
+        if len(etag.split("-")[0]) == 32 and etag != expected:
+            raise ChecksumMismatchError(f"ETag mismatch for {label}: {etag} != {expected}")
+
+
+def create_storage_backend(
+    provider: str,
+    local_path: Optional[Path] = None,
+    bucket: Optional[str] = None,
+    region: Optional[str] = None,
+    endpoint_url: Optional[str] = None,
+    part_size: int = DEFAULT_PART_SIZE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> StorageBackend:
+    """Create a storage backend from a provider name.
+
+    Args:
+        provider: "local"/"filesystem" or "s3"
+
+    Raises:
+        ValueError: If the provider is unknown or required options are missing
+    """
+    if provider in LOCAL_PROVIDERS:
+        return LocalStorageBackend(local_path or Path("/tmp/archives"))
+
+    if provider in S3_PROVIDERS:
+        if not bucket or not region:
+            raise ValueError("S3 bucket and region required for S3 storage")
+        return S3StorageBackend(
+            bucket=bucket,
+            region=region,
+            endpoint_url=endpoint_url,
+            part_size=part_size,
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+        )
+
+    raise ValueError(f"Unknown storage provider: {provider}")
@@ -0,0 +1,174 @@
+"""Wire encodings for the WebSocket session stream.
+
+Clients pick an encoding when connecting (``?encoding=msgpack&compression=deflate``);
+JSON text frames remain the default.
+
+Binary frames are one header byte followed by the body::
+
+    +--------+--------------------------------------------+
+    | flags  | msgpack body (raw deflate if flags & 0x01) |
+    +--------+--------------------------------------------+
+
+Map keys found in ``KEY_TABLE`` are sent as their integer index instead of
+the string, so envelope fields repeated in every event (``type``,
+``data``, ``event_data``, ``delta``, ...) cost one byte. Keys are never
+integers in the JSON payloads, so decoding is unambiguous. The table is
+append-only; ``KEY_TABLE_VERSION`` is announced in the ``connected`` event
+and must be bumped if an entry is ever changed.
+
+Deflate is applied per frame with no shared context, so a frame encoded
+once can be queued for any number of subscribers. Frames smaller than
+``websocket_deflate_min_bytes`` (most streaming deltas) are sent
+uncompressed, where deflate would cost CPU without saving bytes.
+"""
+
+import json
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple, Union
+
+from app.core.config import settings
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+ENCODINGS = ("json", "msgpack")
+COMPRESSIONS = ("none", "deflate")
+
+FLAG_DEFLATE = 0x01
+
+KEY_TABLE_VERSION = 1
+KEY_TABLE: Tuple[str, ...] = (
+    # Event envelope
+    "type", "data", "session_id", "event_type", "event_data", "timestamp",
+    # Streaming events
+    "index", "delta", "text", "partial_json", "thinking", "signature",
+    "content_block", "stop_reason", "usage", "input_tokens", "output_tokens",
+    "cache_creation_input_tokens", "cache_read_input_tokens",
+    # Messages
+    "id", "message", "message_type", "sequence_number", "content",
+    "created_at", "role", "model", "name", "input", "tool_use_id",
+    "is_error", "subtype", "uuid", "parent_tool_use_id",
+    # Results and status
+    "status", "result", "total_cost_usd", "duration_ms", "num_turns",
+    "code", "message_id", "replayed", "last_sequence", "since_sequence",
+)
+KEY_INDEX: Dict[str, int] = {key: index for index, key in enumerate(KEY_TABLE)}
+
+
+def compact_keys(pairs: List[Tuple[str, Any]]) -> Dict[Any, Any]:
+    """Replace known map keys with their table index (json object_pairs_hook)."""
+    return {KEY_INDEX.get(key, key): value for key, value in pairs}
+
+
+def expand_keys(pairs: List[Tuple[Any, Any]]) -> Dict[str, Any]:
+    """Restore table indexes to key names (msgpack object_pairs_hook)."""
+    return {KEY_TABLE[key] if isinstance(key, int) else key: value for key, value in pairs}
+
+
+@dataclass(frozen=True)
+class StreamCodec:
+    """A negotiated stream encoding.
+
+    Attributes:
+        encoding: json or msgpack
+        compression: none or deflate (msgpack only)
+    """
+
+    encoding: str = "json"
+    compression: str = "none"
+
+    @property
+    def name(self) -> str:
+        """Get the codec name (also the key of cached frame encodings)."""
+        if self.compression == "none":
+            return self.encoding
+        return f"{self.encoding}+{self.compression}"
+
+    @property
+    def binary(self) -> bool:
+        """Whether frames are sent as binary WebSocket messages."""
+        return self.encoding != "json"
+
+    def describe(self) -> Dict[str, Any]:
+        """Describe the codec for the ``connected`` event."""
+        return {
+            "encoding": self.encoding,
+            "compression": self.compression,
+            "key_table_version": KEY_TABLE_VERSION if self.binary else None,
+        }
+
+    def encode_text(self, text: str) -> Union[str, bytes]:
+        """Encode an event already serialized as JSON text."""
+        if not self.binary:
+            return text
+        return self._pack(json.loads(text, object_pairs_hook=compact_keys))
+
+    def encode(self, payload: Any) -> Union[str, bytes]:
+        """Encode an event payload."""
+        return self.encode_text(json.dumps(payload, default=str))
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        """Decode a frame produced by this or any other codec."""
+        return decode_frame(data)
+
+    async def send(self, websocket, payload: Any) -> None:
+        """Encode and send an event on a WebSocket."""
+        data = self.encode(payload)
+        if self.binary:
+            await websocket.send_bytes(data)
+        else:
+            await websocket.send_text(data)
+
+    def _pack(self, payload: Any) -> bytes:
+        """Pack a key-compacted payload into a binary frame."""
+        body = msgpack.packb(payload, use_bin_type=True)
+        if self.compression == "deflate" and len(body) >= settings.websocket_deflate_min_bytes:
+            compressor = zlib.compressobj(settings.websocket_deflate_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+            deflated = compressor.compress(body) + compressor.flush()
+            if len(deflated) < len(body):
+                return bytes((FLAG_DEFLATE,)) + deflated
+        return b"\x00" + body
+
+
+JSON_CODEC = StreamCodec()
+
+
+def decode_frame(data: Union[str, bytes]) -> Any:
+    """Decode a stream frame back to the JSON event payload.
+
+    Text frames are JSON; binary frames use the header described above.
+    """
+    if isinstance(data, str):
+        return json.loads(data)
+    if msgpack is None:
+        raise RuntimeError("msgpack is required to decode binary stream frames")
+
+    flags, body = data[0], data[1:]
+    if flags & FLAG_DEFLATE:
+        body = zlib.decompress(body, -zlib.MAX_WBITS)
+    return msgpack.unpackb(body, raw=False, strict_map_key=False, object_pairs_hook=expand_keys)
+
+
+def negotiate_codec(encoding: str = "json", compression: str = "none") -> StreamCodec:
+    """Choose the codec for a connection.
+
+    Falls back to JSON when msgpack is not installed; clients learn the
+    codec actually used from the ``connected`` event (and can always tell
+    text from binary frames).
+
+    Raises:
+        ValueError: If the encoding or compression is unknown
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown stream encoding '{encoding}'. Must be one of: {', '.join(ENCODINGS)}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Unknown stream compression '{compression}'. Must be one of: {', '.join(COMPRESSIONS)}"
+        )
+    if encoding == "json" or msgpack is None:
+        # Text frames are compressed by the server's permessage-deflate instead
+        return JSON_CODEC
+    return StreamCodec(encoding, compression)
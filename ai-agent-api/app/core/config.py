@@ -35,6 +35,64 @@ class Settings(BaseSettings):
     
     # Redis Configuration
     redis_url: str
+
+    # WebSocket Event Broadcasting
+    event_broadcaster_backend: str = "redis"  # 'redis' (multi-worker) or 'memory' (single process)
+    event_broadcaster_channel_prefix: str = "session_events:"
+    websocket_send_queue_size: int = 256  # frames buffered per subscriber
+    websocket_overflow_policy: str = "coalesce"  # 'coalesce', 'drop_oldest' or 'disconnect'
+    websocket_send_timeout_seconds: float = 10.0  # 0 disables the per-send timeout
+    websocket_replay_buffer_size: int = 500  # messages kept per session for resume; 0 disables
+    websocket_replay_max_sessions: int = 1000  # in-memory buffers kept (memory backend)
+    websocket_replay_ttl_seconds: int = 3600  # Redis replay buffer expiry after last message
+    websocket_replay_max_history: int = 1000  # cap on messages replayed from the database
+    websocket_deflate_min_bytes: int = 512  # smaller binary frames are sent uncompressed
+    websocket_deflate_level: int = 6  # zlib level for compression=deflate streams
+    sse_heartbeat_seconds: float = 15.0  # idle interval between SSE heartbeat comments
+    sse_retry_ms: int = 3000  # reconnect delay advertised to SSE clients
+    stream_delta_flush_interval_ms: int = 50  # partial delta coalescing window; 0 sends every delta
+    stream_delta_flush_bytes: int = 1024  # pending delta size that forces an early flush
+
+    # MCP config cache
+    mcp_config_cache_backend: str = "redis"  # 'redis' (shared across workers) or 'memory'
+    mcp_config_cache_ttl_seconds: int = 600  # entry lifetime; bounds staleness without Redis
+    mcp_config_cache_max_entries: int = 1000  # compiled configs kept per process
+
+    # Kubernetes SDK tools
+    kubernetes_client_max_workers: int = 4  # concurrent API calls off the event loop (and pooled connections)
+    kubernetes_client_refresh_seconds: int = 900  # reload config/credentials after this long
+    kubernetes_list_page_size: int = 100  # default list_pods page size (server-side limit)
+
+    # query_database SDK tool
+    query_tool_pool_size: int = 2  # dedicated connections, separate from the API pool
+    query_tool_statement_timeout_ms: int = 5000  # per-query statement_timeout
+    query_tool_max_rows: int = 1000  # hard row cap applied around every query
+    query_tool_max_cell_chars: int = 200  # longer cell values are truncated
+    query_tool_max_output_bytes: int = 65536  # total size of the rendered result table
+
+    # System metrics sampler
+    system_metrics_interval_seconds: float = 1.0  # 0 disables the background sampler
+    system_metrics_history_seconds: int = 300  # longest rolling window kept in memory
+
+    # SDK MCP tool result cache
+    mcp_tool_cache_enabled: bool = True  # reuse results of read-only tools for their TTL
+    mcp_tool_cache_backend: str = "redis"  # 'redis' (shared across workers) or 'memory'
+    mcp_tool_cache_max_entries: int = 2000  # results kept per process
+
+    # MCP server health probes
+    mcp_health_probe_timeout_seconds: float = 10.0  # launch/connect + initialize + list_tools
+    mcp_health_probe_concurrency: int = 4  # probes running at the same time
+    mcp_health_cache_ttl_seconds: int = 60  # how long a probe result is reused
+    mcp_health_probe_interval_seconds: int = 60  # background probe of enabled servers (0 disables)
+    mcp_health_skip_unhealthy: bool = True  # leave servers that failed their last probe out of sessions
+
+    # Shared MCP server processes
+    mcp_process_pool_enabled: bool = False  # run one stdio server process per config, shared by sessions
+    mcp_process_pool_port: int = 0  # loopback proxy port (0 = any free port)
+    mcp_process_pool_idle_seconds: int = 300  # stop processes without sessions after this long
+    mcp_process_pool_max_memory_mb: int = 1024  # restart processes above this RSS (0 = no cap)
+    mcp_process_pool_check_seconds: float = 15.0  # interval of idle and memory checks
+    mcp_process_pool_isolated_servers: List[str] = Field(default_factory=list)  # servers kept per session
     
     # Celery Configuration
     celery_broker_url: str
@@ -59,6 +117,7 @@ class Settings(BaseSettings):
     agent_workdir_base: Path = Path("/tmp/ai-agent-service/sessions")
     agent_workdir_archive: Path = Path("/tmp/ai-agent-service/archives")
     reports_dir: Path = Path("/tmp/ai-agent-service/reports")
+    task_workdir_base: Path = Path("/tmp/agent-workdirs/active")
     
     # Session Configuration
     max_concurrent_sessions: int = 5
@@ -113,9 +172,20 @@ class Settings(BaseSettings):
     aws_s3_archive_prefix: str = "archives/"
     aws_access_key_id: str = ""
     aws_secret_access_key: str = ""
+    aws_s3_endpoint_url: str = ""  # S3-compatible endpoint (e.g. MinIO); empty for AWS
+    storage_multipart_part_size_mb: int = 16
+    storage_multipart_concurrency: int = 8
+    storage_multipart_max_retries: int = 3
     archive_compression: str = "gzip"
     archive_auto_cleanup: bool = True
     archive_retention_days: int = 90
+    storage_reconcile_interval_seconds: int = 3600  # 0 disables periodic reconciliation
+    report_retention_days: int = 90
+    storage_maintenance_interval_seconds: int = 21600  # 0 disables the maintenance worker
+    storage_maintenance_io_mb_per_second: float = 20.0
+    storage_orphan_grace_hours: int = 24
+    file_manifest_cache_max_dirs: int = 64
+    file_manifest_revalidate_seconds: float = 2.0  # polling fallback when inotify is unavailable
 
     # Phase 4: Session Limits
     max_concurrent_interactive_sessions: int = 10
@@ -135,11 +205,20 @@ class Settings(BaseSettings):
     enable_metrics_hook: bool = True
     enable_validation_hook: bool = True
     enable_notification_hook: bool = False
-    hook_execution_timeout_ms: int = 5000
+    hook_execution_timeout_ms: int = 5000  # per-hook budget; hooks may override via timeout_ms
+    hook_fail_closed_types: List[str] = Field(
+        default=[]
+    )  # hook types (e.g. "PreToolUse") where a failed or timed-out hook blocks execution
 
     # Phase 4: Permissions Settings
     enable_custom_policies: bool = True
     permission_cache_ttl_seconds: int = 300
+    permission_cache_max_entries: int = 1000  # decisions kept per PermissionManager (LRU)
+    permission_log_max_pending: int = 10000  # buffered decision rows before new ones are dropped
+    permission_log_batch_size: int = 500  # rows per bulk insert; a full batch flushes early
+    permission_log_flush_interval_seconds: float = 1.0  # max delay before buffered rows are written
+    permission_log_strict: bool = False  # persist denials before the permission check returns
+    permission_log_max_write_attempts: int = 3  # failed inserts of a rejected row before it is dropped
     default_blocked_commands: List[str] = Field(
         default=["rm -rf /", "sudo rm", "format", "mkfs", "dd if="]
     )
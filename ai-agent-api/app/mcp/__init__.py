@@ -9,10 +9,29 @@ This package handles:
 
 from app.mcp.sdk_tools import SDK_MCP_SERVERS
 from app.mcp.config_builder import MCPConfigBuilder
+from app.mcp.config_cache import MCPConfigCache, get_mcp_config_cache
 from app.mcp.config_manager import MCPConfigManager
+from app.mcp.health_prober import MCPHealthProber, get_mcp_health_prober
+from app.mcp.kubernetes_client import KubernetesClientManager, get_kubernetes_client
+from app.mcp.process_pool import MCPProcessPool, get_mcp_process_pool
+from app.mcp.query_executor import ReadOnlyQueryExecutor, get_query_executor
+from app.mcp.tool_cache import ToolResultCache, cached_tool, get_tool_result_cache
 
 __all__ = [
     "SDK_MCP_SERVERS",
     "MCPConfigBuilder",
+    "MCPConfigCache",
+    "get_mcp_config_cache",
     "MCPConfigManager",
+    "MCPHealthProber",
+    "get_mcp_health_prober",
+    "KubernetesClientManager",
+    "get_kubernetes_client",
+    "MCPProcessPool",
+    "get_mcp_process_pool",
+    "ReadOnlyQueryExecutor",
+    "get_query_executor",
+    "ToolResultCache",
+    "cached_tool",
+    "get_tool_result_cache",
 ]
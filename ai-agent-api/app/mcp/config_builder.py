@@ -5,10 +5,14 @@ Converts database MCP server configs to SDK format that can be passed
 to ClaudeAgentOptions.mcp_servers.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from uuid import UUID
+import copy
 import logging
 
+from app.core.config import settings
+from app.mcp.config_cache import MCPConfigCache
+from app.mcp.health_prober import get_mcp_health_prober
 from app.repositories.mcp_server_repository import MCPServerRepository
 
 logger = logging.getLogger(__name__)
@@ -29,8 +33,19 @@ class MCPConfigBuilder:
     }
     """
     
-    def __init__(self, mcp_server_repo: MCPServerRepository):
+    def __init__(
+        self,
+        mcp_server_repo: MCPServerRepository,
+        cache: Optional[MCPConfigCache] = None,
+    ):
+        """
+        Args:
+            mcp_server_repo: MCP server repository
+            cache: Compiled config cache; when given, configs are only
+                rebuilt from the database after an MCP server changed
+        """
         self.mcp_server_repo = mcp_server_repo
+        self.cache = cache
     
     async def build_user_mcp_config(self, user_id: UUID) -> Dict[str, Any]:
         """
@@ -46,6 +61,21 @@ class MCPConfigBuilder:
         Returns:
             Dictionary of MCP server configs in SDK format
         """
+        if self.cache is None:
+            mcp_config = await self._build_user_mcp_config(user_id)
+        else:
+            compiled = await self.cache.get_user_config(
+                user_id, lambda: self._build_user_mcp_config(user_id)
+            )
+            # Callers may modify the result; the cached copy is shared
+            mcp_config = copy.deepcopy(compiled)
+
+        if settings.mcp_health_skip_unhealthy:
+            mcp_config = get_mcp_health_prober().filter_unhealthy(mcp_config)
+        return mcp_config
+    
+    async def _build_user_mcp_config(self, user_id: UUID) -> Dict[str, Any]:
+        """Build MCP config for a user from the database."""
         # Get user's servers
         user_servers = await self.mcp_server_repo.list_by_user(str(user_id))
         
@@ -74,7 +104,8 @@ class MCPConfigBuilder:
         
         return mcp_config
     
-    def _convert_to_sdk_format(self, server) -> Dict[str, Any]:
+    @staticmethod
+    def _convert_to_sdk_format(server) -> Dict[str, Any]:
         """
         Convert database MCPServer entity to SDK format.
         
@@ -0,0 +1,250 @@
+"""
+MCP Config Cache - Compiled per-user MCP configurations.
+
+Building a user's MCP configuration queries user and global servers and
+converts each to SDK format. The result only changes when an MCP server is
+created, updated or deleted, so compiled configurations are cached and
+keyed by version counters:
+
+- ``global``: bumped when a global server changes (affects every user)
+- ``user:{user_id}``: bumped when one of the user's servers changes
+- ``tool_group:{id}``: bumped when a tool group changes
+
+A lookup reads the relevant counters (one Redis MGET) and reuses the
+compiled entry built for exactly those versions, from process memory or
+from Redis where another worker stored it. Invalidation is an INCR, so
+stale entries are never read again and simply expire. Without Redis
+(or with ``mcp_config_cache_backend = "memory"``) counters are per process
+and entries also expire after ``mcp_config_cache_ttl_seconds`` so other
+workers converge.
+
+Cached configurations contain server env and headers (credentials), the
+same data already stored in the database.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+Key = Union[UUID, str]
+
+GLOBAL_SCOPE = "global"
+
+
+class MCPConfigCache:
+    """Version-keyed cache of compiled MCP configs and tool group resolutions."""
+
+    def __init__(
+        self,
+        redis=None,
+        use_redis: Optional[bool] = None,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        key_prefix: str = "mcp_config:",
+    ):
+        """Initialize cache.
+
+        Args:
+            redis: Redis client (defaults to RedisClientManager's client)
+            use_redis: Share versions and entries through Redis
+            ttl_seconds: Entry lifetime (also bounds staleness without Redis)
+            max_entries: Entries kept in process memory
+            key_prefix: Redis key prefix
+        """
+        self._redis = redis
+        self.use_redis = (
+            settings.mcp_config_cache_backend == "redis" if use_redis is None else use_redis
+        )
+        self.ttl_seconds = ttl_seconds or settings.mcp_config_cache_ttl_seconds
+        self.max_entries = max_entries or settings.mcp_config_cache_max_entries
+        self.key_prefix = key_prefix
+
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._local_versions: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def redis(self):
+        """Get the Redis client, or None if unavailable."""
+        if not self.use_redis:
+            return None
+        if self._redis is None:
+            from app.infrastructure.redis_client import RedisClientManager
+            try:
+                return RedisClientManager.get_client()
+            except RuntimeError:
+                return None
+        return self._redis
+
+    async def get_user_config(
+        self,
+        user_id: Key,
+        build: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Get a user's compiled MCP server config, building it on a miss.
+
+        Args:
+            user_id: User ID
+            build: Builds the config from the database
+
+        Returns:
+            Dictionary of MCP server configs in SDK format (do not mutate)
+        """
+        return await self._get(f"user:{user_id}", (GLOBAL_SCOPE, f"user:{user_id}"), build)
+
+    async def get_tool_group(
+        self,
+        tool_group_id: Key,
+        load: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    ) -> Optional[Dict[str, Any]]:
+        """Get a resolved tool group, loading it on a miss.
+
+        Args:
+            tool_group_id: Tool group ID
+            load: Loads the resolution (None if the group does not exist)
+
+        Returns:
+            Tool group resolution (do not mutate), or None
+        """
+        scope = f"tool_group:{tool_group_id}"
+        return await self._get(scope, (scope,), load)
+
+    async def invalidate_user(self, user_id: Key) -> None:
+        """Invalidate a user's config after one of their servers changed."""
+        await self._bump(f"user:{user_id}")
+
+    async def invalidate_global(self) -> None:
+        """Invalidate every user's config after a global server changed."""
+        await self._bump(GLOBAL_SCOPE)
+
+    async def invalidate_server(self, user_id: Optional[Key], is_global: bool = False) -> None:
+        """Invalidate configs that include a server.
+
+        Args:
+            user_id: Server owner (None for global servers)
+            is_global: Whether the server is shared with all users
+        """
+        if is_global or user_id is None:
+            await self.invalidate_global()
+        else:
+            await self.invalidate_user(user_id)
+
+    async def invalidate_tool_group(self, tool_group_id: Key) -> None:
+        """Invalidate a tool group's resolution after it changed."""
+        await self._bump(f"tool_group:{tool_group_id}")
+
+    def clear(self) -> None:
+        """Drop every entry held in process memory."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics for this process."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    async def _get(
+        self,
+        name: str,
+        scopes: Tuple[str, ...],
+        build: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Look up an entry for the current versions of its scopes."""
+        shared_versions = await self._read_versions(scopes)
+        local_versions = tuple(self._local_versions.get(scope, 0) for scope in scopes)
+        local_key = (name, shared_versions, local_versions)
+        now = time.monotonic()
+
+        entry = self._entries.get(local_key)
+        if entry is not None and entry[0] > now:
+            self._entries.move_to_end(local_key)
+            self.hits += 1
+            return entry[1]
+
+        redis_key = None
+        if shared_versions is not None:
+            redis_key = f"{self.key_prefix}{name}:" + ":".join(map(str, shared_versions))
+            value = await self._read_shared(redis_key)
+            if value is not None:
+                self.hits += 1
+                self._store(local_key, value[0], now)
+                return value[0]
+
+        self.misses += 1
+        value = await build()
+        self._store(local_key, value, now)
+        if redis_key is not None:
+            await self._write_shared(redis_key, value)
+        return value
+
+    def _store(self, key: Tuple, value: Any, now: float) -> None:
+        """Keep an entry in process memory, evicting the least recently used."""
+        self._entries[key] = (now + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _version_key(self, scope: str) -> str:
+        return f"{self.key_prefix}version:{scope}"
+
+    async def _read_versions(self, scopes: Tuple[str, ...]) -> Optional[Tuple[int, ...]]:
+        """Read shared version counters (None if Redis is unavailable)."""
+        redis = self.redis
+        if redis is None:
+            return None
+        try:
+            values = await redis.mget([self._version_key(scope) for scope in scopes])
+        except Exception as e:
+            logger.debug(f"MCP config cache versions unavailable: {e}")
+            return None
+        return tuple(int(value or 0) for value in values)
+
+    async def _read_shared(self, key: str) -> Optional[Tuple[Any]]:
+        """Read an entry stored by any worker (wrapped so None is cacheable)."""
+        try:
+            data = await self.redis.get(key)
+        except Exception as e:
+            logger.debug(f"MCP config cache read failed: {e}")
+            return None
+        return (json.loads(data),) if data is not None else None
+
+    async def _write_shared(self, key: str, value: Any) -> None:
+        """Share an entry with other workers."""
+        try:
+            await self.redis.set(key, json.dumps(value), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.debug(f"MCP config cache write failed: {e}")
+
+    async def _bump(self, scope: str) -> None:
+        """Advance a version counter, locally and in Redis."""
+        self._local_versions[scope] = self._local_versions.get(scope, 0) + 1
+        redis = self.redis
+        if redis is None:
+            return
+        try:
+            await redis.incr(self._version_key(scope))
+        except Exception as e:
+            logger.warning(
+                "Failed to publish MCP config invalidation",
+                extra={"scope": scope, "error": str(e)},
+            )
+
+
+_mcp_config_cache: Optional[MCPConfigCache] = None
+
+
+def get_mcp_config_cache() -> MCPConfigCache:
+    """Get the process-wide MCP config cache."""
+    global _mcp_config_cache
+    if _mcp_config_cache is None:
+        _mcp_config_cache = MCPConfigCache()
+    return _mcp_config_cache
+
+
+__all__ = ["MCPConfigCache", "get_mcp_config_cache"]
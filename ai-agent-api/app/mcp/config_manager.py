@@ -12,6 +12,7 @@ import json
 import logging
 
 from app.domain.entities import MCPServer
+from app.mcp.config_cache import get_mcp_config_cache
 from app.repositories.mcp_server_repository import MCPServerRepository
 
 logger = logging.getLogger(__name__)
@@ -122,6 +123,9 @@ class MCPConfigManager:
                 errors.append({"server": server_name, "error": str(e)})
                 logger.error(f"Failed to import server {server_name}: {e}")
         
+        if imported:
+            await self._invalidate_config(user_id)
+        
         return {
             "imported": imported,
             "skipped": skipped,
@@ -258,6 +262,7 @@ class MCPConfigManager:
         
         # Save
         await self.mcp_server_repo.create(server)
+        await self._invalidate_config(server.user_id, is_global)
         logger.info(f"Created MCP server: {name} ({server_type})")
         
         return server
@@ -297,6 +302,7 @@ class MCPConfigManager:
         
         # Save
         await self.mcp_server_repo.update(server)
+        await self._invalidate_config(server.user_id, server.is_global)
         logger.info(f"Updated MCP server: {server.name}")
         
         return server
@@ -308,9 +314,17 @@ class MCPConfigManager:
         Args:
             server_id: Server ID
         """
+        server = await self.mcp_server_repo.get_by_id(str(server_id))
         await self.mcp_server_repo.delete(str(server_id))
+        if server is not None:
+            await self._invalidate_config(server.user_id, server.is_global)
         logger.info(f"Deleted MCP server: {server_id}")
     
+    async def _invalidate_config(self, user_id, is_global: bool = False) -> None:
+        """Commit server changes and invalidate the compiled MCP configs they affect."""
+        await self.mcp_server_repo.db.commit()
+        await get_mcp_config_cache().invalidate_server(user_id, is_global)
+    
     async def get_server_templates(self) -> List[Dict[str, Any]]:
         """
         Get pre-configured templates for popular MCP servers.
@@ -0,0 +1,387 @@
+"""
+MCP Health Prober - Handshake checks for external MCP servers.
+
+A probe launches (stdio) or connects to (sse, http) a server, performs the
+MCP ``initialize`` handshake and lists its tools, all within
+``mcp_health_probe_timeout_seconds``. Probes run concurrently, at most
+``mcp_health_probe_concurrency`` at a time, and results are cached for
+``mcp_health_cache_ttl_seconds`` keyed by the server's SDK config, so a
+changed command, URL or credential is probed afresh.
+
+Session setup consults the cache through ``is_known_unhealthy()`` and
+leaves out servers whose last probe failed instead of letting an agent
+session fail on them mid-run. Servers never probed are assumed healthy.
+Every worker runs ``run_mcp_health_probes()``. Each
+``mcp_health_probe_interval_seconds`` one worker, chosen with a Redis
+lock, probes all enabled external servers, records the outcome on the
+server rows and shares the results through Redis; the other workers load
+them into their caches. Without Redis every worker probes for itself.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+HEALTHY = "healthy"
+UNHEALTHY = "unhealthy"
+
+# Redis hash of config fingerprint -> latest ProbeResult, shared by workers
+SHARED_RESULTS_KEY = "mcp:health:results"
+
+# Redis key giving one worker each probe round
+PROBE_LOCK_KEY = "mcp:health:probe:lock"
+
+# How often workers that did not probe pick up shared results
+SHARED_RESULTS_REFRESH_SECONDS = 15
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one MCP handshake probe."""
+
+    status: str
+    latency_ms: Optional[int] = None
+    tools: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    checked_at: float = field(default_factory=time.time)
+
+    @property
+    def healthy(self) -> bool:
+        return self.status == HEALTHY
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def config_fingerprint(sdk_config: Dict[str, Any]) -> str:
+    """Identify a server by everything that affects how it is reached."""
+    encoded = json.dumps(sdk_config, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:32]
+
+
+def _describe_error(error: BaseException) -> str:
+    """Flatten task-group exception groups to their first cause."""
+    while isinstance(error, BaseExceptionGroup) and error.exceptions:
+        error = error.exceptions[0]
+    return f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+
+
+class MCPHealthProber:
+    """Probes MCP servers with bounded concurrency and caches the results."""
+
+    def __init__(
+        self,
+        timeout_seconds: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """Initialize prober.
+
+        Args:
+            timeout_seconds: Limit for launching, handshaking and listing tools
+            max_concurrency: Probes running at the same time
+            ttl_seconds: How long a result is reused
+        """
+        self.timeout_seconds = timeout_seconds or settings.mcp_health_probe_timeout_seconds
+        self.max_concurrency = max_concurrency or settings.mcp_health_probe_concurrency
+        self.ttl_seconds = ttl_seconds or settings.mcp_health_cache_ttl_seconds
+
+        self._results: Dict[str, ProbeResult] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def cached(self, sdk_config: Dict[str, Any]) -> Optional[ProbeResult]:
+        """Get an unexpired probe result for a config."""
+        result = self._results.get(config_fingerprint(sdk_config))
+        if result is not None and time.time() - result.checked_at < self.ttl_seconds:
+            return result
+        return None
+
+    def is_known_unhealthy(self, sdk_config: Dict[str, Any]) -> bool:
+        """Whether the last probe of this config, within the TTL, failed."""
+        result = self.cached(sdk_config)
+        return result is not None and not result.healthy
+
+    async def probe(self, sdk_config: Dict[str, Any], force: bool = False) -> ProbeResult:
+        """Probe a server, reusing a cached result unless forced.
+
+        Args:
+            sdk_config: Server config in SDK format (see MCPConfigBuilder)
+            force: Ignore the cached result
+
+        Returns:
+            ProbeResult
+        """
+        if not force:
+            result = self.cached(sdk_config)
+            if result is not None:
+                return result
+
+        async with self.semaphore:
+            started = time.perf_counter()
+            try:
+                tools = await self._handshake(sdk_config)
+                result = ProbeResult(
+                    status=HEALTHY,
+                    latency_ms=int((time.perf_counter() - started) * 1000),
+                    tools=tools,
+                )
+            except TimeoutError:
+                result = ProbeResult(
+                    status=UNHEALTHY,
+                    error=f"No response to initialize/list_tools within {self.timeout_seconds:g}s",
+                )
+            except Exception as e:
+                result = ProbeResult(status=UNHEALTHY, error=_describe_error(e))
+
+        self._results[config_fingerprint(sdk_config)] = result
+        if not result.healthy:
+            logger.warning(
+                "MCP server health probe failed",
+                extra={"server_type": sdk_config.get("type", "stdio"), "error": result.error},
+            )
+        return result
+
+    async def probe_many(
+        self,
+        sdk_configs: Dict[str, Dict[str, Any]],
+        force: bool = False,
+    ) -> Dict[str, ProbeResult]:
+        """Probe servers concurrently.
+
+        Args:
+            sdk_configs: Server name -> SDK config
+            force: Ignore cached results
+
+        Returns:
+            Server name -> ProbeResult
+        """
+        names = list(sdk_configs)
+        results = await asyncio.gather(*(self.probe(sdk_configs[name], force) for name in names))
+        return dict(zip(names, results))
+
+    async def share_results(self, redis) -> None:
+        """Publish unexpired results to Redis for the other workers."""
+        now = time.time()
+        mapping = {
+            fingerprint: json.dumps(result.to_dict())
+            for fingerprint, result in self._results.items()
+            if now - result.checked_at < self.ttl_seconds
+        }
+        if not mapping:
+            return
+        pipe = redis.pipeline(transaction=False)
+        pipe.hset(SHARED_RESULTS_KEY, mapping=mapping)
+        pipe.expire(SHARED_RESULTS_KEY, int(self.ttl_seconds) + 1)
+        await pipe.execute()
+
+    async def load_shared_results(self, redis) -> int:
+        """Take results published by other workers that are newer than ours.
+
+        Returns:
+            Number of results taken
+        """
+        shared = await redis.hgetall(SHARED_RESULTS_KEY)
+        loaded = 0
+        for fingerprint, encoded in shared.items():
+            if isinstance(fingerprint, bytes):
+                fingerprint = fingerprint.decode()
+            try:
+                result = ProbeResult(**json.loads(encoded))
+            except (TypeError, ValueError):
+                continue
+            current = self._results.get(fingerprint)
+            if current is None or current.checked_at < result.checked_at:
+                self._results[fingerprint] = result
+                loaded += 1
+        return loaded
+
+    def filter_unhealthy(self, sdk_configs: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Drop servers known to be unhealthy from an MCP config.
+
+        Args:
+            sdk_configs: Server name -> SDK config
+
+        Returns:
+            The config without known-unhealthy servers
+        """
+        skipped = [name for name, config in sdk_configs.items() if self.is_known_unhealthy(config)]
+        if not skipped:
+            return sdk_configs
+        logger.warning("Skipping unhealthy MCP servers", extra={"servers": skipped})
+        return {name: config for name, config in sdk_configs.items() if name not in skipped}
+
+    async def _handshake(self, sdk_config: Dict[str, Any]) -> List[str]:
+        """Connect, initialize and list tools.
+
+        Raises:
+            TimeoutError: If the server does not complete within the timeout
+        """
+        import anyio
+        from mcp import ClientSession
+
+        server_type = sdk_config.get("type", "stdio")
+        # anyio cancel scopes keep cancelling until the transport is torn
+        # down, so a stuck stdio server is killed rather than awaited
+        with anyio.fail_after(self.timeout_seconds):
+            async with self._connect(server_type, sdk_config) as (read_stream, write_stream):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    listed = await session.list_tools()
+                    return [tool.name for tool in listed.tools]
+
+    def _connect(self, server_type: str, sdk_config: Dict[str, Any]):
+        """Open the transport for a server type."""
+        if server_type == "stdio":
+            from mcp import StdioServerParameters
+            from mcp.client.stdio import get_default_environment, stdio_client
+
+            return stdio_client(StdioServerParameters(
+                command=sdk_config["command"],
+                args=sdk_config.get("args", []),
+                env={**get_default_environment(), **(sdk_config.get("env") or {})},
+            ))
+
+        if server_type == "sse":
+            from mcp.client.sse import sse_client
+
+            return sse_client(
+                sdk_config["url"],
+                headers=sdk_config.get("headers") or None,
+                timeout=self.timeout_seconds,
+            )
+
+        if server_type == "http":
+            try:
+                from mcp.client.streamable_http import streamablehttp_client
+            except ImportError:
+                raise ValueError("HTTP MCP servers need a newer mcp package to be probed")
+            return _WithoutSessionId(streamablehttp_client(
+                sdk_config["url"],
+                headers=sdk_config.get("headers") or None,
+                timeout=self.timeout_seconds,
+            ))
+
+        raise ValueError(f"Unsupported server type: {server_type}")
+
+
+class _WithoutSessionId:
+    """Adapt streamablehttp_client's (read, write, get_session_id) to (read, write)."""
+
+    def __init__(self, context):
+        self.context = context
+
+    async def __aenter__(self):
+        read_stream, write_stream, _ = await self.context.__aenter__()
+        return read_stream, write_stream
+
+    async def __aexit__(self, *exc_info):
+        return await self.context.__aexit__(*exc_info)
+
+
+_mcp_health_prober: Optional[MCPHealthProber] = None
+
+
+def get_mcp_health_prober() -> MCPHealthProber:
+    """Get the process-wide MCP health prober."""
+    global _mcp_health_prober
+    if _mcp_health_prober is None:
+        _mcp_health_prober = MCPHealthProber()
+    return _mcp_health_prober
+
+
+async def _claim_probe_round(ttl_seconds: float):
+    """Claim the current probe round for this worker with SET NX PX.
+
+    Returns:
+        (redis client, True if this worker probes), or (None, None) when
+        Redis is unavailable and the worker has to probe for itself
+    """
+    from app.infrastructure.redis_client import RedisClientManager
+
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        redis = RedisClientManager.get_client()
+        claimed = await redis.set(
+            PROBE_LOCK_KEY, owner, nx=True, px=max(int(ttl_seconds * 1000), 1)
+        )
+    except Exception as e:
+        if not isinstance(e, RuntimeError):
+            logger.warning(
+                "Could not claim MCP health probe round, probing locally",
+                extra={"error": str(e), "error_type": type(e).__name__},
+            )
+        return None, None
+    return redis, bool(claimed)
+
+
+async def _probe_enabled_servers() -> None:
+    from app.claude_sdk.monitoring.health_checker import HealthChecker
+    from app.database.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        await HealthChecker(db).check_mcp_servers()
+
+
+async def run_mcp_health_probes(interval_seconds: int) -> None:
+    """Periodically probe every enabled external MCP server until cancelled.
+
+    Runs once right away so filter_unhealthy() has results from startup.
+    With Redis, each round is probed by the worker that claims it and the
+    others load the shared results every SHARED_RESULTS_REFRESH_SECONDS.
+    Results are reused for their TTL, so an interval shorter than
+    mcp_health_cache_ttl_seconds does not probe more often.
+
+    Args:
+        interval_seconds: Delay between probe rounds
+    """
+    prober = get_mcp_health_prober()
+    tick = min(interval_seconds, SHARED_RESULTS_REFRESH_SECONDS)
+    next_local_round = 0.0
+
+    while True:
+        try:
+            # Expire a little before the next round so the lock is free again
+            redis, claimed = await _claim_probe_round(interval_seconds * 0.9)
+            if redis is None:
+                if time.monotonic() >= next_local_round:
+                    next_local_round = time.monotonic() + interval_seconds
+                    await _probe_enabled_servers()
+            elif claimed:
+                await _probe_enabled_servers()
+                await prober.share_results(redis)
+            else:
+                await prober.load_shared_results(redis)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(
+                "MCP server health probes failed",
+                extra={"error": str(e), "error_type": type(e).__name__},
+                exc_info=True,
+            )
+        await asyncio.sleep(tick)
+
+
+__all__ = [
+    "MCPHealthProber",
+    "ProbeResult",
+    "config_fingerprint",
+    "get_mcp_health_prober",
+    "run_mcp_health_probes",
+]
@@ -0,0 +1,201 @@
+"""
+Kubernetes Client - Shared API client for the kubernetes_readonly SDK tools.
+
+The kubernetes package is synchronous: every call blocks on HTTP I/O. Tools
+therefore run their calls through ``KubernetesClientManager.call()``, which
+executes them on a bounded thread pool so a slow or cluster-wide listing
+never blocks the event loop.
+
+Configuration (in-cluster service account, falling back to kubeconfig) is
+loaded once, on first use, into a single ``ApiClient`` whose urllib3 pool
+keeps connections to the API server alive between calls. Credentials are
+refreshed by reloading the configuration when the API server answers 401
+(the call is retried once) and after ``kubernetes_client_refresh_seconds``.
+In-cluster configs additionally re-read the rotated service account token.
+A replaced client is closed only once the calls still using it have
+finished, so a refresh never tears the connection pool out from under them.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def load_kubernetes_configuration():
+    """Load in-cluster config, or kubeconfig outside a cluster.
+
+    Returns:
+        kubernetes.client.Configuration (the global default is untouched)
+    """
+    from kubernetes import client, config
+
+    configuration = client.Configuration()
+    try:
+        config.load_incluster_config(client_configuration=configuration)
+    except config.ConfigException:
+        config.load_kube_config(client_configuration=configuration, persist_config=False)
+    return configuration
+
+
+class KubernetesClientManager:
+    """Lazily configured, shared Kubernetes API client with a bounded worker pool."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        refresh_seconds: Optional[int] = None,
+        loader: Callable[[], Any] = load_kubernetes_configuration,
+    ):
+        """Initialize manager.
+
+        Args:
+            max_workers: Concurrent Kubernetes calls (also the connection pool size)
+            refresh_seconds: Reload configuration after this many seconds
+            loader: Returns a kubernetes.client.Configuration
+        """
+        self.max_workers = max_workers or settings.kubernetes_client_max_workers
+        self.refresh_seconds = refresh_seconds or settings.kubernetes_client_refresh_seconds
+        self._loader = loader
+
+        self._lock = threading.Lock()
+        self._api_client = None
+        self._loaded_at = 0.0
+        # In-flight calls per ApiClient, current or replaced
+        self._in_use: Dict[Any, int] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Get the worker pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="kubernetes"
+            )
+        return self._executor
+
+    def api_client(self):
+        """Get the shared ApiClient, loading or refreshing configuration if needed."""
+        with self._lock:
+            return self._current_client()
+
+    def core_v1(self, api_client=None):
+        """Get a CoreV1Api bound to api_client, or to the shared ApiClient."""
+        from kubernetes import client
+
+        return client.CoreV1Api(api_client or self.api_client())
+
+    def reset(self) -> None:
+        """Discard the current client so the next call reloads configuration."""
+        with self._lock:
+            self._retire_client()
+
+    def _current_client(self):
+        if self._api_client is None or time.monotonic() - self._loaded_at > self.refresh_seconds:
+            self._replace_client()
+        return self._api_client
+
+    def _replace_client(self) -> None:
+        from kubernetes import client
+
+        configuration = self._loader()
+        configuration.connection_pool_maxsize = self.max_workers
+        self._retire_client()
+        self._api_client = client.ApiClient(configuration)
+        self._loaded_at = time.monotonic()
+        logger.info(
+            "Kubernetes client configured",
+            extra={"host": configuration.host, "max_workers": self.max_workers},
+        )
+
+    def _retire_client(self) -> None:
+        """Detach the current client; close it now unless calls still use it."""
+        api_client, self._api_client = self._api_client, None
+        if api_client is not None and api_client not in self._in_use:
+            self._close(api_client)
+
+    @staticmethod
+    def _close(api_client) -> None:
+        try:
+            api_client.close()
+        except Exception as e:
+            logger.debug(f"Error closing Kubernetes client: {e}")
+
+    def _acquire(self):
+        """Get the shared ApiClient and count a call using it."""
+        with self._lock:
+            api_client = self._current_client()
+            self._in_use[api_client] = self._in_use.get(api_client, 0) + 1
+            return api_client
+
+    def _release(self, api_client) -> None:
+        """Finish a call; close its client if it was the last user of a replaced one."""
+        with self._lock:
+            remaining = self._in_use.pop(api_client) - 1
+            if remaining:
+                self._in_use[api_client] = remaining
+                return
+            if api_client is self._api_client:
+                return
+        self._close(api_client)
+
+    def _call_once(self, fn: Callable[[Any], T]) -> T:
+        api_client = self._acquire()
+        try:
+            return fn(self.core_v1(api_client))
+        finally:
+            self._release(api_client)
+
+    def _call_sync(self, fn: Callable[[Any], T]) -> T:
+        """Run fn(CoreV1Api), reloading credentials once on 401 Unauthorized."""
+        from kubernetes.client.exceptions import ApiException
+
+        try:
+            return self._call_once(fn)
+        except ApiException as e:
+            if e.status != 401:
+                raise
+            logger.info("Kubernetes credentials rejected, reloading configuration")
+            self.reset()
+            return self._call_once(fn)
+
+    async def call(self, fn: Callable[[Any], T]) -> T:
+        """Run a blocking Kubernetes call on the worker pool.
+
+        Args:
+            fn: Called with a CoreV1Api; runs in a worker thread
+
+        Returns:
+            fn's result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._call_sync, fn)
+
+    def close(self) -> None:
+        """Close pooled connections and stop the worker pool."""
+        self.reset()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+_kubernetes_client: Optional[KubernetesClientManager] = None
+
+
+def get_kubernetes_client() -> KubernetesClientManager:
+    """Get the process-wide Kubernetes client manager."""
+    global _kubernetes_client
+    if _kubernetes_client is None:
+        _kubernetes_client = KubernetesClientManager()
+    return _kubernetes_client
+
+
+__all__ = ["KubernetesClientManager", "get_kubernetes_client", "load_kubernetes_configuration"]
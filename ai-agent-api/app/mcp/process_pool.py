@@ -0,0 +1,627 @@
+"""
+MCP Process Pool - Shared stdio MCP server processes across sessions.
+
+Every SDK client normally spawns its own copy of each configured stdio MCP
+server, so N concurrent sessions run N identical server processes. With
+``mcp_process_pool_enabled`` the pool runs one long-lived process per
+distinct server configuration (command, args and env) in this worker and
+rewrites session configs to reach it through a local SSE endpoint::
+
+    {"command": "npx", "args": [...]}
+        -> {"type": "sse", "url": "http://127.0.0.1:<port>/servers/<token>/sse"}
+
+The proxy multiplexes sessions onto the shared process by rewriting
+JSON-RPC ids, so each session keeps its own request id space:
+
+- The first ``initialize`` is forwarded; later sessions get the cached
+  result and their ``notifications/initialized`` is absorbed.
+- Requests and cancellations are routed back to the session that sent them;
+  server notifications go to every session. Server-initiated requests
+  (``roots/list``, ``sampling/createMessage``) go to the session that was
+  most recently active; ``ping`` is answered by the proxy.
+
+Crashed processes are restarted with backoff that starts over once a
+process has stayed up for a minute (pending requests fail with a
+JSON-RPC error), processes above ``mcp_process_pool_max_memory_mb`` RSS are
+killed and restarted, and processes without sessions for
+``mcp_process_pool_idle_seconds`` are stopped.
+
+Pooled processes run in the API's working directory, not the session's,
+with the MCP SDK's default environment plus the config's ``env``, not the
+API's own environment.
+Servers that depend on the session directory or keep per-client state
+must be listed in ``mcp_process_pool_isolated_servers`` to keep one
+process per session.
+"""
+
+import asyncio
+import hashlib
+import json
+import secrets
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+JSONRPC_SERVER_ERROR = -32000
+JSONRPC_METHOD_NOT_FOUND = -32601
+
+# Largest JSON-RPC line accepted from a server
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+# A process that stayed up this long starts its restart backoff over
+RESTART_RESET_SECONDS = 60.0
+
+
+def is_poolable(name: str, sdk_config: Dict[str, Any]) -> bool:
+    """Whether a server entry is a stdio server that may be shared."""
+    return (
+        isinstance(sdk_config, dict)
+        and sdk_config.get("type", "stdio") == "stdio"
+        and "command" in sdk_config
+        and name not in settings.mcp_process_pool_isolated_servers
+    )
+
+
+def _fingerprint(sdk_config: Dict[str, Any]) -> str:
+    encoded = json.dumps(
+        [sdk_config["command"], sdk_config.get("args") or [], sdk_config.get("env") or {}],
+        sort_keys=True,
+    )
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _error(request_id: Any, message: str, code: int = JSONRPC_SERVER_ERROR) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+class ProxyClient:
+    """One session connected to a pooled server."""
+
+    def __init__(self):
+        self.id = secrets.token_hex(8)
+        self.queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+        # Client-facing id of a forwarded server request -> the server's id
+        self.server_requests: Dict[str, Any] = {}
+
+    def send(self, message: Dict[str, Any]) -> None:
+        self.queue.put_nowait(message)
+
+    def close(self) -> None:
+        self.queue.put_nowait(None)
+
+
+class PooledServer:
+    """A long-lived stdio MCP server process shared by many sessions."""
+
+    def __init__(self, token: str, sdk_config: Dict[str, Any], request_timeout: float = 60.0):
+        """Initialize pooled server.
+
+        Args:
+            token: Unguessable path segment of the proxy endpoint
+            sdk_config: stdio server config in SDK format
+            request_timeout: Limit for the proxy's own initialize request
+        """
+        self.token = token
+        self.config = sdk_config
+        self.request_timeout = request_timeout
+
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.clients: Dict[str, ProxyClient] = {}
+        self.restarts = 0
+        self.idle_since = time.monotonic()
+        self._started_at = 0.0
+
+        self._next_id = 0
+        self._next_server_request = 0
+        # Proxy id -> (client id, client's request id)
+        self._pending: Dict[int, Tuple[str, Any]] = {}
+        # Proxy id -> future of a request made by the proxy itself
+        self._internal: Dict[int, "asyncio.Future[Any]"] = {}
+        self._init_params: Optional[Dict[str, Any]] = None
+        self._init_result: Optional[Dict[str, Any]] = None
+        self._last_client: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._reader: Optional[asyncio.Task] = None
+        self._restarter: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.running else None
+
+    def connect(self) -> ProxyClient:
+        """Register a session."""
+        client = ProxyClient()
+        self.clients[client.id] = client
+        return client
+
+    def disconnect(self, client: ProxyClient) -> None:
+        """Unregister a session and drop its outstanding requests."""
+        self.clients.pop(client.id, None)
+        for proxy_id, (client_id, _) in list(self._pending.items()):
+            if client_id == client.id:
+                del self._pending[proxy_id]
+        if not self.clients:
+            self.idle_since = time.monotonic()
+
+    async def ensure_started(self) -> None:
+        """Start the process if it is not running."""
+        async with self._lock:
+            if not self.running:
+                await self._spawn()
+
+    async def _spawn(self) -> None:
+        from mcp.client.stdio import get_default_environment
+
+        env = {**get_default_environment(), **(self.config.get("env") or {})}
+        self.process = await asyncio.create_subprocess_exec(
+            self.config["command"],
+            *(self.config.get("args") or []),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            env=env,
+            limit=MAX_MESSAGE_BYTES,
+        )
+        self._started_at = time.monotonic()
+        self._reader = asyncio.create_task(self._read_loop(self.process))
+        logger.info(
+            "Started pooled MCP server",
+            extra={"command": self.config["command"], "pid": self.process.pid},
+        )
+        if self._init_params is not None:
+            # Restarted: sessions are already initialized against the old process
+            await self._handshake(self._init_params)
+
+    async def _handshake(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        result = await self._request("initialize", params)
+        await self._write({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        return result
+
+    async def _request(self, method: str, params: Dict[str, Any]) -> Any:
+        """Send a request on the proxy's own behalf and await its result."""
+        proxy_id = self._allocate_id()
+        future = asyncio.get_running_loop().create_future()
+        self._internal[proxy_id] = future
+        try:
+            await self._write({"jsonrpc": "2.0", "id": proxy_id, "method": method, "params": params})
+            return await asyncio.wait_for(future, self.request_timeout)
+        finally:
+            self._internal.pop(proxy_id, None)
+
+    def _allocate_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    async def _write(self, message: Dict[str, Any]) -> None:
+        if not self.running:
+            raise ConnectionError("MCP server is not running")
+        self.process.stdin.write(json.dumps(message).encode() + b"\n")
+        await self.process.stdin.drain()
+
+    async def handle_client_message(self, client: ProxyClient, message: Dict[str, Any]) -> None:
+        """Forward a JSON-RPC message from a session to the server."""
+        self._last_client = client.id
+        method = message.get("method")
+        message_id = message.get("id")
+
+        if method is None:
+            # Response to a server-initiated request we forwarded to this session
+            server_id = client.server_requests.pop(str(message_id), None)
+            if server_id is not None:
+                await self._write({**message, "id": server_id})
+            return
+
+        if method == "initialize" and message_id is not None:
+            try:
+                await self.ensure_started()
+                async with self._lock:
+                    if self._init_result is None:
+                        self._init_params = message.get("params") or {}
+                        self._init_result = await self._handshake(self._init_params)
+                client.send({"jsonrpc": "2.0", "id": message_id, "result": self._init_result})
+            except Exception as e:
+                client.send(_error(message_id, f"MCP server failed to initialize: {e}"))
+            return
+
+        if method == "notifications/initialized":
+            return
+
+        try:
+            await self.ensure_started()
+            if message_id is None:
+                if method == "notifications/cancelled":
+                    message = self._map_cancellation(client, message)
+                    if message is None:
+                        return
+                await self._write(message)
+                return
+
+            proxy_id = self._allocate_id()
+            self._pending[proxy_id] = (client.id, message_id)
+            await self._write({**message, "id": proxy_id})
+        except Exception as e:
+            if message_id is not None:
+                client.send(_error(message_id, f"MCP server unavailable: {e}"))
+
+    def _map_cancellation(self, client: ProxyClient, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        params = message.get("params") or {}
+        for proxy_id, (client_id, request_id) in self._pending.items():
+            if client_id == client.id and request_id == params.get("requestId"):
+                return {**message, "params": {**params, "requestId": proxy_id}}
+        return None
+
+    async def _read_loop(self, process: asyncio.subprocess.Process) -> None:
+        """Route server output to sessions until the process exits."""
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.debug("Ignoring non-JSON output from MCP server")
+                    continue
+                if isinstance(message, dict):
+                    await self._route_server_message(message)
+        except (asyncio.LimitOverrunError, ValueError) as e:
+            logger.warning("MCP server sent an oversized message", extra={"error": str(e)})
+            process.kill()
+        finally:
+            if process is self.process:
+                self._fail_pending("MCP server exited")
+
+        returncode = await process.wait()
+        if self._closed or process is not self.process:
+            return
+        self.process = None
+        if not self.clients:
+            return
+
+        if time.monotonic() - self._started_at > RESTART_RESET_SECONDS:
+            self.restarts = 0
+        self.restarts += 1
+        delay = min(2 ** (self.restarts - 1), 30)
+        logger.warning(
+            "Pooled MCP server exited, restarting",
+            extra={"command": self.config["command"], "returncode": returncode, "delay": delay},
+        )
+        self._restarter = asyncio.create_task(self._restart(delay))
+
+    async def _restart(self, delay: float) -> None:
+        """Start the process again after a backoff delay.
+
+        A session request arriving during the delay starts it right away.
+        """
+        await asyncio.sleep(delay)
+        try:
+            await self.ensure_started()
+        except Exception as e:
+            logger.error("Failed to restart pooled MCP server", extra={"error": str(e)})
+            for client in list(self.clients.values()):
+                client.close()
+
+    async def _route_server_message(self, message: Dict[str, Any]) -> None:
+        message_id = message.get("id")
+        method = message.get("method")
+
+        if method is None:
+            future = self._internal.get(message_id)
+            if future is not None:
+                if not future.done():
+                    if "error" in message:
+                        future.set_exception(RuntimeError(message["error"].get("message", "error")))
+                    else:
+                        future.set_result(message.get("result"))
+                return
+            target = self._pending.pop(message_id, None)
+            if target is not None and target[0] in self.clients:
+                self.clients[target[0]].send({**message, "id": target[1]})
+            return
+
+        if message_id is None:
+            for client in list(self.clients.values()):
+                client.send(message)
+            return
+
+        if method == "ping":
+            await self._write({"jsonrpc": "2.0", "id": message_id, "result": {}})
+            return
+
+        client = self.clients.get(self._last_client) or next(iter(self.clients.values()), None)
+        if client is None:
+            await self._write(_error(message_id, f"No session to handle {method}", JSONRPC_METHOD_NOT_FOUND))
+            return
+        self._next_server_request += 1
+        client_facing_id = f"pool-{self._next_server_request}"
+        client.server_requests[client_facing_id] = message_id
+        client.send({**message, "id": client_facing_id})
+
+    def _fail_pending(self, reason: str) -> None:
+        for proxy_id, (client_id, request_id) in list(self._pending.items()):
+            client = self.clients.get(client_id)
+            if client is not None:
+                client.send(_error(request_id, reason))
+        self._pending.clear()
+        for future in self._internal.values():
+            if not future.done():
+                future.set_exception(ConnectionError(reason))
+
+    def memory_bytes(self) -> Optional[int]:
+        """Resident memory of the process and its children (None without psutil)."""
+        if not self.running:
+            return 0
+        try:
+            import psutil
+
+            process = psutil.Process(self.process.pid)
+            return process.memory_info().rss + sum(
+                child.memory_info().rss for child in process.children(recursive=True)
+            )
+        except ImportError:
+            return None
+        except Exception:
+            return 0
+
+    def kill(self) -> None:
+        """Kill the process; it is restarted if sessions are connected."""
+        if self.running:
+            self.process.kill()
+
+    async def stop(self) -> None:
+        """Stop the process for good and disconnect every session."""
+        self._closed = True
+        for client in list(self.clients.values()):
+            client.close()
+        if self.running:
+            self.process.kill()
+            await self.process.wait()
+        for task in (self._reader, self._restarter):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+
+class MCPProcessPool:
+    """Runs shared stdio MCP servers behind a local SSE proxy."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: Optional[int] = None,
+        idle_seconds: Optional[float] = None,
+        max_memory_mb: Optional[int] = None,
+        check_interval_seconds: Optional[float] = None,
+    ):
+        """Initialize pool.
+
+        Args:
+            host: Proxy listen address (loopback only)
+            port: Proxy port (0 picks a free port)
+            idle_seconds: Stop processes without sessions after this long
+            max_memory_mb: Restart processes above this resident memory (0: no cap)
+            check_interval_seconds: Interval of idle and memory checks
+        """
+        self.host = host
+        self.port = settings.mcp_process_pool_port if port is None else port
+        self.idle_seconds = idle_seconds or settings.mcp_process_pool_idle_seconds
+        self.max_memory_mb = settings.mcp_process_pool_max_memory_mb if max_memory_mb is None else max_memory_mb
+        self.check_interval_seconds = check_interval_seconds or settings.mcp_process_pool_check_seconds
+
+        self.servers: Dict[str, PooledServer] = {}
+        self._tokens: Dict[str, str] = {}
+        self._http_server = None
+        self._serve_task: Optional[asyncio.Task] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self.base_url: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self.base_url is not None
+
+    async def start(self) -> None:
+        """Start the local proxy endpoint and the monitor."""
+        if self.running:
+            return
+        import uvicorn
+
+        class _ProxyServer(uvicorn.Server):
+            def install_signal_handlers(self) -> None:
+                # The application server owns the process signals
+                pass
+
+        config = uvicorn.Config(
+            self._build_app(), host=self.host, port=self.port,
+            log_level="warning", lifespan="off", access_log=False,
+        )
+        self._http_server = _ProxyServer(config)
+        self._serve_task = asyncio.create_task(self._http_server.serve())
+        while not self._http_server.started:
+            if self._serve_task.done():
+                self._serve_task.result()
+                raise RuntimeError("MCP process pool proxy failed to start")
+            await asyncio.sleep(0.01)
+
+        port = self._http_server.servers[0].sockets[0].getsockname()[1]
+        self.base_url = f"http://{self.host}:{port}"
+        self._monitor_task = asyncio.create_task(self._monitor())
+        logger.info("MCP process pool started", extra={"url": self.base_url})
+
+    async def close(self) -> None:
+        """Stop every pooled process and the proxy."""
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+        for server in list(self.servers.values()):
+            await server.stop()
+        self.servers.clear()
+        self._tokens.clear()
+        if self._http_server is not None:
+            self._http_server.should_exit = True
+            await self._serve_task
+            self._http_server = None
+        self.base_url = None
+
+    def register(self, sdk_config: Dict[str, Any]) -> PooledServer:
+        """Get the pooled server for a stdio config, creating it if needed.
+
+        The process itself starts when the first session connects. The
+        idle timer restarts here so the monitor does not stop a server
+        that was just handed to a session which has not connected yet.
+        """
+        fingerprint = _fingerprint(sdk_config)
+        token = self._tokens.get(fingerprint)
+        if token is None or token not in self.servers:
+            token = secrets.token_urlsafe(16)
+            self._tokens[fingerprint] = token
+            self.servers[token] = PooledServer(token, dict(sdk_config))
+        server = self.servers[token]
+        server.idle_since = time.monotonic()
+        return server
+
+    def route(self, mcp_servers: Dict[str, Any]) -> Dict[str, Any]:
+        """Point a session's stdio servers at their shared processes.
+
+        Args:
+            mcp_servers: Session MCP config in SDK format
+
+        Returns:
+            Config with poolable stdio entries replaced by SSE endpoints
+            (unchanged while the pool is not running)
+        """
+        if not self.running or not isinstance(mcp_servers, dict):
+            return mcp_servers
+        routed = {}
+        for name, config in mcp_servers.items():
+            if is_poolable(name, config):
+                server = self.register(config)
+                config = {"type": "sse", "url": f"{self.base_url}/servers/{server.token}/sse"}
+            routed[name] = config
+        return routed
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Get per-process statistics."""
+        return [
+            {
+                "command": server.config["command"],
+                "pid": server.pid,
+                "sessions": len(server.clients),
+                "restarts": server.restarts,
+                "memory_bytes": server.memory_bytes(),
+            }
+            for server in self.servers.values()
+        ]
+
+    async def _monitor(self) -> None:
+        """Stop idle processes and restart ones over the memory cap."""
+        while True:
+            await asyncio.sleep(self.check_interval_seconds)
+            now = time.monotonic()
+            for token, server in list(self.servers.items()):
+                try:
+                    if not server.clients and now - server.idle_since > self.idle_seconds:
+                        del self.servers[token]
+                        await server.stop()
+                        continue
+                    if self.max_memory_mb:
+                        used = server.memory_bytes()
+                        if used and used > self.max_memory_mb * 1024 * 1024:
+                            logger.warning(
+                                "Pooled MCP server over memory cap, restarting",
+                                extra={"command": server.config["command"], "rss_bytes": used},
+                            )
+                            server.kill()
+                except Exception as e:
+                    logger.error("MCP process pool check failed", extra={"error": str(e)})
+
+    def _build_app(self):
+        """Build the proxy's SSE endpoints."""
+        from starlette.applications import Starlette
+        from starlette.requests import Request
+        from starlette.responses import PlainTextResponse, Response, StreamingResponse
+        from starlette.routing import Route
+
+        heartbeat = settings.sse_heartbeat_seconds
+
+        async def sse(request: Request) -> Response:
+            server = self.servers.get(request.path_params["token"])
+            if server is None:
+                return PlainTextResponse("Unknown MCP server", status_code=404)
+            try:
+                await server.ensure_started()
+            except Exception as e:
+                return PlainTextResponse(f"MCP server failed to start: {e}", status_code=503)
+            client = server.connect()
+
+            async def events():
+                try:
+                    endpoint = f"/servers/{server.token}/messages?session_id={client.id}"
+                    yield f"event: endpoint\ndata: {endpoint}\n\n"
+                    while True:
+                        try:
+                            message = await asyncio.wait_for(client.queue.get(), heartbeat)
+                        except asyncio.TimeoutError:
+                            yield ": ping\n\n"
+                            continue
+                        if message is None:
+                            return
+                        yield f"event: message\ndata: {json.dumps(message)}\n\n"
+                finally:
+                    server.disconnect(client)
+
+            return StreamingResponse(
+                events(),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache"},
+            )
+
+        async def messages(request: Request) -> Response:
+            server = self.servers.get(request.path_params["token"])
+            client = server.clients.get(request.query_params.get("session_id", "")) if server else None
+            if client is None:
+                return PlainTextResponse("Unknown session", status_code=404)
+            try:
+                body = json.loads(await request.body())
+            except ValueError:
+                return PlainTextResponse("Invalid JSON", status_code=400)
+            for message in body if isinstance(body, list) else [body]:
+                if isinstance(message, dict):
+                    await server.handle_client_message(client, message)
+            return PlainTextResponse("Accepted", status_code=202)
+
+        return Starlette(routes=[
+            Route("/servers/{token}/sse", sse, methods=["GET"]),
+            Route("/servers/{token}/messages", messages, methods=["POST"]),
+        ])
+
+
+_mcp_process_pool: Optional[MCPProcessPool] = None
+
+
+def get_mcp_process_pool() -> MCPProcessPool:
+    """Get the process-wide MCP process pool."""
+    global _mcp_process_pool
+    if _mcp_process_pool is None:
+        _mcp_process_pool = MCPProcessPool()
+    return _mcp_process_pool
+
+
+def route_mcp_servers(mcp_servers: Dict[str, Any]) -> Dict[str, Any]:
+    """Route a session's stdio MCP servers through the pool when it is running."""
+    if not settings.mcp_process_pool_enabled:
+        return mcp_servers
+    return get_mcp_process_pool().route(mcp_servers)
+
+
+__all__ = ["MCPProcessPool", "PooledServer", "get_mcp_process_pool", "route_mcp_servers"]
@@ -0,0 +1,257 @@
+"""
+Query Executor - Bounded, read-only execution for the query_database SDK tool.
+
+Agent-written SQL runs on a dedicated small connection pool, never on the
+pool that serves API requests, inside a ``READ ONLY`` transaction with a
+``statement_timeout``. The query is wrapped as a subselect with a hard row
+cap (``SELECT * FROM (<query>) AS q LIMIT n``) so a ``LIMIT`` inside the
+query cannot lift it, and rows are streamed through a server-side cursor
+into a formatter that truncates long cells and stops at a total byte
+budget. A wide or runaway SELECT therefore costs at most one pooled
+connection for ``query_tool_statement_timeout_ms``.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+FORBIDDEN_KEYWORDS = (
+    "DROP", "DELETE", "INSERT", "UPDATE", "ALTER",
+    "CREATE", "TRUNCATE", "GRANT", "REVOKE",
+)
+_FORBIDDEN_PATTERN = re.compile(r"\b(" + "|".join(FORBIDDEN_KEYWORDS) + r")\b", re.IGNORECASE)
+
+
+class QueryRejectedError(ValueError):
+    """Raised when a query is not a single read-only SELECT."""
+
+
+def build_bounded_query(query: str, max_rows: int) -> str:
+    """Validate a SELECT and wrap it with a hard row cap.
+
+    One extra row is fetched so the caller can tell the result was capped.
+
+    Args:
+        query: Agent-supplied SQL
+        max_rows: Maximum rows to return
+
+    Returns:
+        Wrapped SQL with a ``:row_cap`` bind parameter
+
+    Raises:
+        QueryRejectedError: If the query is not a single SELECT
+    """
+    query = query.strip().rstrip(";").strip()
+    if ";" in query:
+        raise QueryRejectedError("Only a single statement is allowed.")
+
+    match = _FORBIDDEN_PATTERN.search(query)
+    if match:
+        raise QueryRejectedError(
+            f"Query contains dangerous keyword '{match.group(1).upper()}'. Only SELECT queries are allowed."
+        )
+
+    first_word = query.split(None, 1)[0].upper() if query else ""
+    if first_word not in ("SELECT", "WITH"):
+        raise QueryRejectedError("Only SELECT queries are allowed.")
+
+    return f"SELECT * FROM (\n{query}\n) AS bounded_query LIMIT :row_cap"
+
+
+@dataclass
+class FormattedResult:
+    """Markdown rendering of a bounded query result."""
+
+    text: str
+    row_count: int
+    row_capped: bool = False
+    byte_capped: bool = False
+
+
+def _format_cell(value: Any, max_chars: int) -> str:
+    """Render one cell, escaped for a markdown table and truncated."""
+    cell = "NULL" if value is None else str(value)
+    if len(cell) > max_chars:
+        cell = cell[:max_chars] + "…"
+    return cell.replace("\\", "\\\\").replace("|", "\\|").replace("\r", " ").replace("\n", " ")
+
+
+class MarkdownTableFormatter:
+    """Builds a markdown table row by row within a byte budget."""
+
+    def __init__(self, columns: Iterable[str], max_cell_chars: int, max_bytes: int):
+        """Initialize formatter.
+
+        Args:
+            columns: Column names
+            max_cell_chars: Characters kept per cell
+            max_bytes: Total UTF-8 size of the rendered table
+        """
+        self.max_cell_chars = max_cell_chars
+        self.max_bytes = max_bytes
+        names = [_format_cell(c, max_cell_chars) for c in columns]
+        self._lines: List[str] = [
+            "| " + " | ".join(names) + " |",
+            "|" + "|".join("---" for _ in names) + "|",
+        ]
+        self._size = sum(len(line.encode()) + 1 for line in self._lines)
+        self.row_count = 0
+        self.byte_capped = False
+
+    def add_row(self, row: Iterable[Any]) -> bool:
+        """Append a row.
+
+        Returns:
+            False (and the row is dropped) once the byte budget is exhausted
+        """
+        line = "| " + " | ".join(_format_cell(v, self.max_cell_chars) for v in row) + " |"
+        size = len(line.encode()) + 1
+        if self._size + size > self.max_bytes:
+            self.byte_capped = True
+            return False
+        self._lines.append(line)
+        self._size += size
+        self.row_count += 1
+        return True
+
+    def render(self) -> str:
+        """Get the table."""
+        return "\n".join(self._lines) + "\n"
+
+
+async def format_rows(
+    columns: Iterable[str],
+    rows: AsyncIterable[Iterable[Any]],
+    max_rows: int,
+    max_cell_chars: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> FormattedResult:
+    """Render streamed rows, stopping at max_rows or the byte budget.
+
+    Args:
+        columns: Column names
+        rows: Rows as they arrive from the cursor (up to max_rows + 1)
+        max_rows: Rows to render; an extra row marks the result as capped
+        max_cell_chars: Characters kept per cell
+        max_bytes: Total size of the rendered table
+
+    Returns:
+        FormattedResult
+    """
+    formatter = MarkdownTableFormatter(
+        columns,
+        max_cell_chars or settings.query_tool_max_cell_chars,
+        max_bytes or settings.query_tool_max_output_bytes,
+    )
+    row_capped = False
+    async for row in rows:
+        if formatter.row_count >= max_rows:
+            row_capped = True
+            break
+        if not formatter.add_row(row):
+            break
+    return FormattedResult(
+        text=formatter.render(),
+        row_count=formatter.row_count,
+        row_capped=row_capped,
+        byte_capped=formatter.byte_capped,
+    )
+
+
+class ReadOnlyQueryExecutor:
+    """Runs agent queries on a dedicated pool in read-only, time-limited transactions."""
+
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        statement_timeout_ms: Optional[int] = None,
+    ):
+        """Initialize executor.
+
+        Args:
+            database_url: Database URL (defaults to the application database)
+            pool_size: Connections reserved for agent queries
+            statement_timeout_ms: Per-query statement_timeout
+        """
+        self.database_url = database_url or settings.database_url
+        self.pool_size = pool_size or settings.query_tool_pool_size
+        self.statement_timeout_ms = statement_timeout_ms or settings.query_tool_statement_timeout_ms
+        self._engine: Optional[AsyncEngine] = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """Get the dedicated engine, creating it on first use."""
+        if self._engine is None:
+            engine_kwargs = {"echo": False, "pool_pre_ping": True}
+            if settings.environment == "test":
+                engine_kwargs["poolclass"] = NullPool
+            else:
+                engine_kwargs["pool_size"] = self.pool_size
+                engine_kwargs["max_overflow"] = 0
+                engine_kwargs["pool_timeout"] = self.statement_timeout_ms / 1000
+            self._engine = create_async_engine(self.database_url, **engine_kwargs)
+        return self._engine
+
+    async def execute(self, query: str, max_rows: Optional[int] = None) -> FormattedResult:
+        """Execute a SELECT and render its result as a markdown table.
+
+        Args:
+            query: Agent-supplied SQL
+            max_rows: Rows to return (capped at query_tool_max_rows)
+
+        Returns:
+            FormattedResult
+
+        Raises:
+            QueryRejectedError: If the query is not a single SELECT
+        """
+        max_rows = max(1, min(max_rows or settings.query_tool_max_rows, settings.query_tool_max_rows))
+        bounded = build_bounded_query(query, max_rows)
+
+        async with self.engine.connect() as conn:
+            async with conn.begin():
+                await conn.execute(text("SET TRANSACTION READ ONLY"))
+                await conn.execute(text(f"SET LOCAL statement_timeout = {int(self.statement_timeout_ms)}"))
+                result = await conn.stream(text(bounded), {"row_cap": max_rows + 1})
+                try:
+                    return await format_rows(list(result.keys()), result, max_rows)
+                finally:
+                    await result.close()
+
+    async def close(self) -> None:
+        """Dispose of the dedicated pool."""
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+
+_query_executor: Optional[ReadOnlyQueryExecutor] = None
+
+
+def get_query_executor() -> ReadOnlyQueryExecutor:
+    """Get the process-wide read-only query executor."""
+    global _query_executor
+    if _query_executor is None:
+        _query_executor = ReadOnlyQueryExecutor()
+    return _query_executor
+
+
+__all__ = [
+    "FormattedResult",
+    "MarkdownTableFormatter",
+    "QueryRejectedError",
+    "ReadOnlyQueryExecutor",
+    "build_bounded_query",
+    "format_rows",
+    "get_query_executor",
+]
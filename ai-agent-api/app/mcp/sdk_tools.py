@@ -7,6 +7,9 @@ The SDK registers them as MCP tools that Claude can use.
 
 from typing import Any, Dict
 
+from app.core.config import settings
+from app.mcp.tool_cache import cached_tool, normalize_args
+
 # Mock @tool decorator and create_sdk_mcp_server due to SDK issues
 try:
     from claude_agent_sdk import tool
@@ -35,33 +38,56 @@ def create_sdk_mcp_server(name: str, version: str = "1.0.0", tools: list = None)
 # Kubernetes Tools (Read-Only)
 # ============================================================================
 
+def _pod_list_key(args: Dict[str, Any]) -> Dict[str, Any]:
+    """Cache key of a list_pods call, with defaults filled in."""
+    all_namespaces = bool(args.get("all_namespaces"))
+    return normalize_args({
+        **args,
+        "namespace": None if all_namespaces else (args.get("namespace") or "default"),
+        "all_namespaces": all_namespaces,
+        "limit": int(args.get("limit") or settings.kubernetes_list_page_size),
+    })
+
+
 @tool(
     name="list_pods",
-    description="List all pods in a Kubernetes namespace with their status",
+    description=(
+        "List pods in a Kubernetes namespace (or all namespaces) with their status. "
+        "Results are paginated: pass the returned continue token to get the next page."
+    ),
     input_schema={
         "namespace": str,
-        "label_selector": str  # Optional: e.g., "app=nginx"
+        "all_namespaces": bool,  # Optional: list across the whole cluster
+        "label_selector": str,  # Optional: e.g., "app=nginx"
+        "field_selector": str,  # Optional: e.g., "status.phase=Running"
+        "limit": int,  # Optional: page size (default 100)
+        "continue": str  # Optional: token from the previous page
     }
 )
+@cached_tool(ttl_seconds=15, key=_pod_list_key)
 async def list_pods(args: Dict[str, Any]) -> Dict[str, Any]:
-    """List pods in a namespace."""
+    """List pods in a namespace, one page at a time."""
     try:
-        from kubernetes import client, config
-        
-        namespace = args.get("namespace", "default")
-        label_selector = args.get("label_selector", "")
-        
-        # Load kubeconfig
-        try:
-            config.load_incluster_config()
-        except:
-            config.load_kube_config()
-        
-        v1 = client.CoreV1Api()
-        pods = v1.list_namespaced_pod(
-            namespace=namespace,
-            label_selector=label_selector
-        )
+        from app.mcp.kubernetes_client import get_kubernetes_client
+        
+        namespace = args.get("namespace") or "default"
+        all_namespaces = bool(args.get("all_namespaces"))
+        limit = min(int(args.get("limit") or settings.kubernetes_list_page_size), 1000)
+        list_kwargs = {"limit": limit}
+        for arg, kwarg in (
+            ("label_selector", "label_selector"),
+            ("field_selector", "field_selector"),
+            ("continue", "_continue"),
+        ):
+            if args.get(arg):
+                list_kwargs[kwarg] = args[arg]
+        
+        def fetch(v1):
+            if all_namespaces:
+                return v1.list_pod_for_all_namespaces(**list_kwargs)
+            return v1.list_namespaced_pod(namespace=namespace, **list_kwargs)
+        
+        pods = await get_kubernetes_client().call(fetch)
         
         # Format pod list
         pod_list = []
@@ -80,14 +106,26 @@ async def list_pods(args: Dict[str, Any]) -> Dict[str, Any]:
             pod_list.append(pod_info)
         
         # Format as markdown table
+        scope = "all namespaces" if all_namespaces else f"namespace '{namespace}'"
         if pod_list:
-            table = "| Name | Status | Ready | Restarts | Age | Node |\n"
-            table += "|------|--------|-------|----------|-----|------|\n"
+            if all_namespaces:
+                table = "| Namespace | Name | Status | Ready | Restarts | Age | Node |\n"
+                table += "|-----------|------|--------|-------|----------|-----|------|\n"
+            else:
+                table = "| Name | Status | Ready | Restarts | Age | Node |\n"
+                table += "|------|--------|-------|----------|-----|------|\n"
             for p in pod_list:
-                table += f"| {p['name']} | {p['status']} | {p['ready']}/{p['total_containers']} | {p['restarts']} | {p['age']} | {p['node']} |\n"
+                prefix = f"| {p['namespace']} " if all_namespaces else ""
+                table += prefix + f"| {p['name']} | {p['status']} | {p['ready']}/{p['total_containers']} | {p['restarts']} | {p['age']} | {p['node']} |\n"
             output = table
         else:
-            output = f"No pods found in namespace '{namespace}'"
+            output = f"No pods found in {scope}"
+        
+        continue_token = pods.metadata._continue if pods.metadata else None
+        if continue_token:
+            remaining = pods.metadata.remaining_item_count
+            more = f"{remaining} more pods" if remaining else "More pods"
+            output += f"\n{more} in {scope}. Pass continue=\"{continue_token}\" for the next page."
         
         return {
             "content": [{
@@ -119,25 +157,20 @@ async def list_pods(args: Dict[str, Any]) -> Dict[str, Any]:
 async def get_pod_logs(args: Dict[str, Any]) -> Dict[str, Any]:
     """Get pod logs."""
     try:
-        from kubernetes import client, config
+        from app.mcp.kubernetes_client import get_kubernetes_client
         
         pod_name = args["pod_name"]
         namespace = args.get("namespace", "default")
         container = args.get("container")
         tail_lines = args.get("tail_lines", 100)
         
-        # Load kubeconfig
-        try:
-            config.load_incluster_config()
-        except:
-            config.load_kube_config()
-        
-        v1 = client.CoreV1Api()
-        logs = v1.read_namespaced_pod_log(
-            name=pod_name,
-            namespace=namespace,
-            container=container,
-            tail_lines=tail_lines
+        logs = await get_kubernetes_client().call(
+            lambda v1: v1.read_namespaced_pod_log(
+                name=pod_name,
+                namespace=namespace,
+                container=container,
+                tail_lines=tail_lines
+            )
         )
         
         return {
@@ -165,22 +198,18 @@ async def get_pod_logs(args: Dict[str, Any]) -> Dict[str, Any]:
         "namespace": str
     }
 )
+@cached_tool(ttl_seconds=10, key=lambda args: {**normalize_args(args), "namespace": args.get("namespace") or "default"})
 async def describe_pod(args: Dict[str, Any]) -> Dict[str, Any]:
     """Describe a pod in detail."""
     try:
-        from kubernetes import client, config
+        from app.mcp.kubernetes_client import get_kubernetes_client
         
         pod_name = args["pod_name"]
         namespace = args.get("namespace", "default")
         
-        # Load kubeconfig
-        try:
-            config.load_incluster_config()
-        except:
-            config.load_kube_config()
-        
-        v1 = client.CoreV1Api()
-        pod = v1.read_namespaced_pod(name=pod_name, namespace=namespace)
+        pod = await get_kubernetes_client().call(
+            lambda v1: v1.read_namespaced_pod(name=pod_name, namespace=namespace)
+        )
         
         # Build detailed description
         description = f"# Pod: {pod_name}\n\n"
@@ -226,19 +255,13 @@ async def describe_pod(args: Dict[str, Any]) -> Dict[str, Any]:
     description="List all Kubernetes namespaces",
     input_schema={}
 )
+@cached_tool(ttl_seconds=30, key=lambda args: {})
 async def list_namespaces(args: Dict[str, Any]) -> Dict[str, Any]:
     """List all namespaces."""
     try:
-        from kubernetes import client, config
-        
-        # Load kubeconfig
-        try:
-            config.load_incluster_config()
-        except:
-            config.load_kube_config()
+        from app.mcp.kubernetes_client import get_kubernetes_client
         
-        v1 = client.CoreV1Api()
-        namespaces = v1.list_namespace()
+        namespaces = await get_kubernetes_client().call(lambda v1: v1.list_namespace())
         
         # Format as list
         ns_list = [ns.metadata.name for ns in namespaces.items]
@@ -276,69 +299,42 @@ async def list_namespaces(args: Dict[str, Any]) -> Dict[str, Any]:
 async def query_database(args: Dict[str, Any]) -> Dict[str, Any]:
     """Execute read-only database query."""
     try:
-        from sqlalchemy import text
-        from app.database.session import get_db
+        from app.mcp.query_executor import QueryRejectedError, get_query_executor
         
-        query = args["query"].strip()
+        query = args["query"]
         limit = args.get("limit", 100)
         
-        # Safety checks - block dangerous operations
-        dangerous_keywords = [
-            "DROP", "DELETE", "INSERT", "UPDATE", "ALTER", 
-            "CREATE", "TRUNCATE", "GRANT", "REVOKE"
-        ]
-        query_upper = query.upper()
-        for keyword in dangerous_keywords:
-            if keyword in query_upper:
-                return {
-                    "content": [{
-                        "type": "text",
-                        "text": f"Error: Query contains dangerous keyword '{keyword}'. Only SELECT queries are allowed."
-                    }],
-                    "isError": True
-                }
-        
-        # Ensure it's a SELECT query
-        if not query_upper.startswith("SELECT"):
+        try:
+            result = await get_query_executor().execute(query, max_rows=limit)
+        except QueryRejectedError as e:
             return {
                 "content": [{
                     "type": "text",
-                    "text": "Error: Only SELECT queries are allowed."
+                    "text": f"Error: {e}"
                 }],
                 "isError": True
             }
         
-        # Add LIMIT if not present
-        if "LIMIT" not in query_upper:
-            query += f" LIMIT {min(limit, 1000)}"
-        
-        # Execute query
-        async for db in get_db():
-            result = await db.execute(text(query))
-            rows = result.fetchall()
-            
-            if not rows:
-                return {
-                    "content": [{
-                        "type": "text",
-                        "text": "Query returned no results."
-                    }]
-                }
-            
-            # Format as markdown table
-            columns = result.keys()
-            table = "| " + " | ".join(columns) + " |\n"
-            table += "|" + "|".join(["---" for _ in columns]) + "|\n"
-            
-            for row in rows:
-                table += "| " + " | ".join(str(v) for v in row) + " |\n"
-            
+        if not result.row_count and not result.byte_capped:
             return {
                 "content": [{
                     "type": "text",
-                    "text": f"Query results ({len(rows)} rows):\n\n{table}"
+                    "text": "Query returned no results."
                 }]
             }
+        
+        output = f"Query results ({result.row_count} rows):\n\n{result.text}"
+        if result.row_capped:
+            output += f"\nResult truncated to {result.row_count} rows; add filters or a smaller LIMIT."
+        elif result.byte_capped:
+            output += f"\nResult truncated after {result.row_count} rows (output size limit); select fewer columns."
+        
+        return {
+            "content": [{
+                "type": "text",
+                "text": output
+            }]
+        }
     
     except Exception as e:
         return {
@@ -357,6 +353,7 @@ async def query_database(args: Dict[str, Any]) -> Dict[str, Any]:
         "table_name": str
     }
 )
+@cached_tool(ttl_seconds=300)
 async def describe_table(args: Dict[str, Any]) -> Dict[str, Any]:
     """Describe a database table schema."""
     try:
@@ -425,28 +422,41 @@ async def describe_table(args: Dict[str, Any]) -> Dict[str, Any]:
     input_schema={}
 )
 async def get_system_metrics(args: Dict[str, Any]) -> Dict[str, Any]:
-    """Get system metrics."""
+    """Get system metrics from the background sampler."""
     try:
-        import psutil
+        from app.claude_sdk.monitoring.system_metrics import get_system_metrics_sampler
         
-        # CPU
-        cpu_percent = psutil.cpu_percent(interval=1)
-        cpu_count = psutil.cpu_count()
+        sampler = get_system_metrics_sampler()
+        if not sampler.running and sampler.interval_seconds > 0:
+            sampler.start()
         
-        # Memory
-        memory = psutil.virtual_memory()
-        memory_used_gb = memory.used / (1024 ** 3)
-        memory_total_gb = memory.total / (1024 ** 3)
+        # On-demand sample while background sampling is off or warming up
+        sample = await sampler.current()
+        minute = sampler.window(60)
+        five_minutes = sampler.window(300)
         
-        # Disk
-        disk = psutil.disk_usage('/')
-        disk_used_gb = disk.used / (1024 ** 3)
-        disk_total_gb = disk.total / (1024 ** 3)
+        memory_used_gb = sample.memory_used_bytes / (1024 ** 3)
+        memory_total_gb = sample.memory_total_bytes / (1024 ** 3)
+        disk_used_gb = sample.disk_used_bytes / (1024 ** 3)
+        disk_total_gb = sample.disk_total_bytes / (1024 ** 3)
         
         output = "# System Metrics\n\n"
-        output += f"**CPU Usage:** {cpu_percent}% ({cpu_count} cores)\n"
-        output += f"**Memory:** {memory_used_gb:.2f}GB / {memory_total_gb:.2f}GB ({memory.percent}%)\n"
-        output += f"**Disk:** {disk_used_gb:.2f}GB / {disk_total_gb:.2f}GB ({disk.percent}%)\n"
+        output += f"**CPU Usage:** {sample.cpu_percent}% ({sampler.cpu_count} cores)\n"
+        output += f"**Memory:** {memory_used_gb:.2f}GB / {memory_total_gb:.2f}GB ({sample.memory_percent}%)\n"
+        output += f"**Disk:** {disk_used_gb:.2f}GB / {disk_total_gb:.2f}GB ({sample.disk_percent}%)\n"
+        output += (
+            f"**Network:** {sample.net_sent_bytes_per_second / 1024:.1f} KB/s sent, "
+            f"{sample.net_recv_bytes_per_second / 1024:.1f} KB/s received\n"
+        )
+        
+        for label, window in (("Last 1m", minute), ("Last 5m", five_minutes)):
+            if window["samples"] > 1:
+                cpu = window["cpu_percent"]
+                memory = window["memory_percent"]
+                output += (
+                    f"**{label}:** CPU avg {cpu['avg']:.1f}% / p95 {cpu['p95']:.1f}% / max {cpu['max']:.1f}%, "
+                    f"memory avg {memory['avg']:.1f}% ({window['samples']} samples)\n"
+                )
         
         return {
             "content": [{
@@ -0,0 +1,265 @@
+"""
+Tool Result Cache - Short-lived results for idempotent read-only SDK tools.
+
+Agents investigating an incident call the same read-only tools with the
+same arguments many times, within a session and across concurrent sessions.
+Tools opt in with ``@cached_tool(ttl_seconds)`` (under ``@tool``) and
+successful results are reused for the TTL:
+
+- Entries live in an in-process LRU, and are shared with other workers
+  through Redis when ``mcp_tool_cache_backend = "redis"``.
+- Concurrent identical calls in a process are coalesced: one call runs and
+  the others await its result (single flight). If that call is cancelled,
+  a waiting caller takes over and makes the call itself.
+- Error results (``isError``) and exceptions are never cached.
+
+Keys are built from the tool name and its arguments, normalized by the
+tool's key function (by default: drop empty values and sort keys).
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from prometheus_client import Counter
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+ToolHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+TOOL_CACHE_LOOKUPS = Counter(
+    "mcp_tool_cache_lookups_total",
+    "SDK MCP tool result cache lookups",
+    ["tool", "result"],
+)
+
+
+def normalize_args(args: Dict[str, Any]) -> Dict[str, Any]:
+    """Default cache key function: drop empty values so omitted and blank args match."""
+    return {key: value for key, value in args.items() if value not in (None, "", [], {})}
+
+
+class ToolResultCache:
+    """TTL cache of SDK MCP tool results with single-flight deduplication."""
+
+    def __init__(
+        self,
+        redis=None,
+        use_redis: Optional[bool] = None,
+        max_entries: Optional[int] = None,
+        key_prefix: str = "mcp_tool:",
+    ):
+        """Initialize cache.
+
+        Args:
+            redis: Redis client (defaults to RedisClientManager's client)
+            use_redis: Share results with other workers through Redis
+            max_entries: Results kept in process memory
+            key_prefix: Redis key prefix
+        """
+        self._redis = redis
+        self.use_redis = (
+            settings.mcp_tool_cache_backend == "redis" if use_redis is None else use_redis
+        )
+        self.max_entries = max_entries or settings.mcp_tool_cache_max_entries
+        self.key_prefix = key_prefix
+
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self.stats = {"hits": 0, "shared_hits": 0, "coalesced": 0, "misses": 0}
+
+    @property
+    def redis(self):
+        """Get the Redis client, or None if unavailable."""
+        if not self.use_redis:
+            return None
+        if self._redis is None:
+            from app.infrastructure.redis_client import RedisClientManager
+            try:
+                return RedisClientManager.get_client()
+            except RuntimeError:
+                return None
+        return self._redis
+
+    @staticmethod
+    def make_key(tool_name: str, key_args: Any) -> str:
+        """Build the cache key of a call."""
+        encoded = json.dumps(key_args, sort_keys=True, default=str, separators=(",", ":"))
+        return f"{tool_name}:{hashlib.sha256(encoded.encode()).hexdigest()[:32]}"
+
+    async def get_or_call(
+        self,
+        tool_name: str,
+        key_args: Any,
+        ttl_seconds: float,
+        call: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Get a cached result, or make the call once for all concurrent callers.
+
+        Args:
+            tool_name: Tool name (key namespace and metrics label)
+            key_args: Normalized arguments identifying the call
+            ttl_seconds: How long a successful result is reused
+            call: Runs the tool
+
+        Returns:
+            Tool result (do not mutate)
+        """
+        key = self.make_key(tool_name, key_args)
+
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._record(tool_name, "hits")
+                    return entry[1]
+                del self._entries[key]
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                return await self._call_once(tool_name, key, ttl_seconds, call)
+
+            self._record(tool_name, "coalesced")
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # Only the caller making the call was cancelled: take over
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+    async def _call_once(
+        self,
+        tool_name: str,
+        key: str,
+        ttl_seconds: float,
+        call: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Make the call on behalf of every concurrent caller of key."""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._read_shared(key)
+            if result is not None:
+                self._record(tool_name, "shared_hits")
+                self._store(key, result, ttl_seconds)
+            else:
+                self._record(tool_name, "misses")
+                result = await call()
+                if not result.get("isError"):
+                    self._store(key, result, ttl_seconds)
+                    await self._write_shared(key, result, ttl_seconds)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieve it so an un-awaited future does not log a warning
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def clear(self) -> None:
+        """Drop every result held in process memory."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics for this process."""
+        return {"entries": len(self._entries), **self.stats}
+
+    def _record(self, tool_name: str, result: str) -> None:
+        self.stats[result] += 1
+        TOOL_CACHE_LOOKUPS.labels(tool=tool_name, result=result).inc()
+
+    def _store(self, key: str, result: Dict[str, Any], ttl_seconds: float) -> None:
+        """Keep a result in process memory, evicting the least recently used."""
+        self._entries[key] = (time.monotonic() + ttl_seconds, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _read_shared(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read a result stored by any worker."""
+        redis = self.redis
+        if redis is None:
+            return None
+        try:
+            data = await redis.get(self.key_prefix + key)
+        except Exception as e:
+            logger.debug(f"MCP tool cache read failed: {e}")
+            return None
+        return json.loads(data) if data is not None else None
+
+    async def _write_shared(self, key: str, result: Dict[str, Any], ttl_seconds: float) -> None:
+        """Share a result with other workers."""
+        redis = self.redis
+        if redis is None:
+            return
+        try:
+            await redis.set(self.key_prefix + key, json.dumps(result), ex=max(1, int(ttl_seconds)))
+        except Exception as e:
+            logger.debug(f"MCP tool cache write failed: {e}")
+
+
+_tool_result_cache: Optional[ToolResultCache] = None
+
+
+def get_tool_result_cache() -> ToolResultCache:
+    """Get the process-wide tool result cache."""
+    global _tool_result_cache
+    if _tool_result_cache is None:
+        _tool_result_cache = ToolResultCache()
+    return _tool_result_cache
+
+
+def cached_tool(
+    ttl_seconds: float,
+    key: Callable[[Dict[str, Any]], Any] = normalize_args,
+    name: Optional[str] = None,
+) -> Callable[[ToolHandler], ToolHandler]:
+    """Cache a read-only tool handler's successful results.
+
+    Apply below ``@tool`` so the SDK registers the cached handler::
+
+        @tool(name="list_namespaces", ...)
+        @cached_tool(ttl_seconds=30)
+        async def list_namespaces(args): ...
+
+    Args:
+        ttl_seconds: How long a result is reused (0 disables caching)
+        key: Maps the tool's args to the values identifying a call
+        name: Cache namespace (defaults to the function name)
+    """
+    def decorator(handler: ToolHandler) -> ToolHandler:
+        tool_name = name or handler.__name__
+
+        @functools.wraps(handler)
+        async def wrapper(args: Dict[str, Any]) -> Dict[str, Any]:
+            if ttl_seconds <= 0 or not settings.mcp_tool_cache_enabled:
+                return await handler(args)
+            return await get_tool_result_cache().get_or_call(
+                tool_name, key(args), ttl_seconds, lambda: handler(args)
+            )
+
+        wrapper.cache_ttl_seconds = ttl_seconds
+        return wrapper
+
+    return decorator
+
+
+__all__ = [
+    "ToolResultCache",
+    "cached_tool",
+    "get_tool_result_cache",
+    "normalize_args",
+]
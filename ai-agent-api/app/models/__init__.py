@@ -15,6 +15,7 @@ from app.models.hook_execution import HookExecutionModel
 from app.models.permission_decision import PermissionDecisionModel
 from app.models.working_directory_archive import WorkingDirectoryArchiveModel
 from app.models.session_metrics_snapshot import SessionMetricsSnapshotModel
+from app.models.storage_usage import StorageUsageModel, StorageUsageTotalModel
 
 __all__ = [
     "OrganizationModel",
@@ -34,4 +35,6 @@ __all__ = [
     "PermissionDecisionModel",
     "WorkingDirectoryArchiveModel",
     "SessionMetricsSnapshotModel",
+    "StorageUsageModel",
+    "StorageUsageTotalModel",
 ]
@@ -1,7 +1,7 @@
 """MCP server database model."""
 from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import Column, String, Text, Boolean, ForeignKey, DateTime, CheckConstraint, Index, UniqueConstraint
+from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, CheckConstraint, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from app.database.base import JSONB
 from sqlalchemy.orm import relationship
@@ -34,6 +34,9 @@ class MCPServerModel(Base):
     # Health
     last_health_check_at = Column(DateTime(timezone=True))
     health_status = Column(String(50))  # 'healthy', 'degraded', 'unhealthy', 'unknown'
+    last_error = Column(Text)  # error of the last failed probe
+    health_latency_ms = Column(Integer)  # initialize + list-tools round trip
+    health_tools = Column(JSONB)  # tool names reported by the last probe
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
@@ -0,0 +1,78 @@
+"""Storage usage accounting database models."""
+from datetime import datetime
+from uuid import uuid4
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    Integer,
+    BigInteger,
+    ForeignKey,
+    DateTime,
+    CheckConstraint,
+    Index,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from app.database.base import Base
+
+
+class StorageUsageModel(Base):
+    """Per-path storage usage table model.
+
+    One row per working directory, archive file or report file, holding the
+    byte and file counts measured when the resource was last written.
+    """
+
+    __tablename__ = "storage_usage"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    execution_id = Column(UUID(as_uuid=True), ForeignKey("task_executions.id", ondelete="SET NULL"))
+
+    # Resource
+    resource_type = Column(String(50), nullable=False)  # 'working_directory', 'archive', 'report'
+    resource_path = Column(Text, nullable=False, unique=True)
+
+    # Counters
+    size_bytes = Column(BigInteger, nullable=False, default=0)
+    file_count = Column(Integer, nullable=False, default=0)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    reconciled_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        CheckConstraint(
+            "resource_type IN ('working_directory', 'archive', 'report')",
+            name="chk_storage_usage_resource_type"
+        ),
+        CheckConstraint("size_bytes >= 0 AND file_count >= 0", name="chk_storage_usage_counters"),
+        Index("idx_storage_usage_user_type", "user_id", "resource_type"),
+    )
+
+
+class StorageUsageTotalModel(Base):
+    """Aggregated storage usage counters.
+
+    Keyed by owner ('global' or a user ID) and resource type so per-user and
+    system-wide usage can be read with a single-row lookup.
+    """
+
+    __tablename__ = "storage_usage_totals"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    owner_key = Column(String(64), nullable=False)  # 'global' or user UUID
+    resource_type = Column(String(50), nullable=False)
+
+    # Counters
+    size_bytes = Column(BigInteger, nullable=False, default=0)
+    file_count = Column(BigInteger, nullable=False, default=0)
+
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("owner_key", "resource_type", name="uq_storage_usage_totals_owner_type"),
+    )
@@ -11,6 +11,7 @@ from app.repositories.hook_execution_repository import HookExecutionRepository
 from app.repositories.permission_decision_repository import PermissionDecisionRepository
 from app.repositories.working_directory_archive_repository import WorkingDirectoryArchiveRepository
 from app.repositories.session_metrics_snapshot_repository import SessionMetricsSnapshotRepository
+from app.repositories.storage_usage_repository import StorageUsageRepository
 
 __all__ = [
     "BaseRepository",
@@ -25,4 +26,5 @@ __all__ = [
     "PermissionDecisionRepository",
     "WorkingDirectoryArchiveRepository",
     "SessionMetricsSnapshotRepository",
+    "StorageUsageRepository",
 ]
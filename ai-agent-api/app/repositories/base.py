@@ -83,3 +83,13 @@ class BaseRepository(Generic[ModelType]):
         query = select(func.count()).select_from(self.model).where(self.model.id == id)
         result = await self.db.execute(query)
         return result.scalar_one() > 0
+
+    async def get_by_ids(self, ids: List[UUID]) -> List[ModelType]:
+        """Get records for several IDs in one query. Missing IDs are skipped."""
+        if not ids:
+            return []
+
+        result = await self.db.execute(
+            select(self.model).where(self.model.id.in_(ids))
+        )
+        return list(result.scalars().all())
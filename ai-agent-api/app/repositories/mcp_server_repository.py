@@ -3,6 +3,7 @@
 Repository for MCP server configuration persistence and retrieval.
 """
 
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy import select, and_
@@ -124,6 +125,8 @@ class MCPServerRepository(BaseRepository[MCPServerModel]):
         server_id: UUID,
         status: str,
         last_error: Optional[str] = None,
+        latency_ms: Optional[int] = None,
+        tools: Optional[List[str]] = None,
     ) -> Optional[MCPServerModel]:
         """Update server health status.
         
@@ -131,6 +134,8 @@ class MCPServerRepository(BaseRepository[MCPServerModel]):
             server_id: Server UUID
             status: Health status
             last_error: Optional error message
+            latency_ms: Optional probe round trip in milliseconds
+            tools: Optional tool names reported by the server
             
         Returns:
             Updated MCPServerModel
@@ -141,6 +146,9 @@ class MCPServerRepository(BaseRepository[MCPServerModel]):
 
         server.health_status = status
         server.last_error = last_error
+        server.health_latency_ms = latency_ms
+        server.health_tools = tools
+        server.last_health_check_at = datetime.utcnow()
         await self.db.commit()
         await self.db.refresh(server)
         return server
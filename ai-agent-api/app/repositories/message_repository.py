@@ -29,6 +29,29 @@ class MessageRepository(BaseRepository[MessageModel]):
         )
         return list(result.scalars().all())
 
+    async def get_after_sequence(
+        self,
+        session_id: UUID,
+        after_sequence: int,
+        before_sequence: Optional[int] = None,
+        limit: int = 1000,
+    ) -> List[MessageModel]:
+        """Get messages with after_sequence < sequence_number < before_sequence."""
+        conditions = [
+            MessageModel.session_id == session_id,
+            MessageModel.sequence_number > after_sequence,
+        ]
+        if before_sequence is not None:
+            conditions.append(MessageModel.sequence_number < before_sequence)
+
+        result = await self.db.execute(
+            select(MessageModel)
+            .where(and_(*conditions))
+            .order_by(MessageModel.sequence_number)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
     async def get_by_session_and_type(
         self,
         session_id: UUID,
@@ -1,7 +1,7 @@
 """Permission decision repository for database operations."""
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.permission_decision import PermissionDecisionModel
 from app.repositories.base import BaseRepository
@@ -13,6 +13,13 @@ class PermissionDecisionRepository(BaseRepository[PermissionDecisionModel]):
     def __init__(self, db: AsyncSession):
         super().__init__(PermissionDecisionModel, db)
 
+    async def bulk_create(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert many permission decisions in one executemany statement."""
+        if not rows:
+            return 0
+        await self.db.execute(insert(PermissionDecisionModel), rows)
+        return len(rows)
+
     async def get_by_session(
         self,
         session_id: UUID,
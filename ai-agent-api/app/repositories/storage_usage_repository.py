@@ -0,0 +1,153 @@
+"""Storage usage repository for database operations."""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.storage_usage import StorageUsageModel, StorageUsageTotalModel
+from app.repositories.base import BaseRepository
+
+# pg_advisory_xact_lock key guarding storage_usage_totals: increments hold it
+# shared, a full rebuild holds it exclusively
+TOTALS_LOCK_KEY = 0x53544F52  # "STOR"
+
+
+class StorageUsageRepository(BaseRepository[StorageUsageModel]):
+    """Repository for per-path storage usage and aggregated totals."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(StorageUsageModel, db)
+
+    async def get_by_path(self, resource_path: str) -> Optional[StorageUsageModel]:
+        """Get usage record for a path."""
+        result = await self.db.execute(
+            select(StorageUsageModel)
+            .where(StorageUsageModel.resource_path == resource_path)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_by_paths(self, resource_paths: List[str]) -> Dict[str, StorageUsageModel]:
+        """Get usage records for several paths, keyed by path."""
+        if not resource_paths:
+            return {}
+
+        result = await self.db.execute(
+            select(StorageUsageModel)
+            .where(StorageUsageModel.resource_path.in_(resource_paths))
+        )
+        return {record.resource_path: record for record in result.scalars().all()}
+
+    async def delete_by_path(self, resource_path: str) -> bool:
+        """Delete usage record for a path."""
+        result = await self.db.execute(
+            delete(StorageUsageModel)
+            .where(StorageUsageModel.resource_path == resource_path)
+        )
+        await self.db.flush()
+        return result.rowcount > 0
+
+    async def list_batch(
+        self,
+        after_path: Optional[str] = None,
+        limit: int = 500,
+    ) -> List[StorageUsageModel]:
+        """Get usage records ordered by path, for keyset-paginated scans."""
+        query = select(StorageUsageModel).order_by(StorageUsageModel.resource_path).limit(limit)
+        if after_path is not None:
+            query = query.where(StorageUsageModel.resource_path > after_path)
+
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def get_totals(self, owner_key: str) -> Dict[str, Tuple[int, int]]:
+        """Get aggregated (size_bytes, file_count) per resource type for an owner."""
+        result = await self.db.execute(
+            select(StorageUsageTotalModel)
+            .where(StorageUsageTotalModel.owner_key == owner_key)
+        )
+        return {
+            total.resource_type: (total.size_bytes, total.file_count)
+            for total in result.scalars().all()
+        }
+
+    async def lock_totals(self, shared: bool = False) -> None:
+        """Take the totals advisory lock until the end of the transaction.
+
+        Args:
+            shared: Take the lock in shared mode (concurrent increments)
+                instead of exclusive mode (rebuilds)
+        """
+        lock = func.pg_advisory_xact_lock_shared if shared else func.pg_advisory_xact_lock
+        await self.db.execute(select(lock(TOTALS_LOCK_KEY)))
+
+    async def increment_totals(
+        self,
+        owner_key: str,
+        resource_type: str,
+        delta_bytes: int,
+        delta_files: int,
+    ) -> None:
+        """Apply a delta to an aggregated counter, creating it if needed.
+
+        A single INSERT ... ON CONFLICT DO UPDATE, so two writers creating
+        the same counter cannot race into a unique violation.
+        """
+        await self.lock_totals(shared=True)
+
+        now = datetime.utcnow()
+        statement = insert(StorageUsageTotalModel).values(
+            owner_key=owner_key,
+            resource_type=resource_type,
+            size_bytes=max(delta_bytes, 0),
+            file_count=max(delta_files, 0),
+            updated_at=now,
+        )
+        await self.db.execute(
+            statement.on_conflict_do_update(
+                constraint="uq_storage_usage_totals_owner_type",
+                set_={
+                    "size_bytes": StorageUsageTotalModel.size_bytes + delta_bytes,
+                    "file_count": StorageUsageTotalModel.file_count + delta_files,
+                    "updated_at": now,
+                },
+            )
+        )
+
+    async def sum_by_owner(self) -> List[Tuple[Optional[str], str, int, int]]:
+        """Recompute totals from per-path records.
+
+        Returns:
+            List of (user_id, resource_type, size_bytes, file_count)
+        """
+        result = await self.db.execute(
+            select(
+                StorageUsageModel.user_id,
+                StorageUsageModel.resource_type,
+                func.coalesce(func.sum(StorageUsageModel.size_bytes), 0),
+                func.coalesce(func.sum(StorageUsageModel.file_count), 0),
+            )
+            .group_by(StorageUsageModel.user_id, StorageUsageModel.resource_type)
+        )
+        return [
+            (str(user_id) if user_id else None, resource_type, int(size), int(files))
+            for user_id, resource_type, size, files in result.all()
+        ]
+
+    async def replace_totals(self, totals: Dict[Tuple[str, str], Tuple[int, int]]) -> None:
+        """Replace all aggregated counters with freshly computed values.
+
+        Holds the totals lock exclusively, so concurrent rebuilds and
+        increments wait for the new counters to be committed.
+        """
+        await self.lock_totals()
+        await self.db.execute(delete(StorageUsageTotalModel))
+        now = datetime.utcnow()
+        for (owner_key, resource_type), (size_bytes, file_count) in totals.items():
+            self.db.add(StorageUsageTotalModel(
+                owner_key=owner_key,
+                resource_type=resource_type,
+                size_bytes=size_bytes,
+                file_count=file_count,
+                updated_at=now,
+            ))
+        await self.db.flush()
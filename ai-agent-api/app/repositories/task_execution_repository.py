@@ -1,8 +1,8 @@
 """Task execution repository for database operations."""
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy import select, and_, update
+from sqlalchemy import select, and_, update, func, case
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.task_execution import TaskExecutionModel
 from app.repositories.base import BaseRepository
@@ -59,6 +59,37 @@ class TaskExecutionRepository(BaseRepository[TaskExecutionModel]):
         )
         return list(result.scalars().all())
 
+    async def get_task_activity(
+        self,
+        task_ids: List[UUID],
+    ) -> Dict[UUID, Tuple[Optional[datetime], bool]]:
+        """Get last activity time and in-flight state for several tasks.
+
+        Returns:
+            Dict of task_id -> (latest completed_at/created_at, has pending or
+            running executions). Tasks without executions are omitted.
+        """
+        if not task_ids:
+            return {}
+
+        in_flight = case(
+            (TaskExecutionModel.status.in_(["pending", "queued", "running"]), 1),
+            else_=0,
+        )
+        result = await self.db.execute(
+            select(
+                TaskExecutionModel.task_id,
+                func.max(func.coalesce(TaskExecutionModel.completed_at, TaskExecutionModel.created_at)),
+                func.sum(in_flight),
+            )
+            .where(TaskExecutionModel.task_id.in_(task_ids))
+            .group_by(TaskExecutionModel.task_id)
+        )
+        return {
+            task_id: (last_activity, bool(active_count))
+            for task_id, last_activity, active_count in result.all()
+        }
+
     async def get_by_trigger_type(
         self,
         trigger_type: str,
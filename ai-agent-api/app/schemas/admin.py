@@ -2,7 +2,8 @@
 Admin-related schemas.
 """
 
-from typing import Dict
+from datetime import datetime
+from typing import Dict, List
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -16,3 +17,31 @@ class SystemStatsResponse(BaseModel):
     users: Dict[str, int] = Field(..., description="User statistics")
     cost: Dict[str, float] = Field(..., description="Cost statistics")
     storage: Dict[str, int] = Field(..., description="Storage statistics")
+    websocket: Dict[str, int] = Field(
+        default_factory=dict, description="WebSocket fan-out statistics for the serving process"
+    )
+
+
+class StorageMaintenanceItem(BaseModel):
+    """Single entry archived or deleted by storage maintenance."""
+
+    action: str = Field(..., description="archive, delete_archive, delete_report or delete_orphan")
+    path: str = Field(..., description="Affected path")
+    size_bytes: int = Field(..., description="Size before the action")
+
+
+class StorageMaintenanceResponse(BaseModel):
+    """Storage maintenance run report."""
+
+    dry_run: bool = Field(..., description="Whether changes were only reported")
+    started_at: datetime
+    completed_at: datetime
+    archived_directories: int = Field(..., description="Working directories archived")
+    deleted_archives: int = Field(..., description="Archives past retention deleted")
+    deleted_reports: int = Field(..., description="Expired report files deleted")
+    orphaned_directories: int = Field(..., description="Directories without a DB row deleted")
+    orphaned_reports: int = Field(..., description="Report files without a DB row deleted")
+    bytes_reclaimed: int = Field(..., description="Bytes freed (estimated for dry runs)")
+    errors: int = Field(..., description="Entries that failed and were skipped")
+    items: List[StorageMaintenanceItem] = Field(default_factory=list)
+
@@ -42,6 +42,9 @@ class MCPServerResponse(BaseModel):
     is_global: bool = Field(..., description="Whether server is global (admin-only)")
     health_status: Optional[str] = Field(None, description="Health status (healthy/unhealthy/unknown)")
     last_health_check_at: Optional[datetime] = Field(None, description="Last health check timestamp")
+    last_error: Optional[str] = Field(None, description="Error from the last failed health check")
+    health_latency_ms: Optional[int] = Field(None, description="Handshake latency of the last health check")
+    health_tools: Optional[List[str]] = Field(None, description="Tools reported by the last health check")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
@@ -167,6 +167,9 @@ class WorkingDirectoryManifest(BaseModel):
     execution_id: UUID = Field(..., description="Execution UUID")
     total_files: int = Field(..., description="Total number of files")
     total_size: int = Field(..., description="Total size in bytes")
+    matched_files: Optional[int] = Field(None, description="Files matching the glob filter")
+    page: Optional[int] = Field(None, description="Current page number (when paginated)")
+    page_size: Optional[int] = Field(None, description="Files per page (when paginated)")
     files: List[WorkingDirectoryFileInfo] = Field(..., description="List of files")
     links: Links = Field(default_factory=Links, alias="_links", description="HATEOAS links")
 
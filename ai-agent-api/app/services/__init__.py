@@ -4,6 +4,8 @@ from app.services.task_service import TaskService
 from app.services.report_service import ReportService
 from app.services.storage_manager import StorageManager
 from app.services.audit_service import AuditService
+from app.services.storage_accounting_service import StorageAccountingService
+from app.services.storage_maintenance_service import StorageMaintenanceService
 
 __all__ = [
     "SessionService",
@@ -11,4 +13,6 @@ __all__ = [
     "ReportService",
     "StorageManager",
     "AuditService",
+    "StorageAccountingService",
+    "StorageMaintenanceService",
 ]
@@ -0,0 +1,174 @@
+"""Progress events for background task executions.
+
+Background executions publish status transitions, assistant text, tool
+calls and the final result on the same event bus as the WebSocket session
+stream (``get_event_broadcaster()``), under the key
+``task_execution:{execution_id}``. Clients follow them over Server-Sent
+Events instead of polling the execution row.
+
+Every event carries a ``sequence`` (microseconds since the epoch, strictly
+increasing per publisher), which is also its SSE ``id``. The bus keeps
+recent events in its replay buffer, so a client reconnecting with
+``Last-Event-ID`` receives only what it missed.
+"""
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Union
+from uuid import UUID
+
+from app.claude_sdk.event_broadcaster import EventBroadcaster, get_event_broadcaster
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+# Event types
+STATUS = "status"
+ASSISTANT_TEXT = "assistant_text"
+TOOL_CALL = "tool_call"
+RESULT = "result"
+
+
+def execution_channel(execution_id: Union[UUID, str]) -> str:
+    """Get the event bus key of an execution."""
+    return f"task_execution:{execution_id}"
+
+
+class ExecutionEventPublisher:
+    """Publishes the progress events of one task execution.
+
+    Publishing never raises: progress events are best effort and must not
+    fail the execution itself.
+    """
+
+    def __init__(self, execution_id: Union[UUID, str], broadcaster: Optional[EventBroadcaster] = None):
+        """Initialize publisher.
+
+        Args:
+            execution_id: Task execution UUID
+            broadcaster: Event bus (defaults to the process-wide broadcaster)
+        """
+        self.execution_id = str(execution_id)
+        self.broadcaster = broadcaster or get_event_broadcaster()
+        self._last_sequence = 0
+
+    def _next_sequence(self) -> int:
+        """Get a sequence number that is time-ordered across workers."""
+        self._last_sequence = max(self._last_sequence + 1, time.time_ns() // 1000)
+        return self._last_sequence
+
+    async def publish(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Publish an event.
+
+        Args:
+            event_type: status, assistant_text, tool_call or result
+            data: Event data
+        """
+        event = {
+            "type": event_type,
+            "sequence": self._next_sequence(),
+            "execution_id": self.execution_id,
+            "timestamp": datetime.utcnow().isoformat(),
+            "data": data,
+        }
+        try:
+            await self.broadcaster.broadcast_message(execution_channel(self.execution_id), event)
+        except Exception as e:
+            logger.warning(
+                "Failed to publish execution event",
+                extra={"execution_id": self.execution_id, "event_type": event_type, "error": str(e)},
+            )
+
+    async def status(self, status: str, **data: Any) -> None:
+        """Publish a status transition."""
+        await self.publish(STATUS, {"status": status, **data})
+
+
+class _EventSink:
+    """WebSocket-compatible sink that hands broadcaster frames to an SSE response."""
+
+    def __init__(self):
+        self.queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+
+    async def send_text(self, text: str) -> None:
+        await self.queue.put(text)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        # Evicted as a slow consumer: end the response so the client reconnects
+        await self.queue.put(None)
+
+
+def format_sse(data: Any, event: Optional[str] = None, event_id: Optional[int] = None) -> str:
+    """Format one Server-Sent Events message."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def stream_execution_events(
+    execution_id: Union[UUID, str],
+    current_status: str,
+    last_event_id: Optional[int] = None,
+    heartbeat_seconds: Optional[float] = None,
+    broadcaster: Optional[EventBroadcaster] = None,
+) -> AsyncIterator[str]:
+    """Stream an execution's progress as Server-Sent Events.
+
+    Buffered events after ``last_event_id`` (all buffered events on a first
+    connect) are sent first, then live events until a terminal status. An
+    execution that had already finished when the client connected ends the
+    stream after the replay, with its stored status if the buffer no longer
+    holds it. Comment lines are sent as heartbeats while idle.
+
+    Args:
+        execution_id: Task execution UUID
+        current_status: Execution status read when the client connected
+        last_event_id: Last event id the client received (Last-Event-ID)
+        heartbeat_seconds: Idle interval between heartbeats
+        broadcaster: Event bus (defaults to the process-wide broadcaster)
+
+    Yields:
+        SSE-formatted messages
+    """
+    broadcaster = broadcaster or get_event_broadcaster()
+    heartbeat_seconds = heartbeat_seconds or settings.sse_heartbeat_seconds
+    channel = execution_channel(execution_id)
+    sink = _EventSink()
+
+    yield f"retry: {settings.sse_retry_ms}\n\n"
+    subscriber = await broadcaster.subscribe(channel, sink, since_sequence=last_event_id or 0)
+    try:
+        while True:
+            try:
+                text = await asyncio.wait_for(sink.queue.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if text is None:
+                return
+
+            event = json.loads(text)
+            event_type = event.get("type")
+            if event_type == "replay_complete":
+                if current_status in TERMINAL_STATUSES:
+                    # Finished before we subscribed and the buffer no longer has the end
+                    yield format_sse(
+                        {"type": STATUS, "execution_id": str(execution_id), "data": {"status": current_status}},
+                        event=STATUS,
+                    )
+                    return
+                continue
+
+            yield format_sse(event, event=event_type, event_id=event.get("sequence"))
+            if event_type == STATUS and (event.get("data") or {}).get("status") in TERMINAL_STATUSES:
+                return
+    finally:
+        await broadcaster.unsubscribe(channel, subscriber)
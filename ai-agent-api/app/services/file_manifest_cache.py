@@ -0,0 +1,615 @@
+"""Cached file manifests for working directories.
+
+Execution file listings are polled while executions run. Instead of walking
+the tree on every request, each directory gets a cached manifest that is
+kept current incrementally:
+
+- On Linux, one inotify descriptor per process holds a watch per watched
+  subdirectory and reports created, modified, moved and deleted entries.
+  Events are read once (a non-blocking read, so an unchanged directory
+  costs one syscall) and queued on the manifests watching that directory;
+  applying them runs in the thread pool.
+- Elsewhere (or when the inotify watch limit is hit), the manifest is
+  revalidated at most every ``file_manifest_revalidate_seconds`` by
+  comparing directory mtimes, rescanning only changed directories, and
+  re-statting the files of unchanged directories to pick up in-place
+  appends.
+
+Every applied change bumps the manifest version, which is exposed as a weak
+ETag so clients can poll with ``If-None-Match``.
+"""
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import os
+import stat as stat_module
+import struct
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# inotify constants (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+# Filtered path lists kept per manifest (keyed by glob pattern)
+FILTER_CACHE_SIZE = 8
+
+_libc = None
+
+
+def _load_libc():
+    """Load libc for inotify, or None when unavailable."""
+    global _libc
+    if _libc is None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            libc.inotify_init1  # noqa: B018 - raises AttributeError off Linux
+            _libc = libc
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc or None
+
+
+class InotifyWatcher:
+    """Non-blocking inotify descriptor shared by every cached manifest.
+
+    A directory watched by several manifests (e.g. a task directory and one
+    of its subdirectories) has a single watch descriptor; its events are
+    queued on each subscribed manifest. Watches are added from scans in the
+    thread pool, so subscriptions are guarded by a lock.
+    """
+
+    def __init__(self):
+        libc = _load_libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+        self._libc = libc
+        self.fd = fd
+        # wd -> {manifest: relative dir ("" for its root)}
+        self.watches: Dict[int, Dict["DirectoryManifest", str]] = {}
+        self._lock = threading.Lock()
+
+    def add_watch(self, path: Path, manifest: "DirectoryManifest", rel_dir: str) -> None:
+        """Watch one directory on behalf of a manifest.
+
+        Raises:
+            OSError: If the watch cannot be added (e.g. ENOSPC watch limit)
+        """
+        with self._lock:
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                raise OSError(err, os.strerror(err))
+            self.watches.setdefault(wd, {})[manifest] = rel_dir
+            manifest.watch_descriptors.add(wd)
+
+    def remove_manifest(self, manifest: "DirectoryManifest") -> None:
+        """Drop a manifest's subscriptions, removing watches nobody else uses."""
+        with self._lock:
+            for wd in manifest.watch_descriptors:
+                subscribers = self.watches.get(wd)
+                if subscribers is None:
+                    continue
+                subscribers.pop(manifest, None)
+                if not subscribers:
+                    del self.watches[wd]
+                    # EINVAL if the kernel already dropped it; nothing to do
+                    self._libc.inotify_rm_watch(self.fd, wd)
+            manifest.watch_descriptors.clear()
+
+    def dispatch(self) -> None:
+        """Drain pending events without blocking and queue them on their manifests."""
+        with self._lock:
+            while True:
+                try:
+                    data = os.read(self.fd, 64 * 1024)
+                except BlockingIOError:
+                    break
+                if not data:
+                    break
+
+                offset = 0
+                while offset < len(data):
+                    wd, mask, _cookie, name_len = EVENT_HEADER.unpack_from(data, offset)
+                    offset += EVENT_HEADER.size
+                    name = os.fsdecode(data[offset:offset + name_len].rstrip(b"\0"))
+                    offset += name_len
+
+                    if mask & IN_Q_OVERFLOW:
+                        # Events were lost for every watch
+                        for subscribers in self.watches.values():
+                            for manifest in subscribers:
+                                manifest.overflowed = True
+                        continue
+
+                    subscribers = self.watches.get(wd)
+                    if subscribers is None:
+                        continue
+                    for manifest, rel_dir in subscribers.items():
+                        manifest.pending_events.append((rel_dir, mask, name))
+                    if mask & IN_IGNORED:
+                        del self.watches[wd]
+                        for manifest in subscribers:
+                            manifest.watch_descriptors.discard(wd)
+
+    def close(self) -> None:
+        """Release the inotify descriptor and all watches."""
+        with self._lock:
+            if self.fd >= 0:
+                os.close(self.fd)
+                self.fd = -1
+                for subscribers in self.watches.values():
+                    for manifest in subscribers:
+                        manifest.watch_descriptors.clear()
+                self.watches.clear()
+
+
+_inotify_watcher: Optional[InotifyWatcher] = None
+_inotify_lock = threading.Lock()
+
+
+def get_inotify_watcher() -> Optional[InotifyWatcher]:
+    """Get the process-wide inotify watcher, or None when unavailable."""
+    global _inotify_watcher
+    with _inotify_lock:
+        if _inotify_watcher is None or _inotify_watcher.fd < 0:
+            try:
+                _inotify_watcher = InotifyWatcher()
+            except OSError as e:
+                logger.warning("inotify unavailable, using polling", extra={"error": str(e)})
+                return None
+        return _inotify_watcher
+
+
+class DirectoryManifest:
+    """Cached manifest of one directory tree."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.files: Dict[str, Tuple[int, int]] = {}  # relpath -> (size, mtime_ns)
+        self.dirs: Dict[str, int] = {}  # rel dir -> mtime_ns ("" for root)
+        self.total_size = 0
+        self.version = 0
+        self.scanned = False
+        self.token = uuid.uuid4().hex[:12]
+        self.validated_at = 0.0
+        self.watcher: Optional[InotifyWatcher] = None
+        self.watch_descriptors: Set[int] = set()
+        self.pending_events: List[Tuple[str, int, str]] = []
+        self.overflowed = False
+        self.lock = asyncio.Lock()
+        self._sorted: Optional[List[str]] = None
+        self._filtered: "OrderedDict[str, List[str]]" = OrderedDict()
+
+    @property
+    def etag(self) -> str:
+        """Weak ETag identifying the current manifest contents."""
+        return f'W/"{self.token}-{self.version}"'
+
+    def sorted_paths(self, pattern: Optional[str] = None) -> List[str]:
+        """Get file paths in sorted order, optionally filtered by a glob pattern."""
+        if self._sorted is None:
+            self._sorted = sorted(self.files)
+
+        if not pattern:
+            return self._sorted
+
+        cached = self._filtered.get(pattern)
+        if cached is None:
+            cached = [path for path in self._sorted if fnmatch.fnmatchcase(path, pattern)]
+            self._filtered[pattern] = cached
+            if len(self._filtered) > FILTER_CACHE_SIZE:
+                self._filtered.popitem(last=False)
+        else:
+            self._filtered.move_to_end(pattern)
+        return cached
+
+    def file_info(self, rel_path: str) -> Dict[str, Any]:
+        """Get the response dict for one file."""
+        size, mtime_ns = self.files[rel_path]
+        return {
+            "path": rel_path,
+            "size": size,
+            "modified_at": datetime.fromtimestamp(mtime_ns / 1e9).isoformat(),
+        }
+
+    # ----- mutation (blocking filesystem calls) -----
+
+    def full_scan(self) -> None:
+        """Build the manifest from scratch."""
+        self.files.clear()
+        self.dirs.clear()
+        self.total_size = 0
+        self._scan_dir("", recursive=True)
+        self.scanned = True
+        self._changed()
+
+    def refresh_file(self, rel_path: str) -> bool:
+        """Re-stat one file; add, update or drop it. Returns True if changed."""
+        try:
+            stat = os.stat(self.root / rel_path, follow_symlinks=False)
+        except (FileNotFoundError, NotADirectoryError):
+            return self.remove_file(rel_path)
+
+        if not _is_regular(stat):
+            return self.remove_file(rel_path)
+
+        current = (stat.st_size, stat.st_mtime_ns)
+        previous = self.files.get(rel_path)
+        if previous == current:
+            return False
+
+        self.total_size += current[0] - (previous[0] if previous else 0)
+        self.files[rel_path] = current
+        return True
+
+    def remove_file(self, rel_path: str) -> bool:
+        """Drop one file. Returns True if it was present."""
+        previous = self.files.pop(rel_path, None)
+        if previous is None:
+            return False
+        self.total_size -= previous[0]
+        return True
+
+    def remove_dir(self, rel_dir: str) -> bool:
+        """Drop a directory and everything under it."""
+        prefix = f"{rel_dir}/"
+        changed = self.dirs.pop(rel_dir, None) is not None
+        for path in [p for p in self.files if p.startswith(prefix)]:
+            changed = self.remove_file(path) or changed
+        for path in [d for d in self.dirs if d.startswith(prefix)]:
+            del self.dirs[path]
+        return changed
+
+    def rescan_dir(self, rel_dir: str) -> bool:
+        """Re-list one directory's direct entries (new subdirs are scanned fully)."""
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        before_files = {
+            p for p in self.files
+            if p.startswith(prefix) and "/" not in p[len(prefix):]
+        }
+        before_dirs = {
+            d for d in self.dirs
+            if d and d.startswith(prefix) and "/" not in d[len(prefix):]
+        }
+
+        seen_files, seen_dirs, changed = self._scan_dir(rel_dir, recursive=False)
+
+        for path in before_files - seen_files:
+            changed = self.remove_file(path) or changed
+        for path in before_dirs - seen_dirs:
+            changed = self.remove_dir(path) or changed
+        for path in seen_dirs - before_dirs:
+            self._scan_dir(path, recursive=True)
+            changed = True
+
+        return changed
+
+    def _scan_dir(self, rel_dir: str, recursive: bool) -> Tuple[set, set, bool]:
+        """Scan a directory, recording files and subdirs."""
+        seen_files = set()
+        seen_dirs = set()
+        changed = False
+        stack = [rel_dir]
+
+        while stack:
+            current = stack.pop()
+            path = self.root / current if current else self.root
+            try:
+                self.dirs[current] = os.stat(path).st_mtime_ns
+                if self.watcher is not None:
+                    self._watch(path, current)
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        rel_path = f"{current}/{entry.name}" if current else entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if current == rel_dir:
+                                    seen_dirs.add(rel_path)
+                                if recursive:
+                                    stack.append(rel_path)
+                            elif entry.is_file(follow_symlinks=False):
+                                if current == rel_dir:
+                                    seen_files.add(rel_path)
+                                stat = entry.stat(follow_symlinks=False)
+                                value = (stat.st_size, stat.st_mtime_ns)
+                                previous = self.files.get(rel_path)
+                                if previous != value:
+                                    self.total_size += value[0] - (previous[0] if previous else 0)
+                                    self.files[rel_path] = value
+                                    changed = True
+                        except FileNotFoundError:
+                            continue
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                self.dirs.pop(current, None)
+                continue
+
+        return seen_files, seen_dirs, changed
+
+    def _watch(self, path: Path, rel_dir: str) -> None:
+        """Add an inotify watch, falling back to polling if the limit is hit."""
+        try:
+            self.watcher.add_watch(path, self, rel_dir)
+        except OSError as e:
+            logger.warning(
+                "inotify watch failed, falling back to polling",
+                extra={"root": str(self.root), "directory": rel_dir, "error": str(e)}
+            )
+            self.close_watcher()
+
+    def close_watcher(self) -> None:
+        """Stop watching; the manifest falls back to mtime revalidation."""
+        if self.watcher is not None:
+            self.watcher.remove_manifest(self)
+            self.watcher = None
+        self.pending_events = []
+        self.overflowed = False
+
+    def take_events(self) -> List[Tuple[str, int, str]]:
+        """Get and clear the events queued by the shared watcher."""
+        events, self.pending_events = self.pending_events, []
+        return events
+
+    def _changed(self) -> None:
+        """Record that the manifest changed."""
+        self.version += 1
+        self._sorted = None
+        self._filtered.clear()
+
+    # ----- revalidation -----
+
+    def apply_events(self, events: List[Tuple[str, int, str]]) -> bool:
+        """Apply queued inotify events. Returns False if a full rescan is needed."""
+        changed = False
+        for rel_dir, mask, name in events:
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                if rel_dir == "":
+                    return False
+                changed = self.remove_dir(rel_dir) or changed
+                continue
+            if not name:
+                continue
+
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._scan_dir(rel_path, recursive=True)
+                    changed = True
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    changed = self.remove_dir(rel_path) or changed
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                changed = self.remove_file(rel_path) or changed
+            else:
+                changed = self.refresh_file(rel_path) or changed
+
+        if changed:
+            self._changed()
+        return True
+
+    def revalidate_by_mtime(self) -> None:
+        """Poll directory mtimes, then file stats in unchanged directories."""
+        changed = False
+        rescanned = set()
+
+        for rel_dir, mtime_ns in list(self.dirs.items()):
+            if rel_dir not in self.dirs:
+                continue  # removed while rescanning a parent
+            path = self.root / rel_dir if rel_dir else self.root
+            try:
+                current = os.stat(path).st_mtime_ns
+            except (FileNotFoundError, NotADirectoryError):
+                changed = self.remove_dir(rel_dir) or changed
+                continue
+            if current != mtime_ns:
+                self.dirs[rel_dir] = current
+                changed = self.rescan_dir(rel_dir) or changed
+                rescanned.add(rel_dir)
+
+        # Directory mtimes do not change on in-place writes, so files still
+        # need a stat, except where the rescan above just did it
+        for rel_path in list(self.files):
+            if rel_path.rpartition("/")[0] in rescanned:
+                continue
+            changed = self.refresh_file(rel_path) or changed
+
+        if changed:
+            self._changed()
+
+
+class FileManifestCache:
+    """Process-wide LRU of directory manifests."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        revalidate_seconds: Optional[float] = None,
+        use_inotify: bool = True,
+    ):
+        self.max_entries = max_entries or settings.file_manifest_cache_max_dirs
+        self.revalidate_seconds = (
+            settings.file_manifest_revalidate_seconds
+            if revalidate_seconds is None else revalidate_seconds
+        )
+        self.use_inotify = use_inotify and _load_libc() is not None
+        self._entries: "OrderedDict[str, DirectoryManifest]" = OrderedDict()
+
+    async def list_files(
+        self,
+        root: Path,
+        pattern: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        if_none_match: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """List a directory's files from its cached manifest.
+
+        Args:
+            root: Directory to list
+            pattern: Shell-style glob matched against relative paths
+            offset: Number of matching files to skip
+            limit: Maximum files to return (None for all)
+            if_none_match: ETag from a previous response
+
+        Returns:
+            Dict with etag, not_modified, total_files, total_size,
+            matched_files and files (None when not modified)
+
+        Raises:
+            FileNotFoundError: If the directory does not exist
+        """
+        manifest = self._get_entry(root)
+
+        # Hold the lock while reading so a concurrent rescan in the thread
+        # pool cannot mutate the manifest mid-iteration
+        async with manifest.lock:
+            await self._refresh(manifest)
+
+            result = {
+                "etag": manifest.etag,
+                "not_modified": etag_matches(if_none_match, manifest.etag),
+                "total_files": len(manifest.files),
+                "total_size": manifest.total_size,
+                "matched_files": None,
+                "files": None,
+            }
+            if result["not_modified"]:
+                return result
+
+            paths = manifest.sorted_paths(pattern)
+            end = None if limit is None else offset + limit
+            result["matched_files"] = len(paths)
+            result["files"] = [manifest.file_info(path) for path in paths[offset:end]]
+            return result
+
+    def _get_entry(self, root: Path) -> DirectoryManifest:
+        """Get or create the cache entry for a directory."""
+        key = str(root)
+        manifest = self._entries.get(key)
+
+        if manifest is None:
+            if not root.is_dir():
+                raise FileNotFoundError(key)
+            manifest = DirectoryManifest(root)
+            self._entries[key] = manifest
+            self._evict()
+        else:
+            self._entries.move_to_end(key)
+
+        return manifest
+
+    def invalidate(self, root: Path) -> None:
+        """Drop the cached manifest for a directory (e.g. after archiving it)."""
+        manifest = self._entries.pop(str(root), None)
+        if manifest is not None:
+            manifest.close_watcher()
+
+    def clear(self) -> None:
+        """Drop all cached manifests."""
+        for manifest in self._entries.values():
+            manifest.close_watcher()
+        self._entries.clear()
+
+    async def _refresh(self, manifest: DirectoryManifest) -> None:
+        """Bring a manifest up to date, scanning only what changed."""
+        loop = asyncio.get_event_loop()
+
+        if manifest.watcher is not None:
+            manifest.watcher.dispatch()
+            if not manifest.overflowed:
+                events = manifest.take_events()
+                if not events:
+                    return
+                # New subdirectories are scanned recursively: keep it off the loop
+                if await loop.run_in_executor(None, manifest.apply_events, events):
+                    return
+            # Event queue overflowed or the root itself moved: rebuild
+            manifest.close_watcher()
+            manifest.scanned = False
+        elif manifest.scanned and time.monotonic() - manifest.validated_at < self.revalidate_seconds:
+            return
+
+        if not manifest.root.is_dir():
+            self.invalidate(manifest.root)
+            raise FileNotFoundError(str(manifest.root))
+
+        if not manifest.scanned:
+            if self.use_inotify:
+                manifest.watcher = get_inotify_watcher()
+            await loop.run_in_executor(None, manifest.full_scan)
+        else:
+            await loop.run_in_executor(None, manifest.revalidate_by_mtime)
+
+        manifest.validated_at = time.monotonic()
+
+    def _evict(self) -> None:
+        """Drop least recently used manifests over the size limit."""
+        while len(self._entries) > self.max_entries:
+            _, manifest = self._entries.popitem(last=False)
+            manifest.close_watcher()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return opaque(etag) in {opaque(tag) for tag in if_none_match.split(",")}
+
+
+def _is_regular(stat: os.stat_result) -> bool:
+    """Check whether a stat result is a regular file."""
+    return stat_module.S_ISREG(stat.st_mode)
+
+
+_manifest_cache: Optional[FileManifestCache] = None
+
+
+def get_manifest_cache() -> FileManifestCache:
+    """Get the process-wide manifest cache."""
+    global _manifest_cache
+    if _manifest_cache is None:
+        _manifest_cache = FileManifestCache()
+    return _manifest_cache
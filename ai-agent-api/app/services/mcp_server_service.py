@@ -6,6 +6,9 @@ from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.user import User
+from app.mcp.config_builder import MCPConfigBuilder
+from app.mcp.config_cache import get_mcp_config_cache
+from app.mcp.health_prober import HEALTHY, UNHEALTHY, ProbeResult, get_mcp_health_prober
 from app.models.mcp_server import MCPServerModel
 from app.repositories.mcp_server_repository import MCPServerRepository
 from app.services.audit_service import AuditService
@@ -82,6 +85,7 @@ class MCPServerService:
             user_id=user.id,
             created_at=datetime.utcnow(),
         )
+        await self._invalidate_config(saved_server)
 
         logger.info(
             "MCP server created successfully",
@@ -169,6 +173,7 @@ class MCPServerService:
         # Check permissions (only server owner can update)
         if server.user_id != user.id:
             raise PermissionError("Access denied to update MCP server")
+        previous_scope = (server.user_id, server.is_global)
 
         # Update fields
         update_dict = {}
@@ -182,6 +187,7 @@ class MCPServerService:
         if update_dict:
             update_dict["updated_at"] = datetime.utcnow()
             updated_server = await self.mcp_server_repo.update(server_id, **update_dict)
+            await self._invalidate_config(updated_server, previous_scope)
         else:
             updated_server = server
 
@@ -221,6 +227,7 @@ class MCPServerService:
             deleted_at=datetime.utcnow(),
             updated_at=datetime.utcnow()
         )
+        await self._invalidate_config(server)
 
         # Audit log
         await self.audit_service.log_action(
@@ -231,6 +238,25 @@ class MCPServerService:
             action_details={"name": server.name},
         )
 
+    async def _invalidate_config(self, server, previous_scope=None) -> None:
+        """Commit a server change and invalidate the compiled MCP configs including it.
+
+        The commit comes first so no worker can rebuild a config from the
+        old rows under the new version.
+
+        Args:
+            server: Server as it is after the change
+            previous_scope: (user_id, is_global) before the change, so
+                configs that included the server under its old owner or
+                visibility are dropped too
+        """
+        scopes = {(server.user_id, server.is_global)}
+        if previous_scope is not None:
+            scopes.add(previous_scope)
+        await self.db.commit()
+        for user_id, is_global in scopes:
+            await get_mcp_config_cache().invalidate_server(user_id, is_global)
+
     async def test_server(
         self,
         user: User,
@@ -253,17 +279,57 @@ class MCPServerService:
         if server.user_id != user.id and not server.is_global:
             raise PermissionError("Access denied to test MCP server")
 
-        # TODO: Implement actual MCP server connection test
-        # For now, return basic validation
-        config = server.config or {}
+        result = await self._probe(server)
         return {
-            "status": "success",
-            "message": "MCP server configuration appears valid",
+            "status": "success" if result.healthy else "failed",
+            "message": (
+                f"MCP server responded with {len(result.tools)} tools"
+                if result.healthy else f"MCP server health check failed: {result.error}"
+            ),
             "details": {
                 "name": server.name,
                 "server_type": server.server_type,
-                "command": config.get("command"),
-                "args_count": len(config.get("args", [])),
-                "env_vars": len(config.get("env", {})),
+                "health_status": result.status,
+                "latency_ms": result.latency_ms,
+                "tools": result.tools,
+                "error": result.error,
             },
-        }
\ No newline at end of file
+        }
+
+    async def check_health(self, server_id: UUID) -> MCPServerModel:
+        """Probe an MCP server now and record its health status.
+
+        Args:
+            server_id: Server UUID
+
+        Returns:
+            Updated MCPServerModel
+        """
+        server = await self.mcp_server_repo.get_by_id(server_id)
+        if not server:
+            raise ValueError(f"MCP server {server_id} not found")
+
+        await self._probe(server)
+        return await self.mcp_server_repo.get_by_id(server_id)
+
+    async def _probe(self, server: MCPServerModel) -> ProbeResult:
+        """Run the MCP handshake against a server and record the result."""
+        if server.server_type == "sdk":
+            # In-process tools have no transport to probe
+            result = ProbeResult(status=HEALTHY)
+        else:
+            try:
+                sdk_config = MCPConfigBuilder._convert_to_sdk_format(server)
+            except (KeyError, ValueError) as e:
+                result = ProbeResult(status=UNHEALTHY, error=f"Invalid configuration: {e}")
+            else:
+                result = await get_mcp_health_prober().probe(sdk_config, force=True)
+
+        await self.mcp_server_repo.update_health_status(
+            server.id,
+            result.status,
+            last_error=result.error,
+            latency_ms=result.latency_ms,
+            tools=result.tools,
+        )
+        return result
@@ -11,6 +11,7 @@ from app.repositories.session_repository import SessionRepository
 from app.repositories.user_repository import UserRepository
 from app.services.storage_manager import StorageManager
 from app.services.audit_service import AuditService
+from app.services.storage_accounting_service import StorageAccountingService
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -124,6 +125,13 @@ class ReportService:
         
         self.db.add(report_model)
         await self.db.flush()
+
+        if report.file_path:
+            await StorageAccountingService(self.db).record_path(
+                report.file_path,
+                resource_type="report",
+                user_id=user_id,
+            )
         
         # Audit log
         await self.audit_service.log_report_generated(
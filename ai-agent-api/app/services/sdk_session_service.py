@@ -272,15 +272,16 @@ class SDKIntegratedSessionService(SessionService):
         )
         
         from claude_agent_sdk.types import HookMatcher
-        from app.mcp import MCPConfigBuilder
+        from app.mcp import MCPConfigBuilder, get_mcp_config_cache
         from app.repositories.mcp_server_repository import MCPServerRepository
         from app.domain.value_objects.sdk_options import SDKOptions
 
         # 1. Build dynamic MCP configuration
         # This merges SDK_MCP_SERVERS (kubernetes_readonly, database, monitoring)
-        # with user's personal MCP servers and global MCP servers from database
+        # with user's personal MCP servers and global MCP servers from database.
+        # Compiled configs are cached until an MCP server changes.
         mcp_server_repo = MCPServerRepository(self.db)
-        mcp_config_builder = MCPConfigBuilder(mcp_server_repo)
+        mcp_config_builder = MCPConfigBuilder(mcp_server_repo, cache=get_mcp_config_cache())
         
         logger.info(
             f"Building MCP config for session",
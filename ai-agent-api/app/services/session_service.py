@@ -488,11 +488,14 @@ class SessionService:
             raise ValueError(f"Working directory {workdir} does not exist")
 
         # Create archiver
-        provider = "s3" if upload_to_s3 and settings.storage_provider == "s3" else "filesystem"
-        archiver = StorageArchiver(
-            provider=provider,
-            bucket=settings.aws_s3_bucket if provider == "s3" else None,
-            region=settings.aws_s3_region if provider == "s3" else None
+        from app.repositories.working_directory_archive_repository import (
+            WorkingDirectoryArchiveRepository
+        )
+        provider = "s3" if upload_to_s3 and settings.storage_provider == "s3" else "local"
+        archiver = StorageArchiver.from_settings(
+            self.db,
+            WorkingDirectoryArchiveRepository(self.db),
+            storage_provider=provider
         )
 
         # Archive working directory
@@ -553,12 +556,7 @@ class SessionService:
         archive = archives[0]  # Get most recent archive
 
         # Create archiver
-        from app.core.config import settings
-        archiver = StorageArchiver(
-            provider=settings.storage_provider,
-            bucket=settings.aws_s3_bucket if settings.storage_provider == "s3" else None,
-            region=settings.aws_s3_region if settings.storage_provider == "s3" else None
-        )
+        archiver = StorageArchiver.from_settings(self.db, archive_repo)
 
         # Determine extraction path
         if not extract_to:
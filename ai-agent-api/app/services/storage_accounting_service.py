@@ -0,0 +1,320 @@
+"""Storage accounting service for incremental usage counters."""
+import asyncio
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.exceptions import QuotaExceededError
+from app.repositories.storage_usage_repository import StorageUsageRepository
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+GLOBAL_OWNER = "global"
+RESOURCE_TYPES = ("working_directory", "archive", "report")
+
+
+def measure_path(path: Path) -> Tuple[int, int]:
+    """Measure total bytes and file count under a path (blocking).
+
+    Symlinks are not followed. Files that disappear mid-scan are skipped.
+
+    Returns:
+        Tuple of (size_bytes, file_count)
+    """
+    if not path.exists():
+        return 0, 0
+
+    if path.is_file():
+        return path.stat().st_size, 1
+
+    total_size = 0
+    file_count = 0
+    stack = [str(path)]
+
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total_size += entry.stat(follow_symlinks=False).st_size
+                            file_count += 1
+                    except FileNotFoundError:
+                        continue
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+
+    return total_size, file_count
+
+
+class StorageAccountingService:
+    """Maintains per-path and per-user storage counters.
+
+    Counters are updated when executions finish, archives are written or
+    reports are saved, so readers (task detail, admin stats, quota checks)
+    never walk the filesystem. A periodic reconciliation scan corrects drift
+    from files changed outside those write points.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.usage_repo = StorageUsageRepository(db)
+
+    async def record_path(
+        self,
+        path: Union[str, Path],
+        resource_type: str,
+        user_id: Optional[UUID] = None,
+        execution_id: Optional[UUID] = None,
+    ) -> Tuple[int, int]:
+        """Measure a path once and store its counters.
+
+        Args:
+            path: Working directory, archive or report path
+            resource_type: 'working_directory', 'archive' or 'report'
+            user_id: Owning user
+            execution_id: Task execution that produced the resource
+
+        Returns:
+            Tuple of (size_bytes, file_count) recorded
+        """
+        if resource_type not in RESOURCE_TYPES:
+            raise ValueError(f"Unknown storage resource type: {resource_type}")
+
+        resource_path = str(path)
+        size_bytes, file_count = await asyncio.get_event_loop().run_in_executor(
+            None, measure_path, Path(resource_path)
+        )
+
+        await self._store(resource_path, resource_type, user_id, execution_id, size_bytes, file_count)
+
+        logger.debug(
+            "Recorded storage usage",
+            extra={
+                "resource_path": resource_path,
+                "resource_type": resource_type,
+                "user_id": str(user_id) if user_id else None,
+                "size_bytes": size_bytes,
+                "file_count": file_count,
+            }
+        )
+
+        return size_bytes, file_count
+
+    async def remove_path(self, path: Union[str, Path]) -> bool:
+        """Drop counters for a path that was deleted or archived."""
+        record = await self.usage_repo.get_by_path(str(path))
+        if not record:
+            return False
+
+        await self._apply_totals(
+            record.user_id, record.resource_type, -record.size_bytes, -record.file_count
+        )
+        return await self.usage_repo.delete_by_path(str(path))
+
+    async def get_usage_by_paths(self, paths: List[str]) -> Dict[str, Dict[str, int]]:
+        """Get recorded counters for several paths in one query."""
+        records = await self.usage_repo.get_by_paths(paths)
+        return {
+            path: {"size_bytes": record.size_bytes, "file_count": record.file_count}
+            for path, record in records.items()
+        }
+
+    async def get_user_usage(self, user_id: UUID) -> Dict[str, Dict[str, int]]:
+        """Get a user's counters per resource type plus a 'total' entry."""
+        return self._format_totals(await self.usage_repo.get_totals(str(user_id)))
+
+    async def get_global_usage(self) -> Dict[str, Dict[str, int]]:
+        """Get system-wide counters per resource type plus a 'total' entry."""
+        return self._format_totals(await self.usage_repo.get_totals(GLOBAL_OWNER))
+
+    async def check_user_quota(
+        self,
+        user_id: UUID,
+        max_storage_mb: Optional[int],
+    ) -> None:
+        """Raise if a user's recorded storage is at or above their quota.
+
+        Raises:
+            QuotaExceededError: If usage >= max_storage_mb
+        """
+        if not max_storage_mb:
+            return
+
+        used_bytes = (await self.get_user_usage(user_id))["total"]["size_bytes"]
+        limit_bytes = max_storage_mb * 1024 * 1024
+
+        if used_bytes >= limit_bytes:
+            raise QuotaExceededError(
+                f"Storage quota exceeded: {used_bytes // (1024 * 1024)} MB used "
+                f"(limit: {max_storage_mb} MB)"
+            )
+
+    async def reconcile(self, batch_size: int = 500) -> Dict[str, int]:
+        """Re-measure every recorded path and rebuild aggregated totals.
+
+        Paths that no longer exist are dropped. Work is done in keyset
+        batches, committing after each one.
+
+        Returns:
+            Reconciliation statistics
+        """
+        stats = {"scanned": 0, "updated": 0, "removed": 0}
+        loop = asyncio.get_event_loop()
+        after_path = None
+
+        while True:
+            batch = await self.usage_repo.list_batch(after_path=after_path, limit=batch_size)
+            if not batch:
+                break
+
+            for record in batch:
+                stats["scanned"] += 1
+                path = Path(record.resource_path)
+
+                if not path.exists():
+                    await self.usage_repo.delete(record.id)
+                    stats["removed"] += 1
+                    continue
+
+                size_bytes, file_count = await loop.run_in_executor(None, measure_path, path)
+                values = {"reconciled_at": datetime.utcnow()}
+                if size_bytes != record.size_bytes or file_count != record.file_count:
+                    values.update(size_bytes=size_bytes, file_count=file_count)
+                    stats["updated"] += 1
+                await self.usage_repo.update(record.id, **values)
+
+            after_path = batch[-1].resource_path
+            await self.db.commit()
+
+        await self._rebuild_totals()
+        await self.db.commit()
+
+        logger.info("Storage usage reconciled", extra=stats)
+        return stats
+
+    async def _store(
+        self,
+        resource_path: str,
+        resource_type: str,
+        user_id: Optional[UUID],
+        execution_id: Optional[UUID],
+        size_bytes: int,
+        file_count: int,
+    ) -> None:
+        """Upsert a path record and apply the difference to totals."""
+        record = await self.usage_repo.get_by_path(resource_path)
+
+        if record is None:
+            await self.usage_repo.create(
+                resource_path=resource_path,
+                resource_type=resource_type,
+                user_id=user_id,
+                execution_id=execution_id,
+                size_bytes=size_bytes,
+                file_count=file_count,
+            )
+            await self._apply_totals(user_id, resource_type, size_bytes, file_count)
+            return
+
+        # Ownership or type changed: move the old counters out first
+        if record.user_id != user_id or record.resource_type != resource_type:
+            await self._apply_totals(
+                record.user_id, record.resource_type, -record.size_bytes, -record.file_count
+            )
+            await self._apply_totals(user_id, resource_type, size_bytes, file_count)
+        else:
+            await self._apply_totals(
+                user_id,
+                resource_type,
+                size_bytes - record.size_bytes,
+                file_count - record.file_count,
+            )
+
+        await self.usage_repo.update(
+            record.id,
+            resource_type=resource_type,
+            user_id=user_id,
+            execution_id=execution_id or record.execution_id,
+            size_bytes=size_bytes,
+            file_count=file_count,
+            updated_at=datetime.utcnow(),
+        )
+
+    async def _apply_totals(
+        self,
+        user_id: Optional[UUID],
+        resource_type: str,
+        delta_bytes: int,
+        delta_files: int,
+    ) -> None:
+        """Apply a delta to the global and (if owned) per-user totals."""
+        if not delta_bytes and not delta_files:
+            return
+
+        await self.usage_repo.increment_totals(GLOBAL_OWNER, resource_type, delta_bytes, delta_files)
+        if user_id:
+            await self.usage_repo.increment_totals(str(user_id), resource_type, delta_bytes, delta_files)
+
+    async def _rebuild_totals(self) -> None:
+        """Recompute all aggregated totals from per-path records."""
+        # Lock before summing so no increment lands between the sum and the replace
+        await self.usage_repo.lock_totals()
+        totals: Dict[Tuple[str, str], Tuple[int, int]] = {}
+
+        for user_id, resource_type, size_bytes, file_count in await self.usage_repo.sum_by_owner():
+            owners = [GLOBAL_OWNER] + ([user_id] if user_id else [])
+            for owner_key in owners:
+                current = totals.get((owner_key, resource_type), (0, 0))
+                totals[(owner_key, resource_type)] = (
+                    current[0] + size_bytes,
+                    current[1] + file_count,
+                )
+
+        await self.usage_repo.replace_totals(totals)
+
+    @staticmethod
+    def _format_totals(raw: Dict[str, Tuple[int, int]]) -> Dict[str, Dict[str, int]]:
+        """Shape raw totals into a response dict with a 'total' entry."""
+        usage = {}
+        total_bytes = 0
+        total_files = 0
+
+        for resource_type in RESOURCE_TYPES:
+            size_bytes, file_count = raw.get(resource_type, (0, 0))
+            usage[resource_type] = {"size_bytes": size_bytes, "file_count": file_count}
+            total_bytes += size_bytes
+            total_files += file_count
+
+        usage["total"] = {"size_bytes": total_bytes, "file_count": total_files}
+        return usage
+
+
+async def run_storage_reconciliation(interval_seconds: int) -> None:
+    """Periodically reconcile storage counters until cancelled.
+
+    Args:
+        interval_seconds: Delay between reconciliation scans
+    """
+    from app.database.session import AsyncSessionLocal
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with AsyncSessionLocal() as db:
+                await StorageAccountingService(db).reconcile()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(
+                "Storage usage reconciliation failed",
+                extra={"error": str(e), "error_type": type(e).__name__},
+                exc_info=True,
+            )
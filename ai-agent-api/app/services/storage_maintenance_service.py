@@ -0,0 +1,505 @@
+"""Storage maintenance service for retention and orphan cleanup."""
+import asyncio
+import os
+import shutil
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.report_repository import ReportRepository
+from app.repositories.session_repository import SessionRepository
+from app.repositories.task_repository import TaskRepository
+from app.repositories.task_execution_repository import TaskExecutionRepository
+from app.services.storage_accounting_service import StorageAccountingService, measure_path
+from app.services.storage_manager import StorageManager
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Session statuses whose working directory is no longer written to
+FINISHED_SESSION_STATUSES = ("completed", "failed", "terminated")
+
+# IDs looked up per query when matching on-disk entries to DB rows
+LOOKUP_BATCH_SIZE = 500
+
+# Redis key ensuring one maintenance pass per interval across workers
+MAINTENANCE_LOCK_KEY = "storage:maintenance:lock"
+
+# Lifetime of the lock held by a manual pass, released when the pass ends
+MANUAL_MAINTENANCE_LOCK_SECONDS = 3600
+
+# Delete the lock only if this worker still owns it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class IOThrottle:
+    """Paces maintenance I/O to a byte rate so live executions keep disk bandwidth.
+
+    Budget is charged before the I/O it covers: each call reserves the next
+    ``nbytes / bytes_per_second`` slot and waits until that slot starts.
+    Unused time does not accumulate, so there are no bursts after idle
+    periods. Safe to share between the event loop and worker threads.
+    """
+
+    def __init__(self, bytes_per_second: float):
+        self.bytes_per_second = bytes_per_second
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, nbytes: int) -> float:
+        """Reserve budget for nbytes and get the seconds to wait before using it."""
+        if self.bytes_per_second <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next_slot, now)
+            self._next_slot = start + nbytes / self.bytes_per_second
+            return start - now
+
+    def acquire(self, nbytes: int) -> None:
+        """Block until nbytes of I/O may be issued (for worker threads)."""
+        delay = self._reserve(nbytes)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def consume(self, nbytes: int) -> None:
+        """Wait until nbytes of I/O may be issued."""
+        await asyncio.sleep(self._reserve(nbytes))
+
+
+class StorageMaintenanceService:
+    """Applies retention to working directories, archives and reports.
+
+    Each run:
+      * archives session and task working directories whose last execution
+        finished more than ``session_auto_archive_days`` ago
+      * deletes archives older than ``archive_retention_days`` (when
+        ``archive_auto_cleanup`` is enabled)
+      * deletes report files older than ``report_retention_days`` or whose
+        report was soft-deleted
+      * garbage-collects directories and report files with no DB row
+
+    On-disk entries drive the scan, so each run only looks up rows for
+    entries that actually exist. Orphans younger than
+    ``storage_orphan_grace_hours`` are left alone to avoid racing with
+    sessions that are still being created.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        storage_manager: Optional[StorageManager] = None,
+        io_mb_per_second: Optional[float] = None,
+    ):
+        self.db = db
+        self.storage_manager = storage_manager or StorageManager()
+        self.task_workdir_base = Path(settings.task_workdir_base)
+        self.session_repo = SessionRepository(db)
+        self.task_repo = TaskRepository(db)
+        self.task_execution_repo = TaskExecutionRepository(db)
+        self.report_repo = ReportRepository(db)
+        self.accounting = StorageAccountingService(db)
+
+        if io_mb_per_second is None:
+            io_mb_per_second = settings.storage_maintenance_io_mb_per_second
+        self.throttle = IOThrottle(io_mb_per_second * 1024 * 1024)
+
+    async def run(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Run one maintenance pass.
+
+        Args:
+            dry_run: Only report what would be archived or deleted
+
+        Returns:
+            Report with per-action counts, bytes reclaimed and affected paths
+        """
+        report = {
+            "dry_run": dry_run,
+            "started_at": datetime.utcnow(),
+            "archived_directories": 0,
+            "deleted_archives": 0,
+            "deleted_reports": 0,
+            "orphaned_directories": 0,
+            "orphaned_reports": 0,
+            "bytes_reclaimed": 0,
+            "errors": 0,
+            "items": [],
+        }
+
+        await self._process_session_directories(report, dry_run)
+        await self._process_task_directories(report, dry_run)
+        if settings.archive_auto_cleanup:
+            await self._expire_archives(report, dry_run)
+        await self._process_reports(report, dry_run)
+
+        report["completed_at"] = datetime.utcnow()
+
+        logger.info(
+            "Storage maintenance completed",
+            extra={
+                key: value for key, value in report.items()
+                if key not in ("items", "started_at", "completed_at")
+            }
+        )
+
+        return report
+
+    async def _process_session_directories(self, report: Dict[str, Any], dry_run: bool) -> None:
+        """Archive finished session directories and remove orphaned ones."""
+        archive_cutoff = self._cutoff(days=settings.session_auto_archive_days)
+
+        for batch in self._batched(self._list_uuid_entries(self.storage_manager.base_workdir, dirs=True)):
+            sessions = {
+                session.id: session
+                for session in await self.session_repo.get_by_ids([entry_id for entry_id, _ in batch])
+            }
+
+            for session_id, path in batch:
+                session = sessions.get(session_id)
+
+                if session is None or session.deleted_at is not None:
+                    await self._remove_orphan(report, path, "orphaned_directories", dry_run)
+                elif (
+                    session.status in FINISHED_SESSION_STATUSES
+                    and session.completed_at is not None
+                    and self._as_utc(session.completed_at) < archive_cutoff
+                ):
+                    await self._archive(report, path, str(session_id), session.user_id, dry_run)
+
+    async def _process_task_directories(self, report: Dict[str, Any], dry_run: bool) -> None:
+        """Archive idle task directories and remove orphaned ones."""
+        archive_cutoff = self._cutoff(days=settings.session_auto_archive_days)
+
+        for batch in self._batched(self._list_uuid_entries(self.task_workdir_base, dirs=True)):
+            task_ids = [entry_id for entry_id, _ in batch]
+            tasks = {task.id: task for task in await self.task_repo.get_by_ids(task_ids)}
+            activity = await self.task_execution_repo.get_task_activity(task_ids)
+
+            for task_id, path in batch:
+                task = tasks.get(task_id)
+
+                if task is None or task.deleted_at is not None:
+                    await self._remove_orphan(report, path, "orphaned_directories", dry_run)
+                    continue
+
+                last_activity, in_flight = activity.get(task_id, (None, False))
+                if in_flight:
+                    continue
+
+                if last_activity is None:
+                    try:
+                        last_activity = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+                    except FileNotFoundError:
+                        continue
+
+                if self._as_utc(last_activity) < archive_cutoff:
+                    await self._archive(report, path, str(task_id), task.user_id, dry_run)
+
+    async def _expire_archives(self, report: Dict[str, Any], dry_run: bool) -> None:
+        """Delete archives past the retention period."""
+        for archive_path in self.storage_manager.find_expired_archives(settings.archive_retention_days):
+            try:
+                size_bytes = archive_path.stat().st_size
+            except FileNotFoundError:
+                continue
+
+            if not dry_run:
+                await self.throttle.consume(size_bytes)
+                try:
+                    await self._run_blocking(self.storage_manager.delete_archive, archive_path)
+                    await self.accounting.remove_path(str(archive_path))
+                    await self.db.commit()
+                except Exception as e:
+                    await self.db.rollback()
+                    self._record_error(report, archive_path, "delete_archive", e)
+                    continue
+
+            self._record(report, "deleted_archives", "delete_archive", archive_path, size_bytes, size_bytes)
+
+    async def _process_reports(self, report: Dict[str, Any], dry_run: bool) -> None:
+        """Delete expired, soft-deleted and orphaned report files."""
+        retention_cutoff = self._cutoff(days=settings.report_retention_days)
+
+        for batch in self._batched(self._list_uuid_entries(self.storage_manager.reports_dir, dirs=False)):
+            reports = {
+                model.id: model
+                for model in await self.report_repo.get_by_ids([entry_id for entry_id, _ in batch])
+            }
+
+            for report_id, path in batch:
+                model = reports.get(report_id)
+
+                if model is None:
+                    await self._remove_orphan(report, path, "orphaned_reports", dry_run)
+                    continue
+
+                expired = (
+                    model.deleted_at is not None
+                    or self._as_utc(model.created_at) < retention_cutoff
+                )
+                if not expired:
+                    continue
+
+                try:
+                    size_bytes = path.stat().st_size
+                except FileNotFoundError:
+                    continue
+
+                if not dry_run:
+                    await self.throttle.consume(size_bytes)
+                    try:
+                        await self._run_blocking(path.unlink, True)
+                        await self.accounting.remove_path(str(path))
+                        if model.file_path == str(path):
+                            await self.report_repo.update(model.id, file_path=None, file_size_bytes=None)
+                        await self.db.commit()
+                    except Exception as e:
+                        await self.db.rollback()
+                        self._record_error(report, path, "delete_report", e)
+                        continue
+
+                self._record(report, "deleted_reports", "delete_report", path, size_bytes, size_bytes)
+
+    async def _archive(
+        self,
+        report: Dict[str, Any],
+        path: Path,
+        name: str,
+        user_id: Optional[UUID],
+        dry_run: bool,
+    ) -> None:
+        """Archive a working directory and delete the original."""
+        size_bytes, _ = await self._run_blocking(measure_path, path)
+
+        if dry_run:
+            self._record(report, "archived_directories", "archive", path, size_bytes, size_bytes)
+            return
+
+        try:
+            # Reads are paced chunk by chunk inside the worker thread
+            archive_path = await self._run_blocking(
+                self.storage_manager.archive_directory, path, name, self.throttle.acquire
+            )
+            await self._run_blocking(shutil.rmtree, path)
+
+            await self.accounting.remove_path(str(path))
+            await self.accounting.record_path(archive_path, resource_type="archive", user_id=user_id)
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            self._record_error(report, path, "archive", e)
+            return
+
+        reclaimed = max(size_bytes - archive_path.stat().st_size, 0)
+        self._record(report, "archived_directories", "archive", path, size_bytes, reclaimed)
+
+    async def _remove_orphan(
+        self,
+        report: Dict[str, Any],
+        path: Path,
+        counter: str,
+        dry_run: bool,
+    ) -> None:
+        """Delete a directory or file that has no DB row, after the grace period."""
+        grace_cutoff = self._cutoff(hours=settings.storage_orphan_grace_hours)
+        try:
+            modified_at = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+        except FileNotFoundError:
+            return
+
+        if modified_at >= grace_cutoff:
+            return
+
+        size_bytes, _ = await self._run_blocking(measure_path, path)
+
+        if not dry_run:
+            await self.throttle.consume(size_bytes)
+            try:
+                if path.is_dir():
+                    await self._run_blocking(shutil.rmtree, path)
+                else:
+                    await self._run_blocking(path.unlink, True)
+                await self.accounting.remove_path(str(path))
+                await self.db.commit()
+            except Exception as e:
+                await self.db.rollback()
+                self._record_error(report, path, "delete_orphan", e)
+                return
+
+        self._record(report, counter, "delete_orphan", path, size_bytes, size_bytes)
+
+    @staticmethod
+    def _list_uuid_entries(base: Path, dirs: bool) -> List[Tuple[UUID, Path]]:
+        """List entries named by a UUID (optionally with a file extension)."""
+        if not base.exists():
+            return []
+
+        entries = []
+        for path in base.iterdir():
+            if dirs != path.is_dir() or path.is_symlink():
+                continue
+            name = path.name if dirs else path.name.split(".", 1)[0]
+            try:
+                entries.append((UUID(name), path))
+            except ValueError:
+                continue
+
+        return entries
+
+    @staticmethod
+    def _batched(entries: List[Tuple[UUID, Path]]) -> List[List[Tuple[UUID, Path]]]:
+        """Split entries into DB lookup batches."""
+        return [
+            entries[i:i + LOOKUP_BATCH_SIZE]
+            for i in range(0, len(entries), LOOKUP_BATCH_SIZE)
+        ]
+
+    @staticmethod
+    def _cutoff(days: int = 0, hours: int = 0) -> datetime:
+        """Get a timezone-aware cutoff relative to now."""
+        return datetime.now(timezone.utc) - timedelta(days=days, hours=hours)
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        """Treat naive timestamps (written with utcnow) as UTC."""
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    @staticmethod
+    async def _run_blocking(func, *args):
+        """Run blocking filesystem work off the event loop."""
+        return await asyncio.get_event_loop().run_in_executor(None, func, *args)
+
+    @staticmethod
+    def _record(
+        report: Dict[str, Any],
+        counter: str,
+        action: str,
+        path: Path,
+        size_bytes: int,
+        reclaimed_bytes: int,
+    ) -> None:
+        """Add an archived or deleted entry to the run report."""
+        report[counter] += 1
+        report["bytes_reclaimed"] += reclaimed_bytes
+        report["items"].append({
+            "action": action,
+            "path": str(path),
+            "size_bytes": size_bytes,
+        })
+
+    @staticmethod
+    def _record_error(report: Dict[str, Any], path: Path, action: str, error: Exception) -> None:
+        """Count a failed entry and log it; the run continues."""
+        report["errors"] += 1
+        logger.warning(
+            "Storage maintenance action failed",
+            extra={"action": action, "path": str(path), "error": str(error)}
+        )
+
+
+def _lock_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def acquire_maintenance_lock(ttl_seconds: float, redis=None) -> bool:
+    """Claim the next maintenance pass for this worker.
+
+    Uses ``SET NX PX`` so exactly one worker per interval wins. The lock is
+    not released after the pass: it expires after ``ttl_seconds``, which
+    keeps workers that wake up later in the same interval from running a
+    second pass.
+
+    Args:
+        ttl_seconds: Lock lifetime
+        redis: Redis client (defaults to RedisClientManager's client)
+
+    Returns:
+        True if this worker should run the pass
+    """
+    if redis is None:
+        from app.infrastructure.redis_client import RedisClientManager
+        try:
+            redis = RedisClientManager.get_client()
+        except RuntimeError:
+            logger.warning("Redis not available, skipping storage maintenance pass")
+            return False
+
+    try:
+        acquired = await redis.set(
+            MAINTENANCE_LOCK_KEY, _lock_owner(), nx=True, px=max(int(ttl_seconds * 1000), 1)
+        )
+    except Exception as e:
+        logger.warning(
+            "Could not take storage maintenance lock, skipping pass",
+            extra={"error": str(e), "error_type": type(e).__name__},
+        )
+        return False
+
+    return bool(acquired)
+
+
+async def release_maintenance_lock(redis=None) -> None:
+    """Release the maintenance lock if this worker holds it.
+
+    Only used after manual passes; periodic passes let the lock expire.
+
+    Args:
+        redis: Redis client (defaults to RedisClientManager's client)
+    """
+    if redis is None:
+        from app.infrastructure.redis_client import RedisClientManager
+        try:
+            redis = RedisClientManager.get_client()
+        except RuntimeError:
+            return
+
+    try:
+        await redis.eval(_RELEASE_LOCK_SCRIPT, 1, MAINTENANCE_LOCK_KEY, _lock_owner())
+    except Exception as e:
+        logger.warning(
+            "Could not release storage maintenance lock, it will expire",
+            extra={"error": str(e), "error_type": type(e).__name__},
+        )
+
+
+async def run_storage_maintenance(interval_seconds: int) -> None:
+    """Periodically run storage maintenance until cancelled.
+
+    Every worker runs this loop; each pass is taken by whichever worker
+    acquires the Redis lock first, the others skip it.
+
+    Args:
+        interval_seconds: Delay between maintenance passes
+    """
+    from app.database.session import AsyncSessionLocal
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        # Expire a little before the next round so the lock is free again
+        if not await acquire_maintenance_lock(interval_seconds * 0.9):
+            logger.debug("Storage maintenance pass taken by another worker")
+            continue
+        try:
+            async with AsyncSessionLocal() as db:
+                await StorageMaintenanceService(db).run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(
+                "Storage maintenance failed",
+                extra={"error": str(e), "error_type": type(e).__name__},
+                exc_info=True,
+            )
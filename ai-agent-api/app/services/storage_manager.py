@@ -1,12 +1,23 @@
 """Storage manager for working directories and file operations."""
+import asyncio
 import os
 import shutil
 import tarfile
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterator, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.claude_sdk.persistence.archive_index import (
+    create_indexed_tar_gz,
+    index_path_for,
+    iter_local_member,
+    load_index,
+    normalize_member_path,
+    write_index,
+)
 from app.core.config import settings
+from app.services.storage_accounting_service import StorageAccountingService
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -106,18 +117,14 @@ class StorageManager:
             )
             return None
 
-        # Create archive directory if it doesn't exist
-        self.archive_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create tar.gz archive
-        archive_name = f"{session_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.tar.gz"
-        archive_path = self.archive_dir / archive_name
-
-        with tarfile.open(archive_path, "w:gz") as tar:
-            tar.add(workdir, arcname=str(session_id))
+        # Compressing and deleting a large tree would stall the event loop
+        loop = asyncio.get_event_loop()
+        archive_path = await loop.run_in_executor(
+            None, self.archive_directory, workdir, str(session_id)
+        )
 
         # Delete original directory
-        shutil.rmtree(workdir)
+        await loop.run_in_executor(None, shutil.rmtree, workdir)
         
         logger.info(
             "Working directory archived successfully",
@@ -130,6 +137,115 @@ class StorageManager:
 
         return archive_path
 
+    def archive_directory(
+        self,
+        workdir: Path,
+        name: str,
+        before_read: Optional[Callable[[int], None]] = None,
+    ) -> Path:
+        """Write an indexed tar.gz of a directory into the archive directory (blocking).
+
+        The source directory is left in place.
+
+        Args:
+            workdir: Directory to archive
+            name: Archive name prefix and root member name (session or task ID)
+            before_read: Called with the size of each file read before it is issued
+
+        Returns:
+            Path to the created archive
+        """
+        # Create archive directory if it doesn't exist
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+
+        archive_name = f"{name}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.tar.gz"
+        archive_path = self.archive_dir / archive_name
+
+        # Framed tar.gz plus sidecar index so single files can be served
+        # without decompressing the whole archive
+        index = create_indexed_tar_gz(workdir, archive_path, arcname=name, before_read=before_read)
+        write_index(index, index_path_for(archive_path))
+
+        return archive_path
+
+    async def find_archive(self, session_id: UUID) -> Optional[Path]:
+        """Get the most recent archive file for a session."""
+        if not self.archive_dir.exists():
+            return None
+
+        matching_archives = list(self.archive_dir.glob(f"{session_id}_*.tar.gz"))
+        if not matching_archives:
+            return None
+
+        return max(matching_archives, key=lambda p: p.stat().st_mtime)
+
+    async def open_archive_file(
+        self,
+        archive_path: Path,
+        file_path: str,
+    ) -> Optional[Tuple[int, Iterator[bytes]]]:
+        """Open a single file inside an archive for streaming.
+
+        Uses the sidecar index to decompress only the frame holding the file.
+        Archives written before indexes existed fall back to a sequential
+        tar scan.
+
+        Args:
+            archive_path: Path to the .tar.gz archive
+            file_path: File path relative to the archived working directory
+
+        Returns:
+            Tuple of (file size, iterator over file bytes), or None if the
+            file is not in the archive
+
+        Raises:
+            ValueError: If file_path is absolute or escapes the archive root
+        """
+        member_path = normalize_member_path(file_path)
+        loop = asyncio.get_event_loop()
+        index = await loop.run_in_executor(None, load_index, index_path_for(archive_path))
+
+        if index is not None:
+            entry = index["files"].get(member_path)
+            if entry is None:
+                return None
+            entry, chunks = iter_local_member(archive_path, index, member_path)
+            return entry["size"], chunks
+
+        logger.debug(
+            "Archive has no index, scanning tar sequentially",
+            extra={"archive_path": str(archive_path), "file_path": member_path}
+        )
+        return await loop.run_in_executor(None, self._scan_tar, archive_path, member_path)
+
+    def _scan_tar(
+        self,
+        archive_path: Path,
+        member_path: str,
+    ) -> Optional[Tuple[int, Iterator[bytes]]]:
+        """Find a member by reading the tar sequentially (blocking operation)."""
+        tar = tarfile.open(archive_path, "r:gz")
+        for member in tar:
+            name = member.name.split("/", 1)[1] if "/" in member.name else ""
+            if name == member_path and member.isreg():
+                return member.size, self._iter_tar_member(tar, member)
+
+        tar.close()
+        return None
+
+    @staticmethod
+    def _iter_tar_member(tar: tarfile.TarFile, member: tarfile.TarInfo) -> Iterator[bytes]:
+        """Yield the contents of a tar member and close the archive when done."""
+        try:
+            fileobj = tar.extractfile(member)
+            while True:
+                chunk = fileobj.read(64 * 1024)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            tar.close()
+
     async def get_directory_size(self, session_id: UUID) -> int:
         """Get total size of working directory in bytes."""
         workdir = self.base_workdir / str(session_id)
@@ -226,40 +342,48 @@ class StorageManager:
             return True
         return False
 
-    async def get_total_storage_usage(self, user_id: Optional[UUID] = None) -> int:
-        """Get total storage usage in bytes, optionally for a specific user."""
-        # This is a simplified implementation
-        # In production, you'd query the database to filter by user
-        total_size = 0
-
-        # Working directories
-        if self.base_workdir.exists():
-            for workdir in self.base_workdir.iterdir():
-                if workdir.is_dir():
-                    for dirpath, dirnames, filenames in os.walk(workdir):
-                        for filename in filenames:
-                            filepath = Path(dirpath) / filename
-                            total_size += filepath.stat().st_size
-
-        # Reports
-        if self.reports_dir.exists():
-            for filepath in self.reports_dir.iterdir():
-                if filepath.is_file():
-                    total_size += filepath.stat().st_size
-
-        return total_size
+    async def get_total_storage_usage(
+        self, db: AsyncSession, user_id: Optional[UUID] = None
+    ) -> int:
+        """Get total storage usage in bytes, optionally for a specific user.
+
+        Reads the counters kept by StorageAccountingService (working
+        directories, archives and reports) instead of walking the tree.
+        """
+        accounting = StorageAccountingService(db)
+        if user_id is None:
+            usage = await accounting.get_global_usage()
+        else:
+            usage = await accounting.get_user_usage(user_id)
+        return usage["total"]["size_bytes"]
 
-    async def cleanup_old_archives(self, days: int = 180) -> int:
-        """Delete archives older than specified days. Returns count of deleted archives."""
+    def find_expired_archives(self, days: int) -> List[Path]:
+        """Get archive files last modified more than the given days ago."""
         if not self.archive_dir.exists():
-            return 0
+            return []
 
         cutoff_time = datetime.utcnow().timestamp() - (days * 24 * 60 * 60)
-        deleted_count = 0
+        expired = []
 
         for archive_file in self.archive_dir.glob("*.tar.gz"):
-            if archive_file.stat().st_mtime < cutoff_time:
-                archive_file.unlink()
-                deleted_count += 1
+            try:
+                if archive_file.stat().st_mtime < cutoff_time:
+                    expired.append(archive_file)
+            except FileNotFoundError:
+                continue
+
+        return expired
+
+    @staticmethod
+    def delete_archive(archive_path: Path) -> None:
+        """Delete an archive file and its sidecar index."""
+        archive_path.unlink(missing_ok=True)
+        index_path_for(archive_path).unlink(missing_ok=True)
+
+    async def cleanup_old_archives(self, days: int = 180) -> int:
+        """Delete archives older than specified days. Returns count of deleted archives."""
+        expired = self.find_expired_archives(days)
+        for archive_file in expired:
+            self.delete_archive(archive_file)
 
-        return deleted_count
+        return len(expired)
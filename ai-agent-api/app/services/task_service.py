@@ -2,15 +2,24 @@
 from typing import Optional
 from uuid import UUID, uuid4
 from datetime import datetime
+from pathlib import Path
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.task import Task
 from app.domain.entities.task_execution import TaskExecution, TaskExecutionStatus, TriggerType
-from app.domain.exceptions import TaskNotFoundError, PermissionDeniedError, ValidationError
+from app.domain.exceptions import (
+    TaskNotFoundError,
+    PermissionDeniedError,
+    ValidationError,
+    QuotaExceededError,
+)
 from app.repositories.task_repository import TaskRepository
 from app.repositories.task_execution_repository import TaskExecutionRepository
 from app.repositories.user_repository import UserRepository
 from app.services.audit_service import AuditService
+from app.services.execution_events import ExecutionEventPublisher
+from app.services.storage_accounting_service import StorageAccountingService
+from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -67,24 +76,36 @@ class TaskService:
         final_disallowed_tools = disallowed_tools or []
 
         if tool_group_id:
+            from app.mcp.config_cache import get_mcp_config_cache
             from app.repositories.tool_group_repository import ToolGroupRepository
-            tool_group_repo = ToolGroupRepository(self.db)
-            tool_group = await tool_group_repo.get_by_id(str(tool_group_id))
+
+            async def load_tool_group():
+                tool_group = await ToolGroupRepository(self.db).get_by_id(str(tool_group_id))
+                if not tool_group:
+                    return None
+                return {
+                    "allowed_tools": tool_group.allowed_tools or [],
+                    "disallowed_tools": tool_group.disallowed_tools or [],
+                }
+
+            # Resolved groups are cached until the group is modified
+            tool_group = await get_mcp_config_cache().get_tool_group(tool_group_id, load_tool_group)
 
             if not tool_group:
                 raise ValidationError(f"Tool group {tool_group_id} not found")
 
             # Use tool group's tools if not provided directly
             if not allowed_tools:
-                final_allowed_tools = tool_group.allowed_tools or []
+                final_allowed_tools = list(tool_group["allowed_tools"])
             if not disallowed_tools:
-                final_disallowed_tools = tool_group.disallowed_tools or []
+                final_disallowed_tools = list(tool_group["disallowed_tools"])
 
         # === VALIDATION LAYER ===
         # Validate task definition before creating entity
         await self._validate_task_definition(
             prompt_template=prompt_template,
             allowed_tools=final_allowed_tools,
+            disallowed_tools=final_disallowed_tools,
             sdk_options=sdk_options,
             is_scheduled=is_scheduled,
             schedule_cron=schedule_cron,
@@ -218,6 +239,9 @@ class TaskService:
         if not task.is_active:
             raise ValidationError("Task is not active")
 
+        # Enforce storage quota from recorded counters (no filesystem walk)
+        await self._check_storage_quota(task.user_id)
+
         # 2. Create task execution record
         execution = TaskExecution(
             id=uuid4(),
@@ -295,6 +319,7 @@ class TaskService:
             started_at=datetime.utcnow(),
         )
         await self.db.commit()
+        await ExecutionEventPublisher(execution.id).status(TaskExecutionStatus.RUNNING.value)
 
         logger.info(
             "Task status updated to RUNNING",
@@ -343,6 +368,7 @@ class TaskService:
         prompt: str,
         task,
         execution_id: str,
+        events: Optional[ExecutionEventPublisher] = None,
     ) -> dict:
         """Execute prompt using Claude SDK directly (following POC patterns).
 
@@ -357,13 +383,13 @@ class TaskService:
             prompt: Rendered prompt to send to Claude
             task: Task entity with SDK options
             execution_id: Execution ID for logging
+            events: Publisher for progress events (assistant text, tool calls, result)
 
         Returns:
             Dictionary with execution results (messages, metadata, etc.)
         """
         from claude_agent_sdk import query, ClaudeAgentOptions
         from claude_agent_sdk import AssistantMessage, TextBlock, ToolUseBlock, ResultMessage
-        from pathlib import Path
         import uuid
 
         logger.info(
@@ -390,7 +416,7 @@ class TaskService:
         )
 
         # Create working directory for this task execution
-        working_dir = Path(f"/tmp/agent-workdirs/active/{task.id}")
+        working_dir = self._get_task_working_dir(task.id)
         working_dir.mkdir(parents=True, exist_ok=True)
 
         logger.info(
@@ -450,6 +476,11 @@ class TaskService:
                     for block in message.content:
                         if isinstance(block, TextBlock):
                             text_blocks.append(block.text)
+                            if events:
+                                await events.publish("assistant_text", {
+                                    "message_number": message_count,
+                                    "text": block.text,
+                                })
                         elif isinstance(block, ToolUseBlock):
                             tool_use_count += 1
                             tool_name = block.name
@@ -459,6 +490,13 @@ class TaskService:
                                 "name": tool_name,
                                 "input_keys": list(block.input.keys()) if isinstance(block.input, dict) else [],
                             })
+                            if events:
+                                await events.publish("tool_call", {
+                                    "message_number": message_count,
+                                    "id": block.id,
+                                    "name": tool_name,
+                                    "input": block.input,
+                                })
 
                     # Log Claude's text response
                     if text_blocks:
@@ -516,6 +554,14 @@ class TaskService:
                             "event": "final_result_received",
                         }
                     )
+                    if events:
+                        await events.publish("result", {
+                            "duration_ms": message.duration_ms,
+                            "num_turns": message.num_turns,
+                            "is_error": message.is_error,
+                            "total_cost_usd": message.total_cost_usd,
+                            "usage": getattr(message, 'usage', None),
+                        })
 
             # Extract final text response from last AssistantMessage
             final_text = ""
@@ -615,6 +661,7 @@ class TaskService:
         )
 
         exec_repo = ExecRepo(db_session)
+        events = ExecutionEventPublisher(execution.id)
 
         try:
             # Step 1: Render prompt template
@@ -655,6 +702,7 @@ class TaskService:
                 prompt=rendered_prompt,
                 task=task,
                 execution_id=str(execution.id),
+                events=events,
             )
 
             # Step 3: Update execution as completed
@@ -697,6 +745,18 @@ class TaskService:
 
             # Commit database changes
             await db_session.commit()
+            await events.status(
+                TaskExecutionStatus.COMPLETED.value,
+                total_messages=result.get("total_messages"),
+                total_tool_uses=result.get("total_tool_uses"),
+                duration_ms=result.get("duration_ms"),
+                cost_usd=result.get("cost_usd"),
+                num_turns=result.get("num_turns"),
+            )
+
+            await self._record_working_dir_usage(
+                db_session, result.get("working_dir"), task.user_id, execution.id
+            )
 
             logger.info(
                 "[BG_TASK] Database changes committed",
@@ -760,6 +820,11 @@ class TaskService:
                     completed_at=datetime.utcnow(),
                     error_message=str(e),
                 )
+                await events.status(TaskExecutionStatus.FAILED.value, error=str(e))
+
+                await self._record_working_dir_usage(
+                    db_session, self._get_task_working_dir(task.id), task.user_id, execution.id
+                )
 
                 logger.info(
                     "[BG_TASK] Execution marked as failed",
@@ -841,6 +906,7 @@ class TaskService:
         """
         from app.services.sdk_session_service import SDKIntegratedSessionService
         from app.services.storage_manager import StorageManager
+        from app.claude_sdk.event_broadcaster import get_event_broadcaster
         from app.repositories.session_repository import SessionRepository
         from app.repositories.message_repository import MessageRepository
         from app.repositories.tool_call_repository import ToolCallRepository
@@ -864,6 +930,7 @@ class TaskService:
                 user_repo=self.user_repo,
                 storage_manager=StorageManager(),
                 audit_service=self.audit_service,
+                event_broadcaster=get_event_broadcaster(),
             )
             
             # Build session name
@@ -920,6 +987,10 @@ class TaskService:
                 completed_at=execution.completed_at,
                 result_data=execution.result_data,
             )
+
+            await self._record_working_dir_usage(
+                self.db, session.working_directory_path, task.user_id, execution.id
+            )
             
             # 7. Generate report if requested
             if task.generate_report:
@@ -986,6 +1057,68 @@ class TaskService:
             
             raise
     
+    @staticmethod
+    def _get_task_working_dir(task_id: UUID) -> Path:
+        """Get the working directory used by background executions of a task."""
+        return Path(settings.task_workdir_base) / str(task_id)
+
+    async def _check_storage_quota(self, user_id: UUID) -> None:
+        """Reject execution if the user's recorded storage exceeds their quota.
+
+        Raises:
+            QuotaExceededError: If storage quota is exceeded
+        """
+        user = await self.user_repo.get_by_id(user_id)
+        if not user:
+            return
+
+        accounting = StorageAccountingService(self.db)
+        try:
+            await accounting.check_user_quota(user_id, user.max_storage_mb)
+        except QuotaExceededError:
+            usage = await accounting.get_user_usage(user_id)
+            await self.audit_service.log_quota_exceeded(
+                user_id=user_id,
+                quota_type="storage_mb",
+                current_value=usage["total"]["size_bytes"] // (1024 * 1024),
+                limit=user.max_storage_mb,
+            )
+            await self.db.commit()
+            raise
+
+    async def _record_working_dir_usage(
+        self,
+        db_session: AsyncSession,
+        working_dir,
+        user_id: UUID,
+        execution_id: UUID,
+    ) -> None:
+        """Record working directory size after an execution finishes.
+
+        Accounting failures are logged and never fail the execution.
+        """
+        if not working_dir:
+            return
+
+        try:
+            await StorageAccountingService(db_session).record_path(
+                working_dir,
+                resource_type="working_directory",
+                user_id=user_id,
+                execution_id=execution_id,
+            )
+            await db_session.commit()
+        except Exception as e:
+            await db_session.rollback()
+            logger.warning(
+                "Failed to record working directory storage usage",
+                extra={
+                    "execution_id": str(execution_id),
+                    "working_dir": str(working_dir),
+                    "error": str(e),
+                }
+            )
+
     def _render_prompt_template(self, template: str, variables: dict) -> str:
         """Render prompt template with variables.
         
@@ -1333,7 +1466,6 @@ class TaskService:
         """
         from sqlalchemy import select
         from app.models.task_execution import TaskExecutionModel
-        import os
 
         # Get executions
         stmt = (
@@ -1348,31 +1480,27 @@ class TaskService:
         active_dirs = []
         archived_dirs = []
 
+        # Sizes come from storage accounting counters (one query, no tree walks)
+        paths = {
+            execution_model.result_data["working_dir"]
+            for execution_model in executions
+            if execution_model.result_data and execution_model.result_data.get("working_dir")
+        }
+        usage = await StorageAccountingService(self.db).get_usage_by_paths(list(paths))
+
         for execution_model in executions:
             if execution_model.result_data and execution_model.result_data.get("working_dir"):
                 # Async mode - working dir in result_data
+                working_dir = execution_model.result_data.get("working_dir")
+                dir_usage = usage.get(working_dir)
                 dir_info = {
                     "execution_id": execution_model.id,
-                    "path": execution_model.result_data.get("working_dir"),
+                    "path": working_dir,
                     "created_at": execution_model.created_at,
                     "is_archived": execution_model.status == "completed",
-                    "size_bytes": None,
+                    "size_bytes": dir_usage["size_bytes"] if dir_usage else None,
                 }
 
-                # Try to get directory size if it exists
-                try:
-                    working_dir = execution_model.result_data.get("working_dir")
-                    if working_dir and os.path.exists(working_dir):
-                        total_size = 0
-                        for dirpath, dirnames, filenames in os.walk(working_dir):
-                            for filename in filenames:
-                                filepath = os.path.join(dirpath, filename)
-                                total_size += os.path.getsize(filepath)
-                        dir_info["size_bytes"] = total_size
-                except Exception as e:
-                    logger.warning(f"Could not get directory size: {e}")
-                    dir_info["size_bytes"] = None
-
                 if execution_model.status == "completed":
                     archived_dirs.append(dir_info)
                 else:
@@ -1518,12 +1646,13 @@ class TaskService:
         schedule_cron: Optional[str],
         generate_report: bool,
         report_format: Optional[str],
+        disallowed_tools: Optional[list[str]] = None,
     ) -> None:
         """Validate task definition to ensure it will execute successfully.
 
         Checks:
         - Prompt template is valid and renderable
-        - Allowed tools are valid patterns
+        - Allowed tools are valid patterns, not all of them disallowed
         - SDK options are properly structured
         - No forbidden permission_mode overrides
         - Schedule cron is valid if scheduled
@@ -1572,6 +1701,7 @@ class TaskService:
             r"^SlashCommand$",
             r"^NotebookEdit$",
             r"^mcp__[\w\-]+__[\w\-]+$",  # MCP tools: mcp__server__tool
+            r"^mcp__[\w\-]+__[\w\-]*\*$",  # MCP tool globs: mcp__server__*
             r"^\*$",  # Allow all
         ]
 
@@ -1583,6 +1713,14 @@ class TaskService:
                     f"(Bash, Read, Write, etc.) or MCP tool (mcp__server__tool) or wildcard (*)"
                 )
 
+        from app.claude_sdk.mcp.tool_pattern_index import get_tool_access_index
+
+        access = get_tool_access_index(allowed_tools, disallowed_tools)
+        if not access.filter(allowed_tools):
+            raise ValidationError(
+                "disallowed_tools blocks every tool in allowed_tools; the task could not use any tool"
+            )
+
         # 3. Validate sdk_options
         if sdk_options:
             # Check for forbidden permission_mode override
@@ -1804,6 +1942,9 @@ class TaskService:
             error_message=reason or "Cancelled by user",
         )
         await self.db.commit()
+        await ExecutionEventPublisher(execution_id).status(
+            TaskExecutionStatus.CANCELLED.value, reason=reason or "Cancelled by user"
+        )
 
         # Create audit log
         await self.audit_service.log_action(
@@ -1835,26 +1976,37 @@ class TaskService:
         self,
         execution_id: UUID,
         user_id: UUID,
+        pattern: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        if_none_match: Optional[str] = None,
     ) -> dict:
         """Get file manifest for task execution's working directory.
 
+        The manifest comes from the process-wide manifest cache, so repeated
+        polls only pay for what changed since the last request.
+
         Args:
             execution_id: Task execution UUID
             user_id: User UUID for authorization
+            pattern: Shell-style glob matched against relative paths
+            offset: Number of matching files to skip
+            limit: Maximum files to return (None for all)
+            if_none_match: ETag from a previous response
 
         Returns:
-            Dictionary with file manifest and metadata
+            Dictionary with file manifest, metadata and ETag
 
         Raises:
             TaskNotFoundError: Execution doesn't exist
             PermissionDeniedError: User doesn't have access
             ValidationError: Working directory not found
         """
-        from app.services.storage_manager import StorageManager
+        from app.services.file_manifest_cache import get_manifest_cache
         from app.domain.exceptions import ValidationError
         from pathlib import Path
 
-        logger.info(
+        logger.debug(
             "Getting files for execution",
             extra={
                 "execution_id": str(execution_id),
@@ -1898,29 +2050,33 @@ class TaskService:
             )
 
         # Get file manifest
-        storage_mgr = StorageManager()
-
-        # Calculate session_id for storage manager (uses session_id or task_id)
-        session_id_for_storage = execution.session_id if execution.session_id else execution.task_id
-
-        files = await storage_mgr.get_file_manifest(session_id_for_storage)
-        total_size = await storage_mgr.get_directory_size(session_id_for_storage)
-        total_files = len(files)
+        try:
+            manifest = await get_manifest_cache().list_files(
+                working_dir,
+                pattern=pattern,
+                offset=offset,
+                limit=limit,
+                if_none_match=if_none_match,
+            )
+        except FileNotFoundError:
+            raise ValidationError(
+                f"Working directory not found for execution {execution_id}. "
+                "It may have been archived or cleaned up."
+            )
 
-        logger.info(
+        logger.debug(
             "Retrieved file manifest for execution",
             extra={
                 "execution_id": str(execution_id),
-                "total_files": total_files,
-                "total_size": total_size,
+                "total_files": manifest["total_files"],
+                "total_size": manifest["total_size"],
+                "not_modified": manifest["not_modified"],
             }
         )
 
         return {
             "execution_id": execution_id,
-            "total_files": total_files,
-            "total_size": total_size,
-            "files": files,
+            **manifest,
         }
 
     async def archive_execution_directory(
@@ -1943,6 +2099,7 @@ class TaskService:
             ValidationError: Working directory not found or already archived
         """
         from app.services.storage_manager import StorageManager
+        from app.services.file_manifest_cache import get_manifest_cache
         from app.domain.exceptions import ValidationError
         from pathlib import Path
 
@@ -2003,6 +2160,17 @@ class TaskService:
         # Get archive size
         archive_size = archive_path.stat().st_size
 
+        # Move accounting from the working directory to the archive file
+        accounting = StorageAccountingService(self.db)
+        await accounting.remove_path(str(working_dir))
+        get_manifest_cache().invalidate(working_dir)
+        await accounting.record_path(
+            archive_path,
+            resource_type="archive",
+            user_id=task.user_id,
+            execution_id=execution_id,
+        )
+
         # Create audit log
         await self.audit_service.log_action(
             user_id=user_id,
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.tool_group import ToolGroup
 from app.domain.exceptions import ValidationError, PermissionDeniedError
+from app.mcp.config_cache import get_mcp_config_cache
 from app.repositories.tool_group_repository import ToolGroupRepository
 from app.repositories.user_repository import UserRepository
 from app.services.audit_service import AuditService
@@ -164,6 +165,7 @@ class ToolGroupService:
 
         updated = await self.tool_group_repo.update(str(tool_group_id), **updates)
         await self.db.commit()
+        await get_mcp_config_cache().invalidate_tool_group(tool_group_id)
 
         logger.info(
             "Tool group updated",
@@ -208,6 +210,7 @@ class ToolGroupService:
 
         success = await self.tool_group_repo.soft_delete(str(tool_group_id))
         await self.db.commit()
+        await get_mcp_config_cache().invalidate_tool_group(tool_group_id)
 
         if success:
             logger.info(
@@ -249,6 +252,7 @@ class ToolGroupService:
             updated_at=datetime.utcnow(),
         )
         await self.db.commit()
+        await get_mcp_config_cache().invalidate_tool_group(tool_group_id)
 
         return tool_group
 
@@ -273,6 +277,7 @@ class ToolGroupService:
             updated_at=datetime.utcnow(),
         )
         await self.db.commit()
+        await get_mcp_config_cache().invalidate_tool_group(tool_group_id)
 
         return tool_group
 
@@ -297,6 +302,7 @@ class ToolGroupService:
             updated_at=datetime.utcnow(),
         )
         await self.db.commit()
+        await get_mcp_config_cache().invalidate_tool_group(tool_group_id)
 
         return tool_group
 
@@ -321,5 +327,6 @@ class ToolGroupService:
             updated_at=datetime.utcnow(),
         )
         await self.db.commit()
+        await get_mcp_config_cache().invalidate_tool_group(tool_group_id)
 
         return tool_group
@@ -1,5 +1,6 @@
 """Main FastAPI application for AI-Agent-API-Service"""
 
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
@@ -25,8 +26,17 @@ from app.api.v1 import api_v1_router
 from app.claude_sdk.exceptions import SDKError
 from app.core.config import settings
 from app.core.logging import get_logger, setup_logging
+from app.claude_sdk.event_broadcaster import get_event_broadcaster
+from app.claude_sdk.monitoring.system_metrics import get_system_metrics_sampler
+from app.claude_sdk.permissions.decision_log import get_permission_decision_log
 from app.db import seed_default_data
 from app.infrastructure.redis_client import RedisClientManager
+from app.mcp.health_prober import run_mcp_health_probes
+from app.mcp.kubernetes_client import get_kubernetes_client
+from app.mcp.process_pool import get_mcp_process_pool
+from app.mcp.query_executor import get_query_executor
+from app.services.storage_accounting_service import run_storage_reconciliation
+from app.services.storage_maintenance_service import run_storage_maintenance
 
 logger = get_logger(__name__)
 
@@ -76,11 +86,76 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         logger.error(f"Database seeding failed: {e}")
         # Don't fail startup if seeding fails
 
+    # Start periodic storage usage reconciliation
+    reconcile_task = None
+    if settings.storage_reconcile_interval_seconds > 0:
+        reconcile_task = asyncio.create_task(
+            run_storage_reconciliation(settings.storage_reconcile_interval_seconds)
+        )
+        logger.info("Storage usage reconciliation scheduled")
+
+    # Start periodic retention and orphan cleanup
+    maintenance_task = None
+    if settings.storage_maintenance_interval_seconds > 0:
+        maintenance_task = asyncio.create_task(
+            run_storage_maintenance(settings.storage_maintenance_interval_seconds)
+        )
+        logger.info("Storage maintenance scheduled")
+
+    # Keep MCP server health results fresh for session setup
+    health_probe_task = None
+    if settings.mcp_health_probe_interval_seconds > 0:
+        health_probe_task = asyncio.create_task(
+            run_mcp_health_probes(settings.mcp_health_probe_interval_seconds)
+        )
+        logger.info("MCP server health probes scheduled")
+
+    # Start background host metrics sampling
+    if settings.system_metrics_interval_seconds > 0:
+        try:
+            get_system_metrics_sampler().start()
+            logger.info("System metrics sampler started")
+        except ImportError:
+            logger.warning("psutil not installed, system metrics sampler disabled")
+
+    # Start the proxy for shared stdio MCP server processes
+    if settings.mcp_process_pool_enabled:
+        try:
+            await get_mcp_process_pool().start()
+        except Exception as e:
+            logger.error(f"Failed to start MCP process pool: {e}")
+
     yield
 
     # Shutdown
     logger.info(f"Shutting down {settings.project_name}")
 
+    if reconcile_task is not None:
+        reconcile_task.cancel()
+
+    if maintenance_task is not None:
+        maintenance_task.cancel()
+
+    if health_probe_task is not None:
+        health_probe_task.cancel()
+
+    await get_system_metrics_sampler().stop()
+
+    # Release pooled Kubernetes API connections and worker threads
+    get_kubernetes_client().close()
+
+    # Stop shared MCP server processes
+    await get_mcp_process_pool().close()
+
+    # Write buffered permission decisions before the database goes away
+    await get_permission_decision_log().close()
+
+    # Dispose of the query_database tool's dedicated pool
+    await get_query_executor().close()
+
+    # Stop the event broadcaster's pub/sub listener before Redis goes away
+    await get_event_broadcaster().close()
+
     # Close Redis connection
     try:
         await RedisClientManager.close()
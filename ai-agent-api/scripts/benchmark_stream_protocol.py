@@ -0,0 +1,157 @@
+"""Benchmark WebSocket stream encodings: bytes and CPU per event.
+
+Replays a synthetic agent turn (streamed text and tool-input deltas,
+complete messages, a large tool result) through every codec and reports
+the wire size and the encode/decode time per event.
+
+Usage:
+    python scripts/benchmark_stream_protocol.py [--turns 50] [--repeat 5]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+# Add parent directory to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Settings require these; the benchmark never connects to anything
+for _name, _value in {
+    "DATABASE_URL": "postgresql+asyncpg://benchmark@localhost/benchmark",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "CELERY_BROKER_URL": "redis://localhost:6379/1",
+    "CELERY_RESULT_BACKEND": "redis://localhost:6379/2",
+    "SECRET_KEY": "benchmark",
+    "ANTHROPIC_API_KEY": "benchmark",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+# Load the codec module alone, not the app.claude_sdk package (SDK client,
+# database models) it lives in
+_spec = importlib.util.spec_from_file_location(
+    "stream_protocol", ROOT / "app" / "claude_sdk" / "stream_protocol.py"
+)
+stream_protocol = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(stream_protocol)
+
+JSON_CODEC = stream_protocol.JSON_CODEC
+StreamCodec = stream_protocol.StreamCodec
+decode_frame = stream_protocol.decode_frame
+msgpack = stream_protocol.msgpack
+
+
+def _partial(session_id, event):
+    return {"type": "partial_message", "data": {
+        "session_id": session_id, "event_type": event["type"], "event_data": event,
+    }}
+
+
+def _message(session_id, sequence, message_type, content):
+    return {
+        "id": str(uuid4()),
+        "session_id": session_id,
+        "sequence_number": sequence,
+        "message_type": message_type,
+        "content": content,
+        "created_at": datetime.utcnow().isoformat(),
+    }
+
+
+def build_events(turns: int):
+    """Build the events of a streamed session as JSON texts."""
+    session_id = str(uuid4())
+    words = "The deployment rollout is progressing and three pods are ready ".split()
+    events = []
+    sequence = 0
+
+    for turn in range(turns):
+        events.append(_partial(session_id, {"type": "message_start", "message": {
+            "id": f"msg_{turn}", "model": "claude-sonnet-4-5", "usage": {"input_tokens": 1200},
+        }}))
+        events.append(_partial(session_id, {
+            "type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""},
+        }))
+        # Coalesced deltas carry a few tokens each
+        for i in range(40):
+            events.append(_partial(session_id, {
+                "type": "content_block_delta", "index": 0,
+                "delta": {"type": "text_delta", "text": " ".join(words[i % 5:i % 5 + 3]) + " "},
+            }))
+        for chunk in ('{"command": ', '"kubectl get pods -n ', 'production"}'):
+            events.append(_partial(session_id, {
+                "type": "content_block_delta", "index": 1,
+                "delta": {"type": "input_json_delta", "partial_json": chunk},
+            }))
+        events.append(_partial(session_id, {
+            "type": "message_delta", "delta": {"stop_reason": "tool_use"}, "usage": {"output_tokens": 180},
+        }))
+
+        sequence += 1
+        events.append(_message(session_id, sequence, "assistant", {"content": [
+            {"type": "text", "text": " ".join(words * 6)},
+            {"type": "tool_use", "id": f"toolu_{turn}", "name": "Bash",
+             "input": {"command": "kubectl get pods -n production"}},
+        ], "model": "claude-sonnet-4-5"}))
+        sequence += 1
+        output = "\n".join(
+            f"web-{i:04d}-7d9f8c6b5-x{i % 7}z  1/1  Running  0  {i % 60}m" for i in range(120)
+        )
+        events.append(_message(session_id, sequence, "user", {"content": [
+            {"type": "tool_result", "tool_use_id": f"toolu_{turn}", "content": output, "is_error": False},
+        ]}))
+
+    return [json.dumps(event) for event in events]
+
+
+def run(codec: StreamCodec, texts, repeat: int):
+    """Measure total bytes and per-event encode/decode CPU time."""
+    encoded = [codec.encode_text(text) for text in texts]
+    size = sum(len(data.encode() if isinstance(data, str) else data) for data in encoded)
+
+    start = time.process_time()
+    for _ in range(repeat):
+        for text in texts:
+            codec.encode_text(text)
+    encode_us = (time.process_time() - start) / (repeat * len(texts)) * 1e6
+
+    start = time.process_time()
+    for _ in range(repeat):
+        for data in encoded:
+            decode_frame(data)
+    decode_us = (time.process_time() - start) / (repeat * len(texts)) * 1e6
+
+    return size, encode_us, decode_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=50, help="Agent turns to simulate")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    args = parser.parse_args()
+
+    if msgpack is None:
+        sys.exit("msgpack is not installed")
+
+    texts = build_events(args.turns)
+    codecs = [JSON_CODEC, StreamCodec("msgpack"), StreamCodec("msgpack", "deflate")]
+    baseline = None
+
+    print(f"{len(texts)} events\n")
+    print(f"{'codec':<18}{'bytes':>12}{'bytes/event':>13}{'vs json':>9}{'encode us':>11}{'decode us':>11}")
+    for codec in codecs:
+        size, encode_us, decode_us = run(codec, texts, args.repeat)
+        baseline = baseline or size
+        print(
+            f"{codec.name:<18}{size:>12,}{size / len(texts):>13.1f}"
+            f"{size / baseline:>8.0%} {encode_us:>10.1f} {decode_us:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Unit tests for process-wide execution pipelines."""
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from claude_agent_sdk import PermissionResultAllow
+
+from app.claude_sdk.execution.pipeline_cache import PipelineCache
+from app.claude_sdk.hooks.base_hook import HookType
+from app.claude_sdk.hooks.hook_context import HookContext
+from app.claude_sdk.hooks.hook_manager import HookManager
+from app.claude_sdk.hooks.implementations.metrics_hook import MetricsHook
+from app.claude_sdk.permissions.permission_manager import PermissionManager
+
+
+def _hook_manager(pipeline, session_id, audit_service=None):
+    manager = HookManager(
+        AsyncMock(),
+        AsyncMock(),
+        registry=pipeline.hook_registry,
+        session_context=HookContext(session_id=session_id, audit_service=audit_service)
+    )
+    manager._log_hook_execution = AsyncMock()
+    return manager
+
+
+class TestPipelineCache:
+    """Test cases for PipelineCache."""
+
+    def test_same_configuration_shares_pipeline(self):
+        """Test pipelines are built once per signature."""
+        cache = PipelineCache()
+
+        first = cache.get(["PreToolUse", "PostToolUse"])
+        second = cache.get(["PostToolUse", "PreToolUse", "PreToolUse"])
+        other = cache.get(["Stop"])
+
+        assert first is second
+        assert other is not first
+        assert cache.get_stats() == {"pipelines": 2, "hits": 1, "builds": 2}
+
+    def test_unknown_and_hookless_types_are_skipped(self):
+        """Test only known hook types with hooks are exposed."""
+        cache = PipelineCache()
+
+        pipeline = cache.get(["PreToolUse", "PreCompact", "NotAHook"])
+
+        assert pipeline.signature == frozenset({HookType.PRE_TOOL_USE, HookType.PRE_COMPACT})
+        assert pipeline.hook_types == (HookType.PRE_TOOL_USE,)
+        assert [len(t) for t in pipeline.hook_registry.get_tiers(HookType.PRE_TOOL_USE)] == [2]
+
+    def test_pipeline_registry_is_immutable(self):
+        """Test a shared registry cannot be modified by a session."""
+        pipeline = PipelineCache().get(["PostToolUse"])
+
+        with pytest.raises(RuntimeError):
+            pipeline.hook_registry.register(HookType.POST_TOOL_USE, MetricsHook())
+
+    def test_pipeline_policy_engine_is_immutable(self):
+        """Test a shared policy engine cannot be modified by a session."""
+        from app.claude_sdk.permissions.policies import ToolBlacklistPolicy
+
+        pipeline = PipelineCache().get(["PreToolUse"])
+
+        with pytest.raises(RuntimeError):
+            pipeline.policy_engine.register_policy(ToolBlacklistPolicy(blocked_tools=["Bash"]))
+        with pytest.raises(RuntimeError):
+            pipeline.policy_engine.clear_policies()
+        assert pipeline.policy_engine.version == 0
+
+    @pytest.mark.asyncio
+    async def test_metrics_aggregate_across_sessions_and_pipelines(self):
+        """Test every session and pipeline feeds the same MetricsHook."""
+        cache = PipelineCache()
+        post_only = cache.get(["PostToolUse"])
+        with_pre = cache.get(["PreToolUse", "PostToolUse"])
+
+        for pipeline in (post_only, with_pre, post_only):
+            await _hook_manager(pipeline, uuid4()).execute_hooks(
+                HookType.POST_TOOL_USE, {"name": "Bash"}, "tool1", None, uuid4()
+            )
+
+        assert cache.metrics_hook.get_statistics()["tool_executions"] == {"Bash": 3}
+
+    @pytest.mark.asyncio
+    async def test_hooks_receive_session_context(self):
+        """Test shared hooks use each session's own audit service and IDs."""
+        pipeline = PipelineCache().get(["PreToolUse"])
+        sessions = [(uuid4(), AsyncMock()), (uuid4(), AsyncMock())]
+        sdk_context = MagicMock()
+
+        for session_id, audit_service in sessions:
+            await _hook_manager(pipeline, session_id, audit_service).execute_hooks(
+                HookType.PRE_TOOL_USE, {"name": "Read"}, "tool1", sdk_context, session_id
+            )
+
+        for session_id, audit_service in sessions:
+            audit_service.log_event.assert_awaited_once()
+            assert audit_service.log_event.call_args.kwargs["session_id"] == session_id
+
+    @pytest.mark.asyncio
+    async def test_shared_decision_cache_survives_new_managers(self):
+        """Test creating a manager for another session keeps cached decisions."""
+        pipeline = PipelineCache().get([])
+        pipeline.policy_engine.evaluate = AsyncMock(return_value=PermissionResultAllow())
+        session_id = uuid4()
+
+        def manager():
+            return PermissionManager(
+                AsyncMock(), pipeline.policy_engine, AsyncMock(),
+                decision_cache=pipeline.decision_cache, decision_log=MagicMock(record=AsyncMock())
+            )
+
+        await manager().can_use_tool("Read", {"file_path": "/tmp/x"}, None, session_id)
+        await manager().can_use_tool("Read", {"file_path": "/tmp/x"}, None, uuid4())
+        await manager().can_use_tool("Read", {"file_path": "/tmp/x"}, None, session_id)
+
+        assert pipeline.policy_engine.evaluate.await_count == 2
@@ -0,0 +1,200 @@
+"""Unit tests for StreamHandler delta coalescing and aggregation."""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from claude_agent_sdk.types import StreamEvent
+
+from app.claude_sdk.handlers.stream_handler import PartialMessageAggregator, StreamHandler
+from app.domain.value_objects.message import MessageType
+
+
+def _event(payload):
+    """Wrap a raw streaming event in a StreamEvent."""
+    return StreamEvent(uuid=str(uuid4()), session_id="sdk-session", event=payload)
+
+
+def _text_delta(text, index=0):
+    return {"type": "content_block_delta", "index": index, "delta": {"type": "text_delta", "text": text}}
+
+
+def _message_events(texts):
+    """Build the raw events of a streamed text + tool_use message."""
+    return [
+        {"type": "message_start", "message": {"id": "msg_1", "model": "claude-sonnet-4-5", "usage": {"input_tokens": 10}}},
+        {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+        *[_text_delta(text) for text in texts],
+        {"type": "content_block_stop", "index": 0},
+        {"type": "content_block_start", "index": 1, "content_block": {"type": "tool_use", "id": "toolu_1", "name": "Bash"}},
+        {"type": "content_block_delta", "index": 1, "delta": {"type": "input_json_delta", "partial_json": '{"command": '}},
+        {"type": "content_block_delta", "index": 1, "delta": {"type": "input_json_delta", "partial_json": '"ls"}'}},
+        {"type": "content_block_stop", "index": 1},
+        {"type": "message_delta", "delta": {"stop_reason": "tool_use"}, "usage": {"output_tokens": 42}},
+        {"type": "message_stop"},
+    ]
+
+
+def _sent(broadcaster):
+    """Get the partial message payloads passed to the broadcaster."""
+    return [call.kwargs["data"] for call in broadcaster.broadcast.await_args_list]
+
+
+@pytest.fixture
+def broadcaster():
+    """Create mock event broadcaster."""
+    return AsyncMock()
+
+
+class TestStreamHandler:
+    """Test cases for StreamHandler."""
+
+    @pytest.mark.asyncio
+    async def test_deltas_coalesced_within_interval(self, broadcaster):
+        """Test a burst of token deltas becomes a few merged frames."""
+        handler = StreamHandler(MagicMock(), MagicMock(), broadcaster, flush_interval_ms=10_000, flush_bytes=10_000)
+        session_id = uuid4()
+        texts = [f"tok{i} " for i in range(500)]
+
+        for payload in _message_events(texts):
+            await handler.handle_stream_event(_event(payload), session_id)
+
+        frames = _sent(broadcaster)
+        deltas = [f for f in frames if f["event_type"] == "content_block_delta"]
+        text = "".join(f["event_data"]["delta"].get("text", "") for f in deltas)
+        assert text == "".join(texts)
+        assert len(frames) < 15
+
+    @pytest.mark.asyncio
+    async def test_flush_bytes_triggers_early_flush(self, broadcaster):
+        """Test reaching flush_bytes broadcasts without waiting for the interval."""
+        handler = StreamHandler(MagicMock(), MagicMock(), broadcaster, flush_interval_ms=10_000, flush_bytes=8)
+        session_id = uuid4()
+        await handler.handle_stream_event(_event(_text_delta("first")), session_id)  # first token: sent at once
+
+        await handler.handle_stream_event(_event(_text_delta("abcd")), session_id)
+        assert len(_sent(broadcaster)) == 1
+        await handler.handle_stream_event(_event(_text_delta("efgh")), session_id)
+
+        frames = _sent(broadcaster)
+        assert [f["event_data"]["delta"]["text"] for f in frames] == ["first", "abcdefgh"]
+
+    @pytest.mark.asyncio
+    async def test_timer_flushes_idle_stream(self, broadcaster):
+        """Test buffered deltas are sent after the interval even if no event follows."""
+        handler = StreamHandler(MagicMock(), MagicMock(), broadcaster, flush_interval_ms=20, flush_bytes=10_000)
+        session_id = uuid4()
+        await handler.handle_stream_event(_event(_text_delta("a")), session_id)
+        await handler.handle_stream_event(_event(_text_delta("b")), session_id)
+        await handler.handle_stream_event(_event(_text_delta("c")), session_id)
+
+        await asyncio.sleep(0.1)
+
+        frames = _sent(broadcaster)
+        assert [f["event_data"]["delta"]["text"] for f in frames] == ["a", "bc"]
+
+    @pytest.mark.asyncio
+    async def test_zero_interval_sends_every_event(self, broadcaster):
+        """Test coalescing can be disabled."""
+        handler = StreamHandler(MagicMock(), MagicMock(), broadcaster, flush_interval_ms=0)
+        session_id = uuid4()
+
+        for text in ("a", "b", "c"):
+            await handler.handle_stream_event(_event(_text_delta(text)), session_id)
+
+        assert len(_sent(broadcaster)) == 3
+
+    @pytest.mark.asyncio
+    async def test_aggregate_assembles_final_message(self, broadcaster):
+        """Test the complete message is assembled in memory without the DB."""
+        message_repo = AsyncMock()
+        handler = StreamHandler(MagicMock(), message_repo, broadcaster)
+        session_id = uuid4()
+        for payload in _message_events(["Listing ", "files"]):
+            await handler.handle_stream_event(_event(payload), session_id)
+
+        message = await handler.aggregate_partial_messages(session_id)
+
+        assert message.message_type == MessageType.ASSISTANT
+        assert message.model == "claude-sonnet-4-5"
+        assert message.content["content"] == [
+            {"type": "text", "text": "Listing files"},
+            {"type": "tool_use", "id": "toolu_1", "name": "Bash", "input": {"command": "ls"}},
+        ]
+        assert message_repo.method_calls == []
+        assert await handler.aggregate_partial_messages(session_id) is None
+
+    @pytest.mark.asyncio
+    async def test_delivered_message_not_aggregated_again(self, broadcaster):
+        """Test a message already received complete is not returned as a partial."""
+        handler = StreamHandler(MagicMock(), AsyncMock(), broadcaster)
+        session_id = uuid4()
+        for payload in _message_events(["done"]):
+            await handler.handle_stream_event(_event(payload), session_id)
+        handler.mark_delivered(session_id)
+
+        assert await handler.aggregate_partial_messages(session_id) is None
+
+    @pytest.mark.asyncio
+    async def test_interrupted_message_after_delivered_one(self, broadcaster):
+        """Test the next message resets the delivered state and is aggregated."""
+        handler = StreamHandler(MagicMock(), AsyncMock(), broadcaster)
+        session_id = uuid4()
+        for payload in _message_events(["done"]):
+            await handler.handle_stream_event(_event(payload), session_id)
+        handler.mark_delivered(session_id)
+
+        for payload in [
+            {"type": "message_start", "message": {"id": "msg_2", "model": "claude-sonnet-4-5"}},
+            {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+            _text_delta("cut o"),
+        ]:
+            await handler.handle_stream_event(_event(payload), session_id)
+
+        message = await handler.aggregate_partial_messages(session_id)
+        assert message.content["content"] == [{"type": "text", "text": "cut o"}]
+
+
+class TestPartialMessageAggregator:
+    """Test cases for PartialMessageAggregator."""
+
+    def test_thinking_and_signature(self):
+        """Test thinking deltas and signatures are accumulated."""
+        aggregator = PartialMessageAggregator()
+        for payload in [
+            {"type": "content_block_start", "index": 0, "content_block": {"type": "thinking", "thinking": ""}},
+            {"type": "content_block_delta", "index": 0, "delta": {"type": "thinking_delta", "thinking": "Let me "}},
+            {"type": "content_block_delta", "index": 0, "delta": {"type": "thinking_delta", "thinking": "check"}},
+            {"type": "content_block_delta", "index": 0, "delta": {"type": "signature_delta", "signature": "sig"}},
+            {"type": "message_stop"},
+        ]:
+            aggregator.apply(payload)
+
+        assert aggregator.complete is True
+        assert aggregator.to_content()["content"] == [
+            {"type": "thinking", "thinking": "Let me check", "signature": "sig"}
+        ]
+
+    def test_invalid_tool_json_kept_raw(self):
+        """Test malformed tool input is preserved rather than lost."""
+        aggregator = PartialMessageAggregator()
+        aggregator.apply({"type": "content_block_start", "index": 0, "content_block": {"type": "tool_use", "id": "t", "name": "Read"}})
+        aggregator.apply({"type": "content_block_delta", "index": 0, "delta": {"type": "input_json_delta", "partial_json": '{"path": '}})
+        aggregator.apply({"type": "content_block_stop", "index": 0})
+
+        assert aggregator.blocks[0]["input"] == {"raw": '{"path": '}
+
+    def test_repeated_message_start_keeps_blocks(self):
+        """Test the reset is keyed on the message id."""
+        aggregator = PartialMessageAggregator()
+        aggregator.apply({"type": "message_start", "message": {"id": "msg_1", "usage": {"input_tokens": 3}}})
+        aggregator.apply(_text_delta("kept"))
+        aggregator.apply({"type": "message_start", "message": {"id": "msg_1"}})
+
+        assert aggregator.to_content()["content"] == [{"type": "text", "text": "kept"}]
+        assert aggregator.usage == {"input_tokens": 3}
+
+        aggregator.apply({"type": "message_start", "message": {"id": "msg_2"}})
+        assert aggregator.blocks == {}
@@ -1,4 +1,7 @@
 """Unit tests for HookManager."""
+import asyncio
+import time
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import UUID, uuid4
@@ -502,3 +505,134 @@ class TestContextSerialization:
         # Should handle error gracefully
         assert "type" in serialized
         assert serialized["type"] == "ProblematicContext"
+
+
+class SlowHook(BaseHook):
+    """Hook that sleeps before returning a fixed result."""
+
+    def __init__(self, delay: float, result: Dict[str, Any], timeout_ms: Optional[int] = None):
+        self.delay = delay
+        self.result = result
+        self._timeout_ms = timeout_ms
+
+    @property
+    def hook_type(self) -> HookType:
+        return HookType.PRE_TOOL_USE
+
+    @property
+    def timeout_ms(self) -> Optional[int]:
+        return self._timeout_ms
+
+    async def execute(self, input_data, tool_use_id, context):
+        await asyncio.sleep(self.delay)
+        return self.result
+
+
+async def _execute(manager, hook_type=HookType.PRE_TOOL_USE):
+    return await manager.execute_hooks(
+        hook_type=hook_type,
+        input_data={"name": "test_tool"},
+        tool_use_id="tool123",
+        context=None,
+        session_id=uuid4()
+    )
+
+
+class TestConcurrentHookExecution:
+    """Tests for tiered concurrent hook execution."""
+
+    @pytest.mark.asyncio
+    async def test_same_priority_hooks_run_concurrently(self, hook_manager):
+        """Test hooks in one priority tier overlap."""
+        for _ in range(3):
+            await hook_manager.register_hook(
+                HookType.PRE_TOOL_USE, SlowHook(0.2, {"continue_": True}), priority=10
+            )
+
+        started = time.perf_counter()
+        result = await _execute(hook_manager)
+
+        assert result["continue_"] is True
+        assert time.perf_counter() - started < 0.45
+
+    @pytest.mark.asyncio
+    async def test_merge_follows_registration_order_not_completion(self, hook_manager):
+        """Test later-registered hooks override earlier ones even if they finish first."""
+        await hook_manager.register_hook(
+            HookType.PRE_TOOL_USE, SlowHook(0.1, {"continue_": True, "field": "first"}), priority=10
+        )
+        await hook_manager.register_hook(
+            HookType.PRE_TOOL_USE, SlowHook(0.0, {"continue_": True, "field": "second"}), priority=10
+        )
+
+        result = await _execute(hook_manager)
+
+        assert result["field"] == "second"
+
+    @pytest.mark.asyncio
+    async def test_block_in_tier_skips_later_tiers(self, hook_manager):
+        """Test a blocking hook stops lower-priority tiers but not its own tier."""
+        blocker = SlowHook(0.0, {"continue_": False, "reason": "no"})
+        sibling = MockHook(should_continue=True)
+        later = MockHook(should_continue=True)
+        await hook_manager.register_hook(HookType.PRE_TOOL_USE, blocker, priority=10)
+        await hook_manager.register_hook(HookType.PRE_TOOL_USE, sibling, priority=10)
+        await hook_manager.register_hook(HookType.PRE_TOOL_USE, later, priority=20)
+
+        result = await _execute(hook_manager)
+
+        assert result["continue_"] is False
+        assert sibling.executed is True
+        assert later.executed is False
+
+    @pytest.mark.asyncio
+    async def test_timeout_fails_open_by_default(self, hook_manager):
+        """Test a hook over its budget is skipped and logged as a timeout."""
+        hook_manager._log_hook_execution = AsyncMock()
+        await hook_manager.register_hook(
+            HookType.PRE_TOOL_USE, SlowHook(1.0, {"continue_": False}, timeout_ms=50)
+        )
+
+        started = time.perf_counter()
+        result = await _execute(hook_manager)
+
+        assert result == {"continue_": True}
+        assert time.perf_counter() - started < 0.5
+        logged = hook_manager._log_hook_execution.call_args.kwargs
+        assert "TimeoutError" in logged["error_message"]
+
+    @pytest.mark.asyncio
+    async def test_fail_closed_hook_type_blocks_on_error(self, mock_db_session, mock_hook_repo):
+        """Test errors block execution for fail-closed hook types only."""
+        manager = HookManager(
+            mock_db_session, mock_hook_repo, fail_closed_types=[HookType.PRE_TOOL_USE]
+        )
+        await manager.register_hook(HookType.PRE_TOOL_USE, MockHook(raise_error=True))
+        await manager.register_hook(HookType.POST_TOOL_USE, MockHook(raise_error=True))
+
+        pre = await _execute(manager, HookType.PRE_TOOL_USE)
+        post = await _execute(manager, HookType.POST_TOOL_USE)
+
+        assert pre["continue_"] is False
+        assert "ValueError" in pre["reason"]
+        assert post == {"continue_": True}
+
+    @pytest.mark.asyncio
+    async def test_execution_time_recorded_per_hook(self, hook_manager):
+        """Test each hook's own duration is logged."""
+        hook_manager._log_hook_execution = AsyncMock()
+        await hook_manager.register_hook(
+            HookType.PRE_TOOL_USE, SlowHook(0.1, {"continue_": True}), priority=10
+        )
+        await hook_manager.register_hook(
+            HookType.PRE_TOOL_USE, SlowHook(0.0, {"continue_": True}), priority=10
+        )
+
+        await _execute(hook_manager)
+
+        times = [
+            call.kwargs["execution_time_ms"]
+            for call in hook_manager._log_hook_execution.call_args_list
+        ]
+        assert times[0] >= 90
+        assert times[1] < 50
@@ -271,6 +271,19 @@ class TestHookRegistry:
         assert hooks[1] == medium_hook  # 100
         assert hooks[2] == low_hook  # 200
 
+    def test_get_tiers_groups_by_priority(self):
+        """Test hooks are grouped into priority tiers in registration order."""
+        registry = HookRegistry()
+        a, b, c, d = MockHook1(), MockHook1(), MockHook2(), MockHook1()
+
+        registry.register(HookType.PRE_TOOL_USE, a, priority=100)
+        registry.register(HookType.PRE_TOOL_USE, c, priority=50)
+        registry.register(HookType.PRE_TOOL_USE, b, priority=100)
+        registry.register(HookType.PRE_TOOL_USE, d, priority=200)
+
+        assert registry.get_tiers(HookType.PRE_TOOL_USE) == [[c], [a, b], [d]]
+        assert registry.get_tiers(HookType.STOP) == []
+
     def test_registered_hook_dataclass(self):
         """Test RegisteredHook dataclass."""
         hook = MockHook1()
@@ -0,0 +1,118 @@
+"""Unit tests for compiled tool-name pattern matching."""
+import pytest
+
+from app.claude_sdk.mcp.tool_pattern_index import (
+    ToolAccessIndex,
+    ToolPatternIndex,
+    get_tool_access_index,
+)
+from app.claude_sdk.mcp.tool_registry import ToolRegistry
+from app.claude_sdk.permissions.policies import ToolBlacklistPolicy
+
+
+class TestToolPatternIndex:
+    """Test cases for ToolPatternIndex."""
+
+    @pytest.mark.parametrize("tool_name,expected", [
+        ("Read", True),
+        ("ReadFile", False),
+        ("mcp__kubernetes_readonly__list_pods", True),
+        ("mcp__kubernetes_readonly__", True),
+        ("mcp__kubernetes__delete_pod", False),
+        ("mcp__database__get_schema", True),
+        ("mcp__database__query", False),
+        ("Write", False),
+    ])
+    def test_exact_prefix_and_glob_patterns(self, tool_name, expected):
+        """Test exact names, trailing-* prefixes and inner globs."""
+        index = ToolPatternIndex(["Read", "mcp__kubernetes_readonly__*", "mcp__*__get_*"])
+
+        assert index.matches(tool_name) is expected
+
+    def test_star_matches_everything(self):
+        """Test a lone * matches any tool."""
+        index = ToolPatternIndex(["*"])
+
+        assert "Bash" in index
+        assert "mcp__any__tool" in index
+
+    def test_empty_index_matches_nothing(self):
+        """Test an index without patterns is falsy and matches nothing."""
+        index = ToolPatternIndex([])
+
+        assert not index
+        assert not index.matches("Read")
+
+
+class TestToolAccessIndex:
+    """Test cases for ToolAccessIndex."""
+
+    def test_disallowed_wins_over_allowed(self):
+        """Test deny patterns override allow patterns."""
+        access = ToolAccessIndex(
+            allowed_tools=["mcp__kubernetes_readonly__*", "Read"],
+            disallowed_tools=["mcp__kubernetes_readonly__get_pod_logs"],
+        )
+
+        assert access.is_allowed("mcp__kubernetes_readonly__list_pods")
+        assert access.is_allowed("Read")
+        assert not access.is_allowed("mcp__kubernetes_readonly__get_pod_logs")
+        assert not access.is_allowed("Bash")
+
+    def test_empty_allow_list_is_unrestricted(self):
+        """Test only deny patterns apply without an allow list."""
+        access = ToolAccessIndex(disallowed_tools=["Bash"])
+
+        assert access.is_allowed("Write")
+        assert not access.is_allowed("Bash")
+
+    def test_same_tool_lists_share_one_index(self):
+        """Test indexes are compiled once per distinct pair of tool lists."""
+        first = get_tool_access_index(["Read", "mcp__db__*"], ["Bash"])
+        second = get_tool_access_index(["Read", "mcp__db__*"], ["Bash"])
+
+        assert first is second
+        assert get_tool_access_index(["Read"]) is not first
+
+
+class TestToolRegistryFiltering:
+    """Test cases for ToolRegistry.list_allowed_tools."""
+
+    def test_list_allowed_tools(self):
+        """Test registered tools are filtered by a compiled access index."""
+        registry = ToolRegistry()
+        registry.register_sdk_server_tools("kubernetes_readonly", ["list_pods", "get_pod_logs"])
+        registry.register_sdk_server_tools("database", ["query_database"])
+        access = get_tool_access_index(
+            ["mcp__kubernetes_readonly__*"], ["mcp__kubernetes_readonly__get_pod_logs"]
+        )
+
+        assert registry.list_allowed_tools(access) == ["mcp__kubernetes_readonly__list_pods"]
+
+    def test_sorted_lists_refresh_after_registration(self):
+        """Test cached tool lists include tools registered later."""
+        registry = ToolRegistry()
+        registry.register_sdk_server_tools("a", ["one"])
+        assert registry.list_all_tools() == ["mcp__a__one"]
+
+        registry.register_sdk_server_tools("a", ["two"])
+
+        assert registry.list_all_tools() == ["mcp__a__one", "mcp__a__two"]
+        assert registry.get_server_tools("a") == ["mcp__a__one", "mcp__a__two"]
+
+
+class TestToolPolicyPatterns:
+    """Test cases for glob support in tool list policies."""
+
+    @pytest.mark.asyncio
+    async def test_blacklist_blocks_server_glob(self):
+        """Test a blacklist entry like mcp__server__* blocks all of its tools."""
+        from claude_agent_sdk import PermissionResultAllow, PermissionResultDeny
+
+        policy = ToolBlacklistPolicy(blocked_tools=["mcp__shell__*"])
+
+        denied = await policy.evaluate("mcp__shell__run", {}, None)
+        allowed = await policy.evaluate("mcp__shellcheck__lint", {}, None)
+
+        assert isinstance(denied, PermissionResultDeny)
+        assert isinstance(allowed, PermissionResultAllow)
@@ -0,0 +1,249 @@
+"""Unit tests for PermissionDecisionLog."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from claude_agent_sdk import PermissionResultDeny
+
+from app.claude_sdk.permissions.decision_log import PermissionDecisionLog
+from app.claude_sdk.permissions.permission_manager import PermissionManager
+from app.claude_sdk.permissions.policy_engine import PolicyEngine
+from app.domain.entities.permission_decision import PermissionResult
+
+
+class FakeSessionFactory:
+    """Session factory recording each bulk insert."""
+
+    def __init__(self, fail=False, delay=0.0, reject_tool=None):
+        self.batches = []
+        self.fail = fail
+        self.delay = delay
+        self.reject_tool = reject_tool
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, rows):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        if any(row["tool_name"] == self.reject_tool for row in rows):
+            raise ValueError("invalid input for column")
+        self.batches.append(list(rows))
+
+    async def commit(self):
+        pass
+
+    @property
+    def rows(self):
+        return [row for batch in self.batches for row in batch]
+
+
+async def _record(log, decision=PermissionResult.ALLOWED, tool_name="Read"):
+    await log.record(
+        session_id=uuid4(),
+        tool_name=tool_name,
+        input_data={"file_path": "/tmp/x"},
+        context_data={},
+        decision=decision,
+        reason="policy_allowed" if decision == PermissionResult.ALLOWED else "blocked",
+    )
+
+
+class TestPermissionDecisionLog:
+    """Test cases for PermissionDecisionLog."""
+
+    @pytest.mark.asyncio
+    async def test_record_returns_before_write(self):
+        """Test recording does not wait for the database."""
+        factory = FakeSessionFactory(delay=0.5)
+        log = PermissionDecisionLog(factory, flush_interval_seconds=0.05, strict=False)
+
+        started = asyncio.get_running_loop().time()
+        await _record(log, PermissionResult.DENIED)
+        assert asyncio.get_running_loop().time() - started < 0.05
+        assert factory.rows == []
+
+        await log.close()
+        assert len(factory.rows) == 1
+
+    @pytest.mark.asyncio
+    async def test_rows_are_written_in_batches(self):
+        """Test buffered decisions are written with one insert per flush."""
+        factory = FakeSessionFactory()
+        log = PermissionDecisionLog(factory, batch_size=1000, flush_interval_seconds=0.05, strict=False)
+
+        for _ in range(25):
+            await _record(log)
+        await asyncio.sleep(0.15)
+
+        assert len(factory.batches) == 1
+        assert len(factory.batches[0]) == 25
+        assert factory.batches[0][0]["decision"] == "allowed"
+        await log.close()
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_early(self):
+        """Test reaching batch_size wakes the flusher before the interval."""
+        factory = FakeSessionFactory()
+        log = PermissionDecisionLog(factory, batch_size=10, flush_interval_seconds=60, strict=False)
+
+        for _ in range(10):
+            await _record(log)
+        await asyncio.sleep(0.05)
+
+        assert len(factory.rows) == 10
+        await log.close()
+
+    @pytest.mark.asyncio
+    async def test_cached_decisions_are_aggregated(self):
+        """Test repeated cache hits become one row with a count."""
+        factory = FakeSessionFactory()
+        log = PermissionDecisionLog(factory, flush_interval_seconds=60, strict=False)
+        session_id = uuid4()
+
+        for _ in range(50):
+            log.record_cached(session_id, "Read", PermissionResult.ALLOWED, "policy_allowed")
+        log.record_cached(session_id, "Bash", PermissionResult.DENIED, "blocked")
+
+        assert await log.flush() == 2
+        counts = {row["tool_name"]: row["context_data"]["count"] for row in factory.rows}
+        assert counts == {"Read": 50, "Bash": 1}
+        assert all(row["context_data"]["cached"] for row in factory.rows)
+        await log.close()
+
+    @pytest.mark.asyncio
+    async def test_buffer_is_bounded(self):
+        """Test decisions beyond max_pending are dropped and counted."""
+        factory = FakeSessionFactory()
+        log = PermissionDecisionLog(factory, max_pending=5, flush_interval_seconds=60, strict=False)
+
+        for _ in range(8):
+            await _record(log)
+
+        assert log.get_stats()["pending"] == 5
+        assert log.get_stats()["dropped"] == 3
+        await log.close()
+        assert len(factory.rows) == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_write_keeps_rows(self):
+        """Test rows survive a failed flush and are written on the next one."""
+        factory = FakeSessionFactory(fail=True)
+        log = PermissionDecisionLog(factory, flush_interval_seconds=60, strict=False)
+
+        await _record(log)
+        assert await log.flush() == 0
+        assert log.get_stats()["pending"] == 1
+
+        factory.fail = False
+        assert await log.flush() == 1
+        await log.close()
+
+    @pytest.mark.asyncio
+    async def test_rejected_row_does_not_hold_back_batch(self):
+        """Test a row the database rejects is isolated, retried, then dropped."""
+        factory = FakeSessionFactory(reject_tool="Bad")
+        log = PermissionDecisionLog(
+            factory, flush_interval_seconds=60, strict=False, max_write_attempts=2
+        )
+
+        for tool_name in ("Read", "Grep", "Bad", "Glob"):
+            await _record(log, tool_name=tool_name)
+        assert await log.flush() == 3
+        assert sorted(row["tool_name"] for row in factory.rows) == ["Glob", "Grep", "Read"]
+        assert log.get_stats()["pending"] == 1
+
+        await _record(log, tool_name="Edit")
+        assert await log.flush() == 1
+        stats = log.get_stats()
+        assert stats["pending"] == 0
+        assert stats["dropped"] == 1
+        assert stats["written"] == 4
+        assert "Bad" not in [row["tool_name"] for row in factory.rows]
+        await log.close()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_database_is_not_bisected(self):
+        """Test an outage costs one attempt per flush and drops nothing."""
+        factory = FakeSessionFactory()
+        log = PermissionDecisionLog(
+            factory, flush_interval_seconds=60, strict=False, max_write_attempts=1
+        )
+        for _ in range(8):
+            await _record(log)
+
+        factory.execute = AsyncMock(side_effect=ConnectionError("connection refused"))
+        assert await log.flush() == 0
+        assert await log.flush() == 0
+
+        assert factory.execute.await_count == 2
+        assert log.get_stats()["pending"] == 8
+        assert log.get_stats()["dropped"] == 0
+
+    @pytest.mark.asyncio
+    async def test_strict_mode_persists_denials_before_returning(self):
+        """Test strict mode writes a denial (and anything queued) before record returns."""
+        factory = FakeSessionFactory(delay=0.01)
+        log = PermissionDecisionLog(factory, flush_interval_seconds=60, strict=True)
+
+        await _record(log, PermissionResult.ALLOWED)
+        assert factory.rows == []
+
+        await _record(log, PermissionResult.DENIED)
+        assert [row["decision"] for row in factory.rows] == ["allowed", "denied"]
+        await log.close()
+
+    @pytest.mark.asyncio
+    async def test_strict_mode_surfaces_write_failures(self):
+        """Test a denial that cannot be persisted raises in strict mode."""
+        log = PermissionDecisionLog(FakeSessionFactory(fail=True), strict=True)
+
+        with pytest.raises(RuntimeError):
+            await _record(log, PermissionResult.DENIED)
+
+
+class TestPermissionManagerDecisionLog:
+    """Test cases for PermissionManager logging through a PermissionDecisionLog."""
+
+    @pytest.mark.asyncio
+    async def test_decisions_go_to_log_and_cache_hits_are_counted(self):
+        """Test evaluated decisions are recorded and cached ones aggregated."""
+        engine = AsyncMock(spec=PolicyEngine)
+        engine.version = 0
+        engine.evaluate = AsyncMock(return_value=PermissionResultDeny(message="nope"))
+        repo = AsyncMock()
+        decision_log = AsyncMock(spec=PermissionDecisionLog)
+        decision_log.record_cached = MagicMock()
+        manager = PermissionManager(AsyncMock(), engine, repo, decision_log=decision_log)
+        session_id = uuid4()
+
+        for _ in range(3):
+            await manager.can_use_tool("Bash", {"command": "x"}, MagicMock(), session_id)
+
+        decision_log.record.assert_awaited_once()
+        assert decision_log.record.call_args.kwargs["decision"] == PermissionResult.DENIED
+        assert decision_log.record_cached.call_count == 2
+        decision_log.record_cached.assert_called_with(
+            session_id, "Bash", PermissionResult.DENIED, "nope"
+        )
+        repo.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_strict_mode_denial_write_failure_propagates(self):
+        """Test the manager does not return a denial that strict mode failed to persist."""
+        engine = AsyncMock(spec=PolicyEngine)
+        engine.version = 0
+        engine.evaluate = AsyncMock(return_value=PermissionResultDeny(message="nope"))
+        decision_log = PermissionDecisionLog(FakeSessionFactory(fail=True), strict=True)
+        manager = PermissionManager(AsyncMock(), engine, AsyncMock(), decision_log=decision_log)
+
+        with pytest.raises(RuntimeError):
+            await manager.can_use_tool("Bash", {"command": "x"}, MagicMock(), uuid4())
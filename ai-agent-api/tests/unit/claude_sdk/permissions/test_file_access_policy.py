@@ -459,3 +459,136 @@ class TestEdgeCases:
 
         # Should still be blocked
         assert isinstance(result, PermissionResultDeny)
+
+
+class TestFileAccessPolicyCanonicalization:
+    """Test cases for path canonicalization and component-wise matching."""
+
+    @pytest.mark.asyncio
+    async def test_dotdot_traversal_is_resolved(self):
+        """Test /tmp/../etc/... is checked as /etc/..."""
+        policy = FileAccessPolicy(
+            restricted_read_paths=["/etc/passwd"],
+            allowed_write_paths=["/tmp/"]
+        )
+
+        read = await policy.evaluate("Read", {"file_path": "/tmp/../etc/passwd"}, None)
+        write = await policy.evaluate("Write", {"file_path": "/tmp/../etc/cron.d/job"}, None)
+
+        assert isinstance(read, PermissionResultDeny)
+        assert isinstance(write, PermissionResultDeny)
+
+    @pytest.mark.asyncio
+    async def test_sibling_with_shared_prefix_not_matched(self):
+        """Test /etc/passwd does not cover /etc/passwd_backup."""
+        policy = FileAccessPolicy(
+            restricted_read_paths=["/etc/passwd"],
+            allowed_write_paths=["/tmp/work"]
+        )
+
+        read = await policy.evaluate("Read", {"file_path": "/etc/passwd_backup"}, None)
+        write = await policy.evaluate("Write", {"file_path": "/tmp/workspace-evil/x"}, None)
+
+        assert isinstance(read, PermissionResultAllow)
+        assert isinstance(write, PermissionResultDeny)
+
+    @pytest.mark.asyncio
+    async def test_symlink_is_resolved(self, tmp_path):
+        """Test a link in an allowed directory cannot reach a restricted file."""
+        secret_dir = tmp_path / "secrets"
+        secret_dir.mkdir()
+        (secret_dir / "key").write_text("x")
+        allowed = tmp_path / "allowed"
+        allowed.mkdir()
+        (allowed / "link").symlink_to(secret_dir)
+        policy = FileAccessPolicy(
+            restricted_read_paths=[str(secret_dir)],
+            allowed_write_paths=[str(allowed)]
+        )
+
+        read = await policy.evaluate("Read", {"file_path": str(allowed / "link" / "key")}, None)
+        write = await policy.evaluate("Write", {"file_path": str(allowed / "link" / "key")}, None)
+
+        assert isinstance(read, PermissionResultDeny)
+        assert isinstance(write, PermissionResultDeny)
+
+    @pytest.mark.asyncio
+    async def test_relative_paths_use_working_directory(self, tmp_path):
+        """Test relative paths resolve against the session working directory."""
+        policy = FileAccessPolicy(
+            restricted_read_paths=[str(tmp_path / ".env")],
+            allowed_write_paths=[str(tmp_path)],
+            working_directory=str(tmp_path / "src")
+        )
+
+        assert isinstance(
+            await policy.evaluate("Write", {"file_path": "out/report.md"}, None),
+            PermissionResultAllow
+        )
+        assert isinstance(
+            await policy.evaluate("Read", {"file_path": "../.env"}, None),
+            PermissionResultDeny
+        )
+        assert isinstance(
+            await policy.evaluate("Write", {"file_path": "../../escape.txt"}, None),
+            PermissionResultDeny
+        )
+
+    @pytest.mark.asyncio
+    async def test_glob_segments(self):
+        """Test glob components in rules."""
+        policy = FileAccessPolicy(
+            restricted_read_paths=["/home/*/.ssh", "/srv/certs/*.pem", "/data/**"],
+            allowed_write_paths=["/tmp/"]
+        )
+
+        for path in ["/home/alice/.ssh/id_rsa", "/srv/certs/server.pem", "/data/a/b/c"]:
+            result = await policy.evaluate("Read", {"file_path": path}, None)
+            assert isinstance(result, PermissionResultDeny), path
+        for path in ["/home/alice/notes", "/srv/certs/readme.txt", "/database"]:
+            result = await policy.evaluate("Read", {"file_path": path}, None)
+            assert isinstance(result, PermissionResultAllow), path
+
+    @pytest.mark.asyncio
+    async def test_double_star_in_middle_of_rule(self):
+        """Test ** inside a rule still requires the components after it."""
+        policy = FileAccessPolicy(
+            restricted_read_paths=["/workspace/**/out"],
+            allowed_write_paths=["/srv/**/cache/*.tmp"]
+        )
+
+        for path in ["/workspace/out", "/workspace/a/out", "/workspace/a/b/out/report.md"]:
+            result = await policy.evaluate("Read", {"file_path": path}, None)
+            assert isinstance(result, PermissionResultDeny), path
+        for path in ["/workspace/secret/anything", "/workspace/output", "/workspace/a/b"]:
+            result = await policy.evaluate("Read", {"file_path": path}, None)
+            assert isinstance(result, PermissionResultAllow), path
+
+        assert isinstance(
+            await policy.evaluate("Write", {"file_path": "/srv/a/b/cache/x.tmp"}, None),
+            PermissionResultAllow
+        )
+        assert isinstance(
+            await policy.evaluate("Write", {"file_path": "/srv/a/b/x.tmp"}, None),
+            PermissionResultDeny
+        )
+
+    @pytest.mark.asyncio
+    async def test_symlink_swapped_in_after_first_check(self, tmp_path):
+        """Test a directory replaced by a link is re-resolved on the next check."""
+        secret_dir = tmp_path / "secrets"
+        secret_dir.mkdir()
+        allowed = tmp_path / "allowed"
+        (allowed / "work").mkdir(parents=True)
+        policy = FileAccessPolicy(
+            restricted_read_paths=[str(secret_dir)],
+            allowed_write_paths=[str(allowed)]
+        )
+        path = str(allowed / "work" / "key")
+
+        assert isinstance(await policy.evaluate("Read", {"file_path": path}, None), PermissionResultAllow)
+
+        (allowed / "work").rmdir()
+        (allowed / "work").symlink_to(secret_dir)
+
+        assert isinstance(await policy.evaluate("Read", {"file_path": path}, None), PermissionResultDeny)
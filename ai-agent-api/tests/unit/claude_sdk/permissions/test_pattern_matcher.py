@@ -0,0 +1,130 @@
+"""Unit tests for compiled multi-pattern matchers."""
+import os
+import random
+import re
+import string
+import time
+
+import pytest
+from claude_agent_sdk import PermissionResultAllow, PermissionResultDeny
+
+from app.claude_sdk.permissions.pattern_matcher import LiteralPatternSet, RegexPatternSet
+from app.claude_sdk.permissions.policies import CommandPolicy
+
+# Wall-clock timings depend on the machine, so they only run when asked for
+benchmark = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run timing benchmarks"
+)
+
+
+def _random_patterns(count, seed=7):
+    rng = random.Random(seed)
+    alphabet = string.ascii_lowercase + " -/"
+    return [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(4, 12)))
+        for _ in range(count)
+    ]
+
+
+class TestLiteralPatternSet:
+    """Test cases for LiteralPatternSet."""
+
+    def test_reports_matching_pattern(self):
+        """Test the pattern found in the text is returned."""
+        patterns = LiteralPatternSet(["rm -rf", "sudo rm", "mkfs"])
+
+        assert patterns.search("echo hi && mkfs.ext4 /dev/sdb") == "mkfs"
+        assert patterns.search("ls -la") is None
+
+    def test_shared_prefixes(self):
+        """Test literals sharing a prefix are all found."""
+        patterns = LiteralPatternSet(["rm -rf", "rmdir", "rm -r /"])
+
+        assert patterns.search("rmdir build") == "rmdir"
+        assert patterns.search("rm -r /tmp") == "rm -r /"
+        assert patterns.search("rm -rf x") in ("rm -rf", "rm -r /")
+        assert patterns.search("rm -f x") is None
+
+    def test_special_characters_are_literal(self):
+        """Test regex metacharacters in literals are matched verbatim."""
+        patterns = LiteralPatternSet(["curl | bash", "a.b"])
+
+        assert patterns.search("curl | bash") == "curl | bash"
+        assert patterns.search("axb") is None
+
+    def test_ignore_case(self):
+        """Test case-insensitive sets return the configured pattern."""
+        patterns = LiteralPatternSet(["DROP TABLE"], ignore_case=True)
+
+        assert patterns.search("drop table users") == "DROP TABLE"
+
+    def test_agrees_with_naive_scan(self):
+        """Test the compiled set finds a match exactly when a substring scan does."""
+        patterns = _random_patterns(300)
+        compiled = LiteralPatternSet(patterns)
+        rng = random.Random(11)
+
+        for _ in range(200):
+            text = "".join(rng.choice(string.ascii_lowercase + " -/") for _ in range(80))
+            found = compiled.search(text)
+            expected = any(p in text for p in patterns)
+            assert (found is not None) == expected
+            assert found is None or found in text
+
+
+class TestRegexPatternSet:
+    """Test cases for RegexPatternSet."""
+
+    def test_reports_matching_pattern(self):
+        """Test the regex that matched is returned."""
+        patterns = RegexPatternSet([r"rm\s+-rf\s+/", r"curl.*\|.*bash"], re.IGNORECASE)
+
+        assert patterns.search("CURL http://x | BASH") == r"curl.*\|.*bash"
+        assert patterns.search("ls") is None
+
+    def test_patterns_with_groups(self):
+        """Test patterns with their own groups report the outer pattern."""
+        patterns = RegexPatternSet([r"(foo|bar)baz", r"(?:qux)+"])
+
+        assert patterns.search("xxbarbaz") == r"(foo|bar)baz"
+        assert patterns.search("quxqux") == r"(?:qux)+"
+
+    def test_backreferences_fall_back_to_separate_search(self):
+        """Test numbered backreferences keep their meaning."""
+        patterns = RegexPatternSet([r"(a)\1", r"zz"])
+
+        assert patterns.search("baab") == r"(a)\1"
+        assert patterns.search("ab") is None
+
+
+class TestCommandPolicyScaling:
+    """Microbenchmark for command checks against large pattern sets."""
+
+    @pytest.mark.asyncio
+    async def test_denial_names_matched_pattern(self):
+        """Test the denial message records which pattern matched."""
+        policy = CommandPolicy(blocked_patterns=["rm -rf", "mkfs"])
+
+        result = await policy.evaluate("Bash", {"command": "sudo mkfs /dev/sdb"}, None)
+
+        assert isinstance(result, PermissionResultDeny)
+        assert "'mkfs'" in result.message
+
+    @benchmark
+    @pytest.mark.asyncio
+    async def test_evaluation_stays_in_microseconds_with_500_patterns(self):
+        """Test a check with 500+ patterns averages well under a millisecond."""
+        patterns = [f"dangerous-{word}" for word in _random_patterns(600)]
+        policy = CommandPolicy(blocked_patterns=patterns)
+        command = {"command": "kubectl get pods -n production -o wide | grep -v Running " * 4}
+
+        result = await policy.evaluate("Bash", command, None)
+        assert isinstance(result, PermissionResultAllow)
+
+        rounds = 2000
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await policy.evaluate("Bash", command, None)
+        per_call = (time.perf_counter() - started) / rounds
+
+        assert per_call < 200e-6, f"{per_call * 1e6:.1f}us per evaluation"
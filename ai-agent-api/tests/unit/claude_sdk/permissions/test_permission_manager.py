@@ -5,6 +5,7 @@ from uuid import uuid4
 
 from claude_agent_sdk import PermissionResultAllow, PermissionResultDeny, ToolPermissionContext
 
+from app.claude_sdk.permissions.decision_cache import PermissionDecisionCache
 from app.claude_sdk.permissions.permission_manager import PermissionManager
 from app.claude_sdk.permissions.policy_engine import PolicyEngine
 from app.repositories.permission_decision_repository import PermissionDecisionRepository
@@ -339,6 +340,103 @@ class TestCaching:
 
         assert len(permission_manager._decision_cache) == 0
 
+    @pytest.mark.asyncio
+    async def test_cache_scoped_by_session(
+        self,
+        permission_manager,
+        mock_policy_engine,
+        mock_context
+    ):
+        """Test a decision cached for one session is not reused by another."""
+        input_data = {"param": "value"}
+
+        await permission_manager.can_use_tool("test_tool", input_data, mock_context, uuid4())
+        await permission_manager.can_use_tool("test_tool", input_data, mock_context, uuid4())
+
+        assert mock_policy_engine.evaluate.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_invalidated_when_policies_change(
+        self,
+        mock_db_session,
+        mock_permission_repo,
+        mock_context
+    ):
+        """Test registering a policy discards decisions made under the old set."""
+        from app.claude_sdk.permissions.policies import ToolBlacklistPolicy
+
+        engine = PolicyEngine()
+        manager = PermissionManager(mock_db_session, engine, mock_permission_repo)
+        session_id = uuid4()
+
+        first = await manager.can_use_tool("Bash", {}, mock_context, session_id)
+        engine.register_policy(ToolBlacklistPolicy(blocked_tools=["Bash"]))
+        second = await manager.can_use_tool("Bash", {}, mock_context, session_id)
+
+        assert isinstance(first, PermissionResultAllow)
+        assert isinstance(second, PermissionResultDeny)
+
+    @pytest.mark.asyncio
+    async def test_shared_cache_keeps_decisions_of_each_engine(
+        self,
+        mock_db_session,
+        mock_permission_repo,
+        mock_context
+    ):
+        """Test managers with different engines on one cache do not evict each other."""
+        cache = PermissionDecisionCache(max_entries=10, ttl_seconds=60)
+        engines = [PolicyEngine(), PolicyEngine()]
+        managers = [
+            PermissionManager(
+                mock_db_session, engine, mock_permission_repo, decision_cache=cache
+            )
+            for engine in engines
+        ]
+        session_id = uuid4()
+
+        for _ in range(2):
+            for manager in managers:
+                await manager.can_use_tool("Read", {}, mock_context, session_id)
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["hits"] == 2
+
+
+class TestPermissionDecisionCache:
+    """Tests for the bounded decision cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest unused entry is evicted beyond max_entries."""
+        cache = PermissionDecisionCache(max_entries=2, ttl_seconds=60)
+        cache.put("a", PermissionResultAllow())
+        cache.put("b", PermissionResultAllow())
+        cache.get("a")
+
+        cache.put("c", PermissionResultAllow())
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        """Test a decision is not returned once its TTL has passed."""
+        import app.claude_sdk.permissions.decision_cache as decision_cache
+
+        now = [1000.0]
+        monkeypatch.setattr(decision_cache.time, "monotonic", lambda: now[0])
+        cache = PermissionDecisionCache(max_entries=10, ttl_seconds=5)
+        cache.put("a", PermissionResultAllow())
+
+        assert cache.get("a") is not None
+        now[0] += 6
+        assert cache.get("a") is None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["expirations"] == 1
+
 
 class TestCacheKeyGeneration:
     """Tests for cache key generation."""
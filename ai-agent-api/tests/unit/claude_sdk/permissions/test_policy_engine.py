@@ -210,6 +210,19 @@ class TestGetPolicies:
         assert policies[1].priority == 50
         assert policies[2].priority == 100
 
+    def test_get_policies_index_refreshed_on_registration(self, policy_engine):
+        """Test a policy registered after a lookup applies to later lookups."""
+        policy_engine.register_policy(MockAllowPolicy(applies_to="test_tool"))
+        assert len(policy_engine.get_policies("test_tool")) == 1
+
+        policy_engine.register_policy(MockDenyPolicy(applies_to="test_tool"))
+
+        assert len(policy_engine.get_policies("test_tool")) == 2
+
+        policy_engine.clear_policies()
+
+        assert policy_engine.get_policies("test_tool") == []
+
 
 class TestPolicyEvaluation:
     """Tests for policy evaluation."""
@@ -0,0 +1,128 @@
+"""Unit tests for the random-access archive index."""
+import os
+import tarfile
+import pytest
+
+from app.claude_sdk.persistence.archive_index import (
+    ArchiveMemberNotFoundError,
+    create_indexed_tar_gz,
+    index_path_for,
+    iter_local_member,
+    load_index,
+    normalize_member_path,
+    write_index,
+)
+
+
+@pytest.fixture
+def temp_working_dir(tmp_path):
+    """Create temporary working directory with small and large files."""
+    working_dir = tmp_path / "working_dir"
+    working_dir.mkdir()
+
+    (working_dir / "file1.txt").write_text("Content 1")
+    (working_dir / "large.bin").write_bytes(os.urandom(256 * 1024))
+
+    subdir = working_dir / "logs"
+    subdir.mkdir()
+    (subdir / "agent.log").write_text("log line\n" * 500)
+
+    return working_dir
+
+
+class TestCreateIndexedArchive:
+    """Tests for writing framed archives."""
+
+    def test_archive_is_readable_by_tarfile(self, temp_working_dir, tmp_path):
+        """Test framed archive is still a standard tar.gz."""
+        archive_path = tmp_path / "test.tar.gz"
+
+        create_indexed_tar_gz(temp_working_dir, archive_path, arcname="session")
+
+        with tarfile.open(archive_path, "r:gz") as tar:
+            names = tar.getnames()
+            content = tar.extractfile("session/logs/agent.log").read()
+
+        assert "session/file1.txt" in names
+        assert "session/large.bin" in names
+        assert content == (temp_working_dir / "logs" / "agent.log").read_bytes()
+
+    def test_index_lists_all_files(self, temp_working_dir, tmp_path):
+        """Test index has one entry per regular file."""
+        index = create_indexed_tar_gz(temp_working_dir, tmp_path / "test.tar.gz")
+
+        assert set(index["files"]) == {"file1.txt", "large.bin", "logs/agent.log"}
+        assert index["files"]["large.bin"]["size"] == 256 * 1024
+
+    def test_large_files_get_own_frame(self, temp_working_dir, tmp_path):
+        """Test files larger than the frame size start a new frame."""
+        index = create_indexed_tar_gz(
+            temp_working_dir,
+            tmp_path / "test.tar.gz",
+            frame_size=64 * 1024
+        )
+
+        large_frame = index["files"]["large.bin"]["frame"]
+        assert index["files"]["file1.txt"]["frame"] != large_frame
+        assert index["files"]["logs/agent.log"]["frame"] != large_frame
+        assert len(index["frames"]) >= 3
+
+
+class TestReadMember:
+    """Tests for random-access member reads."""
+
+    @pytest.mark.parametrize("member", ["file1.txt", "large.bin", "logs/agent.log"])
+    def test_read_member_matches_source(self, temp_working_dir, tmp_path, member):
+        """Test reading a member returns the original bytes."""
+        archive_path = tmp_path / "test.tar.gz"
+        index = create_indexed_tar_gz(temp_working_dir, archive_path, frame_size=64 * 1024)
+
+        entry, chunks = iter_local_member(archive_path, index, member)
+
+        assert b"".join(chunks) == (temp_working_dir / member).read_bytes()
+        assert entry["size"] == (temp_working_dir / member).stat().st_size
+
+    def test_read_member_only_reads_its_frame(self, temp_working_dir, tmp_path):
+        """Test reading a small file does not touch the large file's frame."""
+        archive_path = tmp_path / "test.tar.gz"
+        index = create_indexed_tar_gz(temp_working_dir, archive_path, frame_size=64 * 1024)
+
+        frame = index["frames"][index["files"]["logs/agent.log"]["frame"]]
+
+        assert frame[1] < 16 * 1024
+
+    def test_missing_member_raises(self, temp_working_dir, tmp_path):
+        """Test missing member raises ArchiveMemberNotFoundError."""
+        archive_path = tmp_path / "test.tar.gz"
+        index = create_indexed_tar_gz(temp_working_dir, archive_path)
+
+        with pytest.raises(ArchiveMemberNotFoundError):
+            iter_local_member(archive_path, index, "missing.txt")
+
+
+class TestIndexFiles:
+    """Tests for sidecar index persistence and path handling."""
+
+    def test_index_round_trip(self, temp_working_dir, tmp_path):
+        """Test index survives write and load."""
+        archive_path = tmp_path / "test.tar.gz"
+        index = create_indexed_tar_gz(temp_working_dir, archive_path)
+
+        write_index(index, index_path_for(archive_path))
+
+        assert index_path_for(archive_path).name == "test.tar.gz.index.json"
+        assert load_index(index_path_for(archive_path))["files"] == index["files"]
+
+    def test_load_missing_index_returns_none(self, tmp_path):
+        """Test loading a missing index returns None."""
+        assert load_index(tmp_path / "missing.index.json") is None
+
+    @pytest.mark.parametrize("path", ["../etc/passwd", "/etc/passwd", "a/../../b", ""])
+    def test_normalize_rejects_escaping_paths(self, path):
+        """Test traversal and absolute paths are rejected."""
+        with pytest.raises(ValueError):
+            normalize_member_path(path)
+
+    def test_normalize_strips_dot_segments(self):
+        """Test leading ./ and duplicate slashes are normalized."""
+        assert normalize_member_path("./logs//agent.log") == "logs/agent.log"
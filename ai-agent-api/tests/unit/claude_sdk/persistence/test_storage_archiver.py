@@ -97,6 +97,18 @@ class TestStorageArchiverInitialization:
         mock_boto3.client.assert_called_once_with("s3", region_name="us-east-1")
         assert archiver.s3_client == mock_s3_client
 
+    def test_initialization_filesystem_alias(self, mock_db_session, mock_archive_repo, tmp_path):
+        """Test settings' "filesystem" provider name maps to local storage."""
+        archiver = StorageArchiver(
+            db=mock_db_session,
+            archive_repo=mock_archive_repo,
+            storage_provider="filesystem",
+            local_archive_path=str(tmp_path / "archives")
+        )
+
+        assert archiver.storage_provider == "local"
+        assert (tmp_path / "archives").is_dir()
+
     def test_initialization_unknown_provider_raises_error(self, mock_db_session, mock_archive_repo):
         """Test unknown storage provider raises error."""
         with pytest.raises(ValueError, match="Unknown storage provider"):
@@ -516,3 +528,95 @@ class TestCompressionMethods:
         # Extracted directory should contain files
         assert extract_path.exists()
         assert len(list(extract_path.rglob("*"))) > 0
+
+
+class TestStreamArchiveFile:
+    """Tests for single-file retrieval via the archive index."""
+
+    @pytest.mark.asyncio
+    async def test_stream_archive_file_local(
+        self,
+        mock_db_session,
+        mock_archive_repo,
+        temp_working_dir,
+        tmp_path
+    ):
+        """Test streaming one file from a local archive using its index."""
+        archiver = StorageArchiver(
+            db=mock_db_session,
+            archive_repo=mock_archive_repo,
+            storage_provider="local",
+            local_archive_path=str(tmp_path / "archives")
+        )
+
+        archive_path = tmp_path / "test.tar.gz"
+        archiver._create_tar_gz(temp_working_dir, archive_path)
+
+        archive_id = uuid4()
+        mock_archive_repo.get_by_id.return_value = MagicMock(
+            id=archive_id,
+            archive_path=str(archive_path),
+            status=ArchiveStatus.COMPLETED.value,
+            manifest={"index_path": str(archive_path) + ".index.json"}
+        )
+
+        chunks = [
+            chunk async for chunk in archiver.stream_archive_file(archive_id, "subdir/file3.txt")
+        ]
+
+        assert b"".join(chunks) == b"Content 3"
+
+    @pytest.mark.asyncio
+    async def test_stream_archive_file_without_index_raises_error(
+        self,
+        mock_db_session,
+        mock_archive_repo
+    ):
+        """Test archives without an index cannot be streamed."""
+        archiver = StorageArchiver(
+            db=mock_db_session,
+            archive_repo=mock_archive_repo,
+            storage_provider="local"
+        )
+
+        mock_archive_repo.get_by_id.return_value = MagicMock(
+            status=ArchiveStatus.COMPLETED.value,
+            manifest={}
+        )
+
+        with pytest.raises(ValueError, match="no index"):
+            async for _ in archiver.stream_archive_file(uuid4(), "file1.txt"):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_open_archive_file_checks_member_before_streaming(
+        self,
+        mock_db_session,
+        mock_archive_repo,
+        temp_working_dir,
+        tmp_path
+    ):
+        """Test the size is known and a missing file is reported up front."""
+        from app.claude_sdk.persistence.archive_index import ArchiveMemberNotFoundError
+
+        archiver = StorageArchiver(
+            db=mock_db_session,
+            archive_repo=mock_archive_repo,
+            storage_provider="local",
+            local_archive_path=str(tmp_path / "archives")
+        )
+
+        archive_path = tmp_path / "test.tar.gz"
+        archiver._create_tar_gz(temp_working_dir, archive_path)
+        mock_archive_repo.get_by_id.return_value = MagicMock(
+            archive_path=str(archive_path),
+            status=ArchiveStatus.COMPLETED.value,
+            manifest={"index_path": str(archive_path) + ".index.json"}
+        )
+
+        size, chunks = await archiver.open_archive_file(uuid4(), "subdir/file3.txt")
+        assert size == len(b"Content 3")
+        assert b"".join([chunk async for chunk in chunks]) == b"Content 3"
+
+        with pytest.raises(ArchiveMemberNotFoundError):
+            await archiver.open_archive_file(uuid4(), "missing.txt")
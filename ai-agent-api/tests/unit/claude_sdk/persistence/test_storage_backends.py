@@ -0,0 +1,189 @@
+"""Unit tests for archive storage backends."""
+import hashlib
+import os
+import pytest
+from unittest.mock import MagicMock
+
+from app.claude_sdk.persistence.storage_backends import (
+    ChecksumMismatchError,
+    LocalStorageBackend,
+    MIN_PART_SIZE,
+    S3StorageBackend,
+    create_storage_backend,
+    file_sha256,
+)
+
+BUCKET = "test-archives"
+
+
+@pytest.fixture
+def s3_client():
+    """Create an S3 client backed by moto's in-memory S3."""
+    moto = pytest.importorskip("moto")
+    boto3 = pytest.importorskip("boto3")
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def large_file(tmp_path):
+    """Create a file spanning three multipart parts."""
+    path = tmp_path / "large.tar.gz"
+    path.write_bytes(os.urandom(2 * MIN_PART_SIZE + 1024))
+    return path
+
+
+class TestLocalStorageBackend:
+    """Tests for LocalStorageBackend."""
+
+    def test_upload_moves_file_under_key(self, tmp_path):
+        """Test upload moves the file into the base directory."""
+        backend = LocalStorageBackend(tmp_path / "store")
+        source = tmp_path / "a.tar.gz"
+        source.write_bytes(b"archive")
+
+        uri = backend.upload_file(source, "session/a.tar.gz")
+
+        assert uri == str(tmp_path / "store" / "session" / "a.tar.gz")
+        assert not source.exists()
+
+    def test_download_keeps_stored_copy(self, tmp_path):
+        """Test download copies rather than moving the stored archive."""
+        backend = LocalStorageBackend(tmp_path / "store")
+        source = tmp_path / "a.tar.gz"
+        source.write_bytes(b"archive")
+        uri = backend.upload_file(source, "a.tar.gz")
+
+        backend.download_file(uri, tmp_path / "out.tar.gz", expected_sha256=hashlib.sha256(b"archive").hexdigest())
+
+        assert (tmp_path / "out.tar.gz").read_bytes() == b"archive"
+        assert os.path.exists(uri)
+
+    def test_download_checksum_mismatch_raises(self, tmp_path):
+        """Test a wrong checksum fails the download and removes the partial file."""
+        backend = LocalStorageBackend(tmp_path / "store")
+        source = tmp_path / "a.tar.gz"
+        source.write_bytes(b"archive")
+        uri = backend.upload_file(source, "a.tar.gz")
+
+        with pytest.raises(ChecksumMismatchError):
+            backend.download_file(uri, tmp_path / "out.tar.gz", expected_sha256="0" * 64)
+
+        assert not (tmp_path / "out.tar.gz").exists()
+
+
+class TestS3StorageBackend:
+    """Tests for S3StorageBackend against moto."""
+
+    def test_small_file_single_put(self, s3_client, tmp_path):
+        """Test files within one part are uploaded with a single PUT."""
+        backend = S3StorageBackend(BUCKET, client=s3_client, part_size=MIN_PART_SIZE)
+        source = tmp_path / "small.tar.gz"
+        source.write_bytes(b"small archive")
+
+        uri = backend.upload_file(source, "archives/s/small.tar.gz")
+
+        assert uri == f"s3://{BUCKET}/archives/s/small.tar.gz"
+        assert backend.read_bytes(uri) == b"small archive"
+
+    def test_multipart_round_trip(self, s3_client, large_file, tmp_path):
+        """Test multipart upload and parallel ranged download preserve content."""
+        backend = S3StorageBackend(
+            BUCKET, client=s3_client, part_size=MIN_PART_SIZE, max_concurrency=3
+        )
+        checksum = file_sha256(large_file)
+
+        uri = backend.upload_file(large_file, "archives/s/large.tar.gz")
+        downloaded = backend.download_file(uri, tmp_path / "out.tar.gz", expected_sha256=checksum)
+
+        assert file_sha256(downloaded) == checksum
+        head = s3_client.head_object(Bucket=BUCKET, Key="archives/s/large.tar.gz")
+        assert head["ETag"].strip('"').endswith("-3")
+
+    def test_read_range(self, s3_client, large_file):
+        """Test ranged reads return the requested bytes."""
+        backend = S3StorageBackend(BUCKET, client=s3_client, part_size=MIN_PART_SIZE)
+        uri = backend.upload_file(large_file, "large.tar.gz")
+
+        data = b"".join(backend.read_range(uri, MIN_PART_SIZE - 10, 20, 8))
+
+        assert data == large_file.read_bytes()[MIN_PART_SIZE - 10:MIN_PART_SIZE + 10]
+
+    def test_part_retried_after_failure(self, s3_client, large_file, monkeypatch):
+        """Test a failed part upload is retried."""
+        backend = S3StorageBackend(BUCKET, client=s3_client, part_size=MIN_PART_SIZE, max_retries=2)
+        monkeypatch.setattr("app.claude_sdk.persistence.storage_backends.time.sleep", lambda _: None)
+
+        real_upload_part = s3_client.upload_part
+        failures = {"remaining": 1}
+
+        def flaky_upload_part(**kwargs):
+            if kwargs["PartNumber"] == 2 and failures["remaining"]:
+                failures["remaining"] -= 1
+                raise ConnectionError("connection reset")
+            return real_upload_part(**kwargs)
+
+        monkeypatch.setattr(s3_client, "upload_part", flaky_upload_part)
+
+        uri = backend.upload_file(large_file, "retry.tar.gz")
+
+        assert failures["remaining"] == 0
+        assert s3_client.head_object(Bucket=BUCKET, Key="retry.tar.gz")["ContentLength"] > 0
+        assert uri.endswith("retry.tar.gz")
+
+    def test_failed_upload_is_aborted(self, s3_client, large_file, monkeypatch):
+        """Test a part that keeps failing aborts the multipart upload."""
+        backend = S3StorageBackend(BUCKET, client=s3_client, part_size=MIN_PART_SIZE, max_retries=0)
+
+        def failing_upload_part(**kwargs):
+            raise ConnectionError("connection reset")
+
+        monkeypatch.setattr(s3_client, "upload_part", failing_upload_part)
+
+        with pytest.raises(ConnectionError):
+            backend.upload_file(large_file, "aborted.tar.gz")
+
+        assert not s3_client.list_multipart_uploads(Bucket=BUCKET).get("Uploads")
+
+    def test_etag_mismatch_raises(self, tmp_path):
+        """Test an MD5-shaped ETag that does not match is rejected."""
+        client = MagicMock()
+        client.put_object.return_value = {"ETag": '"' + "0" * 32 + '"'}
+        backend = S3StorageBackend(BUCKET, client=client, part_size=MIN_PART_SIZE)
+        source = tmp_path / "a.tar.gz"
+        source.write_bytes(b"data")
+
+        with pytest.raises(ChecksumMismatchError):
+            backend.upload_file(source, "key")
+
+    def test_part_size_below_minimum_rejected(self):
+        """Test part sizes under the S3 minimum are rejected."""
+        with pytest.raises(ValueError):
+            S3StorageBackend(BUCKET, client=MagicMock(), part_size=1024)
+
+
+class TestCreateStorageBackend:
+    """Tests for provider name handling."""
+
+    @pytest.mark.parametrize("provider", ["local", "filesystem"])
+    def test_local_aliases(self, provider, tmp_path):
+        """Test settings and archiver provider names both map to local storage."""
+        backend = create_storage_backend(provider, local_path=tmp_path)
+
+        assert isinstance(backend, LocalStorageBackend)
+
+    def test_s3_requires_bucket_and_region(self):
+        """Test S3 backend requires bucket and region."""
+        with pytest.raises(ValueError, match="S3 bucket and region required"):
+            create_storage_backend("s3")
+
+    def test_unknown_provider(self):
+        """Test unknown providers are rejected."""
+        with pytest.raises(ValueError, match="Unknown storage provider"):
+            create_storage_backend("azure")
@@ -0,0 +1,570 @@
+"""Unit tests for event broadcasters."""
+
+import asyncio
+import json
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.claude_sdk.event_broadcaster import (
+    EventBroadcaster,
+    Frame,
+    RedisEventBroadcaster,
+    merge_delta_frames,
+)
+from app.domain.value_objects.message import Message, MessageType
+
+
+class FakePubSub:
+    """Minimal asyncio pub/sub connection backed by a FakeRedis hub."""
+
+    def __init__(self, hub):
+        self.hub = hub
+        self.channels = set()
+        self.queue = asyncio.Queue()
+        self.fail_next_read = False
+        hub.connections.append(self)
+
+    @property
+    def subscribed(self):
+        return bool(self.channels)
+
+    async def subscribe(self, *channels):
+        self.channels.update(channels)
+        for channel in channels:
+            self.queue.put_nowait({"type": "subscribe", "channel": channel, "data": len(self.channels)})
+
+    async def unsubscribe(self, *channels):
+        self.channels.difference_update(channels)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        if self.fail_next_read:
+            self.fail_next_read = False
+            raise ConnectionError("Connection reset by peer")
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        self.channels.clear()
+        self.hub.connections.remove(self)
+
+
+class FakePipeline:
+    """Pipeline that runs queued commands against the FakeRedis hub."""
+
+    def __init__(self, hub):
+        self.hub = hub
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        results = []
+        for name, args, kwargs in self.commands:
+            results.append(await getattr(self.hub, name)(*args, **kwargs))
+        return results
+
+
+class FakeRedis:
+    """Pub/sub hub shared by several broadcasters, like one Redis server."""
+
+    def __init__(self):
+        self.connections = []
+        self.publish_error = None
+        self.zsets = {}
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zremrangebyrank(self, key, start, end):
+        members = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        for member, _ in members[: max(0, len(members) + end + 1)]:
+            del self.zsets[key][member]
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def zrangebyscore(self, key, low, high, withscores=False):
+        low = float(low.lstrip("("))
+        members = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        return [(member, score) for member, score in members if score > low]
+
+    async def zrange(self, key, start, end, withscores=False):
+        members = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        return members[start:end + 1]
+
+    async def publish(self, channel, data):
+        if self.publish_error:
+            raise self.publish_error
+        for connection in self.connections:
+            if channel in connection.channels:
+                connection.queue.put_nowait({"type": "message", "channel": channel, "data": data})
+
+
+async def _wait_for(condition, timeout=2.0):
+    """Poll until a condition holds."""
+    deadline = asyncio.get_event_loop().time() + timeout
+    while not condition():
+        if asyncio.get_event_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+def _websocket(gate=None):
+    """Create a mock WebSocket, optionally blocking sends until gate is set."""
+    websocket = AsyncMock()
+    websocket.sent = []
+
+    async def send_text(text):
+        if gate is not None:
+            await gate.wait()
+        websocket.sent.append(json.loads(text))
+
+    websocket.send_text.side_effect = send_text
+    return websocket
+
+
+def _delta(index, text):
+    """Build partial_message event data carrying a text delta."""
+    return {
+        "event_type": "content_block_delta",
+        "event_data": {
+            "type": "content_block_delta",
+            "index": index,
+            "delta": {"type": "text_delta", "text": text},
+        },
+    }
+
+
+def _message(session_id, sequence):
+    """Create a domain message with a sequence number."""
+    return Message(
+        id=uuid4(),
+        session_id=session_id,
+        message_type=MessageType.ASSISTANT,
+        content={"n": sequence},
+        sequence_number=sequence,
+        created_at=datetime.utcnow(),
+    )
+
+
+class TestEventBroadcaster:
+    """Test cases for the in-process broadcaster."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_message_serializes_domain_message(self):
+        """Test domain messages reach every subscriber of the session only."""
+        broadcaster = EventBroadcaster()
+        session_id = uuid4()
+        viewer, other = _websocket(), _websocket()
+        await broadcaster.subscribe(session_id, viewer)
+        await broadcaster.subscribe(uuid4(), other)
+
+        message = Message(
+            id=uuid4(),
+            session_id=session_id,
+            message_type=MessageType.ASSISTANT,
+            content={"content": [{"type": "text", "text": "hi"}]},
+            sequence_number=3,
+            created_at=datetime.utcnow(),
+        )
+        await broadcaster.broadcast_message(session_id, message)
+        await _wait_for(lambda: viewer.sent)
+
+        assert viewer.sent[0]["sequence_number"] == 3
+        assert viewer.sent[0]["message_type"] == "assistant"
+        assert other.sent == []
+
+    @pytest.mark.asyncio
+    async def test_failing_subscriber_does_not_block_others(self):
+        """Test a broken connection does not stop delivery to the rest."""
+        broadcaster = EventBroadcaster()
+        session_id = str(uuid4())
+        broken, healthy = AsyncMock(), _websocket()
+        broken.send_text.side_effect = RuntimeError("closed")
+        await broadcaster.subscribe(session_id, broken)
+        await broadcaster.subscribe(session_id, healthy)
+
+        await broadcaster.broadcast(session_id, "status_change", {"status": "active"})
+        await _wait_for(lambda: healthy.sent)
+
+        assert broadcaster.get_stats()["subscribers"] == 1
+        assert healthy.sent == [{"type": "status_change", "data": {"status": "active"}}]
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_removes_empty_session(self):
+        """Test the last unsubscribe drops the session entry."""
+        broadcaster = EventBroadcaster()
+        session_id = uuid4()
+        websocket = _websocket()
+        handle = await broadcaster.subscribe(session_id, websocket)
+
+        await broadcaster.unsubscribe(session_id, handle)
+
+        assert broadcaster.subscribers == {}
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_does_not_block_producer(self):
+        """Test broadcasting returns while a subscriber's sends are stalled."""
+        broadcaster = EventBroadcaster(max_queue=10, overflow_policy="drop_oldest")
+        session_id = uuid4()
+        stalled, fast = _websocket(gate=asyncio.Event()), _websocket()
+        await broadcaster.subscribe(session_id, stalled)
+        await broadcaster.subscribe(session_id, fast)
+
+        for n in range(5):
+            await asyncio.wait_for(broadcaster.broadcast(session_id, "message", {"n": n}), 0.1)
+        await _wait_for(lambda: len(fast.sent) == 5)
+
+        assert stalled.sent == []
+        await broadcaster.close()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_discards_partial_frames_only(self):
+        """Test overflow drops the oldest partial frames and keeps full messages."""
+        gate = asyncio.Event()
+        broadcaster = EventBroadcaster(max_queue=3, overflow_policy="drop_oldest")
+        session_id = uuid4()
+        viewer = _websocket(gate=gate)
+        subscriber = await broadcaster.subscribe(session_id, viewer)
+        await broadcaster.broadcast(session_id, "message", {"n": 0})
+        await asyncio.sleep(0)  # writer takes frame 0 and blocks on send
+
+        await broadcaster.broadcast(session_id, "partial_message", _delta(0, "a"))
+        await broadcaster.broadcast(session_id, "message", {"n": 1})
+        await broadcaster.broadcast(session_id, "partial_message", _delta(1, "b"))
+        await broadcaster.broadcast(session_id, "message", {"n": 2})
+        gate.set()
+        await _wait_for(lambda: len(viewer.sent) == 4)
+
+        assert [event["type"] for event in viewer.sent] == [
+            "message", "message", "partial_message", "message",
+        ]
+        assert subscriber.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesce_merges_tail_deltas(self):
+        """Test overflow merges consecutive deltas of the same block."""
+        gate = asyncio.Event()
+        broadcaster = EventBroadcaster(max_queue=2, overflow_policy="coalesce")
+        session_id = uuid4()
+        viewer = _websocket(gate=gate)
+        await broadcaster.subscribe(session_id, viewer)
+        await broadcaster.broadcast(session_id, "message", {"n": 0})
+        await asyncio.sleep(0)
+
+        for text in ("Hel", "lo", " wor", "ld"):
+            await broadcaster.broadcast(session_id, "partial_message", _delta(0, text))
+        gate.set()
+        await _wait_for(lambda: len(viewer.sent) == 3)
+
+        texts = [event["data"]["event_data"]["delta"]["text"] for event in viewer.sent[1:]]
+        assert "".join(texts) == "Hello world"
+        assert broadcaster.get_stats()["coalesced_frames"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_closes_slow_consumer(self):
+        """Test the disconnect policy evicts a subscriber whose queue is full."""
+        broadcaster = EventBroadcaster(max_queue=1, overflow_policy="disconnect")
+        session_id = uuid4()
+        viewer = _websocket(gate=asyncio.Event())
+        await broadcaster.subscribe(session_id, viewer)
+
+        for n in range(3):
+            await broadcaster.broadcast(session_id, "message", {"n": n})
+        await _wait_for(lambda: viewer.close.await_count)
+
+        viewer.close.assert_awaited_once_with(code=1013, reason="Client too slow")
+        assert broadcaster.subscribers == {}
+
+    @pytest.mark.asyncio
+    async def test_control_events_share_the_writer(self):
+        """Test replies queued by the handler are sent in order by the writer, never dropped."""
+        gate = asyncio.Event()
+        broadcaster = EventBroadcaster(max_queue=1, overflow_policy="drop_oldest")
+        session_id = uuid4()
+        viewer = _websocket(gate=gate)
+        subscriber = await broadcaster.subscribe(session_id, viewer)
+        await broadcaster.broadcast(session_id, "message", {"n": 0})
+        await asyncio.sleep(0)  # writer blocks sending frame 0
+
+        subscriber.send_event({"type": "pong"})
+        subscriber.send_event({"type": "error", "data": {"code": "INVALID_JSON"}})
+        assert viewer.sent == []
+        gate.set()
+        await _wait_for(lambda: len(viewer.sent) == 3)
+
+        assert [event["type"] for event in viewer.sent] == ["message", "pong", "error"]
+        assert not subscriber.closed
+
+    def test_unknown_overflow_policy_rejected(self):
+        """Test invalid overflow policies are rejected."""
+        with pytest.raises(ValueError, match="Unknown overflow policy"):
+            EventBroadcaster(overflow_policy="block")
+
+    def test_merge_requires_same_block(self):
+        """Test deltas for different blocks are never merged."""
+        first = Frame(json.dumps({"type": "partial_message", "data": _delta(0, "a")}))
+        other_block = Frame(json.dumps({"type": "partial_message", "data": _delta(1, "b")}))
+
+        assert merge_delta_frames(first, other_block) is None
+
+
+class TestRedisEventBroadcaster:
+    """Test cases for the Redis pub/sub broadcaster."""
+
+    @pytest.mark.asyncio
+    async def test_event_crosses_workers(self):
+        """Test an event produced on one node reaches viewers on another."""
+        redis = FakeRedis()
+        producer_node = RedisEventBroadcaster(redis=redis)
+        viewer_node = RedisEventBroadcaster(redis=redis)
+        session_id = uuid4()
+        viewer = _websocket()
+        await viewer_node.subscribe(session_id, viewer)
+        await _wait_for(lambda: any(c.channels for c in redis.connections))
+
+        try:
+            await producer_node.broadcast(session_id, "message", {"text": "hello"})
+            await _wait_for(lambda: viewer.sent)
+        finally:
+            await producer_node.close()
+            await viewer_node.close()
+
+        assert viewer.sent == [{"type": "message", "data": {"text": "hello"}}]
+
+    @pytest.mark.asyncio
+    async def test_resubscribes_after_connection_loss(self):
+        """Test the listener reconnects and resubscribes active sessions."""
+        redis = FakeRedis()
+        broadcaster = RedisEventBroadcaster(redis=redis, reconnect_delay=0.01)
+        session_id = uuid4()
+        viewer = _websocket()
+        await broadcaster.subscribe(session_id, viewer)
+        await _wait_for(lambda: any(c.channels for c in redis.connections))
+
+        try:
+            redis.connections[0].fail_next_read = True
+            first_connection = redis.connections[0]
+            await _wait_for(
+                lambda: redis.connections
+                and redis.connections[0] is not first_connection
+                and redis.connections[0].channels
+            )
+
+            await broadcaster.broadcast(session_id, "message", {"n": 1})
+            await _wait_for(lambda: viewer.sent)
+        finally:
+            await broadcaster.close()
+
+        assert viewer.sent == [{"type": "message", "data": {"n": 1}}]
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_falls_back_to_local_delivery(self):
+        """Test local viewers still get events while Redis is unavailable."""
+        redis = FakeRedis()
+        broadcaster = RedisEventBroadcaster(redis=redis)
+        session_id = uuid4()
+        viewer = _websocket()
+        await broadcaster.subscribe(session_id, viewer)
+        redis.publish_error = ConnectionError("Redis down")
+
+        try:
+            await broadcaster.broadcast(session_id, "message", {"n": 1})
+            await _wait_for(lambda: viewer.sent)
+        finally:
+            await broadcaster.close()
+
+        assert viewer.sent == [{"type": "message", "data": {"n": 1}}]
+
+    @pytest.mark.asyncio
+    async def test_last_unsubscribe_leaves_channel(self):
+        """Test nodes stop receiving a session's channel once no viewer remains."""
+        redis = FakeRedis()
+        broadcaster = RedisEventBroadcaster(redis=redis)
+        session_id = uuid4()
+        viewer = _websocket()
+        await broadcaster.subscribe(session_id, viewer)
+        await _wait_for(lambda: any(c.channels for c in redis.connections))
+
+        try:
+            await broadcaster.unsubscribe(session_id, viewer)
+            await _wait_for(lambda: not any(c.channels for c in redis.connections))
+        finally:
+            await broadcaster.close()
+
+
+class TestResume:
+    """Test cases for resuming streams with since_sequence."""
+
+    @pytest.mark.asyncio
+    async def test_resume_replays_buffer_then_live(self):
+        """Test missed messages are replayed before the live feed continues."""
+        broadcaster = EventBroadcaster(replay_size=10)
+        session_id = uuid4()
+        for sequence in range(1, 6):
+            await broadcaster.broadcast_message(session_id, _message(session_id, sequence))
+        load_history = AsyncMock(return_value=[])
+
+        viewer = _websocket()
+        await broadcaster.subscribe(session_id, viewer, since_sequence=3, load_history=load_history)
+        await broadcaster.broadcast_message(session_id, _message(session_id, 6))
+        await _wait_for(lambda: len(viewer.sent) == 4)
+
+        assert [e.get("sequence_number") for e in viewer.sent] == [4, 5, None, 6]
+        assert viewer.sent[2] == {"type": "replay_complete", "data": {"replayed": 2, "last_sequence": 5}}
+        load_history.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_live_messages_during_replay_not_duplicated(self):
+        """Test messages published while the replay loads are sent exactly once."""
+        broadcaster = EventBroadcaster(replay_size=2)
+        session_id = uuid4()
+        for sequence in range(1, 5):
+            await broadcaster.broadcast_message(session_id, _message(session_id, sequence))
+
+        async def load_history(after, before):
+            # A new message arrives while the database is being queried
+            await broadcaster.broadcast_message(session_id, _message(session_id, 5))
+            return [{"sequence_number": 2, "message_type": "assistant"}]
+
+        viewer = _websocket()
+        await broadcaster.subscribe(session_id, viewer, since_sequence=1, load_history=load_history)
+        await _wait_for(lambda: len(viewer.sent) == 5)
+        await asyncio.sleep(0.05)
+
+        assert [e.get("sequence_number") for e in viewer.sent] == [2, 3, 4, None, 5]
+
+    @pytest.mark.asyncio
+    async def test_database_only_for_gap_older_than_buffer(self):
+        """Test the history loader is asked only for what the buffer lacks."""
+        broadcaster = EventBroadcaster(replay_size=3)
+        session_id = uuid4()
+        for sequence in range(1, 7):
+            await broadcaster.broadcast_message(session_id, _message(session_id, sequence))
+        load_history = AsyncMock(return_value=[
+            {"sequence_number": 2, "message_type": "assistant"},
+            {"sequence_number": 3, "message_type": "assistant"},
+        ])
+
+        frames = await broadcaster.get_replay(session_id, 1, load_history)
+
+        load_history.assert_awaited_once_with(1, 4)
+        assert [frame.sequence for frame in frames] == [2, 3, 4, 5, 6]
+
+    @pytest.mark.asyncio
+    async def test_redis_buffer_shared_across_workers(self):
+        """Test a client resuming on another worker replays from Redis."""
+        redis = FakeRedis()
+        producer_node = RedisEventBroadcaster(redis=redis, replay_size=3)
+        viewer_node = RedisEventBroadcaster(redis=redis, replay_size=3)
+        session_id = uuid4()
+        for sequence in range(1, 6):
+            await producer_node.broadcast_message(session_id, _message(session_id, sequence))
+        load_history = AsyncMock(return_value=[])
+
+        try:
+            frames = await viewer_node.get_replay(session_id, 3, load_history)
+            older = await viewer_node.get_replay(session_id, 1, load_history)
+        finally:
+            await producer_node.close()
+            await viewer_node.close()
+
+        assert [frame.sequence for frame in frames] == [4, 5]
+        assert [frame.sequence for frame in older] == [3, 4, 5]
+        load_history.assert_awaited_once_with(1, 3)
+
+    @pytest.mark.asyncio
+    async def test_history_over_limit_reports_gap(self):
+        """Test a client too far behind gets an explicit replay_gap, not a silent hole."""
+        broadcaster = EventBroadcaster(replay_size=2, history_limit=3)
+        session_id = uuid4()
+        for sequence in range(9, 11):
+            await broadcaster.broadcast_message(session_id, _message(session_id, sequence))
+        load_history = AsyncMock(return_value=[
+            {"sequence_number": n, "message_type": "assistant"} for n in (2, 3, 4)
+        ])
+
+        viewer = _websocket()
+        await broadcaster.subscribe(session_id, viewer, since_sequence=1, load_history=load_history)
+        await _wait_for(lambda: len(viewer.sent) == 7)
+
+        load_history.assert_awaited_once_with(1, 9)
+        assert [e.get("sequence_number") for e in viewer.sent] == [2, 3, 4, None, 9, 10, None]
+        assert viewer.sent[3] == {
+            "type": "replay_gap",
+            "data": {"reason": "too_far_behind", "after_sequence": 4, "before_sequence": 9},
+        }
+        assert viewer.sent[6]["data"] == {"replayed": 5, "last_sequence": 10}
+
+    @pytest.mark.asyncio
+    async def test_message_published_during_replay_read_not_lost(self):
+        """Test a message published right after the replay read arrives live."""
+        redis = FakeRedis()
+        producer_node = RedisEventBroadcaster(redis=redis, replay_size=10)
+        viewer_node = RedisEventBroadcaster(redis=redis, replay_size=10)
+        session_id = uuid4()
+        for sequence in range(1, 3):
+            await producer_node.broadcast_message(session_id, _message(session_id, sequence))
+
+        get_buffered = viewer_node._get_buffered
+
+        async def get_buffered_then_publish(session_key, since_sequence):
+            result = await get_buffered(session_key, since_sequence)
+            await producer_node.broadcast_message(session_id, _message(session_id, 3))
+            return result
+
+        viewer_node._get_buffered = get_buffered_then_publish
+        viewer = _websocket()
+        try:
+            await viewer_node.subscribe(session_id, viewer, since_sequence=0)
+            await _wait_for(lambda: len(viewer.sent) == 4)
+            await asyncio.sleep(0.05)
+        finally:
+            await producer_node.close()
+            await viewer_node.close()
+
+        assert [e.get("sequence_number") for e in viewer.sent] == [1, 2, None, 3]
+
+    @pytest.mark.asyncio
+    async def test_reconnect_catches_up_from_buffer(self):
+        """Test messages published while the listener was down are delivered once."""
+        redis = FakeRedis()
+        producer_node = RedisEventBroadcaster(redis=redis, replay_size=10)
+        viewer_node = RedisEventBroadcaster(redis=redis, replay_size=10, reconnect_delay=0.2)
+        session_id = uuid4()
+        viewer = _websocket()
+        await viewer_node.subscribe(session_id, viewer)
+
+        try:
+            await producer_node.broadcast_message(session_id, _message(session_id, 1))
+            await _wait_for(lambda: len(viewer.sent) == 1)
+
+            connection = redis.connections[-1]
+            connection.fail_next_read = True
+            # Published while the listener is down: it lands on the dead connection
+            await _wait_for(lambda: not connection.fail_next_read)
+            await producer_node.broadcast_message(session_id, _message(session_id, 2))
+
+            await _wait_for(lambda: len(viewer.sent) == 2)
+            await producer_node.broadcast_message(session_id, _message(session_id, 3))
+            await _wait_for(lambda: len(viewer.sent) == 3)
+            await asyncio.sleep(0.05)
+        finally:
+            await producer_node.close()
+            await viewer_node.close()
+
+        assert [e.get("sequence_number") for e in viewer.sent] == [1, 2, 3]
@@ -0,0 +1,107 @@
+"""Unit tests for the WebSocket stream wire encodings."""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+pytest.importorskip("msgpack")
+
+from app.claude_sdk.event_broadcaster import EventBroadcaster, Frame
+from app.claude_sdk.stream_protocol import (
+    FLAG_DEFLATE,
+    JSON_CODEC,
+    StreamCodec,
+    decode_frame,
+    negotiate_codec,
+)
+
+
+def _event(text="hello", size=1):
+    """Build a partial_message event."""
+    return {
+        "type": "partial_message",
+        "data": {
+            "session_id": str(uuid4()),
+            "event_type": "content_block_delta",
+            "event_data": {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": text * size},
+            },
+            "custom_field": {"7": "numeric-looking key"},
+        },
+    }
+
+
+class TestStreamCodec:
+    """Test cases for StreamCodec."""
+
+    @pytest.mark.parametrize("codec", [
+        JSON_CODEC,
+        StreamCodec("msgpack"),
+        StreamCodec("msgpack", "deflate"),
+    ], ids=lambda codec: codec.name)
+    def test_round_trip(self, codec):
+        """Test every codec decodes back to the original payload."""
+        payload = _event(size=200)
+
+        assert decode_frame(codec.encode(payload)) == payload
+
+    def test_field_names_are_dictionary_coded(self):
+        """Test known keys are not sent as strings but unknown keys are."""
+        frame = StreamCodec("msgpack").encode(_event())
+
+        assert frame[0] == 0
+        assert b"event_data" not in frame
+        assert b"custom_field" in frame
+        assert len(frame) < len(JSON_CODEC.encode(_event()))
+
+    def test_small_frames_not_deflated(self):
+        """Test deflate is skipped below the size threshold."""
+        codec = StreamCodec("msgpack", "deflate")
+
+        assert codec.encode(_event())[0] == 0
+        assert codec.encode(_event(size=500))[0] == FLAG_DEFLATE
+
+    def test_negotiation(self):
+        """Test defaults, unknown values and the missing-msgpack fallback."""
+        assert negotiate_codec() is JSON_CODEC
+        assert negotiate_codec("msgpack", "deflate").name == "msgpack+deflate"
+        with pytest.raises(ValueError):
+            negotiate_codec("cbor")
+        with patch("app.claude_sdk.stream_protocol.msgpack", None):
+            assert negotiate_codec("msgpack") is JSON_CODEC
+
+
+class TestBinarySubscribers:
+    """Test cases for subscribers using binary encodings."""
+
+    @pytest.mark.asyncio
+    async def test_frame_encoded_once_per_codec(self):
+        """Test subscribers sharing a codec reuse one encoding of the frame."""
+        broadcaster = EventBroadcaster(send_timeout=0)
+        session_id = uuid4()
+        codec = StreamCodec("msgpack")
+        sockets = [AsyncMock() for _ in range(3)]
+        for websocket in sockets[:2]:
+            await broadcaster.subscribe(session_id, websocket, codec=codec)
+        await broadcaster.subscribe(session_id, sockets[2])
+
+        with patch.object(StreamCodec, "encode_text", wraps=codec.encode_text) as encode_text:
+            await broadcaster.broadcast(session_id, "partial_message", _event()["data"])
+            await asyncio.sleep(0.05)
+
+        assert encode_text.call_count == 1
+        first, second = (ws.send_bytes.await_args.args[0] for ws in sockets[:2])
+        assert first is second
+        assert decode_frame(first)["type"] == "partial_message"
+        sockets[2].send_text.assert_awaited_once()
+        await broadcaster.close()
+
+    def test_json_codec_uses_text(self):
+        """Test the JSON codec sends the frame text unchanged."""
+        frame = Frame('{"type": "pong"}')
+
+        assert frame.encode(JSON_CODEC) is frame.text
@@ -140,6 +140,23 @@ class TestMessageRepository:
         assert page2[0].sequence_number == 3
         assert page2[1].sequence_number == 4
 
+    @pytest.mark.asyncio
+    async def test_get_after_sequence_bounded(
+        self, message_repository, test_session_model, multiple_messages
+    ):
+        """Test getting messages strictly between two sequence numbers."""
+        # Act
+        messages = await message_repository.get_after_sequence(
+            test_session_model.id, after_sequence=1, before_sequence=4
+        )
+        open_ended = await message_repository.get_after_sequence(
+            test_session_model.id, after_sequence=3
+        )
+
+        # Assert
+        assert [msg.sequence_number for msg in messages] == [2, 3]
+        assert [msg.sequence_number for msg in open_ended] == [4, 5]
+
     @pytest.mark.asyncio
     async def test_get_by_session_no_messages(self, message_repository):
         """Test getting messages for session with no messages."""
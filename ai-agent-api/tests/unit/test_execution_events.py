@@ -0,0 +1,94 @@
+"""Unit tests for task execution progress events."""
+
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+
+from app.claude_sdk.event_broadcaster import EventBroadcaster
+from app.services.execution_events import ExecutionEventPublisher, stream_execution_events
+
+
+def _parse(chunks):
+    """Parse SSE chunks into (id, event, data) tuples, skipping comments."""
+    events = []
+    for chunk in chunks:
+        fields = dict(
+            line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith(":")
+        )
+        if "data" in fields:
+            events.append((fields.get("id"), fields.get("event"), json.loads(fields["data"])))
+    return events
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+@pytest.fixture
+def broadcaster():
+    """Create in-process event bus."""
+    return EventBroadcaster(send_timeout=0)
+
+
+class TestExecutionEvents:
+    """Test cases for execution event publishing and SSE streaming."""
+
+    @pytest.mark.asyncio
+    async def test_live_events_until_terminal_status(self, broadcaster):
+        """Test a client sees live progress and the stream ends when the execution does."""
+        execution_id = uuid4()
+        publisher = ExecutionEventPublisher(execution_id, broadcaster)
+        consumer = asyncio.create_task(
+            _collect(stream_execution_events(execution_id, "running", broadcaster=broadcaster))
+        )
+        await asyncio.sleep(0.05)
+
+        await publisher.publish("assistant_text", {"text": "Checking pods"})
+        await publisher.publish("tool_call", {"name": "Bash", "input": {"command": "kubectl get pods"}})
+        await publisher.status("completed", cost_usd=0.01)
+        events = _parse(await asyncio.wait_for(consumer, 1))
+
+        assert [e[1] for e in events] == ["assistant_text", "tool_call", "status"]
+        assert events[-1][2]["data"] == {"status": "completed", "cost_usd": 0.01}
+        assert broadcaster.subscribers == {}
+
+    @pytest.mark.asyncio
+    async def test_last_event_id_resumes_after_gap(self, broadcaster):
+        """Test reconnecting with Last-Event-ID replays only the missed events."""
+        execution_id = uuid4()
+        publisher = ExecutionEventPublisher(execution_id, broadcaster)
+        await publisher.status("running")
+        await publisher.publish("assistant_text", {"text": "one"})
+        seen = _parse(await _collect(stream_execution_events(execution_id, "completed", broadcaster=broadcaster)))
+        await publisher.publish("assistant_text", {"text": "two"})
+        await publisher.status("completed")
+
+        resumed = _parse(await _collect(stream_execution_events(
+            execution_id, "completed", last_event_id=int(seen[1][0]), broadcaster=broadcaster,
+        )))
+
+        assert [e[2]["data"].get("text") for e in seen] == [None, "one", None]
+        assert [e[1] for e in resumed] == ["assistant_text", "status"]
+        assert resumed[0][2]["data"]["text"] == "two"
+        assert int(resumed[0][0]) > int(seen[1][0])
+
+    @pytest.mark.asyncio
+    async def test_finished_execution_without_buffer_gets_stored_status(self, broadcaster):
+        """Test a finished execution whose events expired still ends with its status."""
+        events = _parse(await _collect(stream_execution_events(uuid4(), "failed", broadcaster=broadcaster)))
+
+        assert [(e[1], e[2]["data"]["status"]) for e in events] == [("status", "failed")]
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_while_idle(self, broadcaster):
+        """Test comment heartbeats are sent when no event arrives."""
+        stream = stream_execution_events(uuid4(), "running", heartbeat_seconds=0.01, broadcaster=broadcaster)
+
+        chunks = [await stream.__anext__() for _ in range(3)]
+        await stream.aclose()
+
+        assert chunks[0].startswith("retry:")
+        assert chunks[1:] == [": heartbeat\n\n", ": heartbeat\n\n"]
+        assert broadcaster.subscribers == {}
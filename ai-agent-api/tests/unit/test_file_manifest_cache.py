@@ -0,0 +1,172 @@
+"""Unit tests for FileManifestCache."""
+
+import pytest
+
+from app.services.file_manifest_cache import FileManifestCache, etag_matches
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    """Create a small working directory tree."""
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "run.log").write_text("start\n")
+    (tmp_path / "report.md").write_text("# Report")
+    (tmp_path / "data.json").write_text("{}")
+    return tmp_path
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def cache(request):
+    """Create a cache using inotify or mtime polling."""
+    if request.param and not FileManifestCache(use_inotify=True).use_inotify:
+        pytest.skip("inotify not available")
+    cache = FileManifestCache(max_entries=4, revalidate_seconds=0, use_inotify=request.param)
+    yield cache
+    cache.clear()
+
+
+class TestFileManifestCache:
+    """Test cases for FileManifestCache."""
+
+    @pytest.mark.asyncio
+    async def test_initial_listing(self, cache, workdir):
+        """Test the first listing returns all files sorted by path."""
+        result = await cache.list_files(workdir)
+
+        assert [f["path"] for f in result["files"]] == ["data.json", "logs/run.log", "report.md"]
+        assert result["total_files"] == 3
+        assert result["total_size"] == 6 + 8 + 2
+        assert result["not_modified"] is False
+
+    @pytest.mark.asyncio
+    async def test_append_detected(self, cache, workdir):
+        """Test in-place appends update size and the ETag."""
+        first = await cache.list_files(workdir)
+        with open(workdir / "logs" / "run.log", "a") as f:
+            f.write("more output\n")
+
+        second = await cache.list_files(workdir)
+
+        assert second["etag"] != first["etag"]
+        log = next(f for f in second["files"] if f["path"] == "logs/run.log")
+        assert log["size"] == len("start\nmore output\n")
+
+    @pytest.mark.asyncio
+    async def test_create_and_delete_detected(self, cache, workdir):
+        """Test new files, new subdirectories and deletions are picked up."""
+        await cache.list_files(workdir)
+        (workdir / "data.json").unlink()
+        (workdir / "out" / "nested").mkdir(parents=True)
+        (workdir / "out" / "nested" / "result.csv").write_text("a,b")
+
+        result = await cache.list_files(workdir)
+
+        assert [f["path"] for f in result["files"]] == [
+            "logs/run.log", "out/nested/result.csv", "report.md",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_directory_keeps_etag(self, cache, workdir):
+        """Test polling an unchanged directory returns 304-style results."""
+        first = await cache.list_files(workdir)
+
+        second = await cache.list_files(workdir, if_none_match=first["etag"])
+
+        assert second["etag"] == first["etag"]
+        assert second["not_modified"] is True
+        assert second["files"] is None
+
+    @pytest.mark.asyncio
+    async def test_glob_and_pagination(self, cache, workdir):
+        """Test glob filtering and offset/limit slicing."""
+        for i in range(5):
+            (workdir / "logs" / f"step{i}.log").write_text("x")
+
+        result = await cache.list_files(workdir, pattern="logs/*.log", offset=2, limit=3)
+
+        assert result["matched_files"] == 6
+        assert result["total_files"] == 8
+        assert [f["path"] for f in result["files"]] == [
+            "logs/step1.log", "logs/step2.log", "logs/step3.log",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_missing_directory_raises(self, cache, tmp_path):
+        """Test listing a missing directory raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            await cache.list_files(tmp_path / "missing")
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, cache, tmp_path):
+        """Test least recently used manifests are evicted over the limit."""
+        for i in range(5):
+            (tmp_path / str(i)).mkdir()
+            await cache.list_files(tmp_path / str(i))
+
+        assert len(cache._entries) == 4
+        assert str(tmp_path / "0") not in cache._entries
+
+
+class TestEtagMatches:
+    """Test cases for If-None-Match comparison."""
+
+    @pytest.mark.parametrize("header,expected", [
+        (None, False),
+        ("*", True),
+        ('W/"abc-1"', True),
+        ('"abc-1"', True),
+        ('"other", W/"abc-1"', True),
+        ('W/"abc-2"', False),
+    ])
+    def test_etag_matches(self, header, expected):
+        """Test weak comparison, wildcard and lists."""
+        assert etag_matches(header, 'W/"abc-1"') is expected
+
+
+class TestSharedInotifyWatcher:
+    """Test cases for the process-wide inotify descriptor."""
+
+    @pytest.fixture
+    def inotify_cache(self):
+        """Create a cache that must use inotify."""
+        cache = FileManifestCache(max_entries=4, revalidate_seconds=0, use_inotify=True)
+        if not cache.use_inotify:
+            pytest.skip("inotify not available")
+        yield cache
+        cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_overlapping_manifests_share_descriptor(self, inotify_cache, workdir):
+        """Test a directory watched by two manifests gets one watch and both see changes."""
+        await inotify_cache.list_files(workdir)
+        await inotify_cache.list_files(workdir / "logs")
+        outer = inotify_cache._entries[str(workdir)]
+        inner = inotify_cache._entries[str(workdir / "logs")]
+
+        assert outer.watcher is inner.watcher
+        assert outer.watch_descriptors & inner.watch_descriptors
+
+        with open(workdir / "logs" / "run.log", "a") as f:
+            f.write("more\n")
+
+        outer_result = await inotify_cache.list_files(workdir)
+        inner_result = await inotify_cache.list_files(workdir / "logs")
+        assert next(
+            f["size"] for f in outer_result["files"] if f["path"] == "logs/run.log"
+        ) == len("start\nmore\n")
+        assert inner_result["files"][0]["size"] == len("start\nmore\n")
+
+    @pytest.mark.asyncio
+    async def test_invalidate_keeps_watches_used_by_others(self, inotify_cache, workdir):
+        """Test dropping one manifest leaves the shared watch for the other."""
+        await inotify_cache.list_files(workdir)
+        await inotify_cache.list_files(workdir / "logs")
+        inner = inotify_cache._entries[str(workdir / "logs")]
+        shared = set(inner.watch_descriptors)
+
+        inotify_cache.invalidate(workdir)
+
+        assert shared <= set(inner.watcher.watches)
+        (workdir / "logs" / "new.log").write_text("x")
+        result = await inotify_cache.list_files(workdir / "logs")
+        assert [f["path"] for f in result["files"]] == ["new.log", "run.log"]
@@ -0,0 +1,179 @@
+"""Unit tests for the shared Kubernetes client and the SDK tools using it."""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from kubernetes import client
+from kubernetes.client.exceptions import ApiException
+
+from app.mcp import sdk_tools
+from app.mcp.kubernetes_client import KubernetesClientManager
+
+
+def _loader():
+    """Create a config loader that counts loads."""
+    def load():
+        load.count += 1
+        configuration = client.Configuration()
+        configuration.host = "https://kubernetes.test"
+        return configuration
+    load.count = 0
+    return load
+
+
+def _pod(name, namespace="default"):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(name=name, namespace=namespace, creation_timestamp="2024-01-01"),
+        status=SimpleNamespace(phase="Running", container_statuses=[], pod_ip="10.0.0.1"),
+        spec=SimpleNamespace(containers=[object()], node_name="node-1"),
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_tool_cache(monkeypatch):
+    """Disable tool result caching so every call reaches the API."""
+    monkeypatch.setattr("app.mcp.tool_cache.settings.mcp_tool_cache_enabled", False)
+
+
+@pytest.fixture
+def manager():
+    """Create a manager with a fake config loader."""
+    manager = KubernetesClientManager(max_workers=2, loader=_loader())
+    yield manager
+    manager.close()
+
+
+class TestKubernetesClientManager:
+    """Test cases for KubernetesClientManager."""
+
+    @pytest.mark.asyncio
+    async def test_config_loaded_once_and_calls_run_off_loop(self, manager):
+        """Test calls share one configured client and run in worker threads."""
+        threads = []
+
+        def fn(v1):
+            threads.append(threading.current_thread().name)
+            return v1.api_client
+
+        clients = [await manager.call(fn) for _ in range(3)]
+
+        assert manager._loader.count == 1
+        assert len({id(c) for c in clients}) == 1
+        assert clients[0].configuration.connection_pool_maxsize == 2
+        assert all(name.startswith("kubernetes") for name in threads)
+
+    @pytest.mark.asyncio
+    async def test_unauthorized_reloads_credentials_and_retries(self, manager):
+        """Test a 401 reloads configuration and retries the call once."""
+        calls = []
+
+        def fn(v1):
+            calls.append(v1.api_client)
+            if len(calls) == 1:
+                raise ApiException(status=401, reason="Unauthorized")
+            return "ok"
+
+        assert await manager.call(fn) == "ok"
+        assert manager._loader.count == 2
+        assert calls[0] is not calls[1]
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_retried(self, manager):
+        """Test non-auth API errors propagate without reloading."""
+        def fn(v1):
+            raise ApiException(status=404, reason="Not Found")
+
+        with pytest.raises(ApiException):
+            await manager.call(fn)
+        assert manager._loader.count == 1
+
+    @pytest.mark.asyncio
+    async def test_config_refreshed_after_max_age(self):
+        """Test configuration is reloaded once it is older than refresh_seconds."""
+        manager = KubernetesClientManager(max_workers=1, refresh_seconds=1, loader=_loader())
+        await manager.call(lambda v1: None)
+        manager._loaded_at -= 2
+        await manager.call(lambda v1: None)
+        manager.close()
+
+        assert manager._loader.count == 2
+
+    @pytest.mark.asyncio
+    async def test_replaced_client_closed_after_in_flight_calls(self, manager):
+        """Test a refresh swaps clients at once but closes the old one only when its calls finish."""
+        import asyncio
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow(v1):
+            started.set()
+            release.wait(5)
+            return v1.api_client
+
+        slow_call = asyncio.ensure_future(manager.call(slow))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        old_client = manager.api_client()
+
+        with patch.object(old_client, "close") as close:
+            manager._loaded_at -= manager.refresh_seconds + 1
+            new_client = await manager.call(lambda v1: v1.api_client)
+            assert new_client is not old_client
+            close.assert_not_called()
+
+            release.set()
+            assert await slow_call is old_client
+            close.assert_called_once()
+        assert manager._in_use == {}
+
+
+class TestListPods:
+    """Test cases for the list_pods tool."""
+
+    @pytest.mark.asyncio
+    async def test_pagination_and_selectors(self, manager):
+        """Test list_pods passes limit, continue and selectors and returns the next token."""
+        v1 = MagicMock()
+        v1.list_namespaced_pod.return_value = SimpleNamespace(
+            items=[_pod("web-1")],
+            metadata=SimpleNamespace(_continue="token-2", remaining_item_count=5),
+        )
+
+        with patch.object(manager, "core_v1", return_value=v1), \
+                patch("app.mcp.kubernetes_client.get_kubernetes_client", return_value=manager):
+            result = await sdk_tools.list_pods.handler({
+                "namespace": "prod",
+                "label_selector": "app=web",
+                "field_selector": "status.phase=Running",
+                "limit": 1,
+                "continue": "token-1",
+            })
+
+        v1.list_namespaced_pod.assert_called_once_with(
+            namespace="prod", limit=1, label_selector="app=web",
+            field_selector="status.phase=Running", _continue="token-1",
+        )
+        text = result["content"][0]["text"]
+        assert "web-1" in text
+        assert 'continue="token-2"' in text
+        assert "5 more pods" in text
+
+    @pytest.mark.asyncio
+    async def test_all_namespaces(self, manager):
+        """Test cluster-wide listing uses list_pod_for_all_namespaces."""
+        v1 = MagicMock()
+        v1.list_pod_for_all_namespaces.return_value = SimpleNamespace(
+            items=[_pod("dns", "kube-system")],
+            metadata=SimpleNamespace(_continue=None, remaining_item_count=None),
+        )
+
+        with patch.object(manager, "core_v1", return_value=v1), \
+                patch("app.mcp.kubernetes_client.get_kubernetes_client", return_value=manager):
+            result = await sdk_tools.list_pods.handler({"all_namespaces": True})
+
+        v1.list_pod_for_all_namespaces.assert_called_once_with(limit=100)
+        text = result["content"][0]["text"]
+        assert "| kube-system | dns |" in text
+        assert "continue=" not in text
@@ -0,0 +1,217 @@
+"""Unit tests for MCPConfigCache."""
+
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.mcp.config_builder import MCPConfigBuilder
+from app.mcp.config_cache import MCPConfigCache
+
+
+class FakeRedis:
+    """Minimal async Redis with the string commands the cache uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise ConnectionError("Connection refused")
+
+    async def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value
+
+    async def mget(self, keys):
+        self._check()
+        return [self.data.get(key) for key in keys]
+
+    async def incr(self, key):
+        self._check()
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+def _builder(config):
+    """Create a build callback returning config and counting calls."""
+    return AsyncMock(return_value=config)
+
+
+@pytest.fixture
+def redis():
+    """Create shared fake Redis."""
+    return FakeRedis()
+
+
+class TestMCPConfigCache:
+    """Test cases for MCPConfigCache."""
+
+    @pytest.mark.asyncio
+    async def test_steady_state_builds_once(self, redis):
+        """Test repeated lookups reuse the compiled config."""
+        cache = MCPConfigCache(redis=redis, use_redis=True)
+        user_id = uuid4()
+        build = _builder({"fs": {"command": "npx"}})
+
+        for _ in range(5):
+            assert await cache.get_user_config(user_id, build) == {"fs": {"command": "npx"}}
+
+        assert build.await_count == 1
+        assert cache.get_stats()["hits"] == 4
+
+    @pytest.mark.asyncio
+    async def test_user_invalidation_is_scoped(self, redis):
+        """Test invalidating one user leaves other users cached."""
+        cache = MCPConfigCache(redis=redis, use_redis=True)
+        alice, bob = uuid4(), uuid4()
+        build_alice, build_bob = _builder({"a": {}}), _builder({"b": {}})
+        await cache.get_user_config(alice, build_alice)
+        await cache.get_user_config(bob, build_bob)
+
+        await cache.invalidate_user(alice)
+        await cache.get_user_config(alice, build_alice)
+        await cache.get_user_config(bob, build_bob)
+
+        assert build_alice.await_count == 2
+        assert build_bob.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_global_invalidation_affects_every_user(self, redis):
+        """Test a global server change rebuilds all users' configs."""
+        cache = MCPConfigCache(redis=redis, use_redis=True)
+        builds = {user_id: _builder({}) for user_id in (uuid4(), uuid4())}
+        for user_id, build in builds.items():
+            await cache.get_user_config(user_id, build)
+
+        await cache.invalidate_server(None, is_global=True)
+        for user_id, build in builds.items():
+            await cache.get_user_config(user_id, build)
+
+        assert [build.await_count for build in builds.values()] == [2, 2]
+
+    @pytest.mark.asyncio
+    async def test_shared_across_workers(self, redis):
+        """Test workers reuse each other's builds and see each other's invalidations."""
+        worker_a = MCPConfigCache(redis=redis, use_redis=True)
+        worker_b = MCPConfigCache(redis=redis, use_redis=True)
+        user_id = uuid4()
+        build = _builder({"fs": {"command": "npx"}})
+
+        await worker_a.get_user_config(user_id, build)
+        assert await worker_b.get_user_config(user_id, build) == {"fs": {"command": "npx"}}
+        assert build.await_count == 1
+
+        await worker_a.invalidate_user(user_id)
+        await worker_b.get_user_config(user_id, build)
+        assert build.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_outage_falls_back_to_memory(self, redis):
+        """Test lookups and local invalidation keep working without Redis."""
+        cache = MCPConfigCache(redis=redis, use_redis=True)
+        redis.down = True
+        user_id = uuid4()
+        build = _builder({})
+
+        await cache.get_user_config(user_id, build)
+        await cache.get_user_config(user_id, build)
+        await cache.invalidate_user(user_id)
+        await cache.get_user_config(user_id, build)
+
+        assert build.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_memory_entries_expire(self):
+        """Test entries expire after the TTL without Redis."""
+        cache = MCPConfigCache(use_redis=False, ttl_seconds=1)
+        user_id = uuid4()
+        build = _builder({})
+        await cache.get_user_config(user_id, build)
+
+        for key, (expires, value) in list(cache._entries.items()):
+            cache._entries[key] = (time.monotonic() - 1, value)
+        await cache.get_user_config(user_id, build)
+
+        assert build.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_tool_group_resolution(self, redis):
+        """Test tool groups are cached, including missing groups, until invalidated."""
+        cache = MCPConfigCache(redis=redis, use_redis=True)
+        group_id, missing_id = uuid4(), uuid4()
+        load = _builder({"allowed_tools": ["Bash"], "disallowed_tools": []})
+        load_missing = _builder(None)
+
+        for _ in range(3):
+            assert (await cache.get_tool_group(group_id, load))["allowed_tools"] == ["Bash"]
+            assert await cache.get_tool_group(missing_id, load_missing) is None
+        await cache.invalidate_tool_group(group_id)
+        await cache.get_tool_group(group_id, load)
+
+        assert load.await_count == 2
+        assert load_missing.await_count == 1
+
+
+class TestCachedConfigBuilder:
+    """Test cases for MCPConfigBuilder with a cache."""
+
+    @pytest.mark.asyncio
+    async def test_no_queries_in_steady_state(self, redis):
+        """Test repeated session builds do not query the repository."""
+        user_id = uuid4()
+        repo = AsyncMock()
+        repo.list_by_user = AsyncMock(return_value=[
+            SimpleNamespace(
+                id=uuid4(), user_id=user_id, name="fs", server_type="stdio",
+                config={"command": "npx", "args": ["server-fs"]}, is_enabled=True, is_global=False,
+            ),
+        ])
+        repo.list_enabled = AsyncMock(return_value=[])
+        builder = MCPConfigBuilder(repo, cache=MCPConfigCache(redis=redis, use_redis=True))
+
+        first = await builder.build_session_mcp_config(user_id)
+        first["fs"]["args"].append("mutated")
+        second = await builder.build_session_mcp_config(user_id)
+
+        assert second["fs"] == {"command": "npx", "args": ["server-fs"]}
+        assert repo.list_by_user.await_count == 1
+        assert repo.list_enabled.await_count == 1
+
+
+class TestServerUpdateInvalidation:
+    """Test cases for MCPServerService invalidating compiled configs."""
+
+    @pytest.mark.asyncio
+    async def test_scope_change_invalidates_old_and_new_scope(self, monkeypatch):
+        """Test a server that becomes global drops its owner's config and the global one."""
+        from unittest.mock import MagicMock
+
+        from app.schemas.mcp import MCPServerUpdateRequest
+        from app.services.mcp_server_service import MCPServerService
+
+        user = SimpleNamespace(id=uuid4())
+        server_id = uuid4()
+        before = SimpleNamespace(id=server_id, user_id=user.id, is_global=False)
+        after = SimpleNamespace(id=server_id, user_id=None, is_global=True)
+        repo = AsyncMock()
+        repo.get_by_id = AsyncMock(return_value=before)
+        repo.update = AsyncMock(return_value=after)
+        cache = AsyncMock()
+        monkeypatch.setattr("app.services.mcp_server_service.get_mcp_config_cache", lambda: cache)
+        monkeypatch.setattr(
+            "app.services.mcp_server_service.MCPServerResponse.model_validate", MagicMock()
+        )
+        service = MCPServerService(AsyncMock(), repo, AsyncMock())
+
+        await service.update_server(user, server_id, MCPServerUpdateRequest(description="shared"))
+
+        invalidated = {call.args for call in cache.invalidate_server.await_args_list}
+        assert invalidated == {(user.id, False), (None, True)}
@@ -0,0 +1,208 @@
+"""Unit tests for MCP server health probes against local stub servers."""
+
+import sys
+import textwrap
+import time
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from app.mcp.config_builder import MCPConfigBuilder
+from app.mcp.health_prober import MCPHealthProber
+
+STUB_SERVER = textwrap.dedent("""
+    import json, sys
+
+    for line in sys.stdin:
+        message = json.loads(line)
+        if "id" not in message:
+            continue
+        if message["method"] == "initialize":
+            result = {
+                "protocolVersion": message["params"]["protocolVersion"],
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "stub", "version": "1.0"},
+            }
+        elif message["method"] == "tools/list":
+            result = {"tools": [
+                {"name": "echo", "inputSchema": {"type": "object"}},
+                {"name": "now", "inputSchema": {"type": "object"}},
+            ]}
+        else:
+            result = {}
+        print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}), flush=True)
+""")
+
+HANGING_SERVER = textwrap.dedent("""
+    import signal, time
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    while True:
+        time.sleep(1)
+""")
+
+
+def _stdio(tmp_path, source, name):
+    script = tmp_path / name
+    script.write_text(source)
+    return {"command": sys.executable, "args": [str(script)]}
+
+
+class TestMCPHealthProber:
+    """Test cases for MCPHealthProber."""
+
+    @pytest.mark.asyncio
+    async def test_healthy_server_reports_tools_and_latency(self, tmp_path):
+        """Test a probe completes the handshake and lists tools."""
+        prober = MCPHealthProber(timeout_seconds=10)
+
+        result = await prober.probe(_stdio(tmp_path, STUB_SERVER, "stub.py"))
+
+        assert result.healthy, result.error
+        assert result.tools == ["echo", "now"]
+        assert result.latency_ms is not None
+
+    @pytest.mark.asyncio
+    async def test_unresponsive_server_times_out(self, tmp_path):
+        """Test a server that never answers is reported unhealthy within the timeout."""
+        prober = MCPHealthProber(timeout_seconds=0.5)
+
+        started = time.monotonic()
+        result = await prober.probe(_stdio(tmp_path, HANGING_SERVER, "hang.py"))
+
+        assert not result.healthy
+        assert "within 0.5s" in result.error
+        assert time.monotonic() - started < 5
+
+    @pytest.mark.asyncio
+    async def test_missing_command_is_unhealthy(self):
+        """Test a server that cannot be launched is reported with its error."""
+        prober = MCPHealthProber(timeout_seconds=5)
+
+        result = await prober.probe({"command": "/nonexistent/mcp-server", "args": []})
+
+        assert not result.healthy
+        assert result.error
+
+    @pytest.mark.asyncio
+    async def test_results_cached_and_unhealthy_servers_filtered(self, tmp_path):
+        """Test cached results are reused and known-unhealthy servers are skipped."""
+        prober = MCPHealthProber(timeout_seconds=5, ttl_seconds=60)
+        good = _stdio(tmp_path, STUB_SERVER, "stub.py")
+        bad = {"command": "/nonexistent/mcp-server", "args": []}
+        unprobed = {"type": "sse", "url": "http://localhost:1/sse", "headers": {}}
+
+        results = await prober.probe_many({"good": good, "bad": bad})
+        assert await prober.probe(good) is results["good"]
+
+        assert prober.filter_unhealthy({"good": good, "bad": bad, "new": unprobed}) == {
+            "good": good, "new": unprobed,
+        }
+
+    @pytest.mark.asyncio
+    async def test_session_config_skips_unhealthy_servers(self, tmp_path, monkeypatch):
+        """Test session MCP configs leave out servers whose last probe failed."""
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+        from uuid import uuid4
+
+        prober = MCPHealthProber(timeout_seconds=5, ttl_seconds=60)
+        monkeypatch.setattr("app.mcp.config_builder.get_mcp_health_prober", lambda: prober)
+        user_id = uuid4()
+        servers = [
+            SimpleNamespace(
+                id=uuid4(), user_id=user_id, name=name, server_type="stdio",
+                config=config, is_enabled=True, is_global=False,
+            )
+            for name, config in (
+                ("good", _stdio(tmp_path, STUB_SERVER, "stub.py")),
+                ("bad", {"command": "/nonexistent/mcp-server", "args": []}),
+            )
+        ]
+        repo = AsyncMock()
+        repo.list_by_user = AsyncMock(return_value=servers)
+        repo.list_enabled = AsyncMock(return_value=[])
+        builder = MCPConfigBuilder(repo)
+
+        await prober.probe_many({s.name: builder._convert_to_sdk_format(s) for s in servers})
+        config = await builder.build_user_mcp_config(user_id)
+
+        assert list(config) == ["good"]
+
+    @pytest.mark.asyncio
+    async def test_background_probes_run_at_startup_and_repeat(self, monkeypatch):
+        """Test the probe loop checks servers right away and then every interval."""
+        import asyncio
+        from contextlib import asynccontextmanager
+        from unittest.mock import AsyncMock
+
+        from app.mcp.health_prober import run_mcp_health_probes
+
+        @asynccontextmanager
+        async def session_factory():
+            yield object()
+
+        check = AsyncMock(side_effect=[RuntimeError("db down")] + [{}] * 100)
+        monkeypatch.setattr("app.database.session.AsyncSessionLocal", session_factory)
+        # No Redis: every worker probes for itself
+        monkeypatch.setattr(
+            "app.mcp.health_prober._claim_probe_round", AsyncMock(return_value=(None, None))
+        )
+        monkeypatch.setattr(
+            "app.claude_sdk.monitoring.health_checker.HealthChecker.check_mcp_servers", check
+        )
+
+        task = asyncio.create_task(run_mcp_health_probes(0.01))
+        await asyncio.sleep(0.1)
+        task.cancel()
+
+        # A failed round does not stop the loop
+        assert check.await_count >= 3
+
+    @pytest.mark.asyncio
+    async def test_results_shared_between_workers(self):
+        """Test results one worker probed are loaded by another through Redis."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        from app.mcp.health_prober import SHARED_RESULTS_KEY, ProbeResult, config_fingerprint
+
+        hashes = {}
+        pipe = MagicMock()
+        pipe.hset.side_effect = lambda key, mapping: hashes.setdefault(key, {}).update(mapping)
+        pipe.execute = AsyncMock()
+        redis = MagicMock()
+        redis.pipeline.return_value = pipe
+        redis.hgetall = AsyncMock(side_effect=lambda key: hashes.get(key, {}))
+
+        config = {"type": "stdio", "command": "missing-mcp-server"}
+        prober = MCPHealthProber()
+        prober._results[config_fingerprint(config)] = ProbeResult(status="unhealthy", error="boom")
+        await prober.share_results(redis)
+
+        other_worker = MCPHealthProber()
+        assert not other_worker.is_known_unhealthy(config)
+        assert await other_worker.load_shared_results(redis) == 1
+        assert other_worker.is_known_unhealthy(config)
+        assert list(hashes) == [SHARED_RESULTS_KEY]
+
+    @pytest.mark.asyncio
+    async def test_only_the_claiming_worker_probes(self, monkeypatch):
+        """Test a worker that loses the round loads shared results instead of probing."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock
+
+        import app.mcp.health_prober as health_prober
+
+        redis = MagicMock()
+        probe = AsyncMock()
+        load = AsyncMock(return_value=0)
+        monkeypatch.setattr(health_prober, "_claim_probe_round", AsyncMock(return_value=(redis, False)))
+        monkeypatch.setattr(health_prober, "_probe_enabled_servers", probe)
+        monkeypatch.setattr(health_prober.MCPHealthProber, "load_shared_results", load)
+
+        task = asyncio.create_task(health_prober.run_mcp_health_probes(0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        probe.assert_not_called()
+        assert load.await_count >= 2
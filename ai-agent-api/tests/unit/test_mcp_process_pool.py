@@ -0,0 +1,165 @@
+"""Unit tests for shared MCP server processes behind the local SSE proxy."""
+
+import asyncio
+import sys
+import textwrap
+from contextlib import asynccontextmanager
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from app.mcp.process_pool import MCPProcessPool
+
+# Answers tools/call with its pid; the "crash" tool exits the process
+STUB_SERVER = textwrap.dedent("""
+    import json, os, sys
+
+    for line in sys.stdin:
+        message = json.loads(line)
+        if "id" not in message:
+            continue
+        if message["method"] == "initialize":
+            result = {
+                "protocolVersion": message["params"]["protocolVersion"],
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "stub", "version": "1.0"},
+            }
+        elif message["method"] == "tools/call":
+            if message["params"]["name"] == "crash":
+                sys.exit(1)
+            result = {"content": [{"type": "text", "text": str(os.getpid())}]}
+        else:
+            result = {}
+        print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}), flush=True)
+""")
+
+
+@pytest.fixture
+def stub_config(tmp_path):
+    script = tmp_path / "stub.py"
+    script.write_text(STUB_SERVER)
+    return {"command": sys.executable, "args": [str(script)]}
+
+
+@pytest.fixture
+async def pool():
+    pool = MCPProcessPool(port=0, idle_seconds=60, max_memory_mb=0, check_interval_seconds=0.1)
+    await pool.start()
+    yield pool
+    await pool.close()
+
+
+@asynccontextmanager
+async def _session(url):
+    async with sse_client(url, timeout=10) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            yield session
+
+
+async def _pid(session) -> int:
+    result = await session.call_tool("pid", {})
+    return int(result.content[0].text)
+
+
+class TestMCPProcessPool:
+    """Test cases for MCPProcessPool."""
+
+    @pytest.mark.asyncio
+    async def test_route_rewrites_only_poolable_stdio_servers(self, pool, stub_config, monkeypatch):
+        """Test stdio servers are routed to the proxy while others are kept."""
+        monkeypatch.setattr("app.mcp.process_pool.settings.mcp_process_pool_isolated_servers", ["private"])
+        remote = {"type": "sse", "url": "https://mcp.example.com/sse"}
+
+        routed = pool.route({"shared": stub_config, "private": stub_config, "remote": remote})
+
+        assert routed["shared"]["type"] == "sse"
+        assert routed["shared"]["url"].startswith(pool.base_url)
+        assert routed["private"] == stub_config
+        assert routed["remote"] == remote
+        assert pool.route({"again": dict(stub_config)})["again"] == routed["shared"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sessions_share_one_process(self, pool, stub_config):
+        """Test two sessions talk to the same process with independent request ids."""
+        url = pool.route({"stub": stub_config})["stub"]["url"]
+
+        async with _session(url) as first, _session(url) as second:
+            pids = await asyncio.gather(*(_pid(s) for s in (first, second, first, second)))
+
+        assert len(set(pids)) == 1
+        assert len(pool.servers) == 1
+
+    @pytest.mark.asyncio
+    async def test_crashed_process_is_restarted(self, pool, stub_config):
+        """Test a crash fails the pending request and later calls reach a new process."""
+        url = pool.route({"stub": stub_config})["stub"]["url"]
+        server = next(iter(pool.servers.values()))
+
+        async with _session(url) as session:
+            before = await _pid(session)
+            with pytest.raises(Exception):
+                await session.call_tool("crash", {})
+            for _ in range(100):
+                if server.running and server.pid != before:
+                    break
+                await asyncio.sleep(0.05)
+            after = await _pid(session)
+
+        assert after != before
+        assert server.restarts == 1
+
+    @pytest.mark.asyncio
+    async def test_process_over_memory_cap_is_restarted(self, pool, stub_config):
+        """Test the monitor kills a process above the memory cap and it comes back."""
+        url = pool.route({"stub": stub_config})["stub"]["url"]
+        server = next(iter(pool.servers.values()))
+
+        async with _session(url) as session:
+            before = await _pid(session)
+            pool.max_memory_mb = 1
+            for _ in range(100):
+                if server.restarts:
+                    break
+                await asyncio.sleep(0.05)
+            pool.max_memory_mb = 0
+            after = await _pid(session)
+
+        assert server.restarts == 1
+        assert after != before
+
+    @pytest.mark.asyncio
+    async def test_restart_backoff_resets_after_stable_run(self, pool, stub_config, monkeypatch):
+        """Test a crash after a long healthy run is not backed off as a repeat crash."""
+        monkeypatch.setattr("app.mcp.process_pool.RESTART_RESET_SECONDS", 0)
+        url = pool.route({"stub": stub_config})["stub"]["url"]
+        server = next(iter(pool.servers.values()))
+
+        async with _session(url) as session:
+            for _ in range(2):
+                before = await _pid(session)
+                with pytest.raises(Exception):
+                    await session.call_tool("crash", {})
+                for _ in range(100):
+                    if server.running and server.pid != before:
+                        break
+                    await asyncio.sleep(0.05)
+
+        assert server.restarts == 1
+
+    @pytest.mark.asyncio
+    async def test_route_keeps_idle_server_from_being_stopped(self, pool, stub_config):
+        """Test routing a session restarts the idle timer of an unused server."""
+        pool.idle_seconds = 0.5
+        pool.route({"stub": stub_config})
+        server = next(iter(pool.servers.values()))
+        server.idle_since -= 10
+
+        pool.route({"stub": stub_config})
+        await asyncio.sleep(0.2)
+
+        assert server.token in pool.servers
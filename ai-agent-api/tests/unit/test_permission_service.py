@@ -6,6 +6,8 @@ from unittest.mock import AsyncMock, MagicMock
 from pathlib import Path
 
 from app.claude_sdk.permission_service import PermissionService
+from app.claude_sdk.permissions.decision_log import PermissionDecisionLog
+from app.domain.entities.permission_decision import PermissionResult as PermissionDecision
 from app.domain.entities.user import User
 from app.models.user import UserModel
 from app.models.session import SessionModel
@@ -33,6 +35,7 @@ class TestPermissionService:
             session_repo=SessionRepository(db_session),
             mcp_server_repo=MCPServerRepository(db_session),
             audit_service=mock_audit_service,
+            decision_log=AsyncMock(spec=PermissionDecisionLog),
         )
 
     @pytest.mark.asyncio
@@ -89,8 +92,10 @@ class TestPermissionService:
         assert isinstance(result, PermissionResultDeny)
         assert "dangerous command" in result.message.lower()
         
-        # Verify audit logging
-        mock_audit_service.log_permission_denied.assert_called_once()
+        # Verify decision logging
+        permission_service.decision_log.record.assert_called_once()
+        logged = permission_service.decision_log.record.call_args.kwargs
+        assert logged["decision"] == PermissionDecision.DENIED
 
     @pytest.mark.asyncio
     async def test_check_bash_permission_viewer_role_restricted(
@@ -0,0 +1,80 @@
+"""Unit tests for the query_database tool's bounded query execution."""
+
+import pytest
+
+from app.mcp.query_executor import QueryRejectedError, build_bounded_query, format_rows
+
+
+async def _rows(rows):
+    for row in rows:
+        yield row
+
+
+class TestBuildBoundedQuery:
+    """Test cases for build_bounded_query."""
+
+    def test_wraps_query_with_row_cap(self):
+        """Test the cap applies even when the query has its own LIMIT inside a subquery."""
+        sql = build_bounded_query(
+            "SELECT * FROM users WHERE id IN (SELECT user_id FROM sessions LIMIT 5);", 100
+        )
+
+        assert sql.startswith("SELECT * FROM (\nSELECT * FROM users")
+        assert sql.endswith(") AS bounded_query LIMIT :row_cap")
+        assert ";" not in sql
+
+    def test_allows_cte_and_column_names_containing_keywords(self):
+        """Test keywords only match whole words."""
+        build_bounded_query("WITH recent AS (SELECT created_at, updated_at FROM tasks) SELECT * FROM recent", 10)
+
+    @pytest.mark.parametrize("query", [
+        "DELETE FROM users",
+        "SELECT 1; DROP TABLE users",
+        "SELECT * FROM users WHERE id = 1 OR 1=1; update users set role='admin'",
+        "EXPLAIN ANALYZE SELECT 1",
+        "",
+    ])
+    def test_rejects_non_select(self, query):
+        """Test writes, multiple statements and non-SELECT statements are rejected."""
+        with pytest.raises(QueryRejectedError):
+            build_bounded_query(query, 10)
+
+
+class TestFormatRows:
+    """Test cases for format_rows."""
+
+    @pytest.mark.asyncio
+    async def test_renders_escaped_table(self):
+        """Test cells are escaped for markdown and NULLs are shown."""
+        result = await format_rows(["id", "note"], _rows([(1, "a|b\nc"), (2, None)]), max_rows=10)
+
+        assert result.text == "| id | note |\n|---|---|\n| 1 | a\\|b c |\n| 2 | NULL |\n"
+        assert (result.row_count, result.row_capped, result.byte_capped) == (2, False, False)
+
+    @pytest.mark.asyncio
+    async def test_row_cap_stops_consuming(self):
+        """Test rows beyond max_rows are not read and the result is marked capped."""
+        consumed = []
+
+        async def rows():
+            for i in range(1000):
+                consumed.append(i)
+                yield (i,)
+
+        result = await format_rows(["n"], rows(), max_rows=3)
+
+        assert result.row_count == 3
+        assert result.row_capped
+        assert len(consumed) == 4
+
+    @pytest.mark.asyncio
+    async def test_cell_truncation_and_byte_budget(self):
+        """Test wide cells are truncated and output stops at the byte budget."""
+        wide = [("x" * 10_000,) for _ in range(100)]
+
+        result = await format_rows(["blob"], _rows(wide), max_rows=100, max_cell_chars=50, max_bytes=500)
+
+        assert len(result.text.encode()) <= 500
+        assert "x" * 51 not in result.text
+        assert result.byte_capped
+        assert 0 < result.row_count < 100
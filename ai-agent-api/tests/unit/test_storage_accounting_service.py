@@ -0,0 +1,167 @@
+"""Unit tests for StorageAccountingService."""
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.storage_accounting_service import (
+    GLOBAL_OWNER,
+    StorageAccountingService,
+    measure_path,
+)
+from app.domain.exceptions import QuotaExceededError
+
+
+@pytest.fixture
+def accounting_service():
+    """Create StorageAccountingService with a mocked repository."""
+    service = StorageAccountingService(AsyncMock())
+    service.usage_repo = AsyncMock()
+    return service
+
+
+class TestMeasurePath:
+    """Test cases for measure_path."""
+
+    def test_measure_directory(self, tmp_path):
+        """Test bytes and file count are summed recursively."""
+        (tmp_path / "a.txt").write_bytes(b"x" * 10)
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "b.txt").write_bytes(b"y" * 5)
+
+        assert measure_path(tmp_path) == (15, 2)
+
+    def test_measure_file(self, tmp_path):
+        """Test a single file is measured directly."""
+        file_path = tmp_path / "report.html"
+        file_path.write_bytes(b"z" * 7)
+
+        assert measure_path(file_path) == (7, 1)
+
+    def test_measure_missing_path(self, tmp_path):
+        """Test missing paths measure as empty."""
+        assert measure_path(tmp_path / "missing") == (0, 0)
+
+
+class TestStorageAccountingService:
+    """Test cases for StorageAccountingService."""
+
+    @pytest.mark.asyncio
+    async def test_record_new_path_increments_totals(self, accounting_service, tmp_path):
+        """Test first record adds full size to global and user totals."""
+        user_id = uuid4()
+        (tmp_path / "out.log").write_bytes(b"x" * 100)
+        accounting_service.usage_repo.get_by_path.return_value = None
+
+        result = await accounting_service.record_path(tmp_path, "working_directory", user_id)
+
+        assert result == (100, 1)
+        accounting_service.usage_repo.create.assert_called_once()
+        accounting_service.usage_repo.increment_totals.assert_any_call(
+            GLOBAL_OWNER, "working_directory", 100, 1
+        )
+        accounting_service.usage_repo.increment_totals.assert_any_call(
+            str(user_id), "working_directory", 100, 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_record_existing_path_applies_delta(self, accounting_service, tmp_path):
+        """Test re-recording a path only applies the size difference."""
+        user_id = uuid4()
+        (tmp_path / "out.log").write_bytes(b"x" * 100)
+        accounting_service.usage_repo.get_by_path.return_value = MagicMock(
+            id=uuid4(),
+            user_id=user_id,
+            resource_type="working_directory",
+            execution_id=None,
+            size_bytes=40,
+            file_count=1,
+        )
+
+        await accounting_service.record_path(tmp_path, "working_directory", user_id)
+
+        accounting_service.usage_repo.create.assert_not_called()
+        accounting_service.usage_repo.increment_totals.assert_any_call(
+            str(user_id), "working_directory", 60, 0
+        )
+
+    @pytest.mark.asyncio
+    async def test_record_unknown_resource_type(self, accounting_service, tmp_path):
+        """Test unknown resource types are rejected."""
+        with pytest.raises(ValueError):
+            await accounting_service.record_path(tmp_path, "cache")
+
+    @pytest.mark.asyncio
+    async def test_user_usage_includes_total(self, accounting_service):
+        """Test per-type counters are summed into a total entry."""
+        accounting_service.usage_repo.get_totals.return_value = {
+            "working_directory": (300, 3),
+            "archive": (200, 1),
+        }
+
+        usage = await accounting_service.get_user_usage(uuid4())
+
+        assert usage["report"] == {"size_bytes": 0, "file_count": 0}
+        assert usage["total"] == {"size_bytes": 500, "file_count": 4}
+
+    @pytest.mark.asyncio
+    async def test_check_user_quota_exceeded(self, accounting_service):
+        """Test quota check raises when usage reaches the limit."""
+        accounting_service.usage_repo.get_totals.return_value = {
+            "archive": (2 * 1024 * 1024, 1),
+        }
+
+        with pytest.raises(QuotaExceededError):
+            await accounting_service.check_user_quota(uuid4(), max_storage_mb=2)
+
+    @pytest.mark.asyncio
+    async def test_check_user_quota_within_limit(self, accounting_service):
+        """Test quota check passes under the limit."""
+        accounting_service.usage_repo.get_totals.return_value = {
+            "archive": (1024 * 1024, 1),
+        }
+
+        await accounting_service.check_user_quota(uuid4(), max_storage_mb=2)
+
+    @pytest.mark.asyncio
+    async def test_rebuild_totals_locks_before_summing(self, accounting_service):
+        """Test the totals lock is held before per-path records are summed."""
+        user_id = str(uuid4())
+        accounting_service.usage_repo.sum_by_owner.return_value = [
+            (user_id, "archive", 100, 1),
+            (None, "archive", 50, 1),
+        ]
+
+        await accounting_service._rebuild_totals()
+
+        calls = [name for name, _, _ in accounting_service.usage_repo.mock_calls]
+        assert calls.index("lock_totals") < calls.index("sum_by_owner")
+        accounting_service.usage_repo.replace_totals.assert_called_once_with({
+            (GLOBAL_OWNER, "archive"): (150, 2),
+            (user_id, "archive"): (100, 1),
+        })
+
+
+class TestStorageManagerTotals:
+    """Test cases for StorageManager.get_total_storage_usage."""
+
+    @pytest.mark.asyncio
+    async def test_total_read_from_counters(self, monkeypatch, tmp_path):
+        """Test totals come from the maintained counters, not a tree walk."""
+        from app.services.storage_manager import StorageManager
+
+        get_totals = AsyncMock(return_value={"working_directory": (300, 3), "report": (50, 1)})
+        monkeypatch.setattr(
+            "app.repositories.storage_usage_repository.StorageUsageRepository.get_totals",
+            get_totals,
+        )
+        walk = MagicMock()
+        monkeypatch.setattr("app.services.storage_manager.os.walk", walk)
+        manager = StorageManager()
+        user_id = uuid4()
+
+        assert await manager.get_total_storage_usage(AsyncMock()) == 350
+        assert await manager.get_total_storage_usage(AsyncMock(), user_id) == 350
+
+        assert [call.args[0] for call in get_totals.await_args_list] == [GLOBAL_OWNER, str(user_id)]
+        walk.assert_not_called()
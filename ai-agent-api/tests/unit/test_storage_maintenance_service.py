@@ -0,0 +1,304 @@
+"""Unit tests for StorageMaintenanceService."""
+
+import os
+import socket
+import time
+import pytest
+from datetime import datetime, timedelta
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.storage_maintenance_service import (
+    MAINTENANCE_LOCK_KEY,
+    IOThrottle,
+    StorageMaintenanceService,
+    acquire_maintenance_lock,
+    release_maintenance_lock,
+)
+
+
+def _age(path, days):
+    """Backdate a path's mtime."""
+    old = time.time() - days * 24 * 60 * 60
+    os.utime(path, (old, old))
+
+
+@pytest.fixture
+def storage_dirs(tmp_path):
+    """Create session, task, archive and report directories."""
+    dirs = {
+        name: tmp_path / name
+        for name in ("sessions", "tasks", "archives", "reports")
+    }
+    for path in dirs.values():
+        path.mkdir()
+    return dirs
+
+
+@pytest.fixture
+def maintenance_service(storage_dirs):
+    """Create StorageMaintenanceService over temp dirs with mocked repositories."""
+    from app.services.storage_manager import StorageManager
+    storage_manager = StorageManager.__new__(StorageManager)
+    storage_manager.base_workdir = storage_dirs["sessions"]
+    storage_manager.archive_dir = storage_dirs["archives"]
+    storage_manager.reports_dir = storage_dirs["reports"]
+
+    with patch("app.services.storage_maintenance_service.settings") as mock_settings:
+        mock_settings.task_workdir_base = storage_dirs["tasks"]
+        mock_settings.storage_maintenance_io_mb_per_second = 0
+        mock_settings.session_auto_archive_days = 30
+        mock_settings.archive_auto_cleanup = True
+        mock_settings.archive_retention_days = 90
+        mock_settings.report_retention_days = 90
+        mock_settings.storage_orphan_grace_hours = 24
+
+        service = StorageMaintenanceService(AsyncMock(), storage_manager=storage_manager)
+        service.session_repo = AsyncMock()
+        service.session_repo.get_by_ids.return_value = []
+        service.task_repo = AsyncMock()
+        service.task_repo.get_by_ids.return_value = []
+        service.task_execution_repo = AsyncMock()
+        service.task_execution_repo.get_task_activity.return_value = {}
+        service.report_repo = AsyncMock()
+        service.report_repo.get_by_ids.return_value = []
+        service.accounting = AsyncMock()
+        yield service
+
+
+class TestStorageMaintenanceService:
+    """Test cases for StorageMaintenanceService."""
+
+    @pytest.mark.asyncio
+    async def test_orphaned_directory_removed_after_grace(self, maintenance_service, storage_dirs):
+        """Test directories without a session row are deleted once past the grace period."""
+        orphan = storage_dirs["sessions"] / str(uuid4())
+        orphan.mkdir()
+        (orphan / "out.txt").write_bytes(b"x" * 100)
+        _age(orphan, days=2)
+
+        report = await maintenance_service.run()
+
+        assert not orphan.exists()
+        assert report["orphaned_directories"] == 1
+        assert report["bytes_reclaimed"] == 100
+
+    @pytest.mark.asyncio
+    async def test_recent_orphan_kept(self, maintenance_service, storage_dirs):
+        """Test orphans inside the grace period are left alone."""
+        orphan = storage_dirs["sessions"] / str(uuid4())
+        orphan.mkdir()
+
+        report = await maintenance_service.run()
+
+        assert orphan.exists()
+        assert report["orphaned_directories"] == 0
+
+    @pytest.mark.asyncio
+    async def test_dry_run_changes_nothing(self, maintenance_service, storage_dirs):
+        """Test dry run reports reclaimable bytes without deleting."""
+        orphan = storage_dirs["tasks"] / str(uuid4())
+        orphan.mkdir()
+        (orphan / "out.txt").write_bytes(b"x" * 50)
+        _age(orphan, days=2)
+
+        report = await maintenance_service.run(dry_run=True)
+
+        assert orphan.exists()
+        assert report["dry_run"] is True
+        assert report["orphaned_directories"] == 1
+        assert report["bytes_reclaimed"] == 50
+        maintenance_service.accounting.remove_path.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_finished_session_archived(self, maintenance_service, storage_dirs):
+        """Test old finished session directories are archived and removed."""
+        session_id = uuid4()
+        workdir = storage_dirs["sessions"] / str(session_id)
+        workdir.mkdir()
+        (workdir / "result.txt").write_text("done")
+        maintenance_service.session_repo.get_by_ids.return_value = [
+            MagicMock(
+                id=session_id,
+                user_id=uuid4(),
+                status="completed",
+                completed_at=datetime.utcnow() - timedelta(days=60),
+                deleted_at=None,
+            )
+        ]
+
+        report = await maintenance_service.run()
+
+        assert not workdir.exists()
+        assert report["archived_directories"] == 1
+        assert list(storage_dirs["archives"].glob(f"{session_id}_*.tar.gz"))
+
+    @pytest.mark.asyncio
+    async def test_active_task_directory_kept(self, maintenance_service, storage_dirs):
+        """Test task directories with in-flight executions are never touched."""
+        task_id = uuid4()
+        workdir = storage_dirs["tasks"] / str(task_id)
+        workdir.mkdir()
+        maintenance_service.task_repo.get_by_ids.return_value = [
+            MagicMock(id=task_id, user_id=uuid4(), deleted_at=None)
+        ]
+        maintenance_service.task_execution_repo.get_task_activity.return_value = {
+            task_id: (datetime.utcnow() - timedelta(days=60), True)
+        }
+
+        report = await maintenance_service.run()
+
+        assert workdir.exists()
+        assert report["archived_directories"] == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_archive_and_report_deleted(self, maintenance_service, storage_dirs):
+        """Test archives and reports past retention are deleted."""
+        archive = storage_dirs["archives"] / f"{uuid4()}_20250101_000000.tar.gz"
+        archive.write_bytes(b"a" * 10)
+        _age(archive, days=120)
+
+        report_id = uuid4()
+        report_file = storage_dirs["reports"] / f"{report_id}.html"
+        report_file.write_text("<html></html>")
+        maintenance_service.report_repo.get_by_ids.return_value = [
+            MagicMock(
+                id=report_id,
+                file_path=str(report_file),
+                created_at=datetime.utcnow() - timedelta(days=120),
+                deleted_at=None,
+            )
+        ]
+
+        report = await maintenance_service.run()
+
+        assert not archive.exists()
+        assert not report_file.exists()
+        assert report["deleted_archives"] == 1
+        assert report["deleted_reports"] == 1
+        maintenance_service.report_repo.update.assert_called_once_with(
+            report_id, file_path=None, file_size_bytes=None
+        )
+
+
+class TestIOThrottle:
+    """Test cases for IOThrottle."""
+
+    def test_budget_charged_before_io(self):
+        """Test the first chunk goes immediately and later ones wait for their slot."""
+        throttle = IOThrottle(bytes_per_second=1000)
+
+        started = time.monotonic()
+        throttle.acquire(50)
+        first = time.monotonic() - started
+        throttle.acquire(50)
+        second = time.monotonic() - started
+
+        assert first < 0.02
+        assert second >= 0.045
+
+    @pytest.mark.asyncio
+    async def test_unlimited_rate_does_not_wait(self):
+        """Test a zero rate disables throttling."""
+        throttle = IOThrottle(bytes_per_second=0)
+
+        started = time.monotonic()
+        for _ in range(100):
+            await throttle.consume(10 * 1024 * 1024)
+
+        assert time.monotonic() - started < 0.1
+
+
+class TestMaintenanceLock:
+    """Test cases for acquire_maintenance_lock."""
+
+    @pytest.mark.asyncio
+    async def test_lock_taken_with_set_nx_px(self):
+        """Test the pass is claimed with SET NX PX on the lock key."""
+        redis = AsyncMock()
+        redis.set.return_value = True
+
+        assert await acquire_maintenance_lock(60, redis=redis) is True
+
+        args, kwargs = redis.set.call_args
+        assert args[0] == MAINTENANCE_LOCK_KEY
+        assert kwargs["nx"] is True
+        assert kwargs["px"] == 60000
+
+    @pytest.mark.asyncio
+    async def test_pass_skipped_when_lock_held(self):
+        """Test another worker holding the lock skips the pass."""
+        redis = AsyncMock()
+        redis.set.return_value = None
+
+        assert await acquire_maintenance_lock(60, redis=redis) is False
+
+    @pytest.mark.asyncio
+    async def test_pass_skipped_when_redis_fails(self):
+        """Test Redis errors skip the pass instead of running it everywhere."""
+        redis = AsyncMock()
+        redis.set.side_effect = ConnectionError("down")
+
+        assert await acquire_maintenance_lock(60, redis=redis) is False
+
+    @pytest.mark.asyncio
+    async def test_release_only_deletes_own_lock(self):
+        """Test releasing checks ownership so another worker's lock survives."""
+        redis = AsyncMock()
+
+        await release_maintenance_lock(redis=redis)
+
+        args = redis.eval.call_args.args
+        assert args[1:3] == (1, MAINTENANCE_LOCK_KEY)
+        assert args[3] == f"{socket.gethostname()}:{os.getpid()}"
+
+
+class TestManualMaintenance:
+    """Test cases for the admin storage maintenance endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_conflict_while_another_pass_holds_lock(self):
+        """Test a manual pass is refused while the lock is held."""
+        from fastapi import HTTPException
+        from app.api.v1.admin import run_storage_maintenance
+
+        with patch(
+            "app.api.v1.admin.acquire_maintenance_lock", AsyncMock(return_value=False)
+        ), patch("app.api.v1.admin.StorageMaintenanceService") as service:
+            with pytest.raises(HTTPException) as exc_info:
+                await run_storage_maintenance(dry_run=False, admin_user=MagicMock(), db=AsyncMock())
+
+        assert exc_info.value.status_code == 409
+        service.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_lock_released_after_manual_pass(self):
+        """Test a manual pass releases the lock even when it fails."""
+        from app.api.v1.admin import run_storage_maintenance
+
+        release = AsyncMock()
+        with patch(
+            "app.api.v1.admin.acquire_maintenance_lock", AsyncMock(return_value=True)
+        ), patch("app.api.v1.admin.release_maintenance_lock", release), patch(
+            "app.api.v1.admin.StorageMaintenanceService"
+        ) as service:
+            service.return_value.run = AsyncMock(side_effect=RuntimeError("disk error"))
+            with pytest.raises(RuntimeError):
+                await run_storage_maintenance(dry_run=False, admin_user=MagicMock(), db=AsyncMock())
+
+        release.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_dry_run_does_not_lock(self):
+        """Test dry runs only read, so they skip the lock."""
+        from app.api.v1.admin import run_storage_maintenance
+
+        acquire = AsyncMock()
+        with patch("app.api.v1.admin.acquire_maintenance_lock", acquire), patch(
+            "app.api.v1.admin.StorageMaintenanceService"
+        ) as service, patch("app.api.v1.admin.StorageMaintenanceResponse"):
+            service.return_value.run = AsyncMock(return_value={})
+            await run_storage_maintenance(dry_run=True, admin_user=MagicMock(), db=AsyncMock())
+
+        acquire.assert_not_called()
+        service.return_value.run.assert_awaited_once_with(dry_run=True)
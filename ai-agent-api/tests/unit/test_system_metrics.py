@@ -0,0 +1,103 @@
+"""Unit tests for the background system metrics sampler."""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("psutil")
+
+from app.claude_sdk.monitoring.system_metrics import SystemMetricsSampler, SystemSample
+from app.mcp import sdk_tools
+
+
+def _sample(timestamp, cpu):
+    return SystemSample(
+        timestamp=timestamp, cpu_percent=cpu, memory_percent=50.0,
+        memory_used_bytes=1, memory_total_bytes=2, disk_percent=10.0,
+        disk_used_bytes=1, disk_total_bytes=10,
+        net_sent_bytes_per_second=0.0, net_recv_bytes_per_second=0.0,
+    )
+
+
+class TestSystemMetricsSampler:
+    """Test cases for SystemMetricsSampler."""
+
+    def test_windows_and_percentiles(self):
+        """Test rolling windows only include recent samples."""
+        sampler = SystemMetricsSampler(interval_seconds=1, history_seconds=300)
+        now = time.time()
+        for age in range(299, -1, -1):
+            sampler.samples.append(_sample(now - age, cpu=float(age % 100)))
+
+        minute = sampler.window(60)
+        five_minutes = sampler.window(300)
+
+        assert minute["samples"] == 61
+        assert five_minutes["samples"] == 300
+        assert minute["cpu_percent"]["max"] == 60.0
+        assert five_minutes["cpu_percent"]["p50"] == 49.0
+        assert five_minutes["cpu_percent"]["p95"] == 94.0
+
+    def test_ring_buffer_is_bounded(self):
+        """Test history is capped to history_seconds / interval."""
+        sampler = SystemMetricsSampler(interval_seconds=1, history_seconds=10)
+        for _ in range(50):
+            sampler.sample_once()
+
+        assert len(sampler.samples) == 11
+        assert sampler.snapshot()["latest"]["memory_total_bytes"] > 0
+
+    @pytest.mark.asyncio
+    async def test_background_sampling(self):
+        """Test the background task keeps appending samples until stopped."""
+        sampler = SystemMetricsSampler(interval_seconds=0.01, history_seconds=10)
+        sampler.start()
+        await asyncio.sleep(0.1)
+        await sampler.stop()
+
+        assert len(sampler.samples) > 2
+        assert not sampler.running
+
+    @pytest.mark.asyncio
+    async def test_tool_does_not_block_the_loop(self, monkeypatch):
+        """Test get_system_metrics reads the sampler instead of sleeping."""
+        sampler = SystemMetricsSampler(interval_seconds=60, history_seconds=300)
+        monkeypatch.setattr(
+            "app.claude_sdk.monitoring.system_metrics._system_metrics_sampler", sampler
+        )
+
+        started = time.perf_counter()
+        result = await sdk_tools.get_system_metrics.handler({})
+        elapsed = time.perf_counter() - started
+        await sampler.stop()
+
+        assert "**CPU Usage:**" in result["content"][0]["text"]
+        assert elapsed < 0.5
+
+    @pytest.mark.asyncio
+    async def test_start_primes_without_recording_a_sample(self):
+        """Test the priming read is not kept as a 0% CPU sample."""
+        sampler = SystemMetricsSampler(interval_seconds=60, history_seconds=300)
+        sampler.start()
+        await sampler.stop()
+
+        assert len(sampler.samples) == 0
+
+    @pytest.mark.asyncio
+    async def test_zero_interval_samples_on_demand(self, monkeypatch):
+        """Test an interval of 0 is kept and the tool samples without starting the sampler."""
+        monkeypatch.setattr("app.core.config.settings.system_metrics_interval_seconds", 0)
+        sampler = SystemMetricsSampler()
+        monkeypatch.setattr(
+            "app.claude_sdk.monitoring.system_metrics._system_metrics_sampler", sampler
+        )
+
+        result = await sdk_tools.get_system_metrics.handler({})
+
+        assert sampler.interval_seconds == 0
+        assert not sampler.running
+        assert len(sampler.samples) == 1
+        assert "**CPU Usage:**" in result["content"][0]["text"]
+        with pytest.raises(ValueError):
+            sampler.start()
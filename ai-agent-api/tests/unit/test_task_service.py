@@ -504,4 +504,48 @@ class TestTaskService:
         
         # Assert
         assert len(scheduled_tasks) == 1
-        assert scheduled_tasks[0].name == "Scheduled Task"
\ No newline at end of file
+        assert scheduled_tasks[0].name == "Scheduled Task"
+
+class TestTaskDefinitionValidation:
+    """Test cases for TaskService._validate_task_definition tool lists."""
+
+    @pytest.fixture
+    def task_service(self):
+        return TaskService(
+            db=AsyncMock(),
+            task_repo=AsyncMock(),
+            task_execution_repo=AsyncMock(),
+            user_repo=AsyncMock(),
+            audit_service=AsyncMock(),
+        )
+
+    async def _validate(self, task_service, allowed_tools, disallowed_tools):
+        await task_service._validate_task_definition(
+            prompt_template="Check {{ cluster }}",
+            allowed_tools=allowed_tools,
+            disallowed_tools=disallowed_tools,
+            sdk_options={},
+            is_scheduled=False,
+            schedule_cron=None,
+            generate_report=False,
+            report_format=None,
+        )
+
+    @pytest.mark.asyncio
+    async def test_partially_disallowed_tools_are_accepted(self, task_service):
+        """Test a deny list that leaves some allowed tools usable passes."""
+        await self._validate(
+            task_service,
+            ["Read", "mcp__kubernetes_readonly__*"],
+            ["mcp__kubernetes_readonly__*"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_every_allowed_tool_disallowed_is_rejected(self, task_service):
+        """Test a task whose deny list blocks all of its allowed tools is rejected."""
+        with pytest.raises(ValidationError, match="disallowed_tools"):
+            await self._validate(
+                task_service,
+                ["Bash", "mcp__kubernetes_readonly__list_pods"],
+                ["Bash", "mcp__kubernetes_readonly__*"],
+            )
@@ -0,0 +1,155 @@
+"""Unit tests for the SDK MCP tool result cache."""
+
+import asyncio
+
+import pytest
+
+from app.mcp import tool_cache
+from app.mcp.tool_cache import ToolResultCache, cached_tool
+
+
+class FakeRedis:
+    """Minimal async Redis with get/set."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+def _ok(text):
+    return {"content": [{"type": "text", "text": text}]}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Install a fresh memory-only cache as the process-wide cache."""
+    cache = ToolResultCache(use_redis=False)
+    monkeypatch.setattr(tool_cache, "_tool_result_cache", cache)
+    return cache
+
+
+class TestToolResultCache:
+    """Test cases for ToolResultCache and cached_tool."""
+
+    @pytest.mark.asyncio
+    async def test_identical_calls_hit_cache(self, cache):
+        """Test repeated calls with equivalent args run the tool once."""
+        calls = []
+
+        @cached_tool(ttl_seconds=30)
+        async def describe(args):
+            calls.append(args)
+            return _ok(args["table_name"])
+
+        await describe({"table_name": "users"})
+        await describe({"table_name": "users", "schema": ""})
+        await describe({"table_name": "tasks"})
+
+        assert len(calls) == 2
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_are_coalesced(self, cache):
+        """Test concurrent identical calls share one in-flight execution."""
+        calls = 0
+
+        @cached_tool(ttl_seconds=30)
+        async def slow(args):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return _ok("done")
+
+        results = await asyncio.gather(*(slow({}) for _ in range(5)))
+
+        assert calls == 1
+        assert all(result == _ok("done") for result in results)
+        assert cache.get_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_cancelled_call_is_taken_over_by_a_waiter(self, cache):
+        """Test cancelling the caller making the call does not cancel the waiters."""
+        calls = 0
+
+        @cached_tool(ttl_seconds=30)
+        async def slow(args):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return _ok(f"call {calls}")
+
+        leader = asyncio.create_task(slow({}))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(slow({})) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        results = await asyncio.gather(*waiters)
+
+        assert leader.cancelled()
+        assert calls == 2
+        assert all(result == _ok("call 2") for result in results)
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, cache):
+        """Test error results and exceptions are retried on the next call."""
+        calls = 0
+
+        @cached_tool(ttl_seconds=30)
+        async def flaky(args):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                return {"content": [], "isError": True}
+            if calls == 2:
+                raise RuntimeError("boom")
+            return _ok("ok")
+
+        assert (await flaky({}))["isError"]
+        with pytest.raises(RuntimeError):
+            await flaky({})
+        assert await flaky({}) == _ok("ok")
+        assert await flaky({}) == _ok("ok")
+        assert calls == 3
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self, cache):
+        """Test results are recomputed after the TTL."""
+        calls = 0
+
+        @cached_tool(ttl_seconds=0.01)
+        async def tool(args):
+            nonlocal calls
+            calls += 1
+            return _ok("x")
+
+        await tool({})
+        await asyncio.sleep(0.02)
+        await tool({})
+
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_shared_through_redis(self):
+        """Test a result computed by one worker is reused by another."""
+        redis = FakeRedis()
+        worker_a = ToolResultCache(redis=redis, use_redis=True)
+        worker_b = ToolResultCache(redis=redis, use_redis=True)
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            return _ok("pods")
+
+        await worker_a.get_or_call("list_pods", {"namespace": "default"}, 15, call)
+        result = await worker_b.get_or_call("list_pods", {"namespace": "default"}, 15, call)
+
+        assert result == _ok("pods")
+        assert calls == 1
+        assert worker_b.get_stats()["shared_hits"] == 1
@@ -264,6 +264,45 @@ def get_execution_status(execution_id: str, format: str):
         raise click.ClickException(f"Failed to get execution status: {str(e)}")
 
 
+@tasks.command(name="watch")
+@click.argument("execution_id")
+@click.option("--format", type=click.Choice(["text", "json"]), default="text", help="Output format")
+def watch_execution(execution_id: str, format: str):
+    """Follow a task execution's progress as it happens.
+
+    Streams status changes, Claude's responses, tool calls and the final
+    cost until the execution finishes.
+
+    Example:
+        ai-agent tasks watch abc123
+    """
+    client = get_client()
+
+    try:
+        for event in client.stream_task_execution_events(execution_id):
+            if format == "json":
+                click.echo(json.dumps(event))
+                continue
+
+            event_type = event.get("type")
+            data = event.get("data") or {}
+            if event_type == "status":
+                print_info(f"Status: {data.get('status')}" + (f" ({data['error']})" if data.get("error") else ""))
+            elif event_type == "assistant_text":
+                click.echo(data.get("text", ""))
+            elif event_type == "tool_call":
+                click.echo(f"→ {data.get('name')} {json.dumps(data.get('input'))}")
+            elif event_type == "result":
+                print_success(
+                    f"Finished in {data.get('num_turns')} turns, "
+                    f"{(data.get('duration_ms') or 0) / 1000:.1f}s, "
+                    f"${data.get('total_cost_usd') or 0:.4f}"
+                )
+
+    except Exception as e:
+        raise click.ClickException(f"Failed to watch execution: {str(e)}")
+
+
 @tasks.command(name="retry-execution")
 @click.argument("execution_id")
 @click.option("--format", type=click.Choice(["table", "json"]), default="table", help="Output format")
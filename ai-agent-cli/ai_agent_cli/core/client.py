@@ -1,7 +1,9 @@
 """HTTP client for AI-Agent-API-Service."""
 
 import httpx
-from typing import Any, Dict, Optional
+import json
+import time
+from typing import Any, Dict, Iterator, Optional
 from pathlib import Path
 
 from ai_agent_cli.core.config import config_manager
@@ -244,6 +246,47 @@ class APIClient:
         """Get task execution."""
         return self.get(f"/api/v1/tasks/executions/{execution_id}")
 
+    def stream_task_execution_events(
+        self, execution_id: str, last_event_id: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Follow task execution progress events (Server-Sent Events).
+
+        Yields events until the execution reaches a terminal status.
+        Reconnects after dropped connections, resuming after the last
+        event received.
+        """
+        url = f"{self.base_url}/api/v1/tasks/executions/{execution_id}/events"
+        timeout = httpx.Timeout(60.0, connect=10.0)  # server sends heartbeats while idle
+
+        while True:
+            headers = self._get_headers()
+            headers["Accept"] = "text/event-stream"
+            if last_event_id:
+                headers["Last-Event-ID"] = last_event_id
+
+            try:
+                with httpx.Client(timeout=timeout) as client:
+                    with client.stream("GET", url, headers=headers) as response:
+                        if response.status_code >= 400:
+                            response.read()
+                            self._handle_response(response)
+
+                        event_id, data = None, []
+                        for line in response.iter_lines():
+                            if line.startswith("id:"):
+                                event_id = line[3:].strip()
+                            elif line.startswith("data:"):
+                                data.append(line[5:].strip())
+                            elif not line and data:
+                                if event_id:
+                                    last_event_id = event_id
+                                yield json.loads("\n".join(data))
+                                event_id, data = None, []
+                # The server ends the stream after a terminal status
+                return
+            except (httpx.ReadTimeout, httpx.RemoteProtocolError):
+                time.sleep(3)
+
     def retry_task_execution(self, execution_id: str) -> Dict[str, Any]:
         """Retry a failed task execution.
 
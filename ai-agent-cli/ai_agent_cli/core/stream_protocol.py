@@ -0,0 +1,62 @@
+"""Decoder for session stream WebSocket frames.
+
+The stream endpoint sends JSON text frames by default. With
+``?encoding=msgpack`` (optionally ``&compression=deflate``) it sends binary
+frames: one flags byte followed by a msgpack body, raw-deflated when
+``flags & 0x01``. Map keys listed in ``KEY_TABLE`` are sent as their index.
+
+Binary frames require the optional ``msgpack`` package
+(``pip install ai-agent-cli[stream]``).
+"""
+
+import json
+import zlib
+from typing import Any, Dict, List, Tuple, Union
+
+from ai_agent_cli.core.exceptions import CLIError
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FLAG_DEFLATE = 0x01
+
+# Must match the server's KEY_TABLE for the announced key_table_version
+KEY_TABLE_VERSION = 1
+KEY_TABLE: Tuple[str, ...] = (
+    "type", "data", "session_id", "event_type", "event_data", "timestamp",
+    "index", "delta", "text", "partial_json", "thinking", "signature",
+    "content_block", "stop_reason", "usage", "input_tokens", "output_tokens",
+    "cache_creation_input_tokens", "cache_read_input_tokens",
+    "id", "message", "message_type", "sequence_number", "content",
+    "created_at", "role", "model", "name", "input", "tool_use_id",
+    "is_error", "subtype", "uuid", "parent_tool_use_id",
+    "status", "result", "total_cost_usd", "duration_ms", "num_turns",
+    "code", "message_id", "replayed", "last_sequence", "since_sequence",
+)
+
+
+def stream_params(binary: bool = True, compress: bool = True) -> Dict[str, str]:
+    """Get the query parameters requesting the compact protocol, if available."""
+    if not binary or msgpack is None:
+        return {"encoding": "json"}
+    return {"encoding": "msgpack", "compression": "deflate" if compress else "none"}
+
+
+def _expand_keys(pairs: List[Tuple[Any, Any]]) -> Dict[str, Any]:
+    """Restore key table indexes to key names."""
+    return {KEY_TABLE[key] if isinstance(key, int) else key: value for key, value in pairs}
+
+
+def decode_frame(data: Union[str, bytes]) -> Any:
+    """Decode a stream frame to its event dict."""
+    if isinstance(data, str):
+        return json.loads(data)
+    if msgpack is None:
+        raise CLIError("Binary stream frames require msgpack: pip install ai-agent-cli[stream]")
+
+    flags, body = data[0], data[1:]
+    if flags & FLAG_DEFLATE:
+        body = zlib.decompress(body, -zlib.MAX_WBITS)
+    return msgpack.unpackb(body, raw=False, strict_map_key=False, object_pairs_hook=_expand_keys)
@@ -0,0 +1,149 @@
+/**
+ * Decoder for session stream WebSocket frames.
+ *
+ * The stream endpoint sends JSON text frames by default. With
+ * `?encoding=msgpack&compression=deflate` it sends binary frames: one flags
+ * byte followed by a msgpack body, raw-deflated when `flags & 0x01`. Map
+ * keys listed in KEY_TABLE are sent as their integer index.
+ *
+ * The msgpack reader below handles the subset the server emits and maps
+ * integer keys while decoding (JS objects cannot tell `1` from `"1"`).
+ */
+
+const FLAG_DEFLATE = 0x01;
+
+// Must match the server's KEY_TABLE for the announced key_table_version
+export const KEY_TABLE_VERSION = 1;
+export const KEY_TABLE: readonly string[] = [
+  'type', 'data', 'session_id', 'event_type', 'event_data', 'timestamp',
+  'index', 'delta', 'text', 'partial_json', 'thinking', 'signature',
+  'content_block', 'stop_reason', 'usage', 'input_tokens', 'output_tokens',
+  'cache_creation_input_tokens', 'cache_read_input_tokens',
+  'id', 'message', 'message_type', 'sequence_number', 'content',
+  'created_at', 'role', 'model', 'name', 'input', 'tool_use_id',
+  'is_error', 'subtype', 'uuid', 'parent_tool_use_id',
+  'status', 'result', 'total_cost_usd', 'duration_ms', 'num_turns',
+  'code', 'message_id', 'replayed', 'last_sequence', 'since_sequence',
+];
+
+export interface StreamEvent {
+  type: string;
+  data?: any;
+  [key: string]: any;
+}
+
+/** Query parameters requesting the compact binary protocol. */
+export function streamProtocolParams(compress = true): Record<string, string> {
+  if (typeof DecompressionStream === 'undefined') {
+    return { encoding: 'msgpack', compression: 'none' };
+  }
+  return { encoding: 'msgpack', compression: compress ? 'deflate' : 'none' };
+}
+
+const textDecoder = new TextDecoder();
+
+class MsgpackReader {
+  private view: DataView;
+  private offset = 0;
+
+  constructor(private bytes: Uint8Array) {
+    this.view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  }
+
+  read(): any {
+    const byte = this.view.getUint8(this.offset++);
+    if (byte <= 0x7f) return byte;
+    if (byte >= 0xe0) return byte - 0x100;
+    if ((byte & 0xf0) === 0x80) return this.map(byte & 0x0f);
+    if ((byte & 0xf0) === 0x90) return this.array(byte & 0x0f);
+    if ((byte & 0xe0) === 0xa0) return this.str(byte & 0x1f);
+
+    switch (byte) {
+      case 0xc0: return null;
+      case 0xc2: return false;
+      case 0xc3: return true;
+      case 0xc4: return this.bin(this.uint(1));
+      case 0xc5: return this.bin(this.uint(2));
+      case 0xc6: return this.bin(this.uint(4));
+      case 0xca: return this.advance(4, this.view.getFloat32(this.offset));
+      case 0xcb: return this.advance(8, this.view.getFloat64(this.offset));
+      case 0xcc: return this.uint(1);
+      case 0xcd: return this.uint(2);
+      case 0xce: return this.uint(4);
+      case 0xcf: return this.advance(8, Number(this.view.getBigUint64(this.offset)));
+      case 0xd0: return this.advance(1, this.view.getInt8(this.offset));
+      case 0xd1: return this.advance(2, this.view.getInt16(this.offset));
+      case 0xd2: return this.advance(4, this.view.getInt32(this.offset));
+      case 0xd3: return this.advance(8, Number(this.view.getBigInt64(this.offset)));
+      case 0xd9: return this.str(this.uint(1));
+      case 0xda: return this.str(this.uint(2));
+      case 0xdb: return this.str(this.uint(4));
+      case 0xdc: return this.array(this.uint(2));
+      case 0xdd: return this.array(this.uint(4));
+      case 0xde: return this.map(this.uint(2));
+      case 0xdf: return this.map(this.uint(4));
+      default:
+        throw new Error(`Unsupported msgpack type 0x${byte.toString(16)}`);
+    }
+  }
+
+  private advance<T>(size: number, value: T): T {
+    this.offset += size;
+    return value;
+  }
+
+  private uint(size: 1 | 2 | 4): number {
+    const value =
+      size === 1 ? this.view.getUint8(this.offset)
+        : size === 2 ? this.view.getUint16(this.offset)
+          : this.view.getUint32(this.offset);
+    return this.advance(size, value);
+  }
+
+  private str(length: number): string {
+    const value = textDecoder.decode(this.bytes.subarray(this.offset, this.offset + length));
+    return this.advance(length, value);
+  }
+
+  private bin(length: number): Uint8Array {
+    return this.advance(length, this.bytes.slice(this.offset, this.offset + length));
+  }
+
+  private array(length: number): any[] {
+    const items = new Array(length);
+    for (let i = 0; i < length; i++) items[i] = this.read();
+    return items;
+  }
+
+  private map(length: number): Record<string, any> {
+    const result: Record<string, any> = {};
+    for (let i = 0; i < length; i++) {
+      const key = this.read();
+      result[typeof key === 'number' ? KEY_TABLE[key] : key] = this.read();
+    }
+    return result;
+  }
+}
+
+async function inflateRaw(bytes: Uint8Array): Promise<Uint8Array> {
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate-raw'));
+  return new Uint8Array(await new Response(stream).arrayBuffer());
+}
+
+/**
+ * Decode a stream frame (WebSocket `MessageEvent.data`) to its event.
+ *
+ * Set `websocket.binaryType = 'arraybuffer'` when using the binary protocol.
+ */
+export async function decodeStreamFrame(data: string | ArrayBuffer | Blob): Promise<StreamEvent> {
+  if (typeof data === 'string') {
+    return JSON.parse(data);
+  }
+
+  const frame = new Uint8Array(data instanceof Blob ? await data.arrayBuffer() : data);
+  let body = frame.subarray(1);
+  if (frame[0] & FLAG_DEFLATE) {
+    body = await inflateRaw(body);
+  }
+  return new MsgpackReader(body).read();
+}